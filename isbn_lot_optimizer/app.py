@@ -35,7 +35,7 @@ from typing import Optional, Sequence
 from shared.models import BookEvaluation
 from .service import BookService
 from shared.utils import normalise_isbn
-from .author_match import probable_author_matches, cluster_authors
+from .author_match import AuthorClusterIndex, probable_author_matches, cluster_authors
 from shared.database import DatabaseManager
 
 DEFAULT_DB_PATH = Path.home() / ".isbn_lot_optimizer" / "catalog.db"
@@ -106,6 +106,11 @@ def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
         action="store_true",
         help="Display comprehensive database statistics and exit.",
     )
+    parser.add_argument(
+        "--rebuild-search-index",
+        action="store_true",
+        help="Rebuild the full-text search index over the books table and exit.",
+    )
 
     args = parser.parse_args(argv)
 
@@ -246,6 +251,16 @@ def main(argv: Optional[Sequence[str]] = None) -> None:
             service.close()
         raise SystemExit(0)
 
+    # Fast path: rebuild the library full-text search index
+    if args.rebuild_search_index:
+        db_mgr = DatabaseManager(database_path)
+        try:
+            count = db_mgr.rebuild_search_index()
+        finally:
+            db_mgr.close()
+        print(f"Search index rebuilt: {count} books indexed.")
+        raise SystemExit(0)
+
     # Fast path: author matching utilities
     if args.author_search or args.list_author_clusters:
         db_mgr = DatabaseManager(database_path)
@@ -255,7 +270,7 @@ def main(argv: Optional[Sequence[str]] = None) -> None:
             db_mgr.close()
 
         if args.list_author_clusters:
-            groups = cluster_authors(names)
+            groups = cluster_authors(names, cache_path=AuthorClusterIndex.cache_path_for(database_path))
             print(f"Author clusters: {len(groups)} groups")
             for key in sorted(groups.keys()):
                 members = sorted(groups[key], key=lambda x: x.lower())
@@ -440,6 +455,10 @@ def main(argv: Optional[Sequence[str]] = None) -> None:
             lots = service.build_lot_candidates()
             if args.limit is not None:
                 lots = lots[: args.limit]
+            try:
+                service.prefetch_lot_market(lots)
+            except Exception as exc:
+                print("lot prefetch error:", exc)
             for lot in lots:
                 try:
                     service.enrich_lot_with_market(lot)
@@ -1,9 +1,17 @@
 from __future__ import annotations
 
 import difflib
+import logging
+import os
+import pickle
 import re
+import threading
 import unicodedata
-from typing import Dict, Iterable, List, Sequence, Tuple
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+logger = logging.getLogger(__name__)
 
 
 # Common suffixes to ignore for canonical keying
@@ -75,6 +83,7 @@ def _split_last_first(name: str) -> Tuple[List[str], bool]:
     return tokens, False
 
 
+@lru_cache(maxsize=65536)
 def author_key(name: str) -> str:
     """
     Compute a canonical key for an author suitable for equality/grouping.
@@ -130,12 +139,26 @@ def similarity(a: str, b: str) -> float:
     - If last names match (common catalog case) and either side is short (e.g., only last name
       or first+last where the other has initials/full first), boost to at least ~0.85.
     """
-    ka, kb = author_key(a), author_key(b)
+    return _key_similarity(author_key(a), author_key(b))
+
+
+def _key_similarity(ka: str, kb: str, threshold: float = 0.0) -> float:
+    """
+    ``similarity`` on canonical keys. When the last names differ and the
+    length bound already rules out reaching ``threshold``, returns that
+    bound instead of running the full difflib comparison.
+    """
     if not ka or not kb:
         return 0.0
-    base = difflib.SequenceMatcher(None, ka, kb).ratio()
     ta, tb = ka.split(), kb.split()
-    if ta and tb and ta[-1] == tb[-1]:
+    same_last = bool(ta and tb and ta[-1] == tb[-1])
+    matcher = difflib.SequenceMatcher(None, ka, kb)
+    if not same_last and threshold > 0:
+        bound = matcher.real_quick_ratio()
+        if bound < threshold:
+            return bound
+    base = matcher.ratio()
+    if same_last:
         # Last names match. If one side is short (<=2 tokens), they are likely the same author with
         # different initial/first-name representation. Boost conservatively.
         if len(ta) <= 2 or len(tb) <= 2:
@@ -167,7 +190,7 @@ def probable_author_matches(
 
     seen: Dict[str, float] = {}
     for cand in candidates:
-        score = similarity(query, cand)
+        score = _key_similarity(kq, author_key(cand), threshold)
         if score >= threshold:
             # If multiple raw variants map to the same cand string, keep the max score
             if cand not in seen or score > seen[cand]:
@@ -179,53 +202,317 @@ def probable_author_matches(
     return items
 
 
-def cluster_authors(candidates: Iterable[str], threshold: float = 0.9) -> Dict[str, List[str]]:
+def cluster_authors(
+    candidates: Iterable[str],
+    threshold: float = 0.9,
+    cache_path: Optional[Path] = None,
+) -> Dict[str, List[str]]:
     """
     Cluster candidate author names by their canonical keys (strong grouping),
     then post-merge clusters that clearly refer to the same author (e.g.,
     'rowling' vs 'joanne rowling').
 
     threshold: similarity threshold for merging near-duplicate keys.
+    cache_path: optional file to keep the clustering state in between runs
+        (see AuthorClusterIndex); only names added or removed since the last
+        run are then re-scored.
     """
-    # Initial grouping by canonical key
-    groups: Dict[str, List[str]] = {}
-    for cand in candidates:
-        key = author_key(cand)
-        if not key:
-            continue
-        groups.setdefault(key, []).append(cand)
+    if cache_path is None:
+        index = AuthorClusterIndex(threshold)
+        index.update(candidates)
+        return index.clusters()
+
+    with _cache_lock:
+        index = AuthorClusterIndex.load(cache_path, threshold)
+        index.update(candidates)
+        index.save(cache_path)
+        return index.clusters()
+
+
+# ------------------------------ Blocked clustering ------------------------------ #
+# Phonetic blocks bigger than this are too unselective to be worth scoring
+# pairwise; last-name blocks are always scored.
+MAX_BLOCK_SIZE = 500
+# Surnames shorter than this are too often distinct names one letter apart
+# (King / Kang) to merge as spelling variants
+MIN_VARIANT_SURNAME = 5
+CLUSTER_CACHE_VERSION = 2
+
+_SOUNDEX_CODES = {
+    **dict.fromkeys("bfpv", "1"),
+    **dict.fromkeys("cgjkqsxz", "2"),
+    **dict.fromkeys("dt", "3"),
+    "l": "4",
+    **dict.fromkeys("mn", "5"),
+    "r": "6",
+}
 
-    if not groups:
-        return groups
+_cache_lock = threading.Lock()
 
-    # Build index of keys by last token (last name)
-    by_last: Dict[str, List[str]] = {}
-    for key in list(groups.keys()):
-        tokens = key.split()
-        if not tokens:
-            continue
-        last = tokens[-1]
-        by_last.setdefault(last, []).append(key)
 
-    # Merge keys that share a last name and are similar
-    for last, keys in by_last.items():
-        if len(keys) < 2:
-            continue
-        # Prefer the shortest key as the canonical representative (often just the surname)
-        keys_sorted = sorted(keys, key=lambda k: (len(k.split()), len(k)))
-        canonical = keys_sorted[0]
-        for other in keys_sorted[1:]:
-            if other not in groups or canonical not in groups:
+def soundex(word: str) -> str:
+    """American Soundex code for a word ('' if it has no letters)."""
+    letters = [c for c in _strip_accents(word).lower() if c.isalpha()]
+    if not letters:
+        return ""
+    code = letters[0].upper()
+    previous = _SOUNDEX_CODES.get(letters[0], "")
+    for c in letters[1:]:
+        digit = _SOUNDEX_CODES.get(c, "")
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        if c not in "hw":
+            previous = digit
+    return code.ljust(4, "0")
+
+
+def _blocking_keys(key: str) -> Set[Tuple[str, str]]:
+    """Blocks a canonical key belongs to; only keys sharing a block are compared."""
+    tokens = key.split()
+    last = tokens[-1]
+    return {("last", last), ("phonetic", f"{soundex(last)}:{tokens[0][0] if len(tokens) > 1 else ''}")}
+
+
+def _canonical_order(key: str) -> Tuple[int, int]:
+    """Prefer the shortest key as the canonical representative (often just the surname)."""
+    return (len(key.split()), len(key))
+
+
+def _within_one_edit(a: str, b: str) -> bool:
+    """True if one insertion, deletion or substitution turns ``a`` into ``b``."""
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    if len(a) == len(b):
+        return a[i + 1:] == b[i + 1:]
+    return a[i:] == b[i + 1:]
+
+
+def _should_merge(a: str, b: str, threshold: float) -> bool:
+    """The pairwise merge rule for keys with the same surname."""
+    shorter, longer = sorted((a, b), key=_canonical_order)
+    last = shorter.split()[-1]
+    if shorter == last or shorter in longer:
+        return True
+    return _key_similarity(shorter, longer, threshold) >= threshold
+
+
+def _is_surname_variant(a: str, b: str) -> bool:
+    """
+    The merge rule for keys with different surnames: the same given names and
+    surnames one edit apart, both at least MIN_VARIANT_SURNAME letters long.
+    """
+    *given_a, last_a = a.split()
+    *given_b, last_b = b.split()
+    return (
+        bool(given_a)
+        and given_a == given_b
+        and min(len(last_a), len(last_b)) >= MIN_VARIANT_SURNAME
+        and _within_one_edit(last_a, last_b)
+    )
+
+
+class AuthorClusterIndex:
+    """
+    Incremental author clustering over canonical keys.
+
+    Names are grouped by ``author_key``. Keys are then placed in blocks:
+
+    - last name
+    - Soundex of the last name plus the first given-name initial
+
+    Only keys sharing a block are scored. Within a last-name block each key
+    is compared with the block's shortest key, as before blocking; ties go
+    to the key seen first. Phonetic blocks compare keys with different
+    surnames pairwise and only merge spelling variants of one person (see
+    ``_is_surname_variant``). Blocks over ``MAX_BLOCK_SIZE`` keys are
+    skipped. Pairs that pass are joined with union-find.
+
+    Every pair decision is cached, so after ``update()`` with a slightly
+    different name list, ``clusters()`` only scores pairs involving new keys.
+    The whole state can be pickled with ``save()``/``load()`` between runs.
+    """
+
+    def __init__(self, threshold: float = 0.9):
+        self.threshold = threshold
+        self.names: Dict[str, str] = {}  # name -> key
+        self.members: Dict[str, List[str]] = {}  # key -> names, in insertion order
+        self.first_seen: Dict[str, int] = {}  # key -> position of its first name
+        self.blocks: Dict[Tuple[str, str], Set[str]] = {}
+        self.decisions: Dict[Tuple[str, str], bool] = {}
+        self.scored = 0
+
+    # ------------------------------------------------------------------
+    # Persistence
+
+    @staticmethod
+    def cache_path_for(db_path: Path) -> Path:
+        db_path = Path(db_path)
+        return db_path.with_name(db_path.name + ".author_clusters.pkl")
+
+    @classmethod
+    def load(cls, path: Path, threshold: float = 0.9) -> "AuthorClusterIndex":
+        """Load saved state, or start empty if missing, unreadable or for another threshold."""
+        try:
+            with open(path, "rb") as fh:
+                version, index = pickle.load(fh)
+        except FileNotFoundError:
+            return cls(threshold)
+        except Exception as exc:
+            logger.warning(f"Ignoring unreadable author cluster cache {path}: {exc}")
+            return cls(threshold)
+        if version != CLUSTER_CACHE_VERSION or not isinstance(index, cls) or index.threshold != threshold:
+            return cls(threshold)
+        return index
+
+    def save(self, path: Path) -> None:
+        path = Path(path)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "wb") as fh:
+                pickle.dump((CLUSTER_CACHE_VERSION, self), fh, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError as exc:
+            logger.warning(f"Could not write author cluster cache {path}: {exc}")
+
+    # ------------------------------------------------------------------
+    # Updates
+
+    def update(self, candidates: Iterable[str]) -> None:
+        """Make the index reflect exactly ``candidates`` (adding and removing names)."""
+        wanted = list(dict.fromkeys(candidates))
+        wanted_set = set(wanted)
+        removed: Set[str] = set()
+        for name in [name for name in self.names if name not in wanted_set]:
+            key = self._remove(name)
+            if key is not None:
+                removed.add(key)
+        for name in wanted:
+            if name not in self.names:
+                self.add(name)
+        self._forget(removed - set(self.members))
+        # Canonical-key ties go to the key whose name comes first in this list
+        self.first_seen = {}
+        for position, name in enumerate(wanted):
+            key = self.names.get(name)
+            if key is not None:
+                self.first_seen.setdefault(key, position)
+
+    def add(self, name: str) -> None:
+        key = author_key(name)
+        if not key or name in self.names:
+            return
+        self.names[name] = key
+        if key in self.members:
+            self.members[key].append(name)
+            return
+        self.members[key] = [name]
+        self.first_seen.setdefault(key, len(self.names))
+        for block in _blocking_keys(key):
+            self._join_block(key, block)
+
+    def remove(self, name: str) -> None:
+        key = self._remove(name)
+        if key is not None:
+            self._forget({key})
+
+    def _remove(self, name: str) -> Optional[str]:
+        """Remove a name; returns its key if that was the key's last name."""
+        key = self.names.pop(name, None)
+        if key is None:
+            return None
+        members = self.members[key]
+        members.remove(name)
+        if members:
+            return None
+        del self.members[key]
+        self.first_seen.pop(key, None)
+        for block in _blocking_keys(key):
+            block_keys = self.blocks.get(block)
+            if block_keys is not None:
+                block_keys.discard(key)
+                if not block_keys:
+                    del self.blocks[block]
+        return key
+
+    def _forget(self, keys: Set[str]) -> None:
+        """Drop cached decisions involving keys that are no longer indexed."""
+        if keys:
+            self.decisions = {
+                pair: decision for pair, decision in self.decisions.items()
+                if pair[0] not in keys and pair[1] not in keys
+            }
+
+    def _join_block(self, key: str, block: Tuple[str, str]) -> None:
+        self.blocks.setdefault(block, set()).add(key)
+
+    def _decide(self, a: str, b: str) -> bool:
+        pair = (a, b) if a < b else (b, a)
+        decision = self.decisions.get(pair)
+        if decision is None:
+            if a.rsplit(" ", 1)[-1] == b.rsplit(" ", 1)[-1]:
+                decision = _should_merge(a, b, self.threshold)
+            else:
+                decision = _is_surname_variant(a, b)
+            self.decisions[pair] = decision
+            self.scored += 1
+        return decision
+
+    def _order(self, key: str) -> Tuple[int, int, int]:
+        return (*_canonical_order(key), self.first_seen.get(key, len(self.names)))
+
+    # ------------------------------------------------------------------
+    # Results
+
+    def clusters(self) -> Dict[str, List[str]]:
+        """Clusters keyed by their shortest canonical key (often the bare surname)."""
+        parent = {key: key for key in self.members}
+
+        def find(key: str) -> str:
+            while parent[key] != key:
+                parent[key] = parent[parent[key]]
+                key = parent[key]
+            return key
+
+        def union(a: str, b: str) -> None:
+            root_a, root_b = find(a), find(b)
+            if root_a != root_b:
+                parent[root_b] = root_a
+
+        for (kind, _value), block_keys in self.blocks.items():
+            if kind == "last":
+                # Same surname: merge into the shortest key, as the unblocked clustering did
+                canonical = min(block_keys, key=self._order)
+                for other in block_keys:
+                    if other != canonical and self._decide(canonical, other):
+                        union(canonical, other)
+                continue
+            if len(block_keys) > MAX_BLOCK_SIZE:
                 continue
-            # If canonical is contained in other, or similarity passes threshold, merge
-            similar = similarity(canonical, other) >= threshold
-            contains = canonical == last or canonical in other
-            if similar or contains:
-                # Merge members and drop the other key
-                merged = groups.setdefault(canonical, [])
-                for name in groups.get(other, []):
-                    if name not in merged:
-                        merged.append(name)
-                groups.pop(other, None)
-
-    return groups
+            # Phonetic blocks catch surname variants; same-surname pairs are handled above
+            ordered = sorted(block_keys)
+            for i, a in enumerate(ordered):
+                last_a = a.rsplit(" ", 1)[-1]
+                for b in ordered[i + 1:]:
+                    if b.rsplit(" ", 1)[-1] != last_a and self._decide(a, b):
+                        union(a, b)
+
+        grouped: Dict[str, List[str]] = {}
+        for key in self.members:
+            grouped.setdefault(find(key), []).append(key)
+
+        result: Dict[str, List[str]] = {}
+        for keys in grouped.values():
+            canonical = min(keys, key=self._order)
+            names: List[str] = []
+            for key in keys:
+                names.extend(self.members[key])
+            result[canonical] = names
+        return result
@@ -0,0 +1,118 @@
+"""Materialized snapshot of decoded catalogue rows."""
+from __future__ import annotations
+
+import pickle
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from shared.database import DatabaseManager
+from shared.models import BookEvaluation
+
+
+class BookSnapshot:
+    """
+    Caches decoded BookEvaluation objects keyed by (isbn, updated_at).
+
+    Decoding a books row means json.loads on metadata/market/booksrun/
+    bookscouter/source blobs, which dominates list_books() on large
+    catalogues. The snapshot keeps the decoded evaluation alongside the
+    row's updated_at; a lookup only re-decodes when updated_at moved or the
+    entry was invalidated by a DatabaseManager write (updated_at only has
+    one-second resolution, so writes also evict explicitly).
+
+    Evaluations are stored pickled and every caller gets its own unpickled
+    copy, nested dicts and lists included, so mutating a result never
+    touches the cache (unpickling is cheaper than copy.deepcopy or a fresh
+    decode).
+
+    Every invalidation bumps ``generation``. A row read before an
+    invalidation of its ISBN may hold the data that write replaced, within
+    the same updated_at second, so callers pass the generation they saw
+    before reading rows and such rows are decoded but not cached.
+    """
+
+    def __init__(self, decode: Callable[[Any], BookEvaluation]):
+        """
+        Args:
+            decode: Function turning a books row into a BookEvaluation
+        """
+        self._decode = decode
+        self._entries: Dict[str, Tuple[Optional[str], bytes]] = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+        # Generation of the last invalidation per ISBN, and of the last full clear
+        self._invalidated: Dict[str, int] = {}
+        self._cleared = 0
+
+    @property
+    def generation(self) -> int:
+        """Read before fetching rows and pass to ``evaluation_for_row``."""
+        with self._lock:
+            return self._generation
+
+    def invalidate(self, isbns: Optional[Iterable[str]] = None) -> None:
+        """Drop cached entries for ``isbns``, or everything when None."""
+        with self._lock:
+            self._generation += 1
+            if isbns is None:
+                self._entries.clear()
+                self._invalidated.clear()
+                self._cleared = self._generation
+                return
+            for isbn in isbns:
+                self._entries.pop(isbn, None)
+                self._invalidated[isbn] = self._generation
+
+    def evaluation_for_row(self, row: Any, generation: int) -> BookEvaluation:
+        """
+        Return the evaluation for a full books row, decoding only if stale.
+
+        Args:
+            row: Full books row
+            generation: ``generation`` as read before ``row`` was fetched
+        """
+        isbn = row["isbn"]
+        updated_at = row["updated_at"]
+        with self._lock:
+            entry = self._entries.get(isbn)
+        if entry is not None and entry[0] == updated_at:
+            return pickle.loads(entry[1])
+        evaluation = self._decode(row)
+        try:
+            blob = pickle.dumps(evaluation, pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return evaluation
+        with self._lock:
+            if self._cleared <= generation and self._invalidated.get(isbn, 0) <= generation:
+                self._entries[isbn] = (updated_at, blob)
+        return evaluation
+
+    def load(self, db: DatabaseManager, versions: List[Tuple[str, Optional[str]]]) -> List[BookEvaluation]:
+        """
+        Return evaluations for ``versions`` (ordered (isbn, updated_at) pairs).
+
+        Only rows whose cached updated_at differs are fetched in full and
+        decoded; the rest come straight from the snapshot.
+        """
+        with self._lock:
+            generation = self._generation
+            cached = {
+                isbn: entry[1] for isbn, updated_at in versions
+                if (entry := self._entries.get(isbn)) is not None and entry[0] == updated_at
+            }
+        stale = [isbn for isbn, _ in versions if isbn not in cached]
+        decoded: Dict[str, BookEvaluation] = {}
+        if stale:
+            for row in db.fetch_books_by_isbns(stale).values():
+                decoded[row["isbn"]] = self.evaluation_for_row(row, generation)
+
+        results: List[BookEvaluation] = []
+        for isbn, _ in versions:
+            if isbn in decoded:
+                results.append(decoded[isbn])
+            elif isbn in cached:
+                results.append(pickle.loads(cached[isbn]))
+        return results
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -26,7 +26,6 @@ from __future__ import annotations
 import asyncio
 import logging
 import os
-import sqlite3
 import statistics
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -38,6 +37,7 @@ from typing import Any, Dict, List, Optional, Tuple
 import aiohttp
 import requests
 
+from shared.db_pool import get_pool
 from shared.decodo import DecodoClient
 from shared.metadata import fetch_metadata, create_http_session
 
@@ -126,79 +126,77 @@ def check_data_freshness(
     if force_refresh:
         return FreshnessCheck()  # All True
 
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-
-    check = FreshnessCheck()
-    now = datetime.now()
-
-    # Check cached_books table
-    cursor.execute("""
-        SELECT
-            metadata_fetched_at,
-            amazon_fbm_collected_at,
-            abebooks_enr_collected_at,
-            last_enrichment_at
-        FROM cached_books
-        WHERE isbn = ?
-    """, (isbn,))
-
-    row = cursor.fetchone()
-    if row:
-        # Check metadata freshness
-        if row["metadata_fetched_at"]:
-            metadata_age = now - datetime.fromisoformat(row["metadata_fetched_at"])
-            check.needs_metadata = metadata_age > timedelta(days=FRESHNESS["metadata"])
-
-        # Check Amazon FBM freshness
-        if row["amazon_fbm_collected_at"]:
-            amazon_age = now - datetime.fromisoformat(row["amazon_fbm_collected_at"])
-            check.needs_amazon_fbm = amazon_age > timedelta(days=FRESHNESS["amazon_fbm"])
-
-        # Check AbeBooks freshness (only one with collected_at timestamp)
-        if row["abebooks_enr_collected_at"]:
-            abe_age = now - datetime.fromisoformat(row["abebooks_enr_collected_at"])
-            check.needs_abebooks = abe_age > timedelta(days=FRESHNESS["abebooks"])
-
-        # For Alibris, Biblio, ZVAB - use last_enrichment_at as fallback
-        if row["last_enrichment_at"]:
-            enr_age = now - datetime.fromisoformat(row["last_enrichment_at"])
-            check.needs_alibris = enr_age > timedelta(days=FRESHNESS["alibris"])
-            check.needs_biblio = enr_age > timedelta(days=FRESHNESS["biblio"])
-            check.needs_zvab = enr_age > timedelta(days=FRESHNESS["zvab"])
-            check.needs_series = enr_age > timedelta(days=FRESHNESS["series"])
-            check.needs_bookfinder = enr_age > timedelta(days=FRESHNESS["bookfinder"])
-
-    # Check eBay active listings
-    cursor.execute("""
-        SELECT MAX(collected_at) as last_collected
-        FROM ebay_active_listings
-        WHERE isbn = ?
-    """, (isbn,))
-
-    ebay_row = cursor.fetchone()
-    if ebay_row and ebay_row["last_collected"]:
-        ebay_age = now - datetime.fromisoformat(ebay_row["last_collected"])
-        check.needs_ebay_active = ebay_age > timedelta(days=FRESHNESS["ebay_active"])
-
-    # Check eBay sold comps (check if sold_comps_is_estimate or old data)
-    cursor.execute("""
-        SELECT sold_comps_is_estimate, last_enrichment_at
-        FROM cached_books
-        WHERE isbn = ?
-    """, (isbn,))
-
-    sold_row = cursor.fetchone()
-    if sold_row:
-        # Always refresh if current data is an estimate
-        if sold_row["sold_comps_is_estimate"]:
-            check.needs_ebay_sold = True
-        elif sold_row["last_enrichment_at"]:
-            sold_age = now - datetime.fromisoformat(sold_row["last_enrichment_at"])
-            check.needs_ebay_sold = sold_age > timedelta(days=FRESHNESS["ebay_sold"])
-
-    conn.close()
+    with get_pool(db_path).read() as conn:
+        cursor = conn.cursor()
+
+        check = FreshnessCheck()
+        now = datetime.now()
+
+        # Check cached_books table
+        cursor.execute("""
+            SELECT
+                metadata_fetched_at,
+                amazon_fbm_collected_at,
+                abebooks_enr_collected_at,
+                last_enrichment_at
+            FROM cached_books
+            WHERE isbn = ?
+        """, (isbn,))
+
+        row = cursor.fetchone()
+        if row:
+            # Check metadata freshness
+            if row["metadata_fetched_at"]:
+                metadata_age = now - datetime.fromisoformat(row["metadata_fetched_at"])
+                check.needs_metadata = metadata_age > timedelta(days=FRESHNESS["metadata"])
+
+            # Check Amazon FBM freshness
+            if row["amazon_fbm_collected_at"]:
+                amazon_age = now - datetime.fromisoformat(row["amazon_fbm_collected_at"])
+                check.needs_amazon_fbm = amazon_age > timedelta(days=FRESHNESS["amazon_fbm"])
+
+            # Check AbeBooks freshness (only one with collected_at timestamp)
+            if row["abebooks_enr_collected_at"]:
+                abe_age = now - datetime.fromisoformat(row["abebooks_enr_collected_at"])
+                check.needs_abebooks = abe_age > timedelta(days=FRESHNESS["abebooks"])
+
+            # For Alibris, Biblio, ZVAB - use last_enrichment_at as fallback
+            if row["last_enrichment_at"]:
+                enr_age = now - datetime.fromisoformat(row["last_enrichment_at"])
+                check.needs_alibris = enr_age > timedelta(days=FRESHNESS["alibris"])
+                check.needs_biblio = enr_age > timedelta(days=FRESHNESS["biblio"])
+                check.needs_zvab = enr_age > timedelta(days=FRESHNESS["zvab"])
+                check.needs_series = enr_age > timedelta(days=FRESHNESS["series"])
+                check.needs_bookfinder = enr_age > timedelta(days=FRESHNESS["bookfinder"])
+
+        # Check eBay active listings
+        cursor.execute("""
+            SELECT MAX(collected_at) as last_collected
+            FROM ebay_active_listings
+            WHERE isbn = ?
+        """, (isbn,))
+
+        ebay_row = cursor.fetchone()
+        if ebay_row and ebay_row["last_collected"]:
+            ebay_age = now - datetime.fromisoformat(ebay_row["last_collected"])
+            check.needs_ebay_active = ebay_age > timedelta(days=FRESHNESS["ebay_active"])
+
+        # Check eBay sold comps (check if sold_comps_is_estimate or old data)
+        cursor.execute("""
+            SELECT sold_comps_is_estimate, last_enrichment_at
+            FROM cached_books
+            WHERE isbn = ?
+        """, (isbn,))
+
+        sold_row = cursor.fetchone()
+        if sold_row:
+            # Always refresh if current data is an estimate
+            if sold_row["sold_comps_is_estimate"]:
+                check.needs_ebay_sold = True
+            elif sold_row["last_enrichment_at"]:
+                sold_age = now - datetime.fromisoformat(sold_row["last_enrichment_at"])
+                check.needs_ebay_sold = sold_age > timedelta(days=FRESHNESS["ebay_sold"])
+
     return check
 
 
@@ -246,24 +244,21 @@ async def collect_amazon_fbm(isbn: str, db_path: Path) -> Tuple[int, bool]:
             return 0, False
 
         # Store in amazon_pricing table
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            INSERT OR REPLACE INTO amazon_pricing
-            (isbn, price, condition, shipping_cost, seller_rating, collected_at)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (
-            isbn,
-            result.get("price"),
-            result.get("condition", "Used"),
-            result.get("shipping"),
-            result.get("rating"),
-            datetime.now().isoformat()
-        ))
+        with get_pool(db_path).write() as conn:
+            cursor = conn.cursor()
 
-        conn.commit()
-        conn.close()
+            cursor.execute("""
+                INSERT OR REPLACE INTO amazon_pricing
+                (isbn, price, condition, shipping_cost, seller_rating, collected_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (
+                isbn,
+                result.get("price"),
+                result.get("condition", "Used"),
+                result.get("shipping"),
+                result.get("rating"),
+                datetime.now().isoformat()
+            ))
 
         return 1, True
     except Exception as e:
@@ -331,42 +326,39 @@ async def collect_ebay_active(isbn: str, db_path: Path) -> Tuple[int, bool]:
             return 0, True
 
         # Store in ebay_active_listings table
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
-        count = 0
-        for item in items:
-            item_id = item.get("itemId")
-            if not item_id:
-                continue
-
-            price = None
-            if "price" in item:
-                price = float(item["price"].get("value", 0))
-
-            cursor.execute("""
-                INSERT OR REPLACE INTO ebay_active_listings
-                (isbn, item_id, title, price, condition, binding, seller, listing_url,
-                 image_url, shipping_cost, item_location, collected_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                isbn,
-                item_id,
-                item.get("title"),
-                price,
-                item.get("condition"),
-                None,  # binding not available from Browse API
-                item.get("seller", {}).get("username"),
-                item.get("itemWebUrl"),
-                item.get("image", {}).get("imageUrl") if "image" in item else None,
-                float(item.get("shippingOptions", [{}])[0].get("shippingCost", {}).get("value", 0)) if item.get("shippingOptions") else None,
-                item.get("itemLocation", {}).get("city"),
-                datetime.now().isoformat()
-            ))
-            count += 1
+        with get_pool(db_path).write() as conn:
+            cursor = conn.cursor()
 
-        conn.commit()
-        conn.close()
+            count = 0
+            for item in items:
+                item_id = item.get("itemId")
+                if not item_id:
+                    continue
+
+                price = None
+                if "price" in item:
+                    price = float(item["price"].get("value", 0))
+
+                cursor.execute("""
+                    INSERT OR REPLACE INTO ebay_active_listings
+                    (isbn, item_id, title, price, condition, binding, seller, listing_url,
+                     image_url, shipping_cost, item_location, collected_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    isbn,
+                    item_id,
+                    item.get("title"),
+                    price,
+                    item.get("condition"),
+                    None,  # binding not available from Browse API
+                    item.get("seller", {}).get("username"),
+                    item.get("itemWebUrl"),
+                    item.get("image", {}).get("imageUrl") if "image" in item else None,
+                    float(item.get("shippingOptions", [{}])[0].get("shippingCost", {}).get("value", 0)) if item.get("shippingOptions") else None,
+                    item.get("itemLocation", {}).get("city"),
+                    datetime.now().isoformat()
+                ))
+                count += 1
 
         logger.info(f"Collected {count} eBay active listings for {isbn}")
         return count, True
@@ -437,52 +429,48 @@ async def _estimate_sold_from_active(isbn: str, db_path: Path) -> Tuple[int, boo
     Returns:
         Tuple of (count_collected, success)
     """
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+    with get_pool(db_path).write() as conn:
+        cursor = conn.cursor()
+
+        # Get active listing prices
+        cursor.execute("""
+            SELECT price
+            FROM ebay_active_listings
+            WHERE isbn = ? AND price IS NOT NULL
+        """, (isbn,))
 
-    # Get active listing prices
-    cursor.execute("""
-        SELECT price
-        FROM ebay_active_listings
-        WHERE isbn = ? AND price IS NOT NULL
-    """, (isbn,))
+        prices = [row[0] for row in cursor.fetchall()]
 
-    prices = [row[0] for row in cursor.fetchall()]
+        if not prices:
+            logger.info(f"No active listings to estimate from for {isbn}")
+            return 0, False
 
-    if not prices:
-        logger.info(f"No active listings to estimate from for {isbn}")
-        conn.close()
-        return 0, False
+        # Calculate statistics and apply 75% rule
+        median = statistics.median(prices)
+        estimated_sold_median = median * 0.75
+        estimated_sold_min = min(prices) * 0.75
+        estimated_sold_max = max(prices) * 0.75
 
-    # Calculate statistics and apply 75% rule
-    median = statistics.median(prices)
-    estimated_sold_median = median * 0.75
-    estimated_sold_min = min(prices) * 0.75
-    estimated_sold_max = max(prices) * 0.75
-
-    # Update cached_books with estimated sold comps
-    cursor.execute("""
-        UPDATE cached_books
-        SET
-            sold_comps_count = ?,
-            sold_comps_min = ?,
-            sold_comps_median = ?,
-            sold_comps_max = ?,
-            sold_comps_is_estimate = 1,
-            sold_comps_source = 'active_listings_estimate',
-            last_enrichment_at = ?
-        WHERE isbn = ?
-    """, (
-        len(prices),
-        estimated_sold_min,
-        estimated_sold_median,
-        estimated_sold_max,
-        datetime.now().isoformat(),
-        isbn
-    ))
-
-    conn.commit()
-    conn.close()
+        # Update cached_books with estimated sold comps
+        cursor.execute("""
+            UPDATE cached_books
+            SET
+                sold_comps_count = ?,
+                sold_comps_min = ?,
+                sold_comps_median = ?,
+                sold_comps_max = ?,
+                sold_comps_is_estimate = 1,
+                sold_comps_source = 'active_listings_estimate',
+                last_enrichment_at = ?
+            WHERE isbn = ?
+        """, (
+            len(prices),
+            estimated_sold_min,
+            estimated_sold_median,
+            estimated_sold_max,
+            datetime.now().isoformat(),
+            isbn
+        ))
 
     logger.info(f"Estimated sold comps for {isbn}: ${estimated_sold_median:.2f} median (from {len(prices)} active)")
     return len(prices), True
@@ -534,37 +522,33 @@ async def collect_marketplace_data(
                 continue
 
             # Store aggregated stats in cached_books
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-
-            prices = [o["price"] for o in offers if o.get("price")]
-            if prices:
-                column_prefix = f"{vendor}_enr"
-                cursor.execute(f"""
-                    UPDATE cached_books
-                    SET
-                        {column_prefix}_count = ?,
-                        {column_prefix}_min = ?,
-                        {column_prefix}_median = ?,
-                        {column_prefix}_avg = ?,
-                        {column_prefix}_max = ?,
-                        {column_prefix}_spread = ?,
-                        {column_prefix}_collected_at = ?
-                    WHERE isbn = ?
-                """, (
-                    len(prices),
-                    min(prices),
-                    statistics.median(prices),
-                    sum(prices) / len(prices),
-                    max(prices),
-                    max(prices) - min(prices),
-                    datetime.now().isoformat(),
-                    isbn
-                ))
-
-                conn.commit()
-
-            conn.close()
+            with get_pool(db_path).write() as conn:
+                cursor = conn.cursor()
+
+                prices = [o["price"] for o in offers if o.get("price")]
+                if prices:
+                    column_prefix = f"{vendor}_enr"
+                    cursor.execute(f"""
+                        UPDATE cached_books
+                        SET
+                            {column_prefix}_count = ?,
+                            {column_prefix}_min = ?,
+                            {column_prefix}_median = ?,
+                            {column_prefix}_avg = ?,
+                            {column_prefix}_max = ?,
+                            {column_prefix}_spread = ?,
+                            {column_prefix}_collected_at = ?
+                        WHERE isbn = ?
+                    """, (
+                        len(prices),
+                        min(prices),
+                        statistics.median(prices),
+                        sum(prices) / len(prices),
+                        max(prices),
+                        max(prices) - min(prices),
+                        datetime.now().isoformat(),
+                        isbn
+                    ))
 
             logger.info(f"Collected {len(offers)} {vendor} offers for {isbn}")
             results[vendor] = (len(offers), True)
@@ -739,53 +723,49 @@ def enrich_book_data(
 
 def _ensure_book_exists(isbn: str, db_path: Path) -> None:
     """Ensure a book record exists in cached_books table."""
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+    with get_pool(db_path).write() as conn:
+        cursor = conn.cursor()
 
-    cursor.execute("""
-        INSERT OR IGNORE INTO cached_books (isbn, created_at)
-        VALUES (?, ?)
-    """, (isbn, datetime.now().isoformat()))
+        cursor.execute("""
+            INSERT OR IGNORE INTO cached_books (isbn, created_at)
+            VALUES (?, ?)
+        """, (isbn, datetime.now().isoformat()))
 
-    conn.commit()
-    conn.close()
 
 
 def _store_metadata(isbn: str, metadata: Dict[str, Any], db_path: Path) -> None:
     """Store collected metadata in cached_books table."""
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        UPDATE cached_books
-        SET
-            title = ?,
-            authors = ?,
-            publisher = ?,
-            publication_year = ?,
-            page_count = ?,
-            language = ?,
-            description = ?,
-            thumbnail_url = ?,
-            metadata_fetched_at = ?,
-            updated_at = ?
-        WHERE isbn = ?
-    """, (
-        metadata.get("title"),
-        metadata.get("authors"),
-        metadata.get("publisher"),
-        metadata.get("published_year"),
-        metadata.get("page_count"),
-        metadata.get("language"),
-        metadata.get("description"),
-        metadata.get("thumbnail"),
-        datetime.now().isoformat(),
-        datetime.now().isoformat(),
-        isbn
-    ))
-
-    conn.commit()
-    conn.close()
+    with get_pool(db_path).write() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            UPDATE cached_books
+            SET
+                title = ?,
+                authors = ?,
+                publisher = ?,
+                publication_year = ?,
+                page_count = ?,
+                language = ?,
+                description = ?,
+                thumbnail_url = ?,
+                metadata_fetched_at = ?,
+                updated_at = ?
+            WHERE isbn = ?
+        """, (
+            metadata.get("title"),
+            metadata.get("authors"),
+            metadata.get("publisher"),
+            metadata.get("published_year"),
+            metadata.get("page_count"),
+            metadata.get("language"),
+            metadata.get("description"),
+            metadata.get("thumbnail"),
+            datetime.now().isoformat(),
+            datetime.now().isoformat(),
+            isbn
+        ))
+
 
 
 def _run_ml_predictions(isbn: str, db_path: Path) -> None:
@@ -34,7 +34,7 @@ from shared.models import BookEvaluation, LotSuggestion
 from .service import BookService
 from shared.constants import COVER_CHOICES
 from shared.utils import normalise_isbn, isbn10_to_isbn13, compute_isbn10_check_digit
-from .author_match import cluster_authors
+from .author_match import AuthorClusterIndex, cluster_authors
 from .bulk_helper import extract_offers_from_books, optimize_vendor_bundles, format_bundle_summary
 
 
@@ -1141,7 +1141,9 @@ class BookEvaluatorGUI:
             messagebox.showinfo("Author Cleanup", "No author names found to analyze.")
             return
 
-        clusters = cluster_authors(names)
+        clusters = cluster_authors(
+            names, cache_path=AuthorClusterIndex.cache_path_for(Path(self.service.db.db_path))
+        )
         # Open interactive review UI for case-by-case approval with thumbnails
         review_clusters = {k: v for k, v in clusters.items() if isinstance(v, (list, tuple)) and len(v) >= 2}
         if not review_clusters:
@@ -0,0 +1,484 @@
+"""
+Durable SQLite-backed job queue for background batch work.
+
+Jobs (e.g. "refresh stale market data for these 2,000 ISBNs") are split into
+per-item rows persisted in ``jobs.db``. A small pool of worker threads claims
+items one at a time, so:
+
+- progress survives restarts: a claimed item carries its worker's owner id
+  and a lease that a heartbeat keeps extending; items whose lease ran out
+  (their process died) are claimed again, and finished items are never redone
+- each item is retried with exponential backoff before it is marked failed
+- every item acquires the token buckets registered for its job kind (e.g.
+  the shared eBay limiter) instead of sleeping a fixed interval
+
+Usage:
+    from isbn_lot_optimizer.job_queue import JobQueue
+
+    queue = JobQueue(db_path)
+    queue.register("refresh_market", handler, limiters=[ebay_limiter])
+    queue.start()
+    job_id = queue.enqueue("refresh_market", [(isbn, {}) for isbn in isbns])
+    queue.get_job(job_id)  # {"status": "running", "completed": 120, ...}
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Protocol, Sequence, Tuple
+
+from shared.db_pool import get_pool
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOBS_DB = Path.home() / ".isbn_lot_optimizer" / "jobs.db"
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_ATTEMPTS = 3
+BACKOFF_BASE_SECONDS = 5.0
+BACKOFF_MAX_SECONDS = 300.0
+LIMITER_TIMEOUT_SECONDS = 60.0
+# A running item whose lease isn't renewed for this long is claimed again
+LEASE_SECONDS = 120.0
+HEARTBEAT_SECONDS = LEASE_SECONDS / 4
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_CANCELLED = "cancelled"
+
+ITEM_PENDING = "pending"
+ITEM_RUNNING = "running"
+ITEM_DONE = "done"
+ITEM_FAILED = "failed"
+ITEM_CANCELLED = "cancelled"
+
+JOBS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    params TEXT,
+    total INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    finished_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS job_items (
+    job_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    item_key TEXT NOT NULL,
+    payload TEXT,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    last_error TEXT,
+    owner TEXT,
+    lease_expires_at REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (job_id, seq)
+);
+
+CREATE INDEX IF NOT EXISTS idx_job_items_claim
+    ON job_items(status, next_attempt_at);
+"""
+
+
+class TokenBucket(Protocol):
+    """Anything with RateLimiter's ``acquire`` (see enrichment_coordinator.RateLimiter)."""
+
+    name: str
+
+    def acquire(self, timeout: float = 30.0) -> bool: ...
+
+
+ItemHandler = Callable[[str, Dict[str, Any]], None]
+CompletionHook = Callable[[Dict[str, Any]], None]
+LimiterSelector = Callable[[Dict[str, Any]], Sequence[TokenBucket]]
+
+
+@dataclass
+class JobKind:
+    """Handler and policies registered for a job kind."""
+
+    handler: ItemHandler
+    limiters: Sequence[TokenBucket] = field(default_factory=tuple)
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    on_complete: Optional[CompletionHook] = None
+    select_limiters: Optional[LimiterSelector] = None
+
+    def limiters_for(self, payload: Dict[str, Any]) -> Sequence[TokenBucket]:
+        if self.select_limiters is not None:
+            return tuple(self.select_limiters(payload))
+        return self.limiters
+
+
+class RetryLater(Exception):
+    """Raised by a handler to retry an item without counting it as an error."""
+
+
+class PermanentFailure(Exception):
+    """Raised by a handler when retrying cannot help; the item fails immediately."""
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def backoff_delay(attempts: int) -> float:
+    """Exponential backoff (5s, 10s, 20s, ...) capped at BACKOFF_MAX_SECONDS."""
+    return min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2 ** max(0, attempts - 1)))
+
+
+class JobQueue:
+    """Persistent job queue with worker threads, retries and rate limiting."""
+
+    def __init__(self, db_path: Path = DEFAULT_JOBS_DB, *, workers: int = DEFAULT_WORKERS):
+        self.db_path = Path(db_path)
+        self.workers = max(1, workers)
+        self._pool = get_pool(self.db_path)
+        self._kinds: Dict[str, JobKind] = {}
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        # Identifies this queue's claims among every process sharing jobs.db
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        with self._pool.write() as conn:
+            conn.executescript(JOBS_SCHEMA)
+            self._ensure_lease_columns(conn)
+
+    @staticmethod
+    def _ensure_lease_columns(conn) -> None:
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(job_items)").fetchall()}
+        if "owner" not in columns:
+            conn.execute("ALTER TABLE job_items ADD COLUMN owner TEXT")
+        if "lease_expires_at" not in columns:
+            conn.execute("ALTER TABLE job_items ADD COLUMN lease_expires_at REAL NOT NULL DEFAULT 0")
+
+    # ------------------------------------------------------------------
+    # Registration and lifecycle
+
+    def register(
+        self,
+        kind: str,
+        handler: ItemHandler,
+        *,
+        limiters: Sequence[TokenBucket] = (),
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        on_complete: Optional[CompletionHook] = None,
+        select_limiters: Optional[LimiterSelector] = None,
+    ) -> None:
+        """
+        Register the handler for ``kind``.
+
+        Args:
+            kind: Job kind name used by ``enqueue``
+            handler: Called as handler(item_key, payload); raise to fail/retry
+            limiters: Token buckets acquired before every item
+            max_attempts: Attempts before an item is marked failed
+            on_complete: Called with the job dict once every item is settled
+            select_limiters: Called with an item's payload to pick its token
+                buckets instead of ``limiters``
+        """
+        self._kinds[kind] = JobKind(
+            handler, tuple(limiters), max(1, max_attempts), on_complete, select_limiters
+        )
+
+    def start(self) -> None:
+        """Start the worker threads and the lease heartbeat."""
+        if self._threads:
+            return
+        self._stop.clear()
+        for n in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"job-worker-{n}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        heartbeat = threading.Thread(target=self._heartbeat, name="job-heartbeat", daemon=True)
+        heartbeat.start()
+        self._threads.append(heartbeat)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the workers; items in flight finish, the rest stay pending."""
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads.clear()
+
+    # ------------------------------------------------------------------
+    # Producer API
+
+    def enqueue(
+        self,
+        kind: str,
+        items: Iterable[Tuple[str, Dict[str, Any]]],
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        job_id: Optional[str] = None,
+    ) -> str:
+        """Persist a job made of (item_key, payload) items; returns the job id."""
+        if kind not in self._kinds:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job_id = job_id or f"{kind}_{uuid.uuid4().hex[:12]}"
+        rows = [
+            (job_id, seq, key, json.dumps(payload or {}), ITEM_PENDING)
+            for seq, (key, payload) in enumerate(items)
+        ]
+        now = _now_iso()
+        with self._pool.write() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, status, params, total, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, JOB_QUEUED, json.dumps(params or {}), len(rows), now, now),
+            )
+            conn.executemany(
+                "INSERT INTO job_items (job_id, seq, item_key, payload, status) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            if not rows:
+                self._finish_job(conn, job_id)
+        self._wake.set()
+        return job_id
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel pending items of a job; returns False if the job is unknown."""
+        with self._pool.write() as conn:
+            if conn.execute("SELECT 1 FROM jobs WHERE id = ?", (job_id,)).fetchone() is None:
+                return False
+            conn.execute(
+                "UPDATE job_items SET status = ? WHERE job_id = ? AND status = ?",
+                (ITEM_CANCELLED, job_id, ITEM_PENDING),
+            )
+            conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ?, finished_at = ? "
+                "WHERE id = ? AND status IN (?, ?)",
+                (JOB_CANCELLED, _now_iso(), _now_iso(), job_id, JOB_QUEUED, JOB_RUNNING),
+            )
+        return True
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return job status with per-state item counts, or None if unknown."""
+        with self._pool.read() as conn:
+            job = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if job is None:
+                return None
+            counts = dict(
+                conn.execute(
+                    "SELECT status, COUNT(*) FROM job_items WHERE job_id = ? GROUP BY status",
+                    (job_id,),
+                ).fetchall()
+            )
+            errors = conn.execute(
+                "SELECT item_key, last_error FROM job_items "
+                "WHERE job_id = ? AND status = ? ORDER BY seq LIMIT 20",
+                (job_id, ITEM_FAILED),
+            ).fetchall()
+        return self._job_dict(job, counts, errors)
+
+    def list_jobs(self, kind: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """Return the most recent jobs (newest first), optionally of one kind."""
+        with self._pool.read() as conn:
+            ids = [
+                row["id"]
+                for row in conn.execute(
+                    "SELECT id FROM jobs WHERE (? IS NULL OR kind = ?) "
+                    "ORDER BY created_at DESC, rowid DESC LIMIT ?",
+                    (kind, kind, int(limit)),
+                ).fetchall()
+            ]
+        return [job for job in (self.get_job(job_id) for job_id in ids) if job is not None]
+
+    # ------------------------------------------------------------------
+    # Worker side
+
+    def run_pending(self, max_items: Optional[int] = None) -> int:
+        """
+        Process ready items on the calling thread until none are left.
+
+        Used by tests and CLI tools; the server relies on ``start()``.
+        Returns the number of items processed.
+        """
+        processed = 0
+        while max_items is None or processed < max_items:
+            claimed = self._claim()
+            if claimed is None:
+                break
+            self._process(*claimed)
+            processed += 1
+        return processed
+
+    def renew_leases(self) -> int:
+        """Extend the lease of every item this queue is running; returns how many."""
+        with self._pool.write() as conn:
+            return conn.execute(
+                "UPDATE job_items SET lease_expires_at = ? WHERE owner = ? AND status = ?",
+                (time.time() + LEASE_SECONDS, self.owner, ITEM_RUNNING),
+            ).rowcount
+
+    def _heartbeat(self) -> None:
+        while not self._stop.wait(HEARTBEAT_SECONDS):
+            try:
+                self.renew_leases()
+            except Exception as exc:  # pragma: no cover - DB trouble; retry next beat
+                logger.error(f"Job queue heartbeat failed: {exc}")
+
+    def _worker(self) -> None:
+        while not self._stop.is_set():
+            try:
+                claimed = self._claim()
+            except Exception as exc:  # pragma: no cover - DB trouble; retry later
+                logger.error(f"Job queue claim failed: {exc}")
+                claimed = None
+            if claimed is None:
+                self._wake.wait(timeout=1.0)
+                self._wake.clear()
+                continue
+            self._process(*claimed)
+
+    def _claim(self) -> Optional[Tuple[str, str, int, str, Dict[str, Any], int]]:
+        now = time.time()
+        with self._pool.write() as conn:
+            # Ready pending items, or running items whose owner stopped renewing
+            # the lease (its process died); live claims are left alone
+            row = conn.execute(
+                """
+                SELECT i.job_id, j.kind, i.seq, i.item_key, i.payload, i.attempts, i.status
+                FROM job_items i JOIN jobs j ON j.id = i.job_id
+                WHERE (i.status = ? AND i.next_attempt_at <= ?)
+                   OR (i.status = ? AND i.lease_expires_at < ?)
+                ORDER BY j.created_at, i.next_attempt_at, i.seq
+                LIMIT 1
+                """,
+                (ITEM_PENDING, now, ITEM_RUNNING, now),
+            ).fetchone()
+            if row is None:
+                return None
+            if row["status"] == ITEM_RUNNING:
+                logger.info(f"Job {row['job_id']} item {row['item_key']} lease expired; claiming it again")
+            conn.execute(
+                "UPDATE job_items SET status = ?, attempts = attempts + 1, owner = ?, lease_expires_at = ? "
+                "WHERE job_id = ? AND seq = ?",
+                (ITEM_RUNNING, self.owner, now + LEASE_SECONDS, row["job_id"], row["seq"]),
+            )
+            conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE id = ? AND status = ?",
+                (JOB_RUNNING, _now_iso(), row["job_id"], JOB_QUEUED),
+            )
+        try:
+            payload = json.loads(row["payload"] or "{}")
+        except Exception:
+            payload = {}
+        return row["job_id"], row["kind"], row["seq"], row["item_key"], payload, row["attempts"] + 1
+
+    def _process(
+        self, job_id: str, kind: str, seq: int, key: str, payload: Dict[str, Any], attempts: int
+    ) -> None:
+        spec = self._kinds.get(kind)
+        error: Optional[str] = None
+        retry_free = False
+        if spec is None:
+            error = f"No handler registered for job kind {kind}"
+        else:
+            try:
+                for limiter in spec.limiters_for(payload):
+                    if not limiter.acquire(timeout=LIMITER_TIMEOUT_SECONDS):
+                        raise RetryLater(f"rate limiter {limiter.name} timed out")
+                spec.handler(key, payload)
+            except RetryLater as exc:
+                error, retry_free = str(exc) or "retry requested", True
+            except PermanentFailure as exc:
+                error = str(exc) or "failed"
+                attempts = spec.max_attempts
+            except Exception as exc:
+                error = f"{type(exc).__name__}: {exc}"
+                logger.warning(f"Job {job_id} item {key} attempt {attempts} failed: {error}")
+
+        with self._pool.write() as conn:
+            if error is None:
+                conn.execute(
+                    "UPDATE job_items SET status = ?, last_error = NULL, owner = NULL "
+                    "WHERE job_id = ? AND seq = ? AND owner = ?",
+                    (ITEM_DONE, job_id, seq, self.owner),
+                )
+            else:
+                max_attempts = spec.max_attempts if spec is not None else 1
+                if retry_free:
+                    # Don't let rate-limit waits eat into the retry budget
+                    conn.execute(
+                        "UPDATE job_items SET attempts = attempts - 1 WHERE job_id = ? AND seq = ? AND owner = ?",
+                        (job_id, seq, self.owner),
+                    )
+                    attempts -= 1
+                if attempts < max_attempts:
+                    conn.execute(
+                        "UPDATE job_items SET status = ?, last_error = ?, next_attempt_at = ?, owner = NULL "
+                        "WHERE job_id = ? AND seq = ? AND status = ? AND owner = ?",
+                        (ITEM_PENDING, error, time.time() + backoff_delay(max(1, attempts)),
+                         job_id, seq, ITEM_RUNNING, self.owner),
+                    )
+                else:
+                    conn.execute(
+                        "UPDATE job_items SET status = ?, last_error = ?, owner = NULL "
+                        "WHERE job_id = ? AND seq = ? AND owner = ?",
+                        (ITEM_FAILED, error, job_id, seq, self.owner),
+                    )
+            conn.execute("UPDATE jobs SET updated_at = ? WHERE id = ?", (_now_iso(), job_id))
+            finished = self._finish_job(conn, job_id)
+
+        if finished and spec is not None and spec.on_complete is not None:
+            job = self.get_job(job_id)
+            try:
+                spec.on_complete(job)
+            except Exception as exc:
+                logger.error(f"Completion hook for job {job_id} failed: {exc}")
+
+    def _finish_job(self, conn, job_id: str) -> bool:
+        """Mark the job completed if no items are left to run; True if it just finished."""
+        open_items = conn.execute(
+            "SELECT COUNT(*) FROM job_items WHERE job_id = ? AND status IN (?, ?)",
+            (job_id, ITEM_PENDING, ITEM_RUNNING),
+        ).fetchone()[0]
+        if open_items:
+            return False
+        now = _now_iso()
+        updated = conn.execute(
+            "UPDATE jobs SET status = ?, updated_at = ?, finished_at = ? "
+            "WHERE id = ? AND status IN (?, ?)",
+            (JOB_COMPLETED, now, now, job_id, JOB_QUEUED, JOB_RUNNING),
+        ).rowcount
+        return bool(updated)
+
+    @staticmethod
+    def _job_dict(job, counts: Dict[str, int], errors) -> Dict[str, Any]:
+        total = int(job["total"])
+        done = counts.get(ITEM_DONE, 0)
+        failed = counts.get(ITEM_FAILED, 0)
+        try:
+            params = json.loads(job["params"] or "{}")
+        except Exception:
+            params = {}
+        return {
+            "job_id": job["id"],
+            "kind": job["kind"],
+            "status": job["status"],
+            "params": params,
+            "total": total,
+            "completed": done,
+            "failed": failed,
+            "pending": counts.get(ITEM_PENDING, 0),
+            "running": counts.get(ITEM_RUNNING, 0),
+            "cancelled": counts.get(ITEM_CANCELLED, 0),
+            "progress": round((done + failed) / total, 4) if total else 1.0,
+            "created_at": job["created_at"],
+            "updated_at": job["updated_at"],
+            "finished_at": job["finished_at"],
+            "errors": [{"item": row["item_key"], "error": row["last_error"]} for row in errors],
+        }
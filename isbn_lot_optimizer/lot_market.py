@@ -1,33 +1,189 @@
 from __future__ import annotations
 
 import json
+import logging
 import os
+import sqlite3
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
 import requests
 
+from shared.db_pool import get_pool, import_legacy_json
 from shared.ebay_auth import get_bearer_token
+from shared.http_cache import cached_get
+from shared.market_refresh import AdaptiveRateLimiter, build_market_session
+
+logger = logging.getLogger(__name__)
 
 EBAY_FINDING_URL = "https://svcs.ebay.com/services/search/FindingService/v1"
 BROWSE_URL = "https://api.ebay.com/buy/browse/v1/item_summary/search"
-CACHE_PATH = Path.home() / ".isbn_lot_optimizer" / "lot_cache.json"
+CACHE_PATH = Path.home() / ".isbn_lot_optimizer" / "lot_cache.json"  # legacy, migrated on first use
+CACHE_DB_PATH = Path(
+    os.getenv("LOT_CACHE_PATH", str(Path.home() / ".isbn_lot_optimizer" / "lot_cache.db"))
+)
 CACHE_TTL = 60 * 60 * 24  # 24h
-_CACHE_LOCK = threading.Lock()
+# Oldest snapshots beyond this many are evicted; purges run every PURGE_EVERY_STORES writes
+CACHE_MAX_ENTRIES = 5000
+PURGE_EVERY_STORES = 200
+
+# Threads per snapshot (one per Browse/Finding query) and snapshots fetched at once in a batch
+QUERY_WORKERS = 8
+BATCH_WORKERS = 4
+# Starting Finding API rate; replaces the old fixed 1.2s sleep after each uncached call
+FINDING_RATE = 1.0
+
+LotKey = Tuple[Optional[str], Optional[str], Optional[str]]
+
+LOT_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS lot_market_cache (
+    key TEXT PRIMARY KEY,
+    ts REAL NOT NULL,
+    snapshot TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_lot_market_cache_ts ON lot_market_cache(ts);
+"""
+
+
+def _legacy_snapshot(snapshot: object) -> Optional[Tuple[float, Dict]]:
+    if isinstance(snapshot, dict) and isinstance(snapshot.get("ts"), (int, float)):
+        return float(snapshot["ts"]), snapshot
+    return None
+
+
+class LotSnapshotStore:
+    """Indexed SQLite store for lot market snapshots, keyed on ``_cache_key``."""
+
+    def __init__(
+        self,
+        db_path: Path = CACHE_DB_PATH,
+        *,
+        ttl: float = CACHE_TTL,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        legacy_path: Optional[Path] = None,
+    ):
+        self.db_path = Path(db_path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._pool = get_pool(self.db_path)
+        self._stores = 0
+        self._stores_lock = threading.Lock()
+        with self._pool.write() as conn:
+            conn.executescript(LOT_CACHE_SCHEMA)
+        if legacy_path is not None:
+            self._migrate_json(legacy_path)
+
+    def _migrate_json(self, path: Path) -> None:
+        """One-time import of the legacy JSON cache; renames the file when done."""
+        import_legacy_json(
+            self._pool.write,
+            path,
+            table="lot_market_cache",
+            key_column="key",
+            value_column="snapshot",
+            extract=_legacy_snapshot,
+        )
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict]:
+        """Fresh snapshots for ``keys``; expired and unknown keys are left out."""
+        wanted = list(dict.fromkeys(keys))
+        if not wanted:
+            return {}
+        cutoff = time.time() - self.ttl
+        found: Dict[str, Dict] = {}
+        with self._pool.read() as conn:
+            # Stay well under SQLite's bound-parameter limit
+            for start in range(0, len(wanted), 500):
+                chunk = wanted[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT key, snapshot FROM lot_market_cache WHERE ts >= ? AND key IN ({placeholders})",
+                    (cutoff, *chunk),
+                ).fetchall()
+                for row in rows:
+                    try:
+                        found[row["key"]] = json.loads(row["snapshot"])
+                    except ValueError:
+                        continue
+        return found
 
+    def get(self, key: str) -> Optional[Dict]:
+        return self.get_many([key]).get(key)
 
-def _load_cache() -> Dict[str, Dict]:
-    try:
-        return json.loads(CACHE_PATH.read_text(encoding="utf-8"))
-    except Exception:
-        return {}
+    def put_many(self, snapshots: Dict[str, Dict]) -> None:
+        if not snapshots:
+            return
+        rows = [
+            (key, float(snapshot.get("ts") or time.time()), json.dumps(snapshot, ensure_ascii=False))
+            for key, snapshot in snapshots.items()
+        ]
+        with self._stores_lock:
+            self._stores += len(rows)
+            purge = self._stores >= PURGE_EVERY_STORES
+            if purge:
+                self._stores = 0
+        with self._pool.write() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO lot_market_cache (key, ts, snapshot) VALUES (?, ?, ?)",
+                rows,
+            )
+            if purge:
+                self._evict(conn)
 
+    def put(self, key: str, snapshot: Dict) -> None:
+        self.put_many({key: snapshot})
 
-def _save_cache(cache: Dict[str, Dict]) -> None:
-    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
-    CACHE_PATH.write_text(json.dumps(cache, ensure_ascii=False, indent=2), encoding="utf-8")
+    def evict(self) -> int:
+        """Drop expired snapshots and the oldest ones beyond ``max_entries``."""
+        with self._pool.write() as conn:
+            return self._evict(conn)
+
+    def _evict(self, conn) -> int:
+        removed = conn.execute(
+            "DELETE FROM lot_market_cache WHERE ts < ?", (time.time() - self.ttl,)
+        ).rowcount
+        removed += conn.execute(
+            """
+            DELETE FROM lot_market_cache WHERE key IN (
+                SELECT key FROM lot_market_cache ORDER BY ts DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_entries,),
+        ).rowcount
+        return removed
+
+
+_store: Optional[LotSnapshotStore] = None
+_store_lock = threading.Lock()
+_finding_limiter = AdaptiveRateLimiter(FINDING_RATE)
+_finding_session: Optional[requests.Session] = None
+_finding_session_lock = threading.Lock()
+
+
+def get_snapshot_store() -> Optional[LotSnapshotStore]:
+    """Process-wide snapshot store, or None if the database can't be opened."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            try:
+                _store = LotSnapshotStore(CACHE_DB_PATH, legacy_path=CACHE_PATH)
+            except Exception as exc:
+                logger.warning(f"Lot market cache unavailable, fetching snapshots directly: {exc}")
+                return None
+        return _store
+
+
+def _get_finding_session() -> requests.Session:
+    """Pooled session whose Finding calls all share ``_finding_limiter``."""
+    global _finding_session
+    with _finding_session_lock:
+        if _finding_session is None:
+            _finding_session = build_market_session(_finding_limiter, pool_size=QUERY_WORKERS)
+        return _finding_session
 
 
 def _cache_key(author: Optional[str], series: Optional[str], theme: Optional[str]) -> str:
@@ -53,12 +209,18 @@ def _median(vals: List[float]) -> Optional[float]:
     return round(st.median(xs), 2)
 
 
+def _raise_if_transient(response: requests.Response) -> None:
+    """Raise for rate limiting and server errors, which are failures rather than empty results."""
+    if response.status_code == 429 or response.status_code >= 500:
+        response.raise_for_status()
+
+
 def _browse_active(session: requests.Session, q: str, limit: int = 50) -> Tuple[Optional[float], int]:
     bearer = get_bearer_token(session=session)
     if not bearer:
         return (None, 0)
     params = {"q": q, "category_ids": "267", "limit": str(limit)}
-    response = session.get(
+    response = cached_get(
         BROWSE_URL,
         params=params,
         headers={
@@ -67,7 +229,9 @@ def _browse_active(session: requests.Session, q: str, limit: int = 50) -> Tuple[
             "Accept": "application/json",
         },
         timeout=15,
+        session=session,
     )
+    _raise_if_transient(response)
     if response.status_code != 200:
         return (None, 0)
     payload = response.json()
@@ -86,7 +250,6 @@ def _finding_sold(
     app_id: str,
     q: str,
     entries: int = 100,
-    delay: float = 1.2,
 ) -> Tuple[Optional[float], int]:
     params = {
         "OPERATION-NAME": "findCompletedItems",
@@ -100,7 +263,8 @@ def _finding_sold(
         "categoryId": "267",
         "paginationInput.entriesPerPage": str(entries),
     }
-    response = session.get(EBAY_FINDING_URL, params=params, timeout=20)
+    response = cached_get(EBAY_FINDING_URL, params=params, timeout=20, session=session)
+    _raise_if_transient(response)
     if response.status_code != 200:
         return (None, 0)
     payload = response.json()
@@ -116,7 +280,6 @@ def _finding_sold(
             prices.append(float(sold_price))
         except Exception:
             pass
-    time.sleep(delay)
     return (_median(prices), len(prices))
 
 
@@ -135,54 +298,114 @@ def build_lot_queries(author: str | None, series: str | None, theme: str | None)
     return list(queries.keys())
 
 
-def market_snapshot_for_lot(
+def _fetch_snapshot(
     author: Optional[str],
     series: Optional[str],
     theme: Optional[str],
-    session: requests.Session | None = None,
+    session: requests.Session,
 ) -> Dict:
-    cache_key = _cache_key(author, series, theme)
-    now = int(time.time())
-    with _CACHE_LOCK:
-        cache = _load_cache()
-        cached = cache.get(cache_key)
-        if cached and now - cached.get("ts", 0) < CACHE_TTL:
-            return cached
-
-    sess = session or requests.Session()
+    """Run every Browse and Finding query for one lot concurrently and summarise them."""
     queries = build_lot_queries(author, series, theme)
-    active_prices: List[float] = []
-    sold_prices: List[float] = []
-    active_count_total = 0
-    sold_count_total = 0
+    app_id = os.getenv("EBAY_APP_ID")
+    finding_session = _get_finding_session() if app_id else None
+
+    def browse(query: str) -> Optional[Tuple[Optional[float], int]]:
+        try:
+            return _browse_active(session, query)
+        except Exception as exc:
+            logger.debug(f"Browse lot query failed for {query!r}: {exc}")
+            return None
 
-    for query in queries:
-        price, count = _browse_active(sess, query)
-        if price:
-            active_prices.append(price)
-        active_count_total += count
+    def sold(query: str) -> Optional[Tuple[Optional[float], int]]:
+        try:
+            return _finding_sold(finding_session, app_id, query)  # type: ignore[arg-type]
+        except Exception as exc:
+            logger.debug(f"Finding lot query failed for {query!r}: {exc}")
+            return None
 
-    app_id = os.getenv("EBAY_APP_ID")
-    if app_id:
-        for query in queries:
-            price, count = _finding_sold(sess, app_id, query)
-            if price:
-                sold_prices.append(price)
-            sold_count_total += count
-
-    snapshot = {
+    workers = max(1, min(QUERY_WORKERS, len(queries) * (2 if app_id else 1)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="lot-market") as pool:
+        active_futures = [pool.submit(browse, query) for query in queries]
+        sold_futures = [pool.submit(sold, query) for query in queries] if app_id else []
+        active_results = [future.result() for future in active_futures]
+        sold_results = [future.result() for future in sold_futures]
+
+    # None marks a query that failed (network error, 429, 5xx)
+    active = [result for result in active_results if result is not None]
+    sold_ok = [result for result in sold_results if result is not None]
+    return {
         "queries": queries,
-        "active_median": _median(active_prices),
-        "sold_median": _median(sold_prices),
-        "active_count": active_count_total,
-        "sold_count": sold_count_total,
+        "active_median": _median([price for price, _count in active if price]),
+        "sold_median": _median([price for price, _count in sold_ok if price]),
+        "active_count": sum(count for _price, count in active),
+        "sold_count": sum(count for _price, count in sold_ok),
+        "failed_queries": len(active_results) + len(sold_results) - len(active) - len(sold_ok),
         "source": "ebay_free",
         "ts": int(time.time()),
     }
 
-    with _CACHE_LOCK:
-        cache = _load_cache()
-        cache[cache_key] = snapshot
-        _save_cache(cache)
 
-    return snapshot
+def market_snapshots_for_lots(
+    keys: Sequence[LotKey],
+    session: requests.Session | None = None,
+    max_workers: int = BATCH_WORKERS,
+) -> Dict[LotKey, Dict]:
+    """
+    Market snapshots for many (author, series, theme) keys at once.
+
+    Keys that normalise to the same cache key share one lookup. Fresh
+    snapshots come from the SQLite store in a single query; the rest are
+    fetched ``max_workers`` at a time (each fanning out its own queries) and
+    written back together. Snapshots with failed queries are returned but
+    not cached, so the next call retries them instead of serving a partial
+    snapshot for the whole TTL.
+
+    Returns:
+        Snapshot per key in ``keys``
+    """
+    by_cache_key: Dict[str, LotKey] = {}
+    for key in keys:
+        by_cache_key.setdefault(_cache_key(*key), key)
+
+    store = get_snapshot_store()
+    snapshots: Dict[str, Dict] = {}
+    if store is not None:
+        try:
+            snapshots = store.get_many(by_cache_key)
+        except sqlite3.Error as exc:
+            # A locked or damaged cache shouldn't fail lot pricing; fetch live
+            logger.warning(f"Lot market cache read failed, fetching live: {exc}")
+    missing = [cache_key for cache_key in by_cache_key if cache_key not in snapshots]
+
+    if missing:
+        own_session = session is None
+        sess = session or requests.Session()
+        try:
+            workers = max(1, min(max_workers, len(missing)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="lot-snapshot") as pool:
+                fetched = pool.map(lambda cache_key: _fetch_snapshot(*by_cache_key[cache_key], sess), missing)
+                fresh = dict(zip(missing, fetched))
+        finally:
+            if own_session:
+                sess.close()
+        snapshots.update(fresh)
+        complete = {cache_key: snapshot for cache_key, snapshot in fresh.items() if not snapshot["failed_queries"]}
+        if len(complete) < len(fresh):
+            logger.warning(f"Not caching {len(fresh) - len(complete)} lot market snapshots with failed queries")
+        if store is not None and complete:
+            try:
+                store.put_many(complete)
+            except Exception as exc:
+                logger.warning(f"Lot market cache write failed: {exc}")
+
+    return {key: snapshots[_cache_key(*key)] for key in keys}
+
+
+def market_snapshot_for_lot(
+    author: Optional[str],
+    series: Optional[str],
+    theme: Optional[str],
+    session: requests.Session | None = None,
+) -> Dict:
+    key = (author, series, theme)
+    return market_snapshots_for_lots([key], session=session, max_workers=1)[key]
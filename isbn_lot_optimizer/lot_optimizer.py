@@ -0,0 +1,375 @@
+"""
+Partition accepted inventory into non-overlapping lots.
+
+``generate_lot_suggestions`` and ``build_lots_with_strategies`` emit one lot
+per author, series or genre group, so a book routinely appears in several
+suggestions. ``optimize_lot_assignment`` takes those candidate groups and
+chooses, for every book, at most one lot (a subset of one candidate group) or
+a single listing, maximising expected net profit after fees.
+
+The search is simulated annealing over per-book assignments:
+
+- per-group aggregates (count, summed price, probability and single-listing
+  profit) live in numpy arrays, so the profit delta of moving a book is O(1)
+- each step proposes a batch of random moves and scores them in one
+  vectorised pass; accepted moves that touch distinct groups are applied
+- the run is seeded from the greedy baseline (suggestions taken in their
+  existing order, skipping books already used) and keeps the best state
+  seen, so the result is never worse than the baseline
+- it stops when ``time_budget`` seconds are spent
+
+Usage:
+    from isbn_lot_optimizer.lot_optimizer import optimize_lot_assignment
+
+    plan = optimize_lot_assignment(books, suggestions, time_budget=2.0)
+    plan.lots, plan.singles, plan.improvement_pct
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from shared.models import BookEvaluation
+
+MIN_LOT_SIZE = 2
+DEFAULT_TIME_BUDGET = 2.0
+DEFAULT_BATCH_SIZE = 256
+
+
+@dataclass
+class ProfitModel:
+    """
+    Expected net profit of a listing: P(sale) * (price - fees) - listing cost.
+
+    ``lot_probability_bonus`` mirrors the +8 grouping synergy used when lots
+    are composed in ``lots.py``.
+    """
+
+    fee_rate: float = 0.1325          # eBay final value fee
+    per_order_fee: float = 0.30       # fixed per-order fee, paid only on sale
+    listing_cost: float = 1.50        # supplies + handling per listing
+    lot_probability_bonus: float = 0.08
+
+    def single_profit(self, price: np.ndarray, probability: np.ndarray) -> np.ndarray:
+        return probability * (price * (1.0 - self.fee_rate) - self.per_order_fee) - self.listing_cost
+
+    def lot_profit(self, value: np.ndarray, probability: np.ndarray) -> np.ndarray:
+        p = np.minimum(1.0, probability + self.lot_probability_bonus)
+        return p * (value * (1.0 - self.fee_rate) - self.per_order_fee) - self.listing_cost
+
+
+@dataclass
+class OptimizedLot:
+    """One lot of the chosen partition: a subset of a candidate group."""
+
+    group: Any
+    book_isbns: List[str]
+    estimated_value: float
+    probability: float
+    expected_profit: float
+    singles_profit: float  # what the same books would earn listed individually
+
+
+@dataclass
+class LotPlan:
+    """Non-overlapping assignment of books to lots or single listings."""
+
+    lots: List[OptimizedLot]
+    singles: List[str]
+    expected_profit: float
+    greedy_profit: float
+    singles_only_profit: float
+    iterations: int
+    elapsed: float
+    stats: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def improvement(self) -> float:
+        return self.expected_profit - self.greedy_profit
+
+    @property
+    def improvement_pct(self) -> Optional[float]:
+        if not self.greedy_profit:
+            return None
+        return 100.0 * self.improvement / abs(self.greedy_profit)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "lots": len(self.lots),
+            "books_in_lots": sum(len(lot.book_isbns) for lot in self.lots),
+            "singles": len(self.singles),
+            "expected_profit": round(self.expected_profit, 2),
+            "greedy_profit": round(self.greedy_profit, 2),
+            "singles_only_profit": round(self.singles_only_profit, 2),
+            "improvement": round(self.improvement, 2),
+            "improvement_pct": round(self.improvement_pct, 1) if self.improvement_pct is not None else None,
+            "iterations": self.iterations,
+            "elapsed": round(self.elapsed, 3),
+        }
+
+
+class _Problem:
+    """Array form of the books, candidate groups and current assignment."""
+
+    def __init__(
+        self,
+        books: Sequence[BookEvaluation],
+        groups: Sequence[Any],
+        model: ProfitModel,
+    ):
+        self.books = list(books)
+        self.groups = list(groups)
+        self.model = model
+        index = {book.isbn: i for i, book in enumerate(self.books)}
+
+        self.price = np.array([max(0.0, float(b.estimated_price or 0.0)) for b in self.books])
+        self.prob = np.array([min(1.0, max(0.0, float(b.probability_score or 0.0) / 100.0)) for b in self.books])
+        self.single = model.single_profit(self.price, self.prob)
+
+        # Candidate membership as CSR: options[offsets[b]:offsets[b+1]] are b's groups
+        members: List[List[int]] = [[] for _ in self.books]
+        per_book: List[float] = []
+        for g, group in enumerate(self.groups):
+            for isbn in dict.fromkeys(getattr(group, "book_isbns", ()) or ()):
+                b = index.get(isbn)
+                if b is not None:
+                    members[b].append(g)
+            per_book.append(float(getattr(group, "lot_per_book_price", None) or 0.0))
+        self.per_book_price = np.array(per_book) if per_book else np.zeros(0)
+        counts = np.array([len(m) for m in members], dtype=np.int64)
+        self.offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        self.options = np.array([g for m in members for g in m], dtype=np.int64)
+        self.n_options = counts
+        self.movable = np.flatnonzero(counts > 0)
+
+        n_groups = len(self.groups)
+        self.assign = np.full(len(self.books), -1, dtype=np.int64)
+        self.g_count = np.zeros(n_groups)
+        self.g_price = np.zeros(n_groups)
+        self.g_prob = np.zeros(n_groups)
+        self.g_single = np.zeros(n_groups)
+
+    # Profit of groups given aggregates; groups below MIN_LOT_SIZE sell as singles
+    def group_profit(
+        self,
+        g: np.ndarray,
+        count: np.ndarray,
+        price: np.ndarray,
+        prob: np.ndarray,
+        single: np.ndarray,
+    ) -> np.ndarray:
+        per_book = self.per_book_price[g] if len(self.per_book_price) else np.zeros(len(g))
+        value = np.where(per_book > 0, per_book * count, price)
+        mean_prob = prob / np.maximum(count, 1.0)
+        lot = self.model.lot_profit(value, mean_prob)
+        return np.where(count >= MIN_LOT_SIZE, lot, single)
+
+    def set_assignment(self, assign: np.ndarray) -> float:
+        self.assign = assign.copy()
+        n_groups = len(self.groups)
+        in_lot = assign >= 0
+        g = assign[in_lot]
+        self.g_count = np.bincount(g, minlength=n_groups).astype(float)
+        self.g_price = np.bincount(g, weights=self.price[in_lot], minlength=n_groups)
+        self.g_prob = np.bincount(g, weights=self.prob[in_lot], minlength=n_groups)
+        self.g_single = np.bincount(g, weights=self.single[in_lot], minlength=n_groups)
+        return self.total()
+
+    def total(self) -> float:
+        groups = np.arange(len(self.groups))
+        lots = self.group_profit(groups, self.g_count, self.g_price, self.g_prob, self.g_single).sum()
+        return float(lots + self.single[self.assign < 0].sum())
+
+    def move_deltas(self, b: np.ndarray, new: np.ndarray) -> np.ndarray:
+        """Profit change of moving each book ``b[i]`` to option ``new[i]`` (-1 = single)."""
+        old = self.assign[b]
+        price, prob, single = self.price[b], self.prob[b], self.single[b]
+        delta = np.zeros(len(b))
+
+        leave = old >= 0
+        if leave.any():
+            g = old[leave]
+            before = self.group_profit(g, self.g_count[g], self.g_price[g], self.g_prob[g], self.g_single[g])
+            after = self.group_profit(
+                g, self.g_count[g] - 1, self.g_price[g] - price[leave],
+                self.g_prob[g] - prob[leave], self.g_single[g] - single[leave],
+            )
+            delta[leave] += after - before
+        delta[~leave] -= single[~leave]
+
+        join = new >= 0
+        if join.any():
+            g = new[join]
+            before = self.group_profit(g, self.g_count[g], self.g_price[g], self.g_prob[g], self.g_single[g])
+            after = self.group_profit(
+                g, self.g_count[g] + 1, self.g_price[g] + price[join],
+                self.g_prob[g] + prob[join], self.g_single[g] + single[join],
+            )
+            delta[join] += after - before
+        delta[~join] += single[~join]
+        return delta
+
+    def apply(self, b: int, new: int) -> None:
+        old = self.assign[b]
+        if old >= 0:
+            self.g_count[old] -= 1
+            self.g_price[old] -= self.price[b]
+            self.g_prob[old] -= self.prob[b]
+            self.g_single[old] -= self.single[b]
+        if new >= 0:
+            self.g_count[new] += 1
+            self.g_price[new] += self.price[b]
+            self.g_prob[new] += self.prob[b]
+            self.g_single[new] += self.single[b]
+        self.assign[b] = new
+
+
+def _greedy_assignment(problem: _Problem) -> np.ndarray:
+    """Take candidate groups in their given order, skipping books already used."""
+    assign = np.full(len(problem.books), -1, dtype=np.int64)
+    index = {book.isbn: i for i, book in enumerate(problem.books)}
+    for g, group in enumerate(problem.groups):
+        members = [index[i] for i in dict.fromkeys(getattr(group, "book_isbns", ()) or ()) if i in index]
+        free = [b for b in members if assign[b] < 0]
+        if len(free) >= MIN_LOT_SIZE:
+            assign[free] = g
+    return assign
+
+
+def _anneal(
+    problem: _Problem,
+    start: np.ndarray,
+    time_budget: float,
+    rng: np.random.Generator,
+    batch_size: int,
+) -> Tuple[np.ndarray, float, int]:
+    current = problem.set_assignment(start)
+    best, best_assign = current, problem.assign.copy()
+    if len(problem.movable) == 0 or time_budget <= 0:
+        return best_assign, best, 0
+
+    # Temperature scaled to a typical single-listing profit, cooled geometrically
+    scale = float(np.median(np.abs(problem.single[problem.movable]))) or 1.0
+    t_start, t_end = 0.5 * scale, 0.001 * scale
+    started = time.perf_counter()
+    iterations = 0
+
+    while True:
+        elapsed = time.perf_counter() - started
+        if elapsed >= time_budget:
+            break
+        temperature = t_start * (t_end / t_start) ** (elapsed / time_budget)
+
+        b = rng.choice(problem.movable, size=min(batch_size, len(problem.movable) * 2))
+        # Option k in [0, n_options] where k == n_options means "list as single"
+        k = (rng.random(len(b)) * (problem.n_options[b] + 1)).astype(np.int64)
+        is_single = k >= problem.n_options[b]
+        new = np.where(is_single, -1, problem.options[problem.offsets[b] + np.minimum(k, problem.n_options[b] - 1)])
+        keep = new != problem.assign[b]
+        b, new = b[keep], new[keep]
+        iterations += 1
+        if len(b) == 0:
+            continue
+
+        delta = problem.move_deltas(b, new)
+        with np.errstate(over="ignore"):
+            accept = (delta > 0) | (rng.random(len(b)) < np.exp(np.minimum(0.0, delta) / temperature))
+
+        # Deltas assume the rest of the batch is unapplied: only take moves on distinct groups
+        touched: set[int] = set()
+        moved: set[int] = set()
+        for i in np.flatnonzero(accept):
+            book, old, dest = int(b[i]), int(problem.assign[b[i]]), int(new[i])
+            if book in moved or (old >= 0 and old in touched) or (dest >= 0 and dest in touched):
+                continue
+            problem.apply(book, dest)
+            current += float(delta[i])
+            moved.add(book)
+            if old >= 0:
+                touched.add(old)
+            if dest >= 0:
+                touched.add(dest)
+
+        if current > best + 1e-9:
+            best, best_assign = current, problem.assign.copy()
+
+    # Recompute exactly to shed accumulated float drift
+    best = problem.set_assignment(best_assign)
+    return best_assign, best, iterations
+
+
+def optimize_lot_assignment(
+    books: Sequence[BookEvaluation],
+    groups: Sequence[Any],
+    *,
+    time_budget: float = DEFAULT_TIME_BUDGET,
+    model: Optional[ProfitModel] = None,
+    seed: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> LotPlan:
+    """
+    Choose a non-overlapping partition of ``books`` into lots and singles.
+
+    Args:
+        books: Accepted book evaluations
+        groups: Candidate groupings (``LotSuggestion``/``LotCandidate`` or any
+                object with ``book_isbns``; ``lot_per_book_price`` is used
+                when set). Their order is the greedy baseline's priority.
+        time_budget: Seconds to spend on the search
+        model: Fee and listing-cost model (defaults to ``ProfitModel()``)
+        seed: Random seed for reproducible runs
+        batch_size: Moves proposed and scored per vectorised step
+
+    Returns:
+        LotPlan with the chosen lots, books left as singles, and the greedy
+        baseline's profit for comparison
+    """
+    started = time.perf_counter()
+    model = model or ProfitModel()
+    problem = _Problem(books, groups, model)
+    rng = np.random.default_rng(seed)
+
+    singles_only = float(problem.single.sum())
+    greedy = _greedy_assignment(problem)
+    greedy_profit = problem.set_assignment(greedy)
+    assign, profit, iterations = _anneal(problem, greedy, time_budget, rng, batch_size)
+    if profit < greedy_profit:
+        assign, profit = greedy, problem.set_assignment(greedy)
+
+    lots: List[OptimizedLot] = []
+    for g in np.unique(assign[assign >= 0]):
+        members = np.flatnonzero(assign == g)
+        if len(members) < MIN_LOT_SIZE:
+            continue
+        gi = np.array([g])
+        count = np.array([float(len(members))])
+        price = np.array([problem.price[members].sum()])
+        prob = np.array([problem.prob[members].sum()])
+        single = np.array([problem.single[members].sum()])
+        per_book = problem.per_book_price[g] if len(problem.per_book_price) else 0.0
+        lots.append(OptimizedLot(
+            group=problem.groups[int(g)],
+            book_isbns=[problem.books[b].isbn for b in members],
+            estimated_value=round(float(per_book * len(members) if per_book > 0 else price[0]), 2),
+            probability=round(float(min(1.0, prob[0] / len(members) + model.lot_probability_bonus)), 3),
+            expected_profit=round(float(problem.group_profit(gi, count, price, prob, single)[0]), 2),
+            singles_profit=round(float(single[0]), 2),
+        ))
+    lots.sort(key=lambda lot: lot.expected_profit, reverse=True)
+    in_lots = {isbn for lot in lots for isbn in lot.book_isbns}
+    singles = [book.isbn for book in problem.books if book.isbn not in in_lots]
+
+    return LotPlan(
+        lots=lots,
+        singles=singles,
+        expected_profit=profit,
+        greedy_profit=greedy_profit,
+        singles_only_profit=singles_only,
+        iterations=iterations,
+        elapsed=time.perf_counter() - started,
+        stats={"books": len(problem.books), "groups": len(problem.groups)},
+    )
@@ -1,19 +1,29 @@
 from __future__ import annotations
 
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from shared.author_aliases import canonical_author as alias_canonical_author, display_label
 from shared.models import BookEvaluation, LotSuggestion
 
 # Import lot pricing functions
 try:
-    from shared.market import get_lot_pricing_for_series
+    from shared.market import search_ebay_lot_comps
     LOT_PRICING_AVAILABLE = True
 except Exception:
     LOT_PRICING_AVAILABLE = False
 
+# Unique lot-comp searches run concurrently, behind the shared eBay Browse limiter
+LOT_PRICING_WORKERS = 4
+# Lot comps move slowly; keep them in the HTTP cache longer than per-ISBN browse results
+LOT_COMPS_TTL_SECONDS = 6 * 3600.0
+
+# (lot, books, series_name, author_name) as passed to _enrich_lot_with_pricing
+LotPricingInput = Tuple[LotSuggestion, Sequence[BookEvaluation], Optional[str], Optional[str]]
+
 
 def _series_fields(book: BookEvaluation) -> tuple[str | None, int | None, str | None]:
     name = getattr(book.metadata, "series_name", None) or getattr(book.metadata, "series", None)
@@ -83,6 +93,33 @@ def _first_genre(book: BookEvaluation) -> str | None:
     return None
 
 
+def book_group_keys(book: BookEvaluation) -> set[tuple[str, str]]:
+    """
+    Return the (kind, key) groups a book can be lotted under.
+
+    Mirrors the grouping keys used by ``generate_lot_suggestions`` and
+    ``build_lots_with_strategies`` (canonical and first-credited author,
+    series id/name, first genre), so two books can only end up in the same
+    lot if they share at least one of these keys.
+    """
+    keys: set[tuple[str, str]] = set()
+    canonical_value, credited_list, _display = _author_labels((book,))
+    author_key = canonical_value or (credited_list[0] if credited_list else None)
+    if author_key:
+        keys.add(("author", author_key))
+    authors = getattr(book.metadata, "authors", ()) or ()
+    if authors and authors[0] and authors[0].strip():
+        keys.add(("author", authors[0].strip()))
+    series_name, _series_index, series_id = _series_fields(book)
+    series_key = series_id or (series_name.lower().strip() if isinstance(series_name, str) else None)
+    if series_key:
+        keys.add(("series", str(series_key)))
+    genre = _first_genre(book)
+    if genre:
+        keys.add(("genre", genre))
+    return keys
+
+
 def generate_lot_suggestions(
     books: Sequence[BookEvaluation],
     db_path: Optional[Path] = None,
@@ -101,6 +138,8 @@ def generate_lot_suggestions(
         List of lot suggestions
     """
     suggestions: List[LotSuggestion] = []
+    # Lots to price from eBay lot comps, all at once at the end
+    to_price: List[LotPricingInput] = []
     using_enhanced_series = False
 
     # Try enhanced series lots using bookseries.org data (if db_path provided)
@@ -141,12 +180,13 @@ def generate_lot_suggestions(
                 _probability_summary(author_books),
             ],
             author_name=canonical_name,
-            fetch_pricing=fetch_pricing,
+            fetch_pricing=False,
         )
         if suggestion:
             suggestion.canonical_author = canonical_name
             suggestion.display_author_label = display
             suggestions.append(suggestion)
+            to_price.append((suggestion, author_books, None, canonical_name))
 
     # Group by series identifier/name (author-agnostic)
     # Skip if we're using enhanced series lots from bookseries.org
@@ -193,7 +233,7 @@ def generate_lot_suggestions(
                 justification=justification,
                 series_name=series_name,
                 author_name=canonical_name,
-                fetch_pricing=fetch_pricing,
+                fetch_pricing=False,
             )
             if suggestion:
                 suggestion.series_name = series_name
@@ -201,6 +241,7 @@ def generate_lot_suggestions(
                 suggestion.display_author_label = display
                 suggestion.canonical_series = key
                 suggestions.append(suggestion)
+                to_price.append((suggestion, series_books, series_name, canonical_name))
 
     # Disabled: Value bundles create hodgepodge mixes of unrelated items that don't make sense
     # and would never sell. Low-value books should be handled individually or through
@@ -221,6 +262,9 @@ def generate_lot_suggestions(
     #     if suggestion:
     #         suggestions.append(suggestion)
 
+    if fetch_pricing:
+        suggestions = _price_suggestions(suggestions, to_price)
+
     # Sort lots by probability then value
     suggestions.sort(key=lambda lot: (lot.probability_score, lot.estimated_value), reverse=True)
     return suggestions
@@ -273,6 +317,78 @@ def _compose_lot_without_pricing(
     )
 
 
+def _lot_search_term(lot: LotSuggestion, books: Sequence[BookEvaluation], series_name: Optional[str], author_name: Optional[str]) -> Optional[str]:
+    """eBay lot-comp query for a lot, or None if the lot isn't priced from lot comps."""
+    if lot.strategy not in ("series", "author") or len(books) < 2:
+        return None
+    # For series lots, prefer series name
+    if lot.strategy == "series" and series_name:
+        return f"{author_name} {series_name} lot" if author_name else f"{series_name} lot"
+    # For author lots, search for "Author Name Lot" to find author collections
+    if lot.strategy == "author" and author_name:
+        return f"{author_name} lot"
+    return None
+
+
+def _search_term_key(term: str) -> str:
+    return " ".join(term.lower().split())
+
+
+def _apply_lot_pricing(lot: LotSuggestion, books: Sequence[BookEvaluation], lot_pricing: Optional[Dict[str, Any]]) -> LotSuggestion:
+    """Return ``lot`` re-valued from lot comps (unchanged when there are none)."""
+    if not lot_pricing or lot_pricing.get("total_comps", 0) <= 0:
+        return lot
+    lot_per_book_price = lot_pricing.get("optimal_per_book_price")
+    if not lot_per_book_price:
+        return lot
+
+    # Get individual value for comparison
+    individual_value = lot.individual_value or lot.estimated_value
+    lot_comps_count = lot_pricing["total_comps"]
+
+    # Calculate market value for our lot size
+    lot_market_value = round(lot_per_book_price * len(books), 2)
+
+    # Update justification with pricing comparison
+    updated_justification = list(lot.justification)
+    pricing_comparison = (
+        f"Market lot pricing: ${lot_market_value:.2f} "
+        f"(${lot_per_book_price:.2f}/book based on {lot_comps_count} eBay comps)"
+    )
+    updated_justification.insert(0, pricing_comparison)
+
+    # Show comparison to individual pricing
+    if lot_market_value > individual_value:
+        benefit = lot_market_value - individual_value
+        benefit_pct = (benefit / individual_value) * 100
+        updated_justification.insert(1, f"+${benefit:.2f} ({benefit_pct:.0f}%) vs individual pricing (${individual_value:.2f})")
+    else:
+        diff = individual_value - lot_market_value
+        diff_pct = (diff / individual_value) * 100
+        updated_justification.insert(1, f"Individual pricing higher: ${individual_value:.2f} (+${diff:.2f}/+{diff_pct:.0f}%)")
+
+    return replace(
+        lot,
+        estimated_value=round(lot_market_value, 2),
+        justification=updated_justification,
+        lot_market_value=lot_market_value,
+        lot_optimal_size=lot_pricing.get("optimal_lot_size"),
+        lot_per_book_price=lot_per_book_price,
+        lot_comps_count=lot_comps_count,
+        use_lot_pricing=True,
+        individual_value=individual_value,
+    )
+
+
+def _fetch_lot_comps(search_term: str) -> Optional[Dict[str, Any]]:
+    try:
+        return search_ebay_lot_comps(search_term, limit=50, ttl=LOT_COMPS_TTL_SECONDS)
+    except Exception as e:
+        # Log error but continue - lot pricing is optional enhancement
+        print(f"⚠️ Lot pricing search failed for '{search_term}': {e}")
+        return None
+
+
 def _enrich_lot_with_pricing(
     lot: LotSuggestion,
     books: Sequence[BookEvaluation],
@@ -284,86 +400,70 @@ def _enrich_lot_with_pricing(
 
     Takes a lot created by _compose_lot_without_pricing() and adds market pricing.
     Only call this for lots that need pricing updates (incremental updates).
+    To price several lots, use enrich_lots_with_pricing() instead.
 
     This is the SLOW path that makes eBay API calls.
     """
+    return enrich_lots_with_pricing([(lot, books, series_name, author_name)], max_workers=1)[0]
+
+
+def enrich_lots_with_pricing(
+    entries: Sequence[LotPricingInput],
+    max_workers: int = LOT_PRICING_WORKERS,
+) -> List[LotSuggestion]:
+    """
+    Enrich many lots with eBay lot-comp pricing in one pass.
+
+    Lots that map to the same search term (e.g. an author lot and a value
+    bundle for the same author) share one query. Unique queries run on up to
+    ``max_workers`` threads, each taking a token from the shared eBay Browse
+    rate limiter; answers are kept in the HTTP cache for
+    ``LOT_COMPS_TTL_SECONDS`` so the next recalculation reuses them.
+
+    Args:
+        entries: (lot, books, series_name, author_name) per lot
+        max_workers: Maximum concurrent eBay searches
+
+    Returns:
+        Priced lots, in the order of ``entries``
+    """
     if not LOT_PRICING_AVAILABLE:
-        return lot
+        return [lot for lot, _books, _series, _author in entries]
 
-    if lot.strategy not in ("series", "author") or len(books) < 2:
-        return lot
+    terms: List[Optional[str]] = []
+    unique_terms: Dict[str, str] = {}
+    for lot, books, series_name, author_name in entries:
+        term = _lot_search_term(lot, books, series_name, author_name)
+        terms.append(term)
+        if term:
+            unique_terms.setdefault(_search_term_key(term), term)
 
-    # Get individual value for comparison
-    individual_value = lot.individual_value or lot.estimated_value
+    comps: Dict[str, Optional[Dict[str, Any]]] = {}
+    if unique_terms:
+        from isbn_lot_optimizer.enrichment_coordinator import EnrichmentCoordinator
 
-    try:
-        # Determine search term
-        search_series = series_name
-        search_author = author_name
-
-        # For series lots, prefer series name
-        if lot.strategy == "series" and search_series:
-            lot_pricing = get_lot_pricing_for_series(search_series, search_author)
-        # For author lots, use author name
-        elif lot.strategy == "author" and search_author:
-            # Search for "Author Name Lot" to find author collections
-            from shared.market import search_ebay_lot_comps
-            lot_pricing = search_ebay_lot_comps(f"{search_author} lot", limit=50)
-        else:
-            return lot
-
-        # If we found lot comps, update with market-based value
-        if lot_pricing and lot_pricing.get("total_comps", 0) > 0:
-            lot_comps_count = lot_pricing["total_comps"]
-            lot_optimal_size = lot_pricing.get("optimal_lot_size")
-            lot_per_book_price = lot_pricing.get("optimal_per_book_price")
-
-            if lot_per_book_price:
-                # Calculate market value for our lot size
-                lot_market_value = round(lot_per_book_price * len(books), 2)
-
-                # Update justification with pricing comparison
-                updated_justification = list(lot.justification)
-                pricing_comparison = (
-                    f"Market lot pricing: ${lot_market_value:.2f} "
-                    f"(${lot_per_book_price:.2f}/book based on {lot_comps_count} eBay comps)"
-                )
-                updated_justification.insert(0, pricing_comparison)
-
-                # Show comparison to individual pricing
-                if lot_market_value > individual_value:
-                    benefit = lot_market_value - individual_value
-                    benefit_pct = (benefit / individual_value) * 100
-                    updated_justification.insert(1, f"+${benefit:.2f} ({benefit_pct:.0f}%) vs individual pricing (${individual_value:.2f})")
-                else:
-                    diff = individual_value - lot_market_value
-                    diff_pct = (diff / individual_value) * 100
-                    updated_justification.insert(1, f"Individual pricing higher: ${individual_value:.2f} (+${diff:.2f}/+{diff_pct:.0f}%)")
-
-                # Return enriched lot
-                return LotSuggestion(
-                    name=lot.name,
-                    strategy=lot.strategy,
-                    book_isbns=lot.book_isbns,
-                    estimated_value=round(lot_market_value, 2),
-                    probability_score=lot.probability_score,
-                    probability_label=lot.probability_label,
-                    sell_through=lot.sell_through,
-                    justification=updated_justification,
-                    lot_market_value=lot_market_value,
-                    lot_optimal_size=lot_optimal_size,
-                    lot_per_book_price=lot_per_book_price,
-                    lot_comps_count=lot_comps_count,
-                    use_lot_pricing=True,
-                    individual_value=individual_value,
-                )
-    except Exception as e:
-        # Log error but continue - lot pricing is optional enhancement
-        import traceback
-        print(f"⚠️ Lot pricing search failed for '{search_series or search_author}': {e}")
-        print(traceback.format_exc())
+        limiter = EnrichmentCoordinator.get_instance().rate_limiters["ebay_browse"]
+
+        def fetch(term: str) -> Optional[Dict[str, Any]]:
+            limiter.acquire()
+            return _fetch_lot_comps(term)
+
+        workers = max(1, min(max_workers, len(unique_terms)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="lot-pricing") as pool:
+            results = pool.map(fetch, unique_terms.values())
+            comps = dict(zip(unique_terms.keys(), results))
+
+    return [
+        _apply_lot_pricing(lot, books, comps.get(_search_term_key(term))) if term else lot
+        for (lot, books, _series, _author), term in zip(entries, terms)
+    ]
 
-    return lot
+
+def _price_suggestions(suggestions: List[LotSuggestion], to_price: Sequence[LotPricingInput]) -> List[LotSuggestion]:
+    """Swap each suggestion in ``to_price`` for its priced copy."""
+    priced = enrich_lots_with_pricing(to_price)
+    replacements = {id(entry[0]): lot for entry, lot in zip(to_price, priced)}
+    return [replacements.get(id(lot), lot) for lot in suggestions]
 
 
 def _compose_lot(
@@ -451,6 +551,7 @@ def build_lots_with_strategies(
         return []
 
     suggestions: List[LotSuggestion] = []
+    to_price: List[LotPricingInput] = []
 
     # Author grouping
     if "author" in selected:
@@ -475,10 +576,11 @@ def build_lots_with_strategies(
                     _probability_summary(author_books),
                 ],
                 author_name=author,
-                fetch_pricing=fetch_pricing,
+                fetch_pricing=False,
             )
             if suggestion:
                 suggestions.append(suggestion)
+                to_price.append((suggestion, author_books, None, author))
 
     # Series grouping (explicit series_name + series_index)
     if "series" in selected:
@@ -519,12 +621,13 @@ def build_lots_with_strategies(
                 books=series_books,
                 justification=justification,
                 series_name=series_name,
-                fetch_pricing=fetch_pricing,
+                fetch_pricing=False,
             )
             if suggestion:
                 suggestion.series_name = series_name
                 suggestion.canonical_series = key
                 suggestions.append(suggestion)
+                to_price.append((suggestion, series_books, series_name, None))
 
     # Genre grouping - prefer categories_str from normalized metadata_json
     if "genre" in selected:
@@ -545,11 +648,14 @@ def build_lots_with_strategies(
                     f"Aggregate estimated value ${_sum_price(genre_books):.2f}",
                     _probability_summary(genre_books),
                 ],
-                fetch_pricing=fetch_pricing,
+                fetch_pricing=False,
             )
             if suggestion:
                 suggestions.append(suggestion)
 
+    if fetch_pricing:
+        suggestions = _price_suggestions(suggestions, to_price)
+
     # Sort lots by probability then value
     suggestions.sort(key=lambda lot: (lot.probability_score, lot.estimated_value), reverse=True)
     return suggestions
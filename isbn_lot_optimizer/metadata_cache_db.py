@@ -12,12 +12,13 @@ from __future__ import annotations
 
 import json
 import logging
-import sqlite3
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from shared.db_pool import get_pool
+
 logger = logging.getLogger(__name__)
 
 
@@ -89,72 +90,70 @@ class MetadataCacheDB:
 
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._pool = get_pool(self.db_path)
 
         self._init_database()
 
     def _init_database(self):
         """Create database tables if they don't exist."""
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
-
-        # Main metadata cache table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS cached_books (
-                isbn TEXT PRIMARY KEY,
-                title TEXT,
-                authors TEXT,
-                publisher TEXT,
-                publication_year INTEGER,
-                binding TEXT,
-                page_count INTEGER,
-                language TEXT,
-                isbn13 TEXT,
-                isbn10 TEXT,
-                thumbnail_url TEXT,
-                description TEXT,
-                source TEXT,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                quality_score REAL DEFAULT 0.0
-            )
-        ''')
-
-        # Index on common query fields
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_cached_books_isbn13
-            ON cached_books(isbn13)
-        ''')
-
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_cached_books_isbn10
-            ON cached_books(isbn10)
-        ''')
-
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_cached_books_source
-            ON cached_books(source)
-        ''')
-
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_cached_books_quality
-            ON cached_books(quality_score)
-        ''')
-
-        # Collection stats table (track collection runs)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS collection_runs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                run_type TEXT,
-                books_collected INTEGER,
-                books_failed INTEGER,
-                started_at TEXT,
-                completed_at TEXT,
-                notes TEXT
-            )
-        ''')
-
-        conn.commit()
-        conn.close()
+        with self._pool.write() as conn:
+            cursor = conn.cursor()
+
+            # Main metadata cache table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS cached_books (
+                    isbn TEXT PRIMARY KEY,
+                    title TEXT,
+                    authors TEXT,
+                    publisher TEXT,
+                    publication_year INTEGER,
+                    binding TEXT,
+                    page_count INTEGER,
+                    language TEXT,
+                    isbn13 TEXT,
+                    isbn10 TEXT,
+                    thumbnail_url TEXT,
+                    description TEXT,
+                    source TEXT,
+                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    quality_score REAL DEFAULT 0.0
+                )
+            ''')
+
+            # Index on common query fields
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_cached_books_isbn13
+                ON cached_books(isbn13)
+            ''')
+
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_cached_books_isbn10
+                ON cached_books(isbn10)
+            ''')
+
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_cached_books_source
+                ON cached_books(source)
+            ''')
+
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_cached_books_quality
+                ON cached_books(quality_score)
+            ''')
+
+            # Collection stats table (track collection runs)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS collection_runs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    run_type TEXT,
+                    books_collected INTEGER,
+                    books_failed INTEGER,
+                    started_at TEXT,
+                    completed_at TEXT,
+                    notes TEXT
+                )
+            ''')
 
         logger.info(f"Metadata cache database initialized at {self.db_path}")
 
@@ -169,39 +168,36 @@ class MetadataCacheDB:
             True if stored successfully, False otherwise
         """
         try:
-            conn = sqlite3.connect(str(self.db_path))
-            cursor = conn.cursor()
-
-            # Calculate quality score
-            quality_score = self._calculate_quality_score(book)
-
-            # Insert or replace book
-            cursor.execute('''
-                INSERT OR REPLACE INTO cached_books (
-                    isbn, title, authors, publisher, publication_year,
-                    binding, page_count, language, isbn13, isbn10,
-                    thumbnail_url, description, source, updated_at, quality_score
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                book.isbn,
-                book.title,
-                book.authors,
-                book.publisher,
-                book.publication_year,
-                book.binding,
-                book.page_count,
-                book.language,
-                book.isbn13,
-                book.isbn10,
-                book.thumbnail_url,
-                book.description,
-                book.source,
-                datetime.now().isoformat(),
-                quality_score
-            ))
-
-            conn.commit()
-            conn.close()
+            with self._pool.write() as conn:
+                cursor = conn.cursor()
+
+                # Calculate quality score
+                quality_score = self._calculate_quality_score(book)
+
+                # Insert or replace book
+                cursor.execute('''
+                    INSERT OR REPLACE INTO cached_books (
+                        isbn, title, authors, publisher, publication_year,
+                        binding, page_count, language, isbn13, isbn10,
+                        thumbnail_url, description, source, updated_at, quality_score
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    book.isbn,
+                    book.title,
+                    book.authors,
+                    book.publisher,
+                    book.publication_year,
+                    book.binding,
+                    book.page_count,
+                    book.language,
+                    book.isbn13,
+                    book.isbn10,
+                    book.thumbnail_url,
+                    book.description,
+                    book.source,
+                    datetime.now().isoformat(),
+                    quality_score
+                ))
 
             return True
 
@@ -220,18 +216,16 @@ class MetadataCacheDB:
             CachedBook if found, None otherwise
         """
         try:
-            conn = sqlite3.connect(str(self.db_path))
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
+            with self._pool.read() as conn:
+                cursor = conn.cursor()
 
-            # Try exact match first
-            cursor.execute('''
-                SELECT * FROM cached_books
-                WHERE isbn = ? OR isbn13 = ? OR isbn10 = ?
-            ''', (isbn, isbn, isbn))
+                # Try exact match first
+                cursor.execute('''
+                    SELECT * FROM cached_books
+                    WHERE isbn = ? OR isbn13 = ? OR isbn10 = ?
+                ''', (isbn, isbn, isbn))
 
-            row = cursor.fetchone()
-            conn.close()
+                row = cursor.fetchone()
 
             if row:
                 return CachedBook(
@@ -270,17 +264,16 @@ class MetadataCacheDB:
             True if ISBN exists in cache, False otherwise
         """
         try:
-            conn = sqlite3.connect(str(self.db_path))
-            cursor = conn.cursor()
+            with self._pool.read() as conn:
+                cursor = conn.cursor()
 
-            cursor.execute('''
-                SELECT 1 FROM cached_books
-                WHERE isbn = ? OR isbn13 = ? OR isbn10 = ?
-                LIMIT 1
-            ''', (isbn, isbn, isbn))
+                cursor.execute('''
+                    SELECT 1 FROM cached_books
+                    WHERE isbn = ? OR isbn13 = ? OR isbn10 = ?
+                    LIMIT 1
+                ''', (isbn, isbn, isbn))
 
-            exists = cursor.fetchone() is not None
-            conn.close()
+                exists = cursor.fetchone() is not None
 
             return exists
 
@@ -291,13 +284,12 @@ class MetadataCacheDB:
     def get_count(self) -> int:
         """Get total number of books in cache."""
         try:
-            conn = sqlite3.connect(str(self.db_path))
-            cursor = conn.cursor()
+            with self._pool.read() as conn:
+                cursor = conn.cursor()
 
-            cursor.execute('SELECT COUNT(*) FROM cached_books')
-            count = cursor.fetchone()[0]
+                cursor.execute('SELECT COUNT(*) FROM cached_books')
+                count = cursor.fetchone()[0]
 
-            conn.close()
             return count
 
         except Exception as e:
@@ -312,45 +304,43 @@ class MetadataCacheDB:
             Dict with cache statistics
         """
         try:
-            conn = sqlite3.connect(str(self.db_path))
-            cursor = conn.cursor()
-
-            # Total books
-            cursor.execute('SELECT COUNT(*) FROM cached_books')
-            total = cursor.fetchone()[0]
-
-            # By source
-            cursor.execute('''
-                SELECT source, COUNT(*)
-                FROM cached_books
-                GROUP BY source
-            ''')
-            by_source = dict(cursor.fetchall())
-
-            # By binding
-            cursor.execute('''
-                SELECT binding, COUNT(*)
-                FROM cached_books
-                WHERE binding IS NOT NULL
-                GROUP BY binding
-            ''')
-            by_binding = dict(cursor.fetchall())
-
-            # Quality distribution
-            cursor.execute('''
-                SELECT
-                    CASE
-                        WHEN quality_score >= 0.8 THEN 'high'
-                        WHEN quality_score >= 0.5 THEN 'medium'
-                        ELSE 'low'
-                    END as quality_tier,
-                    COUNT(*)
-                FROM cached_books
-                GROUP BY quality_tier
-            ''')
-            by_quality = dict(cursor.fetchall())
-
-            conn.close()
+            with self._pool.read() as conn:
+                cursor = conn.cursor()
+
+                # Total books
+                cursor.execute('SELECT COUNT(*) FROM cached_books')
+                total = cursor.fetchone()[0]
+
+                # By source
+                cursor.execute('''
+                    SELECT source, COUNT(*)
+                    FROM cached_books
+                    GROUP BY source
+                ''')
+                by_source = dict(cursor.fetchall())
+
+                # By binding
+                cursor.execute('''
+                    SELECT binding, COUNT(*)
+                    FROM cached_books
+                    WHERE binding IS NOT NULL
+                    GROUP BY binding
+                ''')
+                by_binding = dict(cursor.fetchall())
+
+                # Quality distribution
+                cursor.execute('''
+                    SELECT
+                        CASE
+                            WHEN quality_score >= 0.8 THEN 'high'
+                            WHEN quality_score >= 0.5 THEN 'medium'
+                            ELSE 'low'
+                        END as quality_tier,
+                        COUNT(*)
+                    FROM cached_books
+                    GROUP BY quality_tier
+                ''')
+                by_quality = dict(cursor.fetchall())
 
             return {
                 'total_books': total,
@@ -417,20 +407,18 @@ class MetadataCacheDB:
             Run ID
         """
         try:
-            conn = sqlite3.connect(str(self.db_path))
-            cursor = conn.cursor()
-
-            cursor.execute('''
-                INSERT INTO collection_runs (
-                    run_type, books_collected, books_failed,
-                    started_at, completed_at, notes
-                ) VALUES (?, ?, ?, ?, ?, ?)
-            ''', (run_type, books_collected, books_failed,
-                  started_at, completed_at, notes))
-
-            run_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
+            with self._pool.write() as conn:
+                cursor = conn.cursor()
+
+                cursor.execute('''
+                    INSERT INTO collection_runs (
+                        run_type, books_collected, books_failed,
+                        started_at, completed_at, notes
+                    ) VALUES (?, ?, ?, ?, ?, ?)
+                ''', (run_type, books_collected, books_failed,
+                      started_at, completed_at, notes))
+
+                run_id = cursor.lastrowid
 
             return run_id
 
@@ -2,10 +2,20 @@
 Machine Learning module for price estimation.
 
 Replaces heuristic-based pricing with data-driven ML models.
+
+Exports are imported on first access so that importing a submodule (e.g.
+``isbn_lot_optimizer.ml.monitor``) does not pull in numpy and the estimators.
 """
 
-from isbn_lot_optimizer.ml.feature_extractor import FeatureExtractor, FeatureVector
-from isbn_lot_optimizer.ml.price_estimator import MLPriceEstimator, PriceEstimate, get_ml_estimator
+import importlib
+
+_EXPORTS = {
+    "FeatureExtractor": "isbn_lot_optimizer.ml.feature_extractor",
+    "FeatureVector": "isbn_lot_optimizer.ml.feature_extractor",
+    "MLPriceEstimator": "isbn_lot_optimizer.ml.price_estimator",
+    "PriceEstimate": "isbn_lot_optimizer.ml.price_estimator",
+    "get_ml_estimator": "isbn_lot_optimizer.ml.price_estimator",
+}
 
 __all__ = [
     "FeatureExtractor",
@@ -14,3 +24,12 @@ __all__ = [
     "PriceEstimate",
     "get_ml_estimator",
 ]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
@@ -5,7 +5,8 @@ Bootstrap Ensemble for Confidence Scoring.
 Provides prediction confidence intervals by training multiple models on bootstrap samples.
 """
 
-from typing import List, Tuple, NamedTuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple, NamedTuple
 from pathlib import Path
 import joblib
 import numpy as np
@@ -22,6 +23,26 @@ class PredictionWithConfidence(NamedTuple):
     individual_predictions: List[float]
 
 
+class BatchPredictionWithConfidence(NamedTuple):
+    """Confidence metrics for a batch; each field is an array over samples."""
+    mean: np.ndarray
+    std: np.ndarray
+    ci_90_lower: np.ndarray
+    ci_90_upper: np.ndarray
+    ci_95_lower: np.ndarray
+    ci_95_upper: np.ndarray
+    individual_predictions: np.ndarray  # (n_models, n_samples)
+
+
+# Normal quantiles for the confidence intervals
+Z_90 = 1.645
+Z_95 = 1.96
+
+# Single-file ensemble written by save(); older saves use one file per model
+ENSEMBLE_FILE = 'ensemble.pkl'
+ENSEMBLE_FORMAT_VERSION = 1
+
+
 class BootstrapEnsemble:
     """
     Bootstrap ensemble for confidence scoring.
@@ -40,6 +61,10 @@ class BootstrapEnsemble:
         result = ensemble.predict(features)
         print(f"Prediction: ${result.mean:.2f} ± ${result.std:.2f}")
         print(f"90% CI: ${result.confidence_interval_90[0]:.2f} - ${result.confidence_interval_90[1]:.2f}")
+
+        # Whole batch as arrays
+        batch = ensemble.predict_arrays(X)
+        print(batch.mean, batch.ci_90_lower, batch.ci_90_upper)
     """
 
     def __init__(self, n_models: int = 10, random_state: int = 42):
@@ -120,43 +145,28 @@ class BootstrapEnsemble:
         if X.ndim == 1:
             X = X.reshape(1, -1)
 
-        # Scale features
-        X_scaled = self.scaler.transform(X)
-
-        # Get predictions from all models
-        predictions = []
-        for model in self.models:
-            pred = model.predict(X_scaled)[0]
-            predictions.append(pred)
-
-        # Compute statistics
-        predictions = np.array(predictions)
-        mean = np.mean(predictions)
-        std = np.std(predictions)
-
-        # Confidence intervals (assuming normal distribution)
-        # 90% CI: mean ± 1.645 * std
-        # 95% CI: mean ± 1.96 * std
-        ci_90 = (mean - 1.645 * std, mean + 1.645 * std)
-        ci_95 = (mean - 1.96 * std, mean + 1.96 * std)
-
+        batch = self.predict_arrays(X[:1])
         return PredictionWithConfidence(
-            mean=float(mean),
-            std=float(std),
-            confidence_interval_90=ci_90,
-            confidence_interval_95=ci_95,
-            individual_predictions=predictions.tolist()
+            mean=float(batch.mean[0]),
+            std=float(batch.std[0]),
+            confidence_interval_90=(float(batch.ci_90_lower[0]), float(batch.ci_90_upper[0])),
+            confidence_interval_95=(float(batch.ci_95_lower[0]), float(batch.ci_95_upper[0])),
+            individual_predictions=batch.individual_predictions[:, 0].tolist()
         )
 
-    def predict_batch(self, X: np.ndarray) -> List[PredictionWithConfidence]:
+    def predict_arrays(self, X: np.ndarray, n_jobs: int = 1) -> BatchPredictionWithConfidence:
         """
-        Predict batch with confidence intervals.
+        Predict a batch with confidence intervals as arrays.
+
+        Statistics are computed over the (n_models, n_samples) prediction
+        matrix in one pass rather than per sample.
 
         Args:
             X: Features for prediction (n_samples, n_features)
+            n_jobs: Ensemble members to run concurrently (XGBoost releases the GIL)
 
         Returns:
-            List of PredictionWithConfidence for each sample
+            BatchPredictionWithConfidence with one entry per sample
         """
         if not self.trained:
             raise ValueError("Ensemble not trained. Call fit() first or load() from disk.")
@@ -165,32 +175,57 @@ class BootstrapEnsemble:
         X_scaled = self.scaler.transform(X)
 
         # Get predictions from all models (n_models, n_samples)
-        all_predictions = []
-        for model in self.models:
-            preds = model.predict(X_scaled)
-            all_predictions.append(preds)
-
-        all_predictions = np.array(all_predictions)  # Shape: (n_models, n_samples)
+        if n_jobs > 1 and len(self.models) > 1:
+            with ThreadPoolExecutor(max_workers=min(n_jobs, len(self.models))) as pool:
+                member_predictions = list(pool.map(lambda model: model.predict(X_scaled), self.models))
+        else:
+            member_predictions = [model.predict(X_scaled) for model in self.models]
+        all_predictions = np.vstack(member_predictions).astype(np.float64)
+
+        mean = all_predictions.mean(axis=0)
+        std = all_predictions.std(axis=0)
+
+        return BatchPredictionWithConfidence(
+            mean=mean,
+            std=std,
+            ci_90_lower=mean - Z_90 * std,
+            ci_90_upper=mean + Z_90 * std,
+            ci_95_lower=mean - Z_95 * std,
+            ci_95_upper=mean + Z_95 * std,
+            individual_predictions=all_predictions,
+        )
 
-        # Compute statistics for each sample
-        results = []
-        for i in range(X_scaled.shape[0]):
-            predictions = all_predictions[:, i]
-            mean = np.mean(predictions)
-            std = np.std(predictions)
+    def predict_batch(self, X: np.ndarray, n_jobs: int = 1) -> List[PredictionWithConfidence]:
+        """
+        Predict batch with confidence intervals.
 
-            ci_90 = (mean - 1.645 * std, mean + 1.645 * std)
-            ci_95 = (mean - 1.96 * std, mean + 1.96 * std)
+        Use predict_arrays() when per-sample objects are not needed.
 
-            results.append(PredictionWithConfidence(
-                mean=float(mean),
-                std=float(std),
-                confidence_interval_90=ci_90,
-                confidence_interval_95=ci_95,
-                individual_predictions=predictions.tolist()
-            ))
+        Args:
+            X: Features for prediction (n_samples, n_features)
+            n_jobs: Ensemble members to run concurrently
 
-        return results
+        Returns:
+            List of PredictionWithConfidence for each sample
+        """
+        batch = self.predict_arrays(X, n_jobs=n_jobs)
+        individual = batch.individual_predictions.T.tolist()
+
+        return [
+            PredictionWithConfidence(
+                mean=mean,
+                std=std,
+                confidence_interval_90=(ci_90_lower, ci_90_upper),
+                confidence_interval_95=(ci_95_lower, ci_95_upper),
+                individual_predictions=predictions
+            )
+            for mean, std, ci_90_lower, ci_90_upper, ci_95_lower, ci_95_upper, predictions in zip(
+                batch.mean.tolist(), batch.std.tolist(),
+                batch.ci_90_lower.tolist(), batch.ci_90_upper.tolist(),
+                batch.ci_95_lower.tolist(), batch.ci_95_upper.tolist(),
+                individual,
+            )
+        ]
 
     def save(self, directory: Path):
         """
@@ -205,23 +240,18 @@ class BootstrapEnsemble:
         directory = Path(directory)
         directory.mkdir(parents=True, exist_ok=True)
 
-        # Save each model
-        for i, model in enumerate(self.models):
-            model_path = directory / f'model_{i}.pkl'
-            joblib.dump(model, model_path)
-
-        # Save scaler
-        scaler_path = directory / 'scaler.pkl'
-        joblib.dump(self.scaler, scaler_path)
-
-        # Save metadata
-        metadata = {
-            'n_models': self.n_models,
-            'random_state': self.random_state,
-            'trained': self.trained,
-        }
-        metadata_path = directory / 'metadata.pkl'
-        joblib.dump(metadata, metadata_path)
+        # Models, scaler and metadata in one file, read with a single open
+        joblib.dump(
+            {
+                'format_version': ENSEMBLE_FORMAT_VERSION,
+                'n_models': self.n_models,
+                'random_state': self.random_state,
+                'trained': self.trained,
+                'scaler': self.scaler,
+                'models': self.models,
+            },
+            directory / ENSEMBLE_FILE,
+        )
 
         print(f"Saved bootstrap ensemble to {directory}")
 
@@ -238,30 +268,31 @@ class BootstrapEnsemble:
         """
         directory = Path(directory)
 
-        # Load metadata
-        metadata_path = directory / 'metadata.pkl'
-        metadata = joblib.load(metadata_path)
+        ensemble_path = directory / ENSEMBLE_FILE
+        if ensemble_path.exists():
+            saved = joblib.load(ensemble_path)
+            ensemble = cls(n_models=saved['n_models'], random_state=saved['random_state'])
+            ensemble.models = list(saved['models'])
+            ensemble.scaler = saved['scaler']
+            ensemble.trained = saved['trained']
+        else:
+            ensemble = cls._load_per_model_files(directory)
+
+        print(f"Loaded bootstrap ensemble from {directory}")
+        return ensemble
+
+    @classmethod
+    def _load_per_model_files(cls, directory: Path) -> 'BootstrapEnsemble':
+        """Load the older layout: metadata.pkl, scaler.pkl and model_<i>.pkl."""
+        metadata = joblib.load(directory / 'metadata.pkl')
 
-        # Create ensemble
         ensemble = cls(
             n_models=metadata['n_models'],
             random_state=metadata['random_state']
         )
-
-        # Load models
-        ensemble.models = []
-        for i in range(metadata['n_models']):
-            model_path = directory / f'model_{i}.pkl'
-            model = joblib.load(model_path)
-            ensemble.models.append(model)
-
-        # Load scaler
-        scaler_path = directory / 'scaler.pkl'
-        ensemble.scaler = joblib.load(scaler_path)
-
+        ensemble.models = [joblib.load(directory / f'model_{i}.pkl') for i in range(metadata['n_models'])]
+        ensemble.scaler = joblib.load(directory / 'scaler.pkl')
         ensemble.trained = metadata['trained']
-
-        print(f"Loaded bootstrap ensemble from {directory}")
         return ensemble
 
     def evaluate(self, X: np.ndarray, y: np.ndarray) -> dict:
@@ -275,24 +306,17 @@ class BootstrapEnsemble:
         Returns:
             Dictionary with evaluation metrics
         """
-        predictions = self.predict_batch(X)
-
-        means = np.array([p.mean for p in predictions])
-        stds = np.array([p.std for p in predictions])
+        batch = self.predict_arrays(X)
+        y = np.asarray(y)
 
         # Prediction metrics
-        mae = np.mean(np.abs(means - y))
-        rmse = np.sqrt(np.mean((means - y) ** 2))
+        mae = np.mean(np.abs(batch.mean - y))
+        rmse = np.sqrt(np.mean((batch.mean - y) ** 2))
+        stds = batch.std
 
         # Calibration: check if true values fall within confidence intervals
-        ci_90_coverage = np.mean([
-            ci[0] <= true <= ci[1]
-            for ci, true in zip([p.confidence_interval_90 for p in predictions], y)
-        ])
-        ci_95_coverage = np.mean([
-            ci[0] <= true <= ci[1]
-            for ci, true in zip([p.confidence_interval_95 for p in predictions], y)
-        ])
+        ci_90_coverage = np.mean((batch.ci_90_lower <= y) & (y <= batch.ci_90_upper))
+        ci_95_coverage = np.mean((batch.ci_95_lower <= y) & (y <= batch.ci_95_upper))
 
         return {
             'mae': float(mae),
@@ -12,9 +12,10 @@ import sqlite3
 from pathlib import Path
 from typing import Optional, Tuple
 
-import joblib
 import numpy as np
 
+from isbn_lot_optimizer.ml.model_registry import DEFAULT_MODEL_DIR, get_model_registry
+
 
 class EditionPremiumEstimator:
     """
@@ -35,37 +36,41 @@ class EditionPremiumEstimator:
                       Defaults to isbn_lot_optimizer/models/edition_premium/
         """
         if model_dir is None:
-            package_dir = Path(__file__).parent.parent
-            model_dir = package_dir / "models" / "edition_premium"
+            model_dir = DEFAULT_MODEL_DIR / "edition_premium"
 
-        self.model_dir = Path(model_dir)
-        self.model = None
-        self.scaler = None
+        self.registry = get_model_registry(model_dir)
+        self.model_dir = self.registry.model_dir
         self.metadata = {}
 
-        self._load_model()
+        self._load_metadata()
 
-    def _load_model(self) -> None:
-        """Load trained model, scaler, and metadata from disk."""
-        model_path = self.model_dir / "model_v1.pkl"
-        scaler_path = self.model_dir / "scaler_v1.pkl"
+    def _load_metadata(self) -> None:
+        """Load model metadata from disk; model and scaler load on first use."""
         metadata_path = self.model_dir / "metadata_v1.json"
-
-        if not model_path.exists():
+        if not metadata_path.exists():
             return
 
         try:
-            self.model = joblib.load(model_path)
-            if scaler_path.exists():
-                self.scaler = joblib.load(scaler_path)
+            with open(metadata_path, "r") as f:
+                self.metadata = json.load(f)
+        except Exception as e:
+            print(f"Warning: Failed to load edition premium model metadata: {e}")
 
-            if metadata_path.exists():
-                with open(metadata_path, "r") as f:
-                    self.metadata = json.load(f)
+    @property
+    def model(self):
+        try:
+            return self.registry.get("model_v1.pkl")
+        except Exception:
+            return None
 
-        except Exception as e:
-            print(f"Warning: Failed to load edition premium model: {e}")
-            self.model = None
+    @property
+    def scaler(self):
+        if not self.registry.exists("scaler_v1.pkl"):
+            return None
+        try:
+            return self.registry.get("scaler_v1.pkl")
+        except Exception:
+            return None
 
     def is_ready(self) -> bool:
         """Check if model is loaded and ready."""
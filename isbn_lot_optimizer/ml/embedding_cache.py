@@ -0,0 +1,204 @@
+"""
+Persistent cache of description embeddings.
+
+TextEmbedder used to run sentence-transformers over every description on
+every call, and augment_features_with_embeddings does that for the whole
+training set on each training run, which on CPU takes far longer than the
+model fit. The cache keeps each vector once:
+
+- vectors.f16 is a float16 matrix with one row per embedded description,
+  read through a memory map
+- index.db maps a content hash of (model name, normalize flag, normalized
+  description) to its row
+
+Rows are only ever appended. A writer holds the index's write lock while
+it writes its rows and inserts their keys, so concurrent trainers cannot
+hand out the same row twice. Rows past the last indexed one, left behind
+by an interrupted write, are overwritten by the next append.
+
+Usage:
+    cache = get_embedding_cache("all-MiniLM-L6-v2")
+    rows = cache.lookup(keys)            # -1 where not cached
+    rows[missing] = cache.add(missing_keys, vectors)
+    matrix = cache.vectors(rows)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
+
+from shared.db_pool import get_pool
+
+DEFAULT_CACHE_DIR = Path.home() / ".isbn_lot_optimizer" / "embedding_cache"
+
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    key TEXT PRIMARY KEY,
+    row INTEGER NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS cache_info (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# SQLite's default limit on host parameters is 999
+_LOOKUP_CHUNK = 500
+_VECTOR_DTYPE = np.float16
+
+
+def normalize_description(description: Optional[str]) -> Optional[str]:
+    """Description with whitespace collapsed, or None if there is no text."""
+    if description is None:
+        return None
+    text = " ".join(str(description).split())
+    return text or None
+
+
+def description_key(text: str, model_name: str, normalize: bool = True) -> str:
+    """Content hash a normalized description's embedding is cached under."""
+    return hashlib.sha256(f"{model_name}\0{int(normalize)}\0{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Append-only float16 embedding matrix with a hash index, for one model."""
+
+    def __init__(self, cache_dir: Union[str, Path]):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.vectors_path = self.cache_dir / "vectors.f16"
+        self._pool = get_pool(self.cache_dir / "index.db")
+        with self._pool.write() as conn:
+            conn.executescript(INDEX_SCHEMA)
+        self._lock = threading.Lock()
+        self._matrix: Optional[np.memmap] = None
+        self._embedding_dim: Optional[int] = None
+
+    @property
+    def embedding_dim(self) -> Optional[int]:
+        """Vector width, fixed by the first add (None while the cache is empty)."""
+        if self._embedding_dim is None:
+            with self._pool.read() as conn:
+                row = conn.execute("SELECT value FROM cache_info WHERE name = 'embedding_dim'").fetchone()
+            if row is not None:
+                self._embedding_dim = int(row[0])
+        return self._embedding_dim
+
+    def __len__(self) -> int:
+        with self._pool.read() as conn:
+            return conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def lookup(self, keys: Sequence[str]) -> np.ndarray:
+        """Row of each key, -1 for keys not in the cache."""
+        with self._pool.read() as conn:
+            found = self._rows(conn, keys)
+        return np.array([found.get(key, -1) for key in keys], dtype=np.int64)
+
+    def add(self, keys: Sequence[str], vectors: np.ndarray) -> np.ndarray:
+        """
+        Store vectors under their keys; returns the row of each key.
+
+        Keys another process added in the meantime keep their existing row.
+        """
+        vectors = np.asarray(vectors)
+        if len(keys) != len(vectors):
+            raise ValueError(f"Got {len(keys)} keys for {len(vectors)} vectors")
+        if not len(keys):
+            return np.empty(0, dtype=np.int64)
+
+        with self._pool.write() as conn:
+            if not conn.in_transaction:
+                # Take the database write lock now: it also serialises the vector file
+                conn.execute("BEGIN IMMEDIATE")
+            embedding_dim = self._ensure_dim(conn, vectors.shape[1])
+            found = self._rows(conn, keys)
+
+            new_rows = {}
+            next_row = conn.execute("SELECT COALESCE(MAX(row) + 1, 0) FROM embeddings").fetchone()[0]
+            new_positions = []
+            for position, key in enumerate(keys):
+                if key not in found and key not in new_rows:
+                    new_rows[key] = next_row + len(new_rows)
+                    new_positions.append(position)
+
+            if new_positions:
+                block = np.ascontiguousarray(vectors[new_positions], dtype=_VECTOR_DTYPE)
+                mode = "r+b" if self.vectors_path.exists() else "w+b"
+                with open(self.vectors_path, mode) as f:
+                    f.seek(next_row * embedding_dim * block.itemsize)
+                    f.write(block.tobytes())
+                conn.executemany(
+                    "INSERT INTO embeddings (key, row) VALUES (?, ?)",
+                    [(keys[position], new_rows[keys[position]]) for position in new_positions],
+                )
+
+        found.update(new_rows)
+        return np.array([found[key] for key in keys], dtype=np.int64)
+
+    def vectors(self, rows: np.ndarray) -> np.ndarray:
+        """float32 copies of the given rows."""
+        rows = np.asarray(rows, dtype=np.int64)
+        if not len(rows):
+            return np.empty((0, self.embedding_dim or 0), dtype=np.float32)
+        if rows.min() < 0:
+            raise KeyError("Cannot read rows for keys that are not cached")
+        matrix = self._mapped(int(rows.max()) + 1)
+        return np.asarray(matrix[rows], dtype=np.float32)
+
+    def _mapped(self, min_rows: int) -> np.memmap:
+        """The memory map, re-opened if other writers grew the file past it."""
+        with self._lock:
+            if self._matrix is None or len(self._matrix) < min_rows:
+                embedding_dim = self.embedding_dim
+                row_bytes = embedding_dim * np.dtype(_VECTOR_DTYPE).itemsize
+                n_rows = self.vectors_path.stat().st_size // row_bytes
+                self._matrix = np.memmap(self.vectors_path, dtype=_VECTOR_DTYPE, mode="r", shape=(n_rows, embedding_dim))
+            return self._matrix
+
+    def _ensure_dim(self, conn, embedding_dim: int) -> int:
+        row = conn.execute("SELECT value FROM cache_info WHERE name = 'embedding_dim'").fetchone()
+        if row is None:
+            conn.execute("INSERT INTO cache_info (name, value) VALUES ('embedding_dim', ?)", (str(embedding_dim),))
+        elif int(row[0]) != embedding_dim:
+            raise ValueError(f"Embedding cache {self.cache_dir} holds {row[0]}-dim vectors, got {embedding_dim}")
+        self._embedding_dim = embedding_dim
+        return embedding_dim
+
+    @staticmethod
+    def _rows(conn, keys: Sequence[str]) -> Dict[str, int]:
+        found = {}
+        unique = list(dict.fromkeys(keys))
+        for start in range(0, len(unique), _LOOKUP_CHUNK):
+            chunk = unique[start:start + _LOOKUP_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            found.update(conn.execute(f"SELECT key, row FROM embeddings WHERE key IN ({placeholders})", chunk).fetchall())
+        return found
+
+
+# Caches by resolved directory
+_caches: Dict[str, EmbeddingCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_embedding_cache(model_name: str, cache_dir: Optional[Union[str, Path]] = None) -> EmbeddingCache:
+    """
+    Get the process-wide embedding cache for a sentence-transformers model.
+
+    Args:
+        model_name: Model the vectors come from; each model gets its own directory
+        cache_dir: Cache root (default: ~/.isbn_lot_optimizer/embedding_cache)
+    """
+    root = Path(cache_dir) if cache_dir is not None else DEFAULT_CACHE_DIR
+    directory = root.expanduser() / re.sub(r"[^A-Za-z0-9._-]+", "_", model_name)
+    key = str(directory.resolve())
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = _caches[key] = EmbeddingCache(directory)
+        return cache
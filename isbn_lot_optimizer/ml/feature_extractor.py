@@ -9,10 +9,18 @@ from __future__ import annotations
 
 import math
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Dict, List, Optional
 
 import numpy as np
 
+from isbn_lot_optimizer.ml.feature_store import (
+    get_feature_store,
+    load_author_aggregates,
+    load_bookfinder_features,
+    load_sold_listings_features,
+    query_features,
+)
 from shared.models import BookMetadata, EbayMarketStats, BookScouterResult
 
 
@@ -1001,12 +1009,22 @@ class PlatformFeatureExtractor(FeatureExtractor):
         else:
             raise ValueError(f"Unknown platform: {platform}")
 
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def platform_feature_indices(platform: str) -> np.ndarray:
+        """Column positions of a platform's features within a full feature vector."""
+        names = PlatformFeatureExtractor.get_platform_feature_names(platform)
+        indices = np.array([FEATURE_NAMES.index(name) for name in names], dtype=np.intp)
+        indices.flags.writeable = False
+        return indices
+
 
 def get_bookfinder_features(isbn: str, db_path: str) -> Optional[Dict]:
     """
     Query BookFinder aggregator features from database.
 
     Extracts comprehensive pricing and collectibility signals from bookfinder_offers.
+    Served from the preloaded FeatureStore for the database.
 
     Args:
         isbn: ISBN to query
@@ -1015,107 +1033,10 @@ def get_bookfinder_features(isbn: str, db_path: str) -> Optional[Dict]:
     Returns:
         Dict with BookFinder features, or None if no data available
     """
-    import sqlite3
-
-    try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
-        # Comprehensive feature extraction with Phase 2.3 premium calculations
-        cursor.execute("""
-            SELECT
-                -- Basic pricing
-                MIN(price + COALESCE(shipping, 0)) as lowest_price,
-                AVG(price + COALESCE(shipping, 0)) as avg_price,
-                MAX(price + COALESCE(shipping, 0)) as highest_price,
-                COUNT(*) as total_offers,
-                COUNT(DISTINCT vendor) as source_count,
-
-                -- Condition spread
-                MIN(CASE WHEN condition='New' THEN price + COALESCE(shipping, 0) END) as min_new,
-                MIN(CASE WHEN condition='Used' THEN price + COALESCE(shipping, 0) END) as min_used,
-
-                -- Collectibility signals (NEW)
-                SUM(CASE WHEN is_signed = 1 THEN 1 ELSE 0 END) as signed_count,
-                MIN(CASE WHEN is_signed = 1 THEN price + COALESCE(shipping, 0) END) as signed_lowest_price,
-                SUM(CASE WHEN is_first_edition = 1 THEN 1 ELSE 0 END) as first_edition_count,
-                MIN(CASE WHEN is_first_edition = 1 THEN price + COALESCE(shipping, 0) END) as first_ed_lowest_price,
-                SUM(CASE WHEN is_oldworld = 1 THEN 1 ELSE 0 END) as oldworld_count,
-
-                -- Description richness (proxy for quality)
-                AVG(LENGTH(COALESCE(description, ''))) as avg_description_length,
-                SUM(CASE WHEN LENGTH(COALESCE(description, '')) > 100 THEN 1 ELSE 0 END) as detailed_offers_count,
-
-                -- Phase 2.3: Premium differential data
-                AVG(CASE WHEN is_signed = 1 THEN price + COALESCE(shipping, 0) END) as signed_avg_price,
-                AVG(CASE WHEN is_signed = 0 OR is_signed IS NULL THEN price + COALESCE(shipping, 0) END) as unsigned_avg_price,
-                AVG(CASE WHEN is_first_edition = 1 THEN price + COALESCE(shipping, 0) END) as first_ed_avg_price,
-                AVG(CASE WHEN is_first_edition = 0 OR is_first_edition IS NULL THEN price + COALESCE(shipping, 0) END) as non_first_ed_avg_price
-
-            FROM bookfinder_offers
-            WHERE isbn = ?
-        """, (isbn,))
-
-        row = cursor.fetchone()
-        conn.close()
-
-        if row and row[0]:  # Has data
-            min_new = row[5] or 0
-            min_used = row[6] or 0
-            spread = (min_new - min_used) if (min_new > 0 and min_used > 0) else 0
-
-            lowest_price = row[0]
-            avg_price = row[1] or 0
-            highest_price = row[2] or 0
-
-            # Price volatility (range as % of average)
-            price_volatility = ((highest_price - lowest_price) / avg_price) if avg_price > 0 else 0
-
-            # Phase 2.3: Premium differential calculations
-            signed_avg = row[14] or 0
-            unsigned_avg = row[15] or 0
-            first_ed_avg = row[16] or 0
-            non_first_ed_avg = row[17] or 0
-
-            # Signed book premium percentage
-            signed_premium_pct = ((signed_avg - unsigned_avg) / unsigned_avg * 100) if unsigned_avg > 0 and signed_avg > 0 else 0
-            # First edition premium percentage
-            first_ed_premium_pct = ((first_ed_avg - non_first_ed_avg) / non_first_ed_avg * 100) if non_first_ed_avg > 0 and first_ed_avg > 0 else 0
-
-            return {
-                # Original features
-                'bookfinder_lowest_price': lowest_price,
-                'bookfinder_source_count': row[4],
-                'bookfinder_new_vs_used_spread': spread,
-
-                # NEW: Enhanced pricing features
-                'bookfinder_avg_price': avg_price,
-                'bookfinder_total_offers': row[3],
-                'bookfinder_price_volatility': price_volatility,
-
-                # NEW: Collectibility signals
-                'bookfinder_signed_count': row[7] or 0,
-                'bookfinder_has_signed': 1 if row[7] and row[7] > 0 else 0,
-                'bookfinder_signed_lowest': row[8] or 0,
-                'bookfinder_first_edition_count': row[9] or 0,
-                'bookfinder_has_first_edition': 1 if row[9] and row[9] > 0 else 0,
-                'bookfinder_first_ed_lowest': row[10] or 0,
-                'bookfinder_oldworld_count': row[11] or 0,
-
-                # NEW: Quality signals
-                'bookfinder_avg_desc_length': row[12] or 0,
-                'bookfinder_detailed_pct': (row[13] / row[3]) if row[3] > 0 else 0,
-
-                # Phase 2.3: Premium differentials
-                'bookfinder_signed_premium_pct': signed_premium_pct,
-                'bookfinder_first_ed_premium_pct': first_ed_premium_pct,
-            }
-
-        return None
-
-    except Exception as e:
-        # Database may not have bookfinder_offers table yet
-        return None
+    store = get_feature_store(db_path)
+    if store is not None:
+        return store.bookfinder_features(isbn)
+    return query_features(db_path, load_bookfinder_features, isbn)
 
 
 def get_sold_listings_features(isbn: str, db_path: str) -> Optional[Dict]:
@@ -1124,6 +1045,7 @@ def get_sold_listings_features(isbn: str, db_path: str) -> Optional[Dict]:
 
     NOTE: Price features removed to prevent data leakage.
     Only extracts market demand indicators: volume, platform distribution, format indicators.
+    Served from the preloaded FeatureStore for the database.
 
     Args:
         isbn: ISBN to query
@@ -1132,45 +1054,10 @@ def get_sold_listings_features(isbn: str, db_path: str) -> Optional[Dict]:
     Returns:
         Dict with sold listings NON-PRICE features, or None if no data available
     """
-    import sqlite3
-
-    try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
-        # Aggregate sold listings data (NON-PRICE STATISTICS ONLY)
-        cursor.execute("""
-            SELECT
-                COUNT(*) as count,
-                SUM(CASE WHEN signed = 1 THEN 1 ELSE 0 END) as signed_count,
-                SUM(CASE WHEN cover_type = 'Hardcover' THEN 1 ELSE 0 END) as hardcover_count,
-                SUM(CASE WHEN platform = 'ebay' THEN 1 ELSE 0 END) as ebay_count
-            FROM sold_listings
-            WHERE isbn = ? AND price IS NOT NULL
-        """, (isbn,))
-
-        row = cursor.fetchone()
-        conn.close()
-
-        if row and row[0] and row[0] > 0:  # Has sold listings
-            count = row[0]
-            signed_count = row[1] or 0
-            hardcover_count = row[2] or 0
-            ebay_count = row[3] or 0
-
-            return {
-                'serper_sold_count': count,
-                'serper_sold_has_signed': 1 if signed_count > 0 else 0,
-                'serper_sold_signed_pct': (signed_count / count) if count > 0 else 0,
-                'serper_sold_hardcover_pct': (hardcover_count / count) if count > 0 else 0,
-                'serper_sold_ebay_pct': (ebay_count / count) if count > 0 else 0,
-            }
-
-        return None
-
-    except Exception as e:
-        # Database may not have sold_listings table yet
-        return None
+    store = get_feature_store(db_path)
+    if store is not None:
+        return store.sold_listings_features(isbn)
+    return query_features(db_path, load_sold_listings_features, isbn)
 
 
 def get_author_aggregates(canonical_author: str, db_path: str) -> Optional[Dict]:
@@ -1178,7 +1065,8 @@ def get_author_aggregates(canonical_author: str, db_path: str) -> Optional[Dict]
     Query author-level aggregate features from database.
 
     Phase 2.4: Extract author-specific patterns to capture author brand value
-    (e.g., Stephen King vs unknown author).
+    (e.g., Stephen King vs unknown author). Served from the preloaded
+    FeatureStore for the database.
 
     Args:
         canonical_author: Canonical author name to query
@@ -1187,70 +1075,10 @@ def get_author_aggregates(canonical_author: str, db_path: str) -> Optional[Dict]
     Returns:
         Dict with author aggregate features, or None if no data available
     """
-    import sqlite3
-    import math
-
     if not canonical_author or canonical_author == "Unknown":
         return None
 
-    try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
-        # Aggregate statistics across all books by this author
-        cursor.execute("""
-            SELECT
-                COUNT(*) as book_count,
-                AVG(COALESCE(sold_comps_median, 0)) as avg_sold_price,
-                AVG(COALESCE(sold_count, 0)) as avg_sales_velocity,
-                AVG(COALESCE(ratings_count, 0)) as avg_ratings_count,
-                AVG(COALESCE(average_rating, 0)) as avg_rating,
-                SUM(CASE WHEN bookfinder_has_signed = 1 THEN 1 ELSE 0 END) as signed_book_count,
-                SUM(CASE WHEN bookfinder_has_first_edition = 1 THEN 1 ELSE 0 END) as first_ed_book_count
-            FROM books
-            WHERE canonical_author = ? AND sold_comps_median IS NOT NULL
-        """, (canonical_author,))
-
-        row = cursor.fetchone()
-        conn.close()
-
-        if row and row[0] and row[0] > 0:  # Has books by this author
-            book_count = row[0]
-            avg_sold_price = row[1] or 0
-            avg_sales_velocity = row[2] or 0
-            avg_ratings_count = row[3] or 0
-            avg_rating = row[4] or 0
-            signed_book_count = row[5] or 0
-            first_ed_book_count = row[6] or 0
-
-            # Author collectibility score (weighted combination of signals)
-            signed_pct = (signed_book_count / book_count) if book_count > 0 else 0
-            first_ed_pct = (first_ed_book_count / book_count) if book_count > 0 else 0
-            # Normalize price to 0-1 scale (assume $100 as high-end)
-            price_normalized = min(avg_sold_price / 100.0, 1.0)
-
-            collectibility_score = (
-                signed_pct * 0.3 +
-                first_ed_pct * 0.3 +
-                price_normalized * 0.4
-            )
-
-            # Author popularity score (log-scaled ratings * sales velocity)
-            popularity_score = math.log1p(avg_ratings_count) * avg_sales_velocity
-
-            return {
-                'author_book_count': book_count,
-                'log_author_catalog_size': math.log1p(book_count),
-                'author_avg_sold_price': avg_sold_price,
-                'log_author_avg_price': math.log1p(avg_sold_price),
-                'author_avg_sales_velocity': avg_sales_velocity,
-                'author_collectibility_score': collectibility_score,
-                'author_popularity_score': popularity_score,
-                'author_avg_rating': avg_rating,
-            }
-
-        return None
-
-    except Exception as e:
-        # Database may not have required columns yet
-        return None
+    store = get_feature_store(db_path)
+    if store is not None:
+        return store.author_aggregates(canonical_author)
+    return query_features(db_path, load_author_aggregates, canonical_author)
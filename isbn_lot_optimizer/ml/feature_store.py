@@ -0,0 +1,471 @@
+"""
+In-memory store of the per-ISBN and per-author aggregates used as ML features.
+
+``get_bookfinder_features``, ``get_sold_listings_features`` and
+``get_author_aggregates`` used to open a connection and aggregate
+bookfinder_offers, sold_listings or the whole books table on every call, and
+training loops call them once per record. The store computes each aggregate
+for the whole catalogue with one GROUP BY query, keeps the finished feature
+dicts in memory keyed by ISBN or canonical author, and keeps them current
+incrementally:
+
+- triggers on bookfinder_offers, sold_listings and books log changed ISBNs to
+  feature_changes (one row per source and ISBN, with a monotonic seq, the
+  same scheme as book_changes)
+- a refresh re-aggregates only the ISBNs logged since its cursor, and for
+  books the old and new authors of those ISBNs
+
+Lookups check for changes at most every ``refresh_interval`` seconds.
+
+Usage:
+    store = get_feature_store(db_path)
+    features = store.bookfinder_features(isbn)
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Set, Union
+
+from shared.db_pool import get_pool
+
+logger = logging.getLogger(__name__)
+
+REFRESH_INTERVAL_SECONDS = 5.0
+
+SOURCES = ("bookfinder_offers", "sold_listings", "books")
+
+FEATURE_CHANGES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS feature_changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT NOT NULL,
+    isbn TEXT NOT NULL,
+    UNIQUE (source, isbn)
+);
+"""
+
+# Installed per source table once it exists; rows without an ISBN are skipped
+# so the trigger can never fail the write that fired it.
+_CHANGE_TRIGGERS = """
+CREATE TRIGGER IF NOT EXISTS {table}_feature_changes_ai AFTER INSERT ON {table} BEGIN
+    DELETE FROM feature_changes WHERE source = '{table}' AND isbn = new.isbn;
+    INSERT INTO feature_changes (source, isbn)
+        SELECT '{table}', new.isbn WHERE new.isbn IS NOT NULL;
+END;
+
+CREATE TRIGGER IF NOT EXISTS {table}_feature_changes_au AFTER UPDATE ON {table} BEGIN
+    DELETE FROM feature_changes WHERE source = '{table}' AND isbn IN (old.isbn, new.isbn);
+    INSERT INTO feature_changes (source, isbn)
+        SELECT '{table}', old.isbn WHERE old.isbn IS NOT NULL AND old.isbn IS NOT new.isbn;
+    INSERT INTO feature_changes (source, isbn)
+        SELECT '{table}', new.isbn WHERE new.isbn IS NOT NULL;
+END;
+
+CREATE TRIGGER IF NOT EXISTS {table}_feature_changes_ad AFTER DELETE ON {table} BEGIN
+    DELETE FROM feature_changes WHERE source = '{table}' AND isbn = old.isbn;
+    INSERT INTO feature_changes (source, isbn)
+        SELECT '{table}', old.isbn WHERE old.isbn IS NOT NULL;
+END;
+"""
+
+_BOOKFINDER_QUERY = """
+    SELECT
+        isbn,
+        -- Basic pricing
+        MIN(price + COALESCE(shipping, 0)) as lowest_price,
+        AVG(price + COALESCE(shipping, 0)) as avg_price,
+        MAX(price + COALESCE(shipping, 0)) as highest_price,
+        COUNT(*) as total_offers,
+        COUNT(DISTINCT vendor) as source_count,
+
+        -- Condition spread
+        MIN(CASE WHEN condition='New' THEN price + COALESCE(shipping, 0) END) as min_new,
+        MIN(CASE WHEN condition='Used' THEN price + COALESCE(shipping, 0) END) as min_used,
+
+        -- Collectibility signals
+        SUM(CASE WHEN is_signed = 1 THEN 1 ELSE 0 END) as signed_count,
+        MIN(CASE WHEN is_signed = 1 THEN price + COALESCE(shipping, 0) END) as signed_lowest_price,
+        SUM(CASE WHEN is_first_edition = 1 THEN 1 ELSE 0 END) as first_edition_count,
+        MIN(CASE WHEN is_first_edition = 1 THEN price + COALESCE(shipping, 0) END) as first_ed_lowest_price,
+        SUM(CASE WHEN is_oldworld = 1 THEN 1 ELSE 0 END) as oldworld_count,
+
+        -- Description richness (proxy for quality)
+        AVG(LENGTH(COALESCE(description, ''))) as avg_description_length,
+        SUM(CASE WHEN LENGTH(COALESCE(description, '')) > 100 THEN 1 ELSE 0 END) as detailed_offers_count,
+
+        -- Phase 2.3: Premium differential data
+        AVG(CASE WHEN is_signed = 1 THEN price + COALESCE(shipping, 0) END) as signed_avg_price,
+        AVG(CASE WHEN is_signed = 0 OR is_signed IS NULL THEN price + COALESCE(shipping, 0) END) as unsigned_avg_price,
+        AVG(CASE WHEN is_first_edition = 1 THEN price + COALESCE(shipping, 0) END) as first_ed_avg_price,
+        AVG(CASE WHEN is_first_edition = 0 OR is_first_edition IS NULL THEN price + COALESCE(shipping, 0) END) as non_first_ed_avg_price
+    FROM bookfinder_offers
+    {where}
+    GROUP BY isbn
+"""
+
+# Non-price statistics only: price features would leak the training target
+_SOLD_LISTINGS_QUERY = """
+    SELECT
+        isbn,
+        COUNT(*) as count,
+        SUM(CASE WHEN signed = 1 THEN 1 ELSE 0 END) as signed_count,
+        SUM(CASE WHEN cover_type = 'Hardcover' THEN 1 ELSE 0 END) as hardcover_count,
+        SUM(CASE WHEN platform = 'ebay' THEN 1 ELSE 0 END) as ebay_count
+    FROM sold_listings
+    WHERE price IS NOT NULL {where}
+    GROUP BY isbn
+"""
+
+_AUTHOR_QUERY = """
+    SELECT
+        canonical_author,
+        COUNT(*) as book_count,
+        AVG(COALESCE(sold_comps_median, 0)) as avg_sold_price,
+        AVG(COALESCE(sold_count, 0)) as avg_sales_velocity,
+        AVG(COALESCE(ratings_count, 0)) as avg_ratings_count,
+        AVG(COALESCE(average_rating, 0)) as avg_rating,
+        SUM(CASE WHEN bookfinder_has_signed = 1 THEN 1 ELSE 0 END) as signed_book_count,
+        SUM(CASE WHEN bookfinder_has_first_edition = 1 THEN 1 ELSE 0 END) as first_ed_book_count
+    FROM books
+    WHERE sold_comps_median IS NOT NULL AND canonical_author IS NOT NULL {where}
+    GROUP BY canonical_author
+"""
+
+
+def _bookfinder_features(row) -> Optional[Dict]:
+    """Feature dict from one bookfinder_offers aggregate row (without the ISBN)."""
+    if not row[0]:  # No priced offers
+        return None
+
+    min_new = row[5] or 0
+    min_used = row[6] or 0
+    spread = (min_new - min_used) if (min_new > 0 and min_used > 0) else 0
+
+    lowest_price = row[0]
+    avg_price = row[1] or 0
+    highest_price = row[2] or 0
+
+    # Price volatility (range as % of average)
+    price_volatility = ((highest_price - lowest_price) / avg_price) if avg_price > 0 else 0
+
+    # Phase 2.3: Premium differential calculations
+    signed_avg = row[14] or 0
+    unsigned_avg = row[15] or 0
+    first_ed_avg = row[16] or 0
+    non_first_ed_avg = row[17] or 0
+
+    # Signed book premium percentage
+    signed_premium_pct = ((signed_avg - unsigned_avg) / unsigned_avg * 100) if unsigned_avg > 0 and signed_avg > 0 else 0
+    # First edition premium percentage
+    first_ed_premium_pct = ((first_ed_avg - non_first_ed_avg) / non_first_ed_avg * 100) if non_first_ed_avg > 0 and first_ed_avg > 0 else 0
+
+    return {
+        # Original features
+        'bookfinder_lowest_price': lowest_price,
+        'bookfinder_source_count': row[4],
+        'bookfinder_new_vs_used_spread': spread,
+
+        # Enhanced pricing features
+        'bookfinder_avg_price': avg_price,
+        'bookfinder_total_offers': row[3],
+        'bookfinder_price_volatility': price_volatility,
+
+        # Collectibility signals
+        'bookfinder_signed_count': row[7] or 0,
+        'bookfinder_has_signed': 1 if row[7] and row[7] > 0 else 0,
+        'bookfinder_signed_lowest': row[8] or 0,
+        'bookfinder_first_edition_count': row[9] or 0,
+        'bookfinder_has_first_edition': 1 if row[9] and row[9] > 0 else 0,
+        'bookfinder_first_ed_lowest': row[10] or 0,
+        'bookfinder_oldworld_count': row[11] or 0,
+
+        # Quality signals
+        'bookfinder_avg_desc_length': row[12] or 0,
+        'bookfinder_detailed_pct': (row[13] / row[3]) if row[3] > 0 else 0,
+
+        # Phase 2.3: Premium differentials
+        'bookfinder_signed_premium_pct': signed_premium_pct,
+        'bookfinder_first_ed_premium_pct': first_ed_premium_pct,
+    }
+
+
+def _sold_listings_features(row) -> Optional[Dict]:
+    """Feature dict from one sold_listings aggregate row (without the ISBN)."""
+    if not row[0] or row[0] <= 0:  # No sold listings
+        return None
+
+    count = row[0]
+    signed_count = row[1] or 0
+    hardcover_count = row[2] or 0
+    ebay_count = row[3] or 0
+
+    return {
+        'serper_sold_count': count,
+        'serper_sold_has_signed': 1 if signed_count > 0 else 0,
+        'serper_sold_signed_pct': (signed_count / count) if count > 0 else 0,
+        'serper_sold_hardcover_pct': (hardcover_count / count) if count > 0 else 0,
+        'serper_sold_ebay_pct': (ebay_count / count) if count > 0 else 0,
+    }
+
+
+def _author_aggregates(row) -> Optional[Dict]:
+    """Feature dict from one books-by-author aggregate row (without the author)."""
+    if not row[0] or row[0] <= 0:  # No books by this author
+        return None
+
+    book_count = row[0]
+    avg_sold_price = row[1] or 0
+    avg_sales_velocity = row[2] or 0
+    avg_ratings_count = row[3] or 0
+    avg_rating = row[4] or 0
+    signed_book_count = row[5] or 0
+    first_ed_book_count = row[6] or 0
+
+    # Author collectibility score (weighted combination of signals)
+    signed_pct = (signed_book_count / book_count) if book_count > 0 else 0
+    first_ed_pct = (first_ed_book_count / book_count) if book_count > 0 else 0
+    # Normalize price to 0-1 scale (assume $100 as high-end)
+    price_normalized = min(avg_sold_price / 100.0, 1.0)
+
+    collectibility_score = (
+        signed_pct * 0.3 +
+        first_ed_pct * 0.3 +
+        price_normalized * 0.4
+    )
+
+    # Author popularity score (log-scaled ratings * sales velocity)
+    popularity_score = math.log1p(avg_ratings_count) * avg_sales_velocity
+
+    return {
+        'author_book_count': book_count,
+        'log_author_catalog_size': math.log1p(book_count),
+        'author_avg_sold_price': avg_sold_price,
+        'log_author_avg_price': math.log1p(avg_sold_price),
+        'author_avg_sales_velocity': avg_sales_velocity,
+        'author_collectibility_score': collectibility_score,
+        'author_popularity_score': popularity_score,
+        'author_avg_rating': avg_rating,
+    }
+
+
+def _aggregate(
+    conn: sqlite3.Connection,
+    query: str,
+    build: Callable,
+    keys: Optional[Iterable[str]],
+    column: str,
+    where_prefix: str,
+) -> Dict[str, Dict]:
+    if keys is None:
+        rows = conn.execute(query.format(where=""))
+    else:
+        where = f"{where_prefix} {column} IN (SELECT value FROM json_each(?))"
+        rows = conn.execute(query.format(where=where), (json.dumps(list(keys)),))
+    features = {}
+    for row in rows:
+        built = build(tuple(row)[1:])
+        if built is not None:
+            features[row[0]] = built
+    return features
+
+
+def load_bookfinder_features(conn: sqlite3.Connection, isbns: Optional[Iterable[str]] = None) -> Dict[str, Dict]:
+    """BookFinder features by ISBN, for ``isbns`` or every ISBN with offers."""
+    return _aggregate(conn, _BOOKFINDER_QUERY, _bookfinder_features, isbns, "isbn", "WHERE")
+
+
+def load_sold_listings_features(conn: sqlite3.Connection, isbns: Optional[Iterable[str]] = None) -> Dict[str, Dict]:
+    """Sold listings features by ISBN, for ``isbns`` or every ISBN with listings."""
+    return _aggregate(conn, _SOLD_LISTINGS_QUERY, _sold_listings_features, isbns, "isbn", "AND")
+
+
+def load_author_aggregates(conn: sqlite3.Connection, authors: Optional[Iterable[str]] = None) -> Dict[str, Dict]:
+    """Author aggregate features by canonical author, for ``authors`` or all of them."""
+    return _aggregate(conn, _AUTHOR_QUERY, _author_aggregates, authors, "canonical_author", "AND")
+
+
+def query_features(db_path: Union[str, Path], loader: Callable, key: str) -> Optional[Dict]:
+    """Uncached lookup of one key, used when no store can be kept for the database."""
+    try:
+        conn = sqlite3.connect(db_path)
+        try:
+            return loader(conn, [key]).get(key)
+        finally:
+            conn.close()
+    except Exception:
+        # Database may not have the source table or columns yet
+        return None
+
+
+class FeatureStore:
+    """Preloaded BookFinder, sold listings and author features for one catalog."""
+
+    def __init__(self, db_path: Union[str, Path], refresh_interval: float = REFRESH_INTERVAL_SECONDS):
+        self.db_path = Path(db_path)
+        self.refresh_interval = refresh_interval
+        self._pool = get_pool(self.db_path)
+        self._lock = threading.RLock()
+        self._bookfinder: Dict[str, Dict] = {}
+        self._sold_listings: Dict[str, Dict] = {}
+        self._authors: Dict[str, Dict] = {}
+        self._book_authors: Dict[str, Optional[str]] = {}
+        self._loaded: Set[str] = set()
+        self._cursor = 0
+        self._checked_at = 0.0
+
+        with self._pool.write() as conn:
+            conn.executescript(FEATURE_CHANGES_SCHEMA)
+        self.refresh()
+
+    # ------------------------------------------------------------------
+    # Lookups
+
+    def bookfinder_features(self, isbn: str) -> Optional[Dict]:
+        self._maybe_refresh()
+        features = self._bookfinder.get(isbn)
+        return dict(features) if features is not None else None
+
+    def sold_listings_features(self, isbn: str) -> Optional[Dict]:
+        self._maybe_refresh()
+        features = self._sold_listings.get(isbn)
+        return dict(features) if features is not None else None
+
+    def author_aggregates(self, canonical_author: str) -> Optional[Dict]:
+        self._maybe_refresh()
+        features = self._authors.get(canonical_author)
+        return dict(features) if features is not None else None
+
+    # ------------------------------------------------------------------
+    # Refreshing
+
+    def _maybe_refresh(self) -> None:
+        if time.monotonic() - self._checked_at < self.refresh_interval:
+            return
+        try:
+            self.refresh()
+        except sqlite3.Error as exc:
+            logger.warning(f"Feature store refresh failed for {self.db_path}: {exc}")
+
+    def refresh(self) -> None:
+        """
+        Bring the store up to date with the database.
+
+        Source tables not loaded yet (first refresh, or created since) get
+        their change triggers and are loaded in full; the rest only
+        re-aggregate the ISBNs logged in feature_changes since the cursor.
+        """
+        with self._lock:
+            self._checked_at = time.monotonic()
+            with self._pool.read() as conn:
+                names = {
+                    row[0]
+                    for row in conn.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")
+                }
+            untriggered = [
+                table for table in SOURCES
+                if table in names and f"{table}_feature_changes_ai" not in names
+            ]
+            if untriggered:
+                with self._pool.write() as conn:
+                    for table in untriggered:
+                        conn.executescript(_CHANGE_TRIGGERS.format(table=table))
+            unloaded = [table for table in SOURCES if table in names and table not in self._loaded]
+
+            with self._pool.read() as conn:
+                # Triggers are in place before anything is read, so a change
+                # made while loading is logged and replayed by the next refresh
+                if not self._loaded:
+                    self._cursor = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM feature_changes").fetchone()[0]
+                    changes = []
+                else:
+                    changes = conn.execute(
+                        "SELECT seq, source, isbn FROM feature_changes WHERE seq > ? ORDER BY seq",
+                        (self._cursor,),
+                    ).fetchall()
+                changed: Dict[str, Set[str]] = {}
+                for seq, source, isbn in changes:
+                    changed.setdefault(source, set()).add(isbn)
+                    self._cursor = seq
+
+                for table in unloaded:
+                    self._load_source(conn, table, None)
+                    self._loaded.add(table)
+                for table, isbns in changed.items():
+                    if table in self._loaded and table not in unloaded:
+                        self._load_source(conn, table, isbns)
+
+    def _load_source(self, conn: sqlite3.Connection, table: str, isbns: Optional[Set[str]]) -> None:
+        try:
+            if table == "bookfinder_offers":
+                self._merge(self._bookfinder, load_bookfinder_features(conn, isbns), isbns)
+            elif table == "sold_listings":
+                self._merge(self._sold_listings, load_sold_listings_features(conn, isbns), isbns)
+            elif table == "books":
+                self._load_authors(conn, isbns)
+        except sqlite3.Error as exc:
+            # Missing columns in an older catalog: the features are unavailable
+            logger.debug(f"Feature store could not load {table}: {exc}")
+
+    def _load_authors(self, conn: sqlite3.Connection, isbns: Optional[Set[str]]) -> None:
+        query = "SELECT isbn, canonical_author FROM books"
+        if isbns is None:
+            book_authors = dict(conn.execute(query).fetchall())
+            self._book_authors = book_authors
+            self._authors = load_author_aggregates(conn)
+            return
+
+        current = dict(conn.execute(
+            query + " WHERE isbn IN (SELECT value FROM json_each(?))", (json.dumps(list(isbns)),)
+        ).fetchall())
+        authors = {self._book_authors.get(isbn) for isbn in isbns} | set(current.values())
+        authors.discard(None)
+        for isbn in isbns:
+            if isbn in current:
+                self._book_authors[isbn] = current[isbn]
+            else:
+                self._book_authors.pop(isbn, None)
+        self._merge(self._authors, load_author_aggregates(conn, authors), authors)
+
+    @staticmethod
+    def _merge(target: Dict[str, Dict], loaded: Dict[str, Dict], keys: Optional[Iterable[str]]) -> None:
+        if keys is None:
+            target.clear()
+            target.update(loaded)
+            return
+        for key in keys:
+            if key in loaded:
+                target[key] = loaded[key]
+            else:
+                target.pop(key, None)
+
+
+# Stores already built in this process, by database path (None: unavailable)
+_stores: Dict[str, Optional[FeatureStore]] = {}
+_stores_lock = threading.Lock()
+
+
+def get_feature_store(db_path: Union[str, Path]) -> Optional[FeatureStore]:
+    """
+    Get the process-wide feature store for a catalog database.
+
+    Returns None when the database is missing or cannot take the change
+    log (e.g. it is read-only); callers then query it directly.
+    """
+    path = Path(db_path)
+    if not path.exists():
+        return None
+    key = str(path.resolve())
+    with _stores_lock:
+        if key not in _stores:
+            try:
+                _stores[key] = FeatureStore(path)
+            except sqlite3.Error as exc:
+                logger.warning(f"Feature store unavailable for {path}, querying directly: {exc}")
+                _stores[key] = None
+        return _stores[key]
@@ -0,0 +1,163 @@
+"""
+Process-wide registry of trained model files, loaded lazily and hot-swapped.
+
+PredictionRouter, MLPriceEstimator and EditionPremiumEstimator used to
+``joblib.load`` every model and scaler in their constructors, so creating
+one paid for xgboost/sklearn and every pickle up front, and the router and
+estimator each held their own copy of price_v1.pkl. The registry instead:
+
+- loads a file on first use and hands the same object to every caller in
+  the process
+- loads each file fully into memory. Files are not memory-mapped, because
+  the trainers and ModelVersioner.restore_backup rewrite model files in
+  place, and touching a mapped array of a truncated file raises SIGBUS
+- re-stats the files it has loaded at most every ``check_interval`` seconds
+  and reloads the ones that changed, so a retrain (which backs up the old
+  files through ModelVersioner before writing new ones) or a
+  ModelVersioner.restore_backup is picked up without a restart. A file
+  that fails to reload, e.g. while it is being written, keeps serving the
+  previous version and is retried on the next check.
+
+Usage:
+    registry = get_model_registry()
+    model = registry.get("stacking/ebay_model.pkl")
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_DIR = Path(os.environ.get("ML_MODEL_DIR") or Path(__file__).parent.parent / "models")
+CHECK_INTERVAL_SECONDS = 10.0
+
+
+class _Entry(NamedTuple):
+    value: Any
+    signature: Optional[Tuple[int, int, int]]
+    error: Optional[Exception]
+
+
+def _signature(path: Path) -> Optional[Tuple[int, int, int]]:
+    """What a reload has to change: (mtime_ns, size, inode), or None if missing."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+def _load_file(path: Path) -> Any:
+    import joblib
+
+    return joblib.load(path)
+
+
+class ModelRegistry:
+    """Lazily loaded, shared model files under one model directory."""
+
+    def __init__(self, model_dir: Union[str, Path], check_interval: float = CHECK_INTERVAL_SECONDS):
+        self.model_dir = Path(model_dir)
+        self.check_interval = check_interval
+        # Bumped whenever a loaded file is replaced by a new version
+        self.generation = 0
+        self._lock = threading.RLock()
+        self._entries: Dict[str, _Entry] = {}
+        self._checked_at = time.monotonic()
+
+    def path(self, name: str) -> Path:
+        return self.model_dir / name
+
+    def exists(self, name: str) -> bool:
+        return self.path(name).exists()
+
+    def get(self, name: str) -> Any:
+        """
+        The loaded object for ``name`` (relative to the model directory).
+
+        Raises the load error if the file is missing or unreadable; the
+        failure is remembered until the file changes.
+        """
+        if time.monotonic() - self._checked_at >= self.check_interval:
+            self.check()
+        entry = self._entries.get(name)
+        if entry is None:
+            with self._lock:
+                entry = self._entries.get(name)
+                if entry is None:
+                    entry = self._entries[name] = self._load(name, None)
+        if entry.error is not None:
+            raise entry.error
+        return entry.value
+
+    def warm_up(self, names: Iterable[str]) -> List[str]:
+        """Load ``names`` now instead of on first use; returns the ones that loaded."""
+        loaded = []
+        for name in names:
+            try:
+                self.get(name)
+            except Exception:
+                continue
+            loaded.append(name)
+        return loaded
+
+    def check(self) -> bool:
+        """Reload loaded files that changed on disk; True if any was swapped."""
+        with self._lock:
+            self._checked_at = time.monotonic()
+            swapped = False
+            for name, entry in list(self._entries.items()):
+                if _signature(self.path(name)) == entry.signature:
+                    continue
+                reloaded = self._load(name, entry)
+                self._entries[name] = reloaded
+                if reloaded.value is not entry.value:
+                    logger.info(f"Reloaded model file {name}")
+                    swapped = True
+            if swapped:
+                self.generation += 1
+            return swapped
+
+    def _load(self, name: str, previous: Optional[_Entry]) -> _Entry:
+        path = self.path(name)
+        signature = _signature(path)
+        try:
+            if signature is None:
+                raise FileNotFoundError(f"Model file not found: {path}")
+            return _Entry(_load_file(path), signature, None)
+        except Exception as exc:
+            if previous is not None and previous.error is None:
+                # Keep serving the old version; the unchanged signature makes
+                # the next check try again
+                logger.warning(f"Could not reload {path}, keeping the loaded version: {exc}")
+                return previous
+            if signature is not None:
+                logger.warning(f"Could not load {path}: {exc}")
+            return _Entry(None, signature, exc)
+
+
+# Registries by resolved model directory
+_registries: Dict[str, ModelRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_model_registry(model_dir: Optional[Union[str, Path]] = None) -> ModelRegistry:
+    """
+    Get the process-wide registry for a model directory.
+
+    Args:
+        model_dir: Model directory (default: ``ML_MODEL_DIR`` or isbn_lot_optimizer/models)
+    """
+    model_dir = Path(model_dir) if model_dir is not None else DEFAULT_MODEL_DIR
+    key = str(model_dir.expanduser().resolve())
+    with _registries_lock:
+        registry = _registries.get(key)
+        if registry is None:
+            registry = _registries[key] = ModelRegistry(model_dir.expanduser())
+        return registry
@@ -62,6 +62,7 @@ class ModelVersioner:
                     "zvab_model.pkl", "zvab_scaler.pkl", "zvab_metadata.json",
                     "lot_model.pkl", "lot_scaler.pkl", "lot_metadata.json",
                     "meta_model.pkl", "meta_metadata.json",
+                    "oof_predictions.pkl", "oof_metadata.json",
                 ]
             ])
 
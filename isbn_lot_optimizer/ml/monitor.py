@@ -6,7 +6,6 @@ Provides real-time monitoring, drift detection, and performance tracking
 for production ML models.
 """
 
-import sqlite3
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass, asdict
@@ -15,6 +14,8 @@ import numpy as np
 from collections import defaultdict
 import json
 
+from shared.db_pool import get_pool
+
 
 @dataclass
 class PredictionLog:
@@ -85,6 +86,7 @@ class ModelMonitor:
 
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._pool = get_pool(self.db_path)
 
         self._init_database()
 
@@ -105,81 +107,78 @@ class ModelMonitor:
 
     def _init_database(self):
         """Initialize monitoring database schema."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Prediction logs table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS prediction_logs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TEXT NOT NULL,
-                model_name TEXT NOT NULL,
-                platform TEXT NOT NULL,
-                prediction REAL NOT NULL,
-                confidence_std REAL,
-                true_value REAL,
-                error REAL,
-                features TEXT NOT NULL,
-                latency_ms REAL NOT NULL
-            )
-        """)
-
-        # Aggregated metrics table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS metrics (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                window_start TEXT NOT NULL,
-                window_end TEXT NOT NULL,
-                model_name TEXT NOT NULL,
-                n_predictions INTEGER NOT NULL,
-                mean_prediction REAL NOT NULL,
-                std_prediction REAL NOT NULL,
-                mean_confidence_std REAL,
-                n_with_ground_truth INTEGER NOT NULL,
-                mae REAL,
-                rmse REAL,
-                mean_latency_ms REAL NOT NULL,
-                p95_latency_ms REAL NOT NULL
-            )
-        """)
-
-        # Drift alerts table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS drift_alerts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TEXT NOT NULL,
-                model_name TEXT NOT NULL,
-                drift_type TEXT NOT NULL,
-                severity TEXT NOT NULL,
-                metric TEXT NOT NULL,
-                baseline_value REAL NOT NULL,
-                current_value REAL NOT NULL,
-                deviation_pct REAL NOT NULL,
-                message TEXT NOT NULL
-            )
-        """)
-
-        # Baseline statistics table (for drift detection)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS baselines (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                model_name TEXT NOT NULL,
-                feature_name TEXT,
-                statistic_name TEXT NOT NULL,
-                statistic_value REAL NOT NULL,
-                created_at TEXT NOT NULL,
-                UNIQUE(model_name, feature_name, statistic_name)
-            )
-        """)
-
-        # Create indices
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_timestamp ON prediction_logs(timestamp)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_model ON prediction_logs(model_name)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_metrics_window ON metrics(window_start, window_end)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_alerts_timestamp ON drift_alerts(timestamp)")
-
-        conn.commit()
-        conn.close()
+        with self._pool.write() as conn:
+            cursor = conn.cursor()
+
+            # Prediction logs table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS prediction_logs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TEXT NOT NULL,
+                    model_name TEXT NOT NULL,
+                    platform TEXT NOT NULL,
+                    prediction REAL NOT NULL,
+                    confidence_std REAL,
+                    true_value REAL,
+                    error REAL,
+                    features TEXT NOT NULL,
+                    latency_ms REAL NOT NULL
+                )
+            """)
+
+            # Aggregated metrics table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS metrics (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    window_start TEXT NOT NULL,
+                    window_end TEXT NOT NULL,
+                    model_name TEXT NOT NULL,
+                    n_predictions INTEGER NOT NULL,
+                    mean_prediction REAL NOT NULL,
+                    std_prediction REAL NOT NULL,
+                    mean_confidence_std REAL,
+                    n_with_ground_truth INTEGER NOT NULL,
+                    mae REAL,
+                    rmse REAL,
+                    mean_latency_ms REAL NOT NULL,
+                    p95_latency_ms REAL NOT NULL
+                )
+            """)
+
+            # Drift alerts table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS drift_alerts (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TEXT NOT NULL,
+                    model_name TEXT NOT NULL,
+                    drift_type TEXT NOT NULL,
+                    severity TEXT NOT NULL,
+                    metric TEXT NOT NULL,
+                    baseline_value REAL NOT NULL,
+                    current_value REAL NOT NULL,
+                    deviation_pct REAL NOT NULL,
+                    message TEXT NOT NULL
+                )
+            """)
+
+            # Baseline statistics table (for drift detection)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS baselines (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    model_name TEXT NOT NULL,
+                    feature_name TEXT,
+                    statistic_name TEXT NOT NULL,
+                    statistic_value REAL NOT NULL,
+                    created_at TEXT NOT NULL,
+                    UNIQUE(model_name, feature_name, statistic_name)
+                )
+            """)
+
+            # Create indices
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_timestamp ON prediction_logs(timestamp)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_model ON prediction_logs(model_name)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_metrics_window ON metrics(window_start, window_end)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_alerts_timestamp ON drift_alerts(timestamp)")
 
     def log_prediction(
         self,
@@ -219,20 +218,18 @@ class ModelMonitor:
         error = float(error) if error is not None else None
         latency_ms = float(latency_ms) if latency_ms is not None else None
 
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._pool.write() as conn:
+            cursor = conn.cursor()
 
-        cursor.execute("""
-            INSERT INTO prediction_logs
-            (timestamp, model_name, platform, prediction, confidence_std,
-             true_value, error, features, latency_ms)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (timestamp, model_name, platform, prediction, confidence_std,
-              true_value, error, features_json, latency_ms))
+            cursor.execute("""
+                INSERT INTO prediction_logs
+                (timestamp, model_name, platform, prediction, confidence_std,
+                 true_value, error, features, latency_ms)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (timestamp, model_name, platform, prediction, confidence_std,
+                  true_value, error, features_json, latency_ms))
 
-        log_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+            log_id = cursor.lastrowid
 
         return log_id
 
@@ -244,26 +241,22 @@ class ModelMonitor:
             log_id: Prediction log ID
             true_value: Ground truth value
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Get prediction
-        cursor.execute("SELECT prediction FROM prediction_logs WHERE id = ?", (log_id,))
-        result = cursor.fetchone()
-
-        if result:
-            prediction = result[0]
-            error = prediction - true_value
+        with self._pool.write() as conn:
+            cursor = conn.cursor()
 
-            cursor.execute("""
-                UPDATE prediction_logs
-                SET true_value = ?, error = ?
-                WHERE id = ?
-            """, (true_value, error, log_id))
+            # Get prediction
+            cursor.execute("SELECT prediction FROM prediction_logs WHERE id = ?", (log_id,))
+            result = cursor.fetchone()
 
-            conn.commit()
+            if result:
+                prediction = result[0]
+                error = prediction - true_value
 
-        conn.close()
+                cursor.execute("""
+                    UPDATE prediction_logs
+                    SET true_value = ?, error = ?
+                    WHERE id = ?
+                """, (true_value, error, log_id))
 
     def compute_metrics(
         self,
@@ -283,25 +276,24 @@ class ModelMonitor:
         window_end = datetime.now()
         window_start = window_end - timedelta(hours=hours)
 
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._pool.read() as conn:
+            cursor = conn.cursor()
 
-        # Build query
-        query = """
-            SELECT
-                prediction, confidence_std, true_value, error, latency_ms
-            FROM prediction_logs
-            WHERE timestamp >= ?
-        """
-        params = [window_start.isoformat()]
+            # Build query
+            query = """
+                SELECT
+                    prediction, confidence_std, true_value, error, latency_ms
+                FROM prediction_logs
+                WHERE timestamp >= ?
+            """
+            params = [window_start.isoformat()]
 
-        if model_name:
-            query += " AND model_name = ?"
-            params.append(model_name)
+            if model_name:
+                query += " AND model_name = ?"
+                params.append(model_name)
 
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        conn.close()
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
 
         if not rows:
             return None
@@ -344,66 +336,62 @@ class ModelMonitor:
         """
         window_start = datetime.now() - timedelta(hours=hours)
 
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Get predictions and features
-        cursor.execute("""
-            SELECT prediction, features
-            FROM prediction_logs
-            WHERE model_name = ? AND timestamp >= ?
-        """, (model_name, window_start.isoformat()))
-
-        rows = cursor.fetchall()
-
-        if not rows:
-            conn.close()
-            return
-
-        # Compute prediction distribution baseline
-        predictions = np.array([row[0] for row in rows])
-        timestamp = datetime.now().isoformat()
-
-        baselines = [
-            (model_name, None, "prediction_mean", float(np.mean(predictions)), timestamp),
-            (model_name, None, "prediction_std", float(np.std(predictions)), timestamp),
-            (model_name, None, "prediction_p25", float(np.percentile(predictions, 25)), timestamp),
-            (model_name, None, "prediction_p50", float(np.percentile(predictions, 50)), timestamp),
-            (model_name, None, "prediction_p75", float(np.percentile(predictions, 75)), timestamp),
-        ]
-
-        # Compute feature distribution baselines
-        feature_stats = defaultdict(list)
-        for row in rows:
-            features = json.loads(row[1])
-            for feature_name, value in features.items():
-                # Only compute stats for numeric values (not booleans)
-                if isinstance(value, (int, float)) and not isinstance(value, bool):
-                    feature_stats[feature_name].append(value)
+        with self._pool.write() as conn:
+            cursor = conn.cursor()
 
-        for feature_name, values in feature_stats.items():
-            if len(values) == 0:
-                continue  # Skip if no numeric values
-
-            values = np.array(values, dtype=np.float64)  # Ensure float64 type
-            baselines.extend([
-                (model_name, feature_name, "mean", float(np.mean(values)), timestamp),
-                (model_name, feature_name, "std", float(np.std(values)), timestamp),
-                (model_name, feature_name, "p25", float(np.percentile(values, 25)), timestamp),
-                (model_name, feature_name, "p50", float(np.percentile(values, 50)), timestamp),
-                (model_name, feature_name, "p75", float(np.percentile(values, 75)), timestamp),
-            ])
-
-        # Save baselines (replace existing)
-        cursor.execute("DELETE FROM baselines WHERE model_name = ?", (model_name,))
-        cursor.executemany("""
-            INSERT INTO baselines
-            (model_name, feature_name, statistic_name, statistic_value, created_at)
-            VALUES (?, ?, ?, ?, ?)
-        """, baselines)
-
-        conn.commit()
-        conn.close()
+            # Get predictions and features
+            cursor.execute("""
+                SELECT prediction, features
+                FROM prediction_logs
+                WHERE model_name = ? AND timestamp >= ?
+            """, (model_name, window_start.isoformat()))
+
+            rows = cursor.fetchall()
+
+            if not rows:
+                return
+
+            # Compute prediction distribution baseline
+            predictions = np.array([row[0] for row in rows])
+            timestamp = datetime.now().isoformat()
+
+            baselines = [
+                (model_name, None, "prediction_mean", float(np.mean(predictions)), timestamp),
+                (model_name, None, "prediction_std", float(np.std(predictions)), timestamp),
+                (model_name, None, "prediction_p25", float(np.percentile(predictions, 25)), timestamp),
+                (model_name, None, "prediction_p50", float(np.percentile(predictions, 50)), timestamp),
+                (model_name, None, "prediction_p75", float(np.percentile(predictions, 75)), timestamp),
+            ]
+
+            # Compute feature distribution baselines
+            feature_stats = defaultdict(list)
+            for row in rows:
+                features = json.loads(row[1])
+                for feature_name, value in features.items():
+                    # Only compute stats for numeric values (not booleans)
+                    if isinstance(value, (int, float)) and not isinstance(value, bool):
+                        feature_stats[feature_name].append(value)
+
+            for feature_name, values in feature_stats.items():
+                if len(values) == 0:
+                    continue  # Skip if no numeric values
+
+                values = np.array(values, dtype=np.float64)  # Ensure float64 type
+                baselines.extend([
+                    (model_name, feature_name, "mean", float(np.mean(values)), timestamp),
+                    (model_name, feature_name, "std", float(np.std(values)), timestamp),
+                    (model_name, feature_name, "p25", float(np.percentile(values, 25)), timestamp),
+                    (model_name, feature_name, "p50", float(np.percentile(values, 50)), timestamp),
+                    (model_name, feature_name, "p75", float(np.percentile(values, 75)), timestamp),
+                ])
+
+            # Save baselines (replace existing)
+            cursor.execute("DELETE FROM baselines WHERE model_name = ?", (model_name,))
+            cursor.executemany("""
+                INSERT INTO baselines
+                (model_name, feature_name, statistic_name, statistic_value, created_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, baselines)
 
     def detect_drift(
         self,
@@ -424,34 +412,32 @@ class ModelMonitor:
         """
         window_start = datetime.now() - timedelta(hours=hours)
 
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._pool.read() as conn:
+            cursor = conn.cursor()
 
-        # Get baseline statistics
-        cursor.execute("""
-            SELECT feature_name, statistic_name, statistic_value
-            FROM baselines
-            WHERE model_name = ?
-        """, (model_name,))
+            # Get baseline statistics
+            cursor.execute("""
+                SELECT feature_name, statistic_name, statistic_value
+                FROM baselines
+                WHERE model_name = ?
+            """, (model_name,))
 
-        baselines = {}
-        for row in cursor.fetchall():
-            key = (row[0], row[1])  # (feature_name, statistic_name)
-            baselines[key] = row[2]
+            baselines = {}
+            for row in cursor.fetchall():
+                key = (row[0], row[1])  # (feature_name, statistic_name)
+                baselines[key] = row[2]
 
-        if not baselines:
-            conn.close()
-            return []
+            if not baselines:
+                return []
 
-        # Get recent predictions and features
-        cursor.execute("""
-            SELECT prediction, true_value, error, features
-            FROM prediction_logs
-            WHERE model_name = ? AND timestamp >= ?
-        """, (model_name, window_start.isoformat()))
+            # Get recent predictions and features
+            cursor.execute("""
+                SELECT prediction, true_value, error, features
+                FROM prediction_logs
+                WHERE model_name = ? AND timestamp >= ?
+            """, (model_name, window_start.isoformat()))
 
-        rows = cursor.fetchall()
-        conn.close()
+            rows = cursor.fetchall()
 
         if not rows:
             return []
@@ -555,21 +541,18 @@ class ModelMonitor:
 
         # Save alerts to database
         if alerts:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
-            for alert in alerts:
-                cursor.execute("""
-                    INSERT INTO drift_alerts
-                    (timestamp, model_name, drift_type, severity, metric,
-                     baseline_value, current_value, deviation_pct, message)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (alert.timestamp, alert.model_name, alert.drift_type,
-                      alert.severity, alert.metric, alert.baseline_value,
-                      alert.current_value, alert.deviation_pct, alert.message))
-
-            conn.commit()
-            conn.close()
+            with self._pool.write() as conn:
+                cursor = conn.cursor()
+
+                for alert in alerts:
+                    cursor.execute("""
+                        INSERT INTO drift_alerts
+                        (timestamp, model_name, drift_type, severity, metric,
+                         baseline_value, current_value, deviation_pct, message)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """, (alert.timestamp, alert.model_name, alert.drift_type,
+                          alert.severity, alert.metric, alert.baseline_value,
+                          alert.current_value, alert.deviation_pct, alert.message))
 
         return alerts
 
@@ -592,25 +575,24 @@ class ModelMonitor:
         """
         window_start = datetime.now() - timedelta(hours=hours)
 
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._pool.read() as conn:
+            cursor = conn.cursor()
 
-        query = "SELECT * FROM drift_alerts WHERE timestamp >= ?"
-        params = [window_start.isoformat()]
+            query = "SELECT * FROM drift_alerts WHERE timestamp >= ?"
+            params = [window_start.isoformat()]
 
-        if severity:
-            query += " AND severity = ?"
-            params.append(severity)
+            if severity:
+                query += " AND severity = ?"
+                params.append(severity)
 
-        if model_name:
-            query += " AND model_name = ?"
-            params.append(model_name)
+            if model_name:
+                query += " AND model_name = ?"
+                params.append(model_name)
 
-        query += " ORDER BY timestamp DESC"
+            query += " ORDER BY timestamp DESC"
 
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        conn.close()
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
 
         alerts = []
         for row in rows:
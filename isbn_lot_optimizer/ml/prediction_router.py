@@ -8,17 +8,81 @@ falling back to unified model when necessary.
 import json
 import logging
 from pathlib import Path
-from typing import Optional, Dict, Tuple
-import joblib
+from typing import Optional, Dict, List, Sequence, Tuple
 import numpy as np
 import time
 
 from isbn_lot_optimizer.ml.feature_extractor import PlatformFeatureExtractor
+from isbn_lot_optimizer.ml.model_registry import get_model_registry
 from shared.models import BookMetadata, EbayMarketStats, BookScouterResult
 from shared.collectible_detection import detect_collectible, CollectibleInfo
 
 logger = logging.getLogger(__name__)
 
+# Model and scaler files, relative to the model directory
+UNIFIED_FILES = ('price_v1.pkl', 'scaler_v1.pkl')
+SPECIALIST_FILES = {
+    'abebooks': ('stacking/abebooks_model.pkl', 'stacking/abebooks_scaler.pkl'),
+    'ebay': ('stacking/ebay_model.pkl', 'stacking/ebay_scaler.pkl'),
+}
+
+# Routing order: each book goes to the first model whose data requirements it meets
+ROUTE_ORDER = ('abebooks_specialist', 'ebay_specialist', 'unified')
+
+# Routing statistics counter for each model
+ROUTE_STAT_KEYS = {
+    'abebooks_specialist': 'abebooks_routed',
+    'ebay_specialist': 'ebay_routed',
+    'unified': 'unified_fallback',
+}
+
+# Per-model metadata reported in routing_info
+MODEL_INFO = {
+    'abebooks_specialist': {
+        'model_display_name': 'AbeBooks Specialist',
+        'model_mae': 0.06,
+        'model_r2': 0.999,
+        'features': 28,
+        'confidence': 'high',
+        'confidence_score': 0.95,  # Numerical confidence (0-1)
+        'routing_reason': 'High-quality AbeBooks pricing data available',
+        'coverage': '98.4% of catalog',
+    },
+    'ebay_specialist': {
+        'model_display_name': 'eBay Specialist',
+        'model_mae': 3.03,
+        'model_r2': 0.469,
+        'features': 20,
+        'confidence': 'high',
+        'confidence_score': 0.85,  # Numerical confidence (0-1)
+        'routing_reason': 'eBay market data available (active listings or sold comps)',
+        'coverage': '72% of catalog',
+    },
+    'unified': {
+        'model_display_name': 'Unified Model',
+        'model_mae': 3.36,
+        'model_r2': 0.015,
+        'features': 91,
+        'confidence': 'medium',
+        'confidence_score': 0.70,  # Numerical confidence (0-1)
+        'routing_reason': 'No platform-specific data available, using general model',
+        'coverage': '100% of catalog (fallback)',
+    },
+}
+
+# Keyword arguments of PredictionRouter.predict and their defaults
+PREDICT_DEFAULTS = {
+    'metadata': None,
+    'market': None,
+    'bookscouter': None,
+    'condition': 'Good',
+    'abebooks': None,
+    'bookfinder': None,
+    'sold_listings': None,
+    'signed': False,
+    'first_edition': False,
+}
+
 
 class PredictionRouter:
     """
@@ -34,44 +98,24 @@ class PredictionRouter:
 
     def __init__(self, model_dir: Optional[Path] = None, monitor=None):
         """
-        Initialize prediction router with models.
+        Initialize prediction router.
+
+        Models are not loaded here: they come from the shared ModelRegistry
+        on first use (see ``warm_up``) and are hot-swapped when retrained.
 
         Args:
-            model_dir: Directory containing model files (default: ~/ISBN/isbn_lot_optimizer/models)
+            model_dir: Directory containing model files (default: isbn_lot_optimizer/models,
+                       or ML_MODEL_DIR)
             monitor: Optional ModelMonitor instance for prediction tracking
         """
-        if model_dir is None:
-            model_dir = Path.home() / "ISBN" / "isbn_lot_optimizer" / "models"
-
-        self.model_dir = Path(model_dir)
+        self.registry = get_model_registry(model_dir)
+        self.model_dir = self.registry.model_dir
         self.extractor = PlatformFeatureExtractor()
         self.monitor = monitor
 
-        # Load unified model (fallback)
-        self.unified_model = joblib.load(self.model_dir / "price_v1.pkl")
-        self.unified_scaler = joblib.load(self.model_dir / "scaler_v1.pkl")
-
-        # Load AbeBooks specialist
-        try:
-            abebooks_dir = self.model_dir / "stacking"
-            self.abebooks_model = joblib.load(abebooks_dir / "abebooks_model.pkl")
-            self.abebooks_scaler = joblib.load(abebooks_dir / "abebooks_scaler.pkl")
-            self.has_abebooks_specialist = True
-            logger.info("AbeBooks specialist model loaded successfully")
-        except Exception as e:
-            logger.warning(f"Could not load AbeBooks specialist: {e}")
-            self.has_abebooks_specialist = False
-
-        # Load eBay specialist
-        try:
-            ebay_dir = self.model_dir / "stacking"
-            self.ebay_model = joblib.load(ebay_dir / "ebay_model.pkl")
-            self.ebay_scaler = joblib.load(ebay_dir / "ebay_scaler.pkl")
-            self.has_ebay_specialist = True
-            logger.info("eBay specialist model loaded successfully")
-        except Exception as e:
-            logger.warning(f"Could not load eBay specialist: {e}")
-            self.has_ebay_specialist = False
+        # The unified model is the fallback for every route, so it must exist
+        if not self.registry.exists(UNIFIED_FILES[0]):
+            raise FileNotFoundError(f"Unified model not found: {self.registry.path(UNIFIED_FILES[0])}")
 
         # Load eBay condition/format multipliers
         try:
@@ -101,6 +145,55 @@ class PredictionRouter:
             'unified_fallback': 0,
         }
 
+    # Models, loaded lazily from the registry
+
+    @property
+    def unified_model(self):
+        return self.registry.get(UNIFIED_FILES[0])
+
+    @property
+    def unified_scaler(self):
+        return self.registry.get(UNIFIED_FILES[1])
+
+    @property
+    def abebooks_model(self):
+        return self.registry.get(SPECIALIST_FILES['abebooks'][0])
+
+    @property
+    def abebooks_scaler(self):
+        return self.registry.get(SPECIALIST_FILES['abebooks'][1])
+
+    @property
+    def ebay_model(self):
+        return self.registry.get(SPECIALIST_FILES['ebay'][0])
+
+    @property
+    def ebay_scaler(self):
+        return self.registry.get(SPECIALIST_FILES['ebay'][1])
+
+    @property
+    def has_abebooks_specialist(self) -> bool:
+        return self._has_specialist('abebooks')
+
+    @property
+    def has_ebay_specialist(self) -> bool:
+        return self._has_specialist('ebay')
+
+    def _has_specialist(self, platform: str) -> bool:
+        try:
+            for name in SPECIALIST_FILES[platform]:
+                self.registry.get(name)
+        except Exception:
+            return False
+        return True
+
+    def warm_up(self) -> List[str]:
+        """Load every routed model now rather than on the first prediction."""
+        names = list(UNIFIED_FILES)
+        for files in SPECIALIST_FILES.values():
+            names.extend(files)
+        return self.registry.warm_up(names)
+
     def predict(
         self,
         metadata: Optional[BookMetadata],
@@ -156,22 +249,7 @@ class PredictionRouter:
 
                 self.stats['abebooks_routed'] += 1
 
-                routing_info = {
-                    'model': 'abebooks_specialist',
-                    'model_display_name': 'AbeBooks Specialist',
-                    'model_mae': 0.06,
-                    'model_r2': 0.999,
-                    'features': 28,
-                    'confidence': 'high',
-                    'confidence_score': 0.95,  # Numerical confidence (0-1)
-                    'routing_reason': 'High-quality AbeBooks pricing data available',
-                    'coverage': '98.4% of catalog',
-                    'collectible_detected': collectible_info.is_collectible,
-                    'collectible_type': collectible_info.collectible_type,
-                    'collectible_multiplier': collectible_info.fame_multiplier,
-                    'famous_person': collectible_info.famous_person,
-                    'base_price': base_price,
-                }
+                routing_info = self._routing_info('abebooks_specialist', collectible_info, base_price)
 
                 # Log to monitor if available
                 if self.monitor:
@@ -206,22 +284,7 @@ class PredictionRouter:
 
                 self.stats['ebay_routed'] += 1
 
-                routing_info = {
-                    'model': 'ebay_specialist',
-                    'model_display_name': 'eBay Specialist',
-                    'model_mae': 3.03,
-                    'model_r2': 0.469,
-                    'features': 20,
-                    'confidence': 'high',
-                    'confidence_score': 0.85,  # Numerical confidence (0-1)
-                    'routing_reason': 'eBay market data available (active listings or sold comps)',
-                    'coverage': '72% of catalog',
-                    'collectible_detected': collectible_info.is_collectible,
-                    'collectible_type': collectible_info.collectible_type,
-                    'collectible_multiplier': collectible_info.fame_multiplier,
-                    'famous_person': collectible_info.famous_person,
-                    'base_price': base_price,
-                }
+                routing_info = self._routing_info('ebay_specialist', collectible_info, base_price)
 
                 # Log to monitor if available
                 if self.monitor:
@@ -254,22 +317,7 @@ class PredictionRouter:
 
         self.stats['unified_fallback'] += 1
 
-        routing_info = {
-            'model': 'unified',
-            'model_display_name': 'Unified Model',
-            'model_mae': 3.36,
-            'model_r2': 0.015,
-            'features': 91,
-            'confidence': 'medium',
-            'confidence_score': 0.70,  # Numerical confidence (0-1)
-            'routing_reason': 'No platform-specific data available, using general model',
-            'coverage': '100% of catalog (fallback)',
-            'collectible_detected': collectible_info.is_collectible,
-            'collectible_type': collectible_info.collectible_type,
-            'collectible_multiplier': collectible_info.fame_multiplier,
-            'famous_person': collectible_info.famous_person,
-            'base_price': base_price,
-        }
+        routing_info = self._routing_info('unified', collectible_info, base_price)
 
         # Log to monitor if available
         if self.monitor:
@@ -288,6 +336,164 @@ class PredictionRouter:
 
         return price, 'unified', routing_info
 
+    def predict_batch(self, items: Sequence[Dict]) -> List[Tuple[float, str, Dict]]:
+        """
+        Predict prices for many books with one scaler/model call per model.
+
+        Each item is a dict of ``predict`` keyword arguments. Rows are routed
+        with the same rules as ``predict``, stacked into one feature matrix
+        per model, and scored together. If a specialist fails, its rows fall
+        back to the next model, as they would one at a time.
+
+        Args:
+            items: One dict of ``predict`` arguments per book
+
+        Returns:
+            List of (predicted_price, model_used, routing_info), in item order
+        """
+        start_time = time.time()
+        books = [{**PREDICT_DEFAULTS, **item} for item in items]
+        self.stats['total_predictions'] += len(books)
+
+        collectibles = [
+            detect_collectible(
+                metadata=book['metadata'],
+                signed=book['signed'],
+                first_edition=book['first_edition'],
+                abebooks_data=book['abebooks'],
+            )
+            for book in books
+        ]
+
+        results: List[Optional[Tuple[float, str, Dict]]] = [None] * len(books)
+        full_features: Dict[int, np.ndarray] = {}
+        pending = list(range(len(books)))
+        for model_name in ROUTE_ORDER:
+            if model_name == 'abebooks_specialist':
+                rows = [i for i in pending if self._can_use_abebooks(books[i]['abebooks'])]
+            elif model_name == 'ebay_specialist':
+                rows = [i for i in pending if self._can_use_ebay(books[i]['market'])]
+            else:
+                rows = pending
+            if not rows:
+                continue
+
+            try:
+                rows, base_prices = self._predict_rows(model_name, rows, books, full_features)
+            except Exception as e:
+                if model_name == 'unified':
+                    raise
+                logger.warning(f"{MODEL_INFO[model_name]['model_display_name']} failed for batch, falling back: {e}")
+                continue
+
+            for i, base_price in zip(rows, base_prices):
+                book = books[i]
+                collectible_info = collectibles[i]
+                price = base_price * collectible_info.fame_multiplier
+                results[i] = (price, model_name, self._routing_info(model_name, collectible_info, base_price))
+                if self.monitor:
+                    self._log_prediction(
+                        model_name=model_name,
+                        price=price,
+                        metadata=book['metadata'],
+                        market=book['market'],
+                        bookscouter=book['bookscouter'],
+                        condition=book['condition'],
+                        abebooks=book['abebooks'],
+                        bookfinder=book['bookfinder'],
+                        sold_listings=book['sold_listings'],
+                        start_time=start_time,
+                    )
+            self.stats[ROUTE_STAT_KEYS[model_name]] += len(rows)
+            done = set(rows)
+            pending = [i for i in pending if i not in done]
+
+        return results
+
+    def _predict_rows(
+        self,
+        model_name: str,
+        rows: List[int],
+        books: List[Dict],
+        full_features: Dict[int, np.ndarray],
+    ) -> Tuple[List[int], List[float]]:
+        """
+        Score ``rows`` of a batch with one model.
+
+        Full feature vectors (at the book's own condition) are extracted once
+        per book and shared between models through ``full_features``. A book
+        whose features cannot be extracted is left out of the returned rows,
+        so the caller falls it through to the next model.
+        """
+        if model_name == 'abebooks_specialist':
+            scaler, model = self.abebooks_scaler, self.abebooks_model
+            columns = PlatformFeatureExtractor.platform_feature_indices('abebooks')
+        elif model_name == 'ebay_specialist':
+            scaler, model = self.ebay_scaler, self.ebay_model
+            columns = PlatformFeatureExtractor.platform_feature_indices('ebay')
+        else:
+            scaler, model = self.unified_scaler, self.unified_model
+            columns = None
+
+        scored: List[int] = []
+        matrix = []
+        for i in rows:
+            book = books[i]
+            try:
+                if model_name == 'ebay_specialist' and book['condition'] != 'Good':
+                    # Model trained on "Good" baseline
+                    values = self._extract_values(book, 'Good')
+                else:
+                    values = full_features.get(i)
+                    if values is None:
+                        values = full_features[i] = self._extract_values(book, book['condition'])
+            except Exception as e:
+                if model_name == 'unified':
+                    raise
+                logger.warning(f"{MODEL_INFO[model_name]['model_display_name']} failed, falling back: {e}")
+                continue
+            scored.append(i)
+            matrix.append(values if columns is None else values[columns])
+        if not scored:
+            return [], []
+
+        predictions = model.predict(scaler.transform(np.vstack(matrix)))
+
+        if model_name != 'ebay_specialist':
+            return scored, [max(0.01, prediction) for prediction in predictions]
+
+        base_prices = []
+        for i, base_prediction in zip(scored, predictions):
+            condition_mult = self.condition_multipliers.get(books[i]['condition'], 1.0)
+            format_mult = self._format_multiplier(books[i]['metadata'])
+            base_prices.append(max(0.01, base_prediction * condition_mult * format_mult))
+        return scored, base_prices
+
+    def _extract_values(self, book: Dict, condition: str) -> np.ndarray:
+        """Full feature vector for one batch item."""
+        return self.extractor.extract(
+            metadata=book['metadata'],
+            market=book['market'],
+            bookscouter=book['bookscouter'],
+            condition=condition,
+            abebooks=book['abebooks'],
+            bookfinder=book['bookfinder'],
+            sold_listings=book['sold_listings'],
+        ).values
+
+    @staticmethod
+    def _routing_info(model_name: str, collectible_info: CollectibleInfo, base_price: float) -> Dict:
+        """Build the routing_info dict returned with a prediction."""
+        return {
+            'model': model_name,
+            **MODEL_INFO[model_name],
+            'collectible_detected': collectible_info.is_collectible,
+            'collectible_type': collectible_info.collectible_type,
+            'collectible_multiplier': collectible_info.fame_multiplier,
+            'famous_person': collectible_info.famous_person,
+            'base_price': base_price,
+        }
+
     def _can_use_abebooks(self, abebooks: Optional[Dict]) -> bool:
         """
         Check if book has sufficient AbeBooks data for specialist model.
@@ -402,6 +608,15 @@ class PredictionRouter:
         condition_mult = self.condition_multipliers.get(condition, 1.0)
 
         # Apply format multiplier if metadata available
+        format_mult = self._format_multiplier(metadata)
+
+        # Calculate final prediction with multipliers
+        prediction = base_prediction * condition_mult * format_mult
+
+        return max(0.01, prediction)  # Ensure positive price
+
+    def _format_multiplier(self, metadata: Optional[BookMetadata]) -> float:
+        """eBay binding multiplier for the book's cover type (1.0 if unknown)."""
         format_mult = 1.0
         if metadata and hasattr(metadata, 'cover_type') and metadata.cover_type:
             cover_type = metadata.cover_type
@@ -414,11 +629,7 @@ class PredictionRouter:
                 format_mult = self.binding_multipliers.get('Paperback', 1.0)
             elif 'trade' in cover_type.lower():
                 format_mult = self.binding_multipliers.get('Trade Paperback', 1.0)
-
-        # Calculate final prediction with multipliers
-        prediction = base_prediction * condition_mult * format_mult
-
-        return max(0.01, prediction)  # Ensure positive price
+        return format_mult
 
     def _predict_unified(
         self,
@@ -10,17 +10,20 @@ import json
 import os
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
-import joblib
 import numpy as np
 
 from isbn_lot_optimizer.ml.feature_extractor import FeatureExtractor, FeatureVector
+from isbn_lot_optimizer.ml.model_registry import get_model_registry
 from shared.models import BookMetadata, EbayMarketStats, BookScouterResult
 
 # Phase 1: Platform-specific routing feature flag
 USE_ROUTING = os.environ.get("ML_USE_ROUTING", "1") == "1"
 
+MODEL_FILE = "price_v1.pkl"
+SCALER_FILE = "scaler_v1.pkl"
+
 
 @dataclass
 class PriceEstimate:
@@ -58,26 +61,22 @@ class MLPriceEstimator:
 
     def __init__(self, model_dir: Optional[Path] = None, monitor=None):
         """
-        Initialize estimator by loading trained model.
+        Initialize estimator. The model loads from the shared ModelRegistry
+        on first use (see ``warm_up``) and is hot-swapped when retrained.
 
         Args:
             model_dir: Directory containing model files. Defaults to
-                      isbn_lot_optimizer/models/
+                      isbn_lot_optimizer/models/ (or ML_MODEL_DIR)
             monitor: Optional ModelMonitor instance for prediction tracking
         """
-        if model_dir is None:
-            # Default to models/ directory in package
-            package_dir = Path(__file__).parent.parent
-            model_dir = package_dir / "models"
-
-        self.model_dir = Path(model_dir)
+        self.registry = get_model_registry(model_dir)
+        self.model_dir = self.registry.model_dir
         self.feature_extractor = FeatureExtractor()
 
-        # Load model and metadata
-        self.model = None
-        self.scaler = None
+        # Model and scaler load lazily from the shared registry; metadata is small
         self.metadata = {}
         self.feature_importance = {}
+        self._metadata_generation = self.registry.generation
 
         # Initialize prediction router if enabled
         self.router = None
@@ -88,38 +87,56 @@ class MLPriceEstimator:
             except Exception as e:
                 print(f"Warning: Could not initialize prediction router: {e}")
 
-        self._load_model()
+        self._load_metadata()
 
-    def _load_model(self) -> None:
-        """Load trained model, scaler, and metadata from disk."""
-        model_path = self.model_dir / "price_v1.pkl"
-        scaler_path = self.model_dir / "scaler_v1.pkl"
+    def _load_metadata(self) -> None:
+        """Load model metadata (version, feature importance) from disk."""
         metadata_path = self.model_dir / "metadata.json"
-
-        if not model_path.exists():
-            # Model not trained yet
+        if not metadata_path.exists():
             return
 
         try:
-            self.model = joblib.load(model_path)
-            if scaler_path.exists():
-                self.scaler = joblib.load(scaler_path)
-
-            if metadata_path.exists():
-                with open(metadata_path, "r") as f:
-                    self.metadata = json.load(f)
-                    # Extract feature importance if available
-                    if "feature_importance" in self.metadata:
-                        self.feature_importance = self.metadata["feature_importance"]
-
+            with open(metadata_path, "r") as f:
+                self.metadata = json.load(f)
+                # Extract feature importance if available
+                if "feature_importance" in self.metadata:
+                    self.feature_importance = self.metadata["feature_importance"]
         except Exception as e:
-            print(f"Warning: Failed to load ML model: {e}")
-            self.model = None
+            print(f"Warning: Failed to load ML model metadata: {e}")
+
+    @property
+    def model(self):
+        """Trained unified model, or None if it is not trained yet or cannot be loaded."""
+        try:
+            model = self.registry.get(MODEL_FILE)
+        except Exception:
+            return None
+        if self._metadata_generation != self.registry.generation:
+            # A retrained model was swapped in; pick up its metadata too
+            self._metadata_generation = self.registry.generation
+            self._load_metadata()
+        return model
+
+    @property
+    def scaler(self):
+        """Feature scaler, or None if the model was trained without one."""
+        if not self.registry.exists(SCALER_FILE):
+            return None
+        try:
+            return self.registry.get(SCALER_FILE)
+        except Exception:
+            return None
 
     def is_ready(self) -> bool:
         """Check if model is loaded and ready for predictions."""
         return self.model is not None
 
+    def warm_up(self) -> None:
+        """Load the unified model and all routed models now rather than on first use."""
+        self.registry.warm_up([MODEL_FILE, SCALER_FILE])
+        if self.router:
+            self.router.warm_up()
+
     def estimate_price(
         self,
         metadata: Optional[BookMetadata],
@@ -165,40 +182,19 @@ class MLPriceEstimator:
                 )
 
                 # Return result with routing metadata
-                return PriceEstimate(
-                    price=round(price, 2),
-                    confidence=0.95 if model_used == 'abebooks_specialist' else 0.85 if model_used == 'ebay_specialist' else 0.70,
-                    prediction_interval=None,
-                    reason=f"Routed to {model_used} (MAE: ${routing_info['model_mae']:.2f})",
-                    feature_importance={},
-                    model_version=routing_info['model']
-                )
+                return self._routed_estimate(price, model_used, routing_info)
             except Exception as e:
                 # Fall through to unified model on routing errors
                 pass
         if not self.is_ready():
-            return PriceEstimate(
-                price=None,
-                confidence=0.0,
-                prediction_interval=None,
-                reason="ML model not trained yet",
-                feature_importance={},
-                model_version="none"
-            )
+            return self._not_ready_estimate()
 
         # Extract features
         features = self.feature_extractor.extract(metadata, market, bookscouter, condition)
 
         # Check if we have enough features
         if features.completeness < 0.3:
-            return PriceEstimate(
-                price=None,
-                confidence=0.0,
-                prediction_interval=None,
-                reason=f"Insufficient data for ML prediction (only {features.completeness:.0%} of features available)",
-                feature_importance={},
-                model_version=self.metadata.get("version", "unknown")
-            )
+            return self._insufficient_estimate(features)
 
         # Apply feature scaling if available
         X = features.values.reshape(1, -1)
@@ -208,35 +204,135 @@ class MLPriceEstimator:
         # Make prediction
         try:
             pred = self.model.predict(X)[0]
-            pred = max(3.0, float(pred))  # Floor at $3
+            return self._model_estimate(features, X, pred)
+
+        except Exception as e:
+            return self._failed_estimate(e)
+
+    def estimate_price_batch(self, items: Sequence[Dict]) -> List[PriceEstimate]:
+        """
+        Estimate prices for many books with one model call per model.
 
-            # Calculate confidence based on feature completeness
-            confidence = self._calculate_confidence(features)
+        Each item is a dict of ``estimate_price`` keyword arguments. Results
+        are the same as calling ``estimate_price`` for every item, but
+        features are stacked into one matrix and scaled/predicted in bulk.
 
-            # Get prediction interval if model supports it
-            interval = self._get_prediction_interval(X, pred, confidence)
+        Args:
+            items: One dict of ``estimate_price`` arguments per book
+
+        Returns:
+            List of PriceEstimate, in item order
+        """
+        items = [{"metadata": None, "market": None, "bookscouter": None, **item} for item in items]
+        if not items:
+            return []
 
-            # Get feature importance for this prediction
-            importance = self._explain_prediction(features)
+        if self.router:
+            try:
+                return [
+                    self._routed_estimate(price, model_used, routing_info)
+                    for price, model_used, routing_info in self.router.predict_batch(items)
+                ]
+            except Exception:
+                # Some book broke the unified route; redo them one at a time so
+                # only that book falls through to the unified model
+                return [self.estimate_price(**item) for item in items]
 
-            return PriceEstimate(
-                price=round(pred, 2),
-                confidence=confidence,
-                prediction_interval=interval,
-                reason=f"ML prediction based on {features.completeness:.0%} of features",
-                feature_importance=importance,
-                model_version=self.metadata.get("version", "v1")
+        if not self.is_ready():
+            return [self._not_ready_estimate() for _ in items]
+
+        results: List[Optional[PriceEstimate]] = [None] * len(items)
+        rows: List[int] = []
+        row_features: List[FeatureVector] = []
+        for i, item in enumerate(items):
+            features = self.feature_extractor.extract(
+                item["metadata"], item["market"], item["bookscouter"], item.get("condition", "Good")
             )
+            if features.completeness < 0.3:
+                results[i] = self._insufficient_estimate(features)
+            else:
+                rows.append(i)
+                row_features.append(features)
+        if not rows:
+            return results
+
+        X = np.vstack([features.values for features in row_features])
+        if self.scaler is not None:
+            X = self.scaler.transform(X)
 
+        try:
+            predictions = self.model.predict(X)
         except Exception as e:
-            return PriceEstimate(
-                price=None,
-                confidence=0.0,
-                prediction_interval=None,
-                reason=f"Prediction failed: {str(e)}",
-                feature_importance={},
-                model_version=self.metadata.get("version", "unknown")
-            )
+            for i in rows:
+                results[i] = self._failed_estimate(e)
+            return results
+
+        for row, (i, features) in enumerate(zip(rows, row_features)):
+            results[i] = self._model_estimate(features, X[row:row + 1], predictions[row])
+        return results
+
+    def _routed_estimate(self, price: float, model_used: str, routing_info: Dict) -> PriceEstimate:
+        """PriceEstimate for a prediction made by the prediction router."""
+        return PriceEstimate(
+            price=round(price, 2),
+            confidence=0.95 if model_used == 'abebooks_specialist' else 0.85 if model_used == 'ebay_specialist' else 0.70,
+            prediction_interval=None,
+            reason=f"Routed to {model_used} (MAE: ${routing_info['model_mae']:.2f})",
+            feature_importance={},
+            model_version=routing_info['model']
+        )
+
+    def _model_estimate(self, features: FeatureVector, X: np.ndarray, pred: float) -> PriceEstimate:
+        """PriceEstimate for a raw prediction of the unified model."""
+        pred = max(3.0, float(pred))  # Floor at $3
+
+        # Calculate confidence based on feature completeness
+        confidence = self._calculate_confidence(features)
+
+        # Get prediction interval if model supports it
+        interval = self._get_prediction_interval(X, pred, confidence)
+
+        # Get feature importance for this prediction
+        importance = self._explain_prediction(features)
+
+        return PriceEstimate(
+            price=round(pred, 2),
+            confidence=confidence,
+            prediction_interval=interval,
+            reason=f"ML prediction based on {features.completeness:.0%} of features",
+            feature_importance=importance,
+            model_version=self.metadata.get("version", "v1")
+        )
+
+    def _not_ready_estimate(self) -> PriceEstimate:
+        return PriceEstimate(
+            price=None,
+            confidence=0.0,
+            prediction_interval=None,
+            reason="ML model not trained yet",
+            feature_importance={},
+            model_version="none"
+        )
+
+    def _insufficient_estimate(self, features: FeatureVector) -> PriceEstimate:
+        return PriceEstimate(
+            price=None,
+            confidence=0.0,
+            prediction_interval=None,
+            reason=f"Insufficient data for ML prediction (only {features.completeness:.0%} of features available)",
+            feature_importance={},
+            model_version=self.metadata.get("version", "unknown")
+        )
+
+    def _failed_estimate(self, error: Exception) -> PriceEstimate:
+        return PriceEstimate(
+            price=None,
+            confidence=0.0,
+            prediction_interval=None,
+            reason=f"Prediction failed: {str(error)}",
+            feature_importance={},
+            model_version=self.metadata.get("version", "unknown")
+        )
 
     def _calculate_confidence(self, features: FeatureVector) -> float:
         """
@@ -10,6 +10,8 @@ Architecture:
 - Model: all-MiniLM-L6-v2 (384-dim embeddings, fast inference)
 - Use case: Augment XGBoost/GradientBoosting with text features
 - Target segment: Books with limited market data (sold_comps_count < 10) or collectibles
+- Embeddings are cached on disk (see embedding_cache), so only new or changed
+  descriptions are run through the model
 
 Usage:
     from isbn_lot_optimizer.ml.text_embeddings import TextEmbedder
@@ -27,6 +29,11 @@ import numpy as np
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from isbn_lot_optimizer.ml.embedding_cache import description_key, get_embedding_cache, normalize_description
+
+# Descriptions encoded between cache writes, so an interrupted run keeps its progress
+ENCODE_CHUNK_SIZE = 1024
+
 
 class TextEmbedder:
     """
@@ -36,16 +43,30 @@ class TextEmbedder:
     Handles missing descriptions gracefully with zero vectors.
     """
 
-    def __init__(self, model_name: str = 'all-MiniLM-L6-v2', cache_dir: Optional[str] = None):
+    def __init__(
+        self,
+        model_name: str = 'all-MiniLM-L6-v2',
+        cache_dir: Optional[str] = None,
+        embedding_cache_dir: Optional[str] = None,
+        use_embedding_cache: bool = True,
+        batch_size: int = 64
+    ):
         """
         Initialize text embedder.
 
         Args:
             model_name: Sentence transformer model name (default: all-MiniLM-L6-v2)
             cache_dir: Optional cache directory for model weights
+            embedding_cache_dir: Root of the embedding cache
+                (default: ~/.isbn_lot_optimizer/embedding_cache)
+            use_embedding_cache: Reuse cached embeddings (default: True)
+            batch_size: Descriptions per model forward pass (default: 64)
         """
         self.model_name = model_name
         self.cache_dir = cache_dir or str(Path.home() / '.cache' / 'sentence-transformers')
+        self.embedding_cache_dir = embedding_cache_dir
+        self.use_embedding_cache = use_embedding_cache
+        self.batch_size = batch_size
         self.model = None
         self.embedding_dim = 384  # all-MiniLM-L6-v2 dimension
 
@@ -81,6 +102,9 @@ class TextEmbedder:
             numpy array of shape (n_descriptions, 384)
             Missing descriptions are replaced with zero vectors
 
+        Descriptions already in the embedding cache (same text after whitespace
+        normalization, same model) are read from it instead of re-encoded.
+
         Example:
             >>> embedder = TextEmbedder()
             >>> descs = ["First edition signed", None, "Hardcover dust jacket"]
@@ -88,35 +112,53 @@ class TextEmbedder:
             >>> embeddings.shape
             (3, 384)
         """
-        self._load_model()
+        texts = [normalize_description(desc) for desc in descriptions]
+        present = [i for i, text in enumerate(texts) if text is not None]
+        unique_texts = list(dict.fromkeys(texts[i] for i in present))
 
-        # Handle None/empty descriptions
-        processed_descs = []
-        missing_indices = []
+        if self.use_embedding_cache and unique_texts:
+            unique_embeddings = self._encode_cached(unique_texts, normalize, show_progress)
+        elif unique_texts:
+            unique_embeddings = self._encode(unique_texts, normalize, show_progress)
 
-        for i, desc in enumerate(descriptions):
-            if desc is None or (isinstance(desc, str) and not desc.strip()):
-                processed_descs.append("")  # Placeholder for embedding
-                missing_indices.append(i)
-            else:
-                processed_descs.append(str(desc).strip())
+        # Missing descriptions stay zero vectors
+        embeddings = np.zeros((len(texts), self.embedding_dim), dtype=np.float32)
+        if present:
+            position = {text: i for i, text in enumerate(unique_texts)}
+            embeddings[present] = unique_embeddings[[position[texts[i]] for i in present]]
 
-        # Encode all descriptions (including empty ones)
+        return embeddings
+
+    def _encode(self, texts: List[str], normalize: bool, show_progress: bool) -> np.ndarray:
+        """Run the model over texts."""
+        self._load_model()
         embeddings = self.model.encode(
-            processed_descs,
+            texts,
+            batch_size=self.batch_size,
             normalize_embeddings=normalize,
             show_progress_bar=show_progress,
             convert_to_numpy=True
         )
-
-        # Replace embeddings for missing descriptions with zero vectors
-        if missing_indices:
-            zero_vector = np.zeros(self.embedding_dim)
-            for idx in missing_indices:
-                embeddings[idx] = zero_vector
-
+        self.embedding_dim = embeddings.shape[1]
         return embeddings
 
+    def _encode_cached(self, texts: List[str], normalize: bool, show_progress: bool) -> np.ndarray:
+        """Embeddings for distinct texts, encoding only those not in the cache."""
+        cache = get_embedding_cache(self.model_name, self.embedding_cache_dir)
+        keys = [description_key(text, self.model_name, normalize) for text in texts]
+        rows = cache.lookup(keys)
+
+        missing = np.flatnonzero(rows < 0)
+        if len(missing):
+            print(f"Encoding {len(missing)} of {len(texts)} descriptions ({len(texts) - len(missing)} cached)")
+        for start in range(0, len(missing), ENCODE_CHUNK_SIZE):
+            chunk = missing[start:start + ENCODE_CHUNK_SIZE]
+            embeddings = self._encode([texts[i] for i in chunk], normalize, show_progress)
+            rows[chunk] = cache.add([keys[i] for i in chunk], embeddings)
+
+        self.embedding_dim = cache.embedding_dim
+        return cache.vectors(rows)
+
     def encode_single(self, description: Optional[str], normalize: bool = True) -> np.ndarray:
         """
         Encode a single description.
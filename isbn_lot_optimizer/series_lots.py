@@ -40,32 +40,27 @@ def build_series_lots_enhanced(
     suggestions: List[LotSuggestion] = []
 
     try:
-        # Group books by their matched series
-        series_groups: Dict[int, List[BookEvaluation]] = defaultdict(list)
-
+        # Group books by their matched series: one query for the whole catalogue
+        books_by_isbn: Dict[str, List[BookEvaluation]] = defaultdict(list)
         for book in books:
-            # Get series matches for this ISBN
-            series_matches = series_db.get_series_for_isbn(book.isbn)
+            books_by_isbn[book.isbn].append(book)
+        series_groups = series_db.group_isbns_by_series(list(books_by_isbn))
 
-            if series_matches:
-                # Use the highest confidence match
-                best_match = series_matches[0]
-                series_id = best_match['series_id']
-                series_groups[series_id].append(book)
+        eligible = {
+            series_id: group
+            for series_id, group in series_groups.items()
+            if sum(len(books_by_isbn[isbn]) for isbn in group['isbns']) >= min_books
+        }
+        # Book lists for every eligible series, also in one query
+        books_by_series = series_db.get_books_for_series(list(eligible))
 
         # Build lots for each series
-        for series_id, series_books in series_groups.items():
-            if len(series_books) < min_books:
-                continue
-
-            # Get series information
-            series_info = series_db.get_series_for_isbn(series_books[0].isbn)
-            if not series_info:
-                continue
+        for series_id, group in eligible.items():
+            series_books = [book for isbn in group['isbns'] for book in books_by_isbn[isbn]]
 
-            series_title = series_info[0]['series_title']
-            author_name = series_info[0]['author_name']
-            book_count = series_info[0]['book_count']
+            series_title = group['series_title']
+            author_name = group['author_name']
+            book_count = group['book_count']
 
             # Check if books have individual series names in metadata
             # (e.g., standalone novels grouped under umbrella series)
@@ -88,7 +83,7 @@ def build_series_lots_enhanced(
                 series_title = f"{author_name} Collection"
 
             # Get complete list of books in this series
-            all_series_books = series_db.get_series_books(series_id)
+            all_series_books = books_by_series[series_id]
 
             # Determine which books we have
             have_titles = {_normalize_title(book.metadata.title) for book in series_books if book.metadata}
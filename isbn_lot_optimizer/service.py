@@ -5,6 +5,7 @@ import os
 from collections import Counter, defaultdict
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import re
+import threading
 import time
 from dataclasses import asdict, fields
 from pathlib import Path
@@ -12,13 +13,14 @@ from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tupl
 
 import requests
 
-from shared.author_aliases import canonical_author, display_label as alias_display_label
+from shared.author_aliases import canonical_author, canonical_author as alias_canonical_author, display_label as alias_display_label
 from shared.booksrun import (
     BooksRunAPIError,
     DEFAULT_BASE_URL as BOOKSRUN_DEFAULT_BASE_URL,
     fetch_offer as fetch_booksrun_offer,
     normalise_condition as normalize_booksrun_condition,
 )
+from .book_snapshot import BookSnapshot
 from .recent_scans import RecentScansCache
 from shared.bookscouter import (
     BookScouterAPIError,
@@ -55,11 +57,12 @@ from shared.models import (
     VendorOffer,
 )
 from shared.probability import build_book_evaluation
-from .lots import build_lots_with_strategies, generate_lot_suggestions
+from .lots import book_group_keys, build_lots_with_strategies, generate_lot_suggestions
+from .lot_optimizer import DEFAULT_TIME_BUDGET, LotPlan, optimize_lot_assignment
 from shared.series_catalog import get_or_fetch_series_for_authors
 from shared.series_finder import attach_series
 from shared.market import fetch_single_market_stat, fetch_market_stats_v2
-from .lot_market import market_snapshot_for_lot
+from .lot_market import market_snapshot_for_lot, market_snapshots_for_lots
 from .lot_scoring import score_lot
 from shared.utils import normalise_isbn, read_isbn_csv
 from shared.timing import timer, get_stats
@@ -69,6 +72,9 @@ from .book_routing import route_book, route_books, RoutingDecision
 # New code should import from constants.py directly
 __all__ = ["BookService", "COVER_CHOICES"]
 
+# Upper bound on threads used to fan out evaluate_isbn's upstream fetches
+EVALUATION_MAX_WORKERS = 8
+
 
 def _normalise_title(text: Optional[str]) -> str:
     if not text:
@@ -166,6 +172,9 @@ class BookService:
             else float(bookscouter_timeout_env) if bookscouter_timeout_env else 15.0
         )
         self._bookscouter_session: Optional[requests.Session] = None
+        # Bounded pool shared by evaluate_isbn for its upstream fan-out
+        self._evaluation_executor: Optional[ThreadPoolExecutor] = None
+        self._evaluation_executor_lock = threading.Lock()
 
     # ------------------------------------------------------------------
     # Public API
@@ -186,6 +195,10 @@ class BookService:
                 self._booksrun_session.close()
             except Exception:
                 pass
+        with self._evaluation_executor_lock:
+            executor, self._evaluation_executor = self._evaluation_executor, None
+        if executor:
+            executor.shutdown(wait=False)
         # Close database connection
         try:
             self.db.close()
@@ -201,6 +214,7 @@ class BookService:
         include_market: bool = True,
         signed: bool = False,
         first_edition: bool = False,
+        concurrent: bool = True,
     ) -> BookEvaluation:
         """
         Evaluate a book WITHOUT persisting to database.
@@ -215,6 +229,8 @@ class BookService:
             include_market: Whether to fetch market data (default: True)
             signed: Whether book is signed
             first_edition: Whether book is first edition
+            concurrent: Fetch the upstream sources in parallel (default: True).
+                Pass False to run them one after another, e.g. when debugging.
 
         Returns:
             BookEvaluation with all data populated but not persisted
@@ -228,37 +244,45 @@ class BookService:
         # Only fall back to Google Books if BookScouter fails or lacks data
         metadata: Optional[BookMetadata] = None
         amazon_rank: Optional[int] = None
-        bookscouter_metadata_raw: Optional[Dict[str, Any]] = None
-
-        if include_market and self.bookscouter_api_key:
-            try:
-                with timer(f"BookScouter metadata: {normalized}", log=True, record=False):
-                    bookscouter_metadata_raw = fetch_bookscouter_metadata(
-                        normalized,
-                        api_key=self.bookscouter_api_key,
-                        base_url=self.bookscouter_base_url,
-                        timeout=int(self.bookscouter_timeout),
-                        session=self._bookscouter_session,
-                    )
-                if bookscouter_metadata_raw:
-                    # Extract Amazon rank
-                    rank_value = bookscouter_metadata_raw.get("AmazonSalesRank")
-                    if rank_value:
-                        try:
-                            amazon_rank = int(rank_value)
-                        except (ValueError, TypeError):
-                            pass
+        market_stats: Optional[EbayMarketStats] = None
+        v2_stats_result: Optional[Dict[str, Any]] = None
+        booksrun_offer: Optional[BooksRunOffer] = None
+        bookscouter_result: Optional[BookScouterResult] = None
 
-                    # Try to build metadata from BookScouter
-                    metadata = self._build_metadata_from_bookscouter(normalized, bookscouter_metadata_raw)
-            except BookScouterAPIError:
-                pass  # Fall back to Google Books
+        if include_market and concurrent:
+            # The upstream sources are independent, so launch them together and
+            # let scan latency track the slowest source instead of the sum.
+            executor = self._get_evaluation_executor()
+            metadata_future = (
+                executor.submit(self._evaluate_bookscouter_metadata, normalized)
+                if self.bookscouter_api_key
+                else None
+            )
+            market_future = executor.submit(self._evaluate_market_stats, normalized)
+            booksrun_future = executor.submit(self._evaluate_booksrun_offer, normalized, condition)
+            bookscouter_future = executor.submit(self._evaluate_bookscouter_offers, normalized)
+            if metadata_future is not None:
+                metadata, amazon_rank = metadata_future.result()
+            # Google Books fallback overlaps with the market/offer fetches still in flight
+            if metadata is None:
+                metadata = self._evaluate_google_metadata(normalized)
+            market_stats, v2_stats_result = market_future.result()
+            booksrun_offer = booksrun_future.result()
+            bookscouter_result = bookscouter_future.result()
+        else:
+            if include_market and self.bookscouter_api_key:
+                metadata, amazon_rank = self._evaluate_bookscouter_metadata(normalized)
+            # Fallback to Google Books if BookScouter didn't provide metadata
+            if metadata is None:
+                metadata = self._evaluate_google_metadata(normalized)
+            if include_market:
+                market_stats, v2_stats_result = self._evaluate_market_stats(normalized)
+                booksrun_offer = self._evaluate_booksrun_offer(normalized, condition)
+                bookscouter_result = self._evaluate_bookscouter_offers(normalized)
 
-        # Fallback to Google Books if BookScouter didn't provide metadata
-        if metadata is None:
-            with timer(f"Google Books metadata: {normalized}", log=True, record=False):
-                metadata_payload = fetch_metadata(self.metadata_session, normalized, delay=self.metadata_delay)
-                metadata = self._build_metadata_from_payload(normalized, metadata_payload)
+        # Use Amazon rank from BookScouter result if we didn't get it from metadata
+        if amazon_rank is None and bookscouter_result:
+            amazon_rank = bookscouter_result.amazon_sales_rank
 
         existing_row = self.db.fetch_book(normalized)
         existing_quantity = 1
@@ -279,65 +303,6 @@ class BookService:
                 existing = self._row_to_evaluation(existing_row)
                 metadata = existing.metadata
 
-        market_stats: Optional[EbayMarketStats] = None
-        v2_stats_result: Optional[Dict[str, Any]] = None
-        if include_market:
-            # Use v2 API which includes Browse API + sold comps (Track B)
-            # Track B only needs EBAY_CLIENT_ID/EBAY_CLIENT_SECRET (no app_id required)
-            try:
-                with timer(f"eBay market stats v2: {normalized}", log=True, record=False):
-                    stats_dict = fetch_market_stats_v2(normalized, include_sold_comps=True)
-                if stats_dict and "error" not in stats_dict:
-                    # Store for later use (estimated_price override and persistence)
-                    v2_stats_result = stats_dict
-
-                    # Convert dict to EbayMarketStats
-                    market_stats = EbayMarketStats(
-                        isbn=normalized,
-                        active_count=stats_dict.get("active_count", 0) or 0,
-                        active_avg_price=stats_dict.get("median_price"),  # Use median as avg
-                        active_median_price=stats_dict.get("median_price"),
-                        sold_count=stats_dict.get("sold_count", 0) or 0,
-                        sold_avg_price=None,  # Not available from Browse API
-                        sold_median_price=None,  # Not available from Browse API
-                        sell_through_rate=stats_dict.get("sell_through"),
-                        currency="USD",
-                        # Sold comps from Track B (active listing estimate)
-                        sold_comps_count=stats_dict.get("sold_comps_count"),
-                        sold_comps_min=stats_dict.get("sold_comps_min"),
-                        sold_comps_median=stats_dict.get("sold_comps_median"),
-                        sold_comps_max=stats_dict.get("sold_comps_max"),
-                        sold_comps_is_estimate=stats_dict.get("sold_comps_is_estimate", True),
-                        sold_comps_source=stats_dict.get("sold_comps_source", "estimate"),
-                        sold_comps_last_sold_date=stats_dict.get("sold_comps_last_sold_date"),
-                        # Smart filtering metadata
-                        signed_listings_detected=stats_dict.get("signed_listings_detected"),
-                        lot_listings_detected=stats_dict.get("lot_listings_detected"),
-                        filtered_count=stats_dict.get("filtered_count"),
-                        total_listings=stats_dict.get("total_listings"),
-                    )
-            except Exception as e:
-                print(f"⚠️  eBay market data fetch failed: {e}")
-
-        # Fetch BookScouter offers
-        booksrun_offer: Optional[BooksRunOffer] = None
-        bookscouter_result: Optional[BookScouterResult] = None
-        if include_market:
-            with timer(f"BooksRun offer: {normalized}", log=True, record=False):
-                booksrun_offer = self._fetch_booksrun_offer(normalized, condition=condition)
-
-            # Always fetch Amazon data (includes price, rank, count)
-            # Even if we got rank from metadata fetch, we need price and count
-            with timer(f"BookScouter offers (+ Amazon): {normalized}", log=True, record=False):
-                bookscouter_result = self._fetch_bookscouter_offers_internal(
-                    normalized,
-                    fetch_amazon_rank=True  # Always True to get full Amazon data
-                )
-
-            # Use Amazon rank from BookScouter result if we didn't get it from metadata
-            if amazon_rank is None and bookscouter_result:
-                amazon_rank = bookscouter_result.amazon_sales_rank
-
         evaluation = build_book_evaluation(
             isbn=normalized,
             original_isbn=original_isbn,
@@ -569,10 +534,14 @@ class BookService:
                 continue
         return evaluations
 
-    def refresh_book_market(self, isbn: str, *, recalc_lots: bool = True) -> Optional[BookEvaluation]:
+    def refresh_book_market(
+        self, isbn: str, *, recalc_lots: bool = True, include_offers: bool = True
+    ) -> Optional[BookEvaluation]:
         """
         Refresh market stats for a single ISBN and persist the updated evaluation.
         Uses Finding API (if AppID is configured) and Browse median price override when available.
+        With include_offers=False the stored BooksRun/BookScouter offers are kept
+        instead of being fetched again.
         """
         row = self.db.fetch_book(isbn)
         if not row:
@@ -626,8 +595,11 @@ class BookService:
         except Exception:
             pass
 
-        booksrun_offer = self._fetch_booksrun_offer(isbn, condition=existing.condition)
-        bookscouter_result = self._fetch_bookscouter_offers(isbn)
+        if include_offers:
+            booksrun_offer = self._fetch_booksrun_offer(isbn, condition=existing.condition)
+            bookscouter_result = self._fetch_bookscouter_offers(isbn)
+        else:
+            booksrun_offer = existing.booksrun
         self._apply_booksrun_to_evaluation(evaluation, booksrun_offer)
         self._apply_bookscouter_to_evaluation(evaluation, bookscouter_result)
         self._persist_book(evaluation, v2_stats=v2_stats_result)
@@ -635,9 +607,34 @@ class BookService:
             self.recalculate_lots()
         return evaluation
 
+    @property
+    def db(self) -> DatabaseManager:
+        return self._db
+
+    @db.setter
+    def db(self, db: DatabaseManager) -> None:
+        # Callers (e.g. the web app) may swap in another manager; keep the
+        # decoded-row snapshot subscribed to whichever one is current.
+        snapshot = self.__dict__.get("_book_snapshot")
+        if snapshot is None:
+            snapshot = self._book_snapshot = BookSnapshot(self._row_to_evaluation)
+        previous = self.__dict__.get("_db")
+        if previous is not None and hasattr(previous, "remove_change_listener"):
+            previous.remove_change_listener(snapshot.invalidate)
+        self._db = db
+        snapshot.invalidate()
+        if hasattr(db, "add_change_listener"):
+            db.add_change_listener(snapshot.invalidate)
+
     def list_books(self) -> List[BookEvaluation]:
-        rows = self.db.fetch_all_books()
-        return [self._row_to_evaluation(row) for row in rows]
+        """
+        Return every accepted book, newest first.
+
+        Served from the decoded-row snapshot: only books whose updated_at
+        changed since the last call are fetched and decoded again.
+        """
+        versions = self.db.fetch_book_versions()
+        return self._book_snapshot.load(self.db, versions)
 
     def get_all_books(self) -> List[BookEvaluation]:
         """Return all books currently stored in the database."""
@@ -653,8 +650,42 @@ class BookService:
         Returns:
             List of BookEvaluation objects updated after the given timestamp
         """
+        generation = self._book_snapshot.generation
         rows = self.db.fetch_books_updated_since(since_timestamp)
-        return [self._row_to_evaluation(row) for row in rows]
+        return [self._book_snapshot.evaluation_for_row(row, generation) for row in rows]
+
+    def get_book_changes(self, cursor: int = 0) -> Dict[str, Any]:
+        """
+        Return what changed in the catalogue since a sync cursor.
+
+        Args:
+            cursor: Value of ``cursor`` from a previous call (0 for everything)
+
+        Returns:
+            Dict with:
+            - cursor: current change cursor to send back next time
+            - books: accepted BookEvaluations changed since ``cursor``
+            - seqs: change seq per returned ISBN (stable version tag)
+            - deleted: ISBNs deleted (or no longer accepted) since ``cursor``
+        """
+        current = self.db.fetch_change_cursor()
+        changes = self.db.fetch_changes_since(cursor, until=current)
+        seqs = {row["isbn"]: int(row["seq"]) for row in changes}
+        live = [row["isbn"] for row in changes if not row["deleted"]]
+        generation = self._book_snapshot.generation
+        rows = self.db.fetch_books_by_isbns(live)
+
+        books: List[BookEvaluation] = []
+        deleted: List[str] = [row["isbn"] for row in changes if row["deleted"]]
+        for isbn in live:
+            row = rows.get(isbn)
+            status = row["status"] if row is not None and "status" in row.keys() else None
+            if row is None or (status or "ACCEPT") != "ACCEPT":
+                deleted.append(isbn)
+                continue
+            books.append(self._book_snapshot.evaluation_for_row(row, generation))
+
+        return {"cursor": current, "books": books, "seqs": seqs, "deleted": deleted}
 
     def route_book(self, isbn: str) -> Optional[RoutingDecision]:
         """
@@ -681,6 +712,36 @@ class BookService:
         books = self.list_books()
         return route_books(books)
 
+    def estimate_ml_prices(self, isbns: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        ML price estimates for many books with one scaler/predict call per model.
+
+        Args:
+            isbns: Books to estimate (default: every accepted book)
+
+        Returns:
+            Dict mapping ISBN to PriceEstimate; ISBNs not in the catalog are omitted
+        """
+        from isbn_lot_optimizer.ml import get_ml_estimator
+
+        books = self.list_books()
+        if isbns is not None:
+            wanted = {normalise_isbn(isbn) for isbn in isbns}
+            books = [book for book in books if book.isbn in wanted]
+        if not books:
+            return {}
+
+        estimates = get_ml_estimator().estimate_price_batch([
+            {
+                "metadata": book.metadata,
+                "market": book.market,
+                "bookscouter": book.bookscouter,
+                "condition": book.condition or "Good",
+            }
+            for book in books
+        ])
+        return {book.isbn: estimate for book, estimate in zip(books, estimates)}
+
     def batch_refresh_amazon_ranks(
         self,
         *,
@@ -1369,7 +1430,7 @@ class BookService:
             return 0
         deleted = self.db.delete_books(normalized_isbns)
         if deleted:
-            self.recalculate_lots()
+            self.update_lots_for_isbns(normalized_isbns)
         return deleted
 
     def refresh_books(
@@ -1719,10 +1780,12 @@ class BookService:
 
     def search_books(self, query: str) -> List[BookEvaluation]:
         """
-        Search books by ISBN/title/authors using DatabaseManager.search_books.
+        Ranked, prefix-matching search over ISBN/title/authors/series/publisher
+        using DatabaseManager.search_books (backed by the books_fts index).
         """
+        generation = self._book_snapshot.generation
         rows = self.db.search_books(query)
-        return [self._row_to_evaluation(row) for row in rows]
+        return [self._book_snapshot.evaluation_for_row(row, generation) for row in rows]
 
     def list_lots(self) -> List[LotSuggestion]:
         rows = self.db.fetch_lots()
@@ -1773,16 +1836,25 @@ class BookService:
         """
         return self.list_lots()
 
-    def build_lot_candidates(self, fetch_pricing: bool = True) -> List[LotCandidate]:
+    def build_lot_candidates(
+        self,
+        fetch_pricing: bool = True,
+        books: Optional[Sequence[BookEvaluation]] = None,
+    ) -> List[LotCandidate]:
         """
         Build lot candidates from accepted books.
 
         Args:
             fetch_pricing: If True (default), fetches eBay pricing (slow).
                           If False, uses only individual book pricing (fast).
+            books: Accepted books to group (default: all of them). Incremental
+                   updates pass only the books sharing a group with the change.
         """
-        with timer("List books from database", log=True, record=True):
-            books = self.list_books()
+        if books is None:
+            with timer("List books from database", log=True, record=True):
+                books = self.list_books()
+        else:
+            books = list(books)
         if not books:
             return []
 
@@ -2009,6 +2081,22 @@ class BookService:
         self.series_index.save_if_dirty()
         return filtered
 
+    def prefetch_lot_market(self, lots: Sequence[LotCandidate]) -> None:
+        """
+        Fetch market snapshots for many lots in one batch.
+
+        Snapshots land in the lot market cache, so the ``enrich_lot_with_market``
+        calls that follow are answered without hitting eBay.
+        """
+        keys = list(dict.fromkeys((lot.author, lot.series_name, None) for lot in lots))
+        if not keys:
+            return
+        session = requests.Session()
+        try:
+            market_snapshots_for_lots(keys, session=session)
+        finally:
+            session.close()
+
     def enrich_lot_with_market(self, lot: LotCandidate) -> None:
         session = requests.Session()
         try:
@@ -2048,52 +2136,55 @@ class BookService:
 
         self._record_lot_signal(lot, snapshot, score)
 
+    def _lot_to_payload(self, lot: LotCandidate) -> Dict[str, Any]:
+        justification_lines = list(lot.justification)
+        if lot.probability_reasons:
+            for line in (line.strip() for line in lot.probability_reasons.splitlines() if line.strip()):
+                if line not in justification_lines:
+                    justification_lines.append(line)
+        return {
+            "name": lot.name,
+            "strategy": lot.strategy,
+            "book_isbns": list(lot.book_isbns),
+            "estimated_value": float(lot.estimated_value or 0.0),
+            "probability_label": lot.probability_label,
+            "probability_score": float(lot.probability_score or 0.0),
+            "sell_through": lot.sell_through,
+            "justification": "\n".join(justification_lines),
+            "lot_market_value": lot.lot_market_value,
+            "lot_optimal_size": lot.lot_optimal_size,
+            "lot_per_book_price": lot.lot_per_book_price,
+            "lot_comps_count": lot.lot_comps_count,
+            "use_lot_pricing": 1 if lot.use_lot_pricing else 0,
+        }
+
     def save_lots(self, lots: Sequence[LotCandidate]) -> None:
-        payloads = []
-        for lot in lots:
-            justification_lines = list(lot.justification)
-            if lot.probability_reasons:
-                for line in (line.strip() for line in lot.probability_reasons.splitlines() if line.strip()):
-                    if line not in justification_lines:
-                        justification_lines.append(line)
-            payloads.append(
-                {
-                    "name": lot.name,
-                    "strategy": lot.strategy,
-                    "book_isbns": list(lot.book_isbns),
-                    "estimated_value": float(lot.estimated_value or 0.0),
-                    "probability_label": lot.probability_label,
-                    "probability_score": float(lot.probability_score or 0.0),
-                    "sell_through": lot.sell_through,
-                    "justification": "\n".join(justification_lines),
-                    "lot_market_value": lot.lot_market_value,
-                    "lot_optimal_size": lot.lot_optimal_size,
-                    "lot_per_book_price": lot.lot_per_book_price,
-                    "lot_comps_count": lot.lot_comps_count,
-                    "use_lot_pricing": 1 if lot.use_lot_pricing else 0,
-                }
-            )
+        payloads = [self._lot_to_payload(lot) for lot in lots]
 
         if payloads:
-            name_tracker: dict[tuple[str, str], int] = {}
-            used_names: set[tuple[str, str]] = set()
-            for payload in payloads:
-                base_key = (payload["name"], payload["strategy"])
-                name_tracker[base_key] = name_tracker.get(base_key, 0) + 1
-                if name_tracker[base_key] > 1:
-                    suffix = name_tracker[base_key]
-                    new_name = f"{payload['name']} ({suffix})"
-                    while (new_name, payload["strategy"]) in used_names:
-                        suffix += 1
-                        new_name = f"{payload['name']} ({suffix})"
-                    payload["name"] = new_name
-                    used_names.add((payload["name"], payload["strategy"]))
-                else:
-                    used_names.add(base_key)
-
+            self._dedupe_lot_names(payloads)
             self.db.replace_lots(payloads)
         else:
             self.db.replace_lots([])
+        with timer("Rebuild lot index", log=True, record=True):
+            self._rebuild_lot_index()
+
+    @staticmethod
+    def _dedupe_lot_names(payloads: List[Dict[str, Any]], taken: Iterable[Tuple[str, str]] = ()) -> None:
+        """
+        Suffix repeated lot names with " (2)", " (3)", ... in place.
+
+        ``(name, strategy)`` is unique in the lots table; ``taken`` holds the
+        pairs already used by lots that are not being replaced.
+        """
+        used_names: set[tuple[str, str]] = set(taken)
+        for payload in payloads:
+            base_name = payload["name"]
+            suffix = 1
+            while (payload["name"], payload["strategy"]) in used_names:
+                suffix += 1
+                payload["name"] = f"{base_name} ({suffix})"
+            used_names.add((payload["name"], payload["strategy"]))
 
     def refresh_series_catalog_for_authors(self, authors: List[str]) -> None:
         if not authors:
@@ -2422,12 +2513,31 @@ class BookService:
         print("\n" + stats.report() + "\n")
         return result
 
+    def optimize_lots(self, time_budget: float = DEFAULT_TIME_BUDGET, seed: Optional[int] = None) -> LotPlan:
+        """
+        Partition accepted books into non-overlapping lots and singles.
+
+        The current lot skeletons (author, series, genre groups) are the
+        candidate groupings; each book ends up in at most one of them or is
+        listed on its own, maximising expected profit after fees. The plan
+        reports how far the greedy "first suggestion wins" split is behind.
+        """
+        books = self.list_books()
+        if not books:
+            return optimize_lot_assignment([], [], time_budget=0)
+        with timer("Build lot skeletons for optimizer", log=True, record=True):
+            candidates = self.build_lot_candidates(fetch_pricing=False)
+        with timer("Optimize lot assignment", log=True, record=True):
+            return optimize_lot_assignment(books, candidates, time_budget=time_budget, seed=seed)
+
     def _enrich_candidates_with_pricing(self, candidates: List[LotCandidate]) -> List[LotCandidate]:
         """
         Enrich lot candidates with eBay market pricing.
 
         This is the SLOW operation that makes eBay API calls. Only call this for
         candidates that need pricing updates (e.g., affected lots in incremental update).
+        Candidates sharing a search term share one query, and unique queries
+        run concurrently (see ``lots.enrich_lots_with_pricing``).
 
         Args:
             candidates: List of lot candidates to enrich
@@ -2435,10 +2545,10 @@ class BookService:
         Returns:
             List of enriched lot candidates with market pricing
         """
-        from isbn_lot_optimizer.lots import _enrich_lot_with_pricing
+        from isbn_lot_optimizer.lots import enrich_lots_with_pricing
         from shared.models import LotSuggestion
 
-        enriched = []
+        entries = []
         for candidate in candidates:
             # Get the books for this lot
             books = candidate.books if hasattr(candidate, 'books') and candidate.books else []
@@ -2460,15 +2570,18 @@ class BookService:
                 use_lot_pricing=candidate.use_lot_pricing,
                 individual_value=candidate.estimated_value,  # Use estimated_value as individual_value
             )
-
-            # Enrich the lot suggestion with pricing
-            enriched_suggestion = _enrich_lot_with_pricing(
+            entries.append((
                 suggestion,
-                books=books,
-                series_name=getattr(candidate, 'series_name', None),
-                author_name=getattr(candidate, 'canonical_author', None)
-            )
+                books,
+                getattr(candidate, 'series_name', None),
+                getattr(candidate, 'canonical_author', None),
+            ))
+
+        # Enrich all lot suggestions with pricing in one batch
+        enriched_suggestions = enrich_lots_with_pricing(entries)
 
+        enriched = []
+        for candidate, enriched_suggestion in zip(candidates, enriched_suggestions):
             # Update candidate with enriched pricing data
             candidate.estimated_value = enriched_suggestion.estimated_value
             candidate.lot_market_value = enriched_suggestion.lot_market_value
@@ -2484,71 +2597,197 @@ class BookService:
 
     def update_lots_for_isbn(self, isbn: str) -> List[LotSuggestion]:
         """
-        Incrementally update only the lots that contain the specified ISBN.
+        Incrementally update only the lots affected by a change to ``isbn``.
 
-        This uses the optimized incremental update architecture:
-        1. Build ALL lot skeletons WITHOUT pricing (fast, ~1s for 175 lots)
-        2. Filter to only lots containing the ISBN
-        3. Enrich ONLY affected lots with eBay pricing (1-3 API calls instead of 122)
+        See ``update_lots_for_isbns``.
+        """
+        return self.update_lots_for_isbns([isbn])
 
-        This achieves 20-40x speedup compared to full regeneration.
+    def update_lots_for_isbns(self, isbns: Iterable[str]) -> List[LotSuggestion]:
+        """
+        Incrementally update only the lots affected by changes to ``isbns``.
+
+        Uses the persistent lot index (author/series/genre keys -> lot ids,
+        see ``DatabaseManager.rebuild_lot_index``):
+        1. Sync the index with the book change log; any book whose group
+           keys changed (accept, delete, metadata edit) marks its old and
+           new keys as affected
+        2. Expand the affected keys to every lot indexed under them and to
+           those lots' own keys, until the set is closed
+        3. Rebuild lot skeletons from only the books under those keys and
+           replace the affected lots
+        4. Enrich with eBay pricing only lots whose membership changed
+
+        Work is proportional to the size of the affected groups, not the
+        catalogue. All ISBNs share one scope, so a batch (e.g. a bulk delete)
+        rebuilds each affected group once.
 
         Args:
-            isbn: The ISBN of the book to update lots for
+            isbns: ISBNs of the books to update lots for
 
         Returns:
-            List of updated lot suggestions (only the affected ones)
+            List of rebuilt lot suggestions (only the ones whose books changed)
         """
-        from shared.utils import normalise_isbn
-
-        normalized_isbn = normalise_isbn(isbn)
-        if not normalized_isbn:
+        targets = {norm for norm in (normalise_isbn(isbn) for isbn in isbns) if norm}
+        if not targets:
             return []
 
-        # Get the book to check it exists
-        book = self.get_book(normalized_isbn)
-        if not book:
+        if self.db.fetch_lot_index_cursor() is None:
+            with timer("Build lot index", log=True, record=True):
+                self._rebuild_lot_index()
+
+        # Nothing to do for ISBNs we have never seen (or never lotted)
+        targets = (
+            set(self.db.fetch_books_by_isbns(targets))
+            | set(self.db.fetch_book_group_keys(targets))
+            | {isbn for isbn in targets if self.db.fetch_lot_ids_for_keys([("isbn", isbn)])}
+        )
+        if not targets:
             return []
 
-        print(f"\n⚡ Incremental lot update for ISBN {normalized_isbn}")
+        label = next(iter(targets)) if len(targets) == 1 else f"{len(targets)} ISBNs"
+        print(f"\n⚡ Incremental lot update for {label}")
         stats = get_stats()
         stats.start()
 
         with timer("TOTAL: Incremental lot update", log=True, record=True):
-            # Phase 1: Build ALL lot skeletons WITHOUT pricing (fast - no eBay API calls)
-            with timer("Phase 1: Build lot skeletons (no pricing)", log=True, record=True):
-                all_skeleton_candidates = self.build_lot_candidates(fetch_pricing=False)
-
-            # Phase 2: Filter to only lots containing the new ISBN
-            with timer("Phase 2: Filter to affected lots", log=True, record=True):
-                affected_skeletons = [
-                    lot for lot in all_skeleton_candidates
-                    if normalized_isbn in lot.book_isbns
-                ]
-
-            if not affected_skeletons:
-                print(f"  No lots contain ISBN {normalized_isbn}, skipping update")
-                return []
-
-            print(f"  Found {len(affected_skeletons)} affected lots (out of {len(all_skeleton_candidates)} total)")
-            print(f"  Savings: {((len(all_skeleton_candidates) - len(affected_skeletons)) / len(all_skeleton_candidates) * 100):.1f}% fewer eBay calls")
-
-            # Phase 3: Enrich ONLY affected lots with eBay pricing (1-3 API calls)
-            with timer("Phase 3: Enrich affected lots with pricing", log=True, record=True):
-                enriched_candidates = self._enrich_candidates_with_pricing(affected_skeletons)
-
-            # Upsert enriched lots to database (preserves unaffected lots)
-            with timer("Upsert updated lots", log=True, record=True):
-                payloads = [self._lot_to_payload(lot) for lot in enriched_candidates]
+            kinds = self._lot_index_kinds()
+            with timer("Phase 1: Sync lot index", log=True, record=True):
+                scope = {key for key in self._sync_lot_index(targets) if key[0] in kinds}
+
+            # Phase 2: grow the scope until every lot touching it is complete
+            with timer("Phase 2: Rebuild affected lot skeletons", log=True, record=True):
+                lot_ids: set = set()
+                while True:
+                    lot_ids |= self.db.fetch_lot_ids_for_keys(scope | {("isbn", isbn) for isbn in targets})
+                    grown = set(scope)
+                    for keys in self.db.fetch_lot_index_keys(lot_ids).values():
+                        grown |= {key for key in keys if key[0] in kinds}
+                    books = self._accepted_books(self.db.fetch_isbns_for_group_keys(grown) | targets)
+                    book_keys = {book.isbn: book_group_keys(book) for book in books}
+                    candidates = self.build_lot_candidates(fetch_pricing=False, books=books) if books else []
+                    candidate_keys = [self._shared_group_keys(c.book_isbns, book_keys) for c in candidates]
+                    for keys in candidate_keys:
+                        grown |= {key for key in keys if key[0] in kinds}
+                    if grown == scope:
+                        break
+                    scope = grown
+
+            old_rows = self.db.fetch_lots_by_ids(lot_ids)
+            old_by_members = {
+                (row["strategy"], frozenset(json.loads(row["book_isbns"] or "[]"))): row for row in old_rows
+            }
+
+            # Lots with no shared key can't be checked for completeness; keep
+            # them only if they hold one of the ISBNs or replace an affected lot
+            kept: List[Tuple[LotCandidate, set]] = []
+            for candidate, keys in zip(candidates, candidate_keys):
+                members = (candidate.strategy, frozenset(candidate.book_isbns))
+                if keys or targets.intersection(candidate.book_isbns) or members in old_by_members:
+                    kept.append((candidate, keys))
+
+            changed: List[LotCandidate] = []
+            for candidate, _keys in kept:
+                row = old_by_members.get((candidate.strategy, frozenset(candidate.book_isbns)))
+                if row is None:
+                    changed.append(candidate)
+                else:
+                    self._copy_lot_pricing(candidate, row)
+
+            print(f"  {len(old_rows)} affected lots, {len(kept)} rebuilt from {len(books)} books, {len(changed)} changed")
+
+            # Phase 3: Enrich ONLY lots whose membership changed with eBay pricing
+            with timer("Phase 3: Enrich changed lots with pricing", log=True, record=True):
+                self._enrich_candidates_with_pricing(changed)
+
+            with timer("Replace affected lots", log=True, record=True):
+                self.db.delete_lots_by_ids(lot_ids)
+                payloads = [self._lot_to_payload(lot) for lot, _keys in kept]
+                # Same naming as save_lots, so no rebuilt lot replaces another
+                self._dedupe_lot_names(payloads, taken=self.db.fetch_lot_names())
                 self.db.upsert_lots(payloads)
+                self.db.index_lots({
+                    (payload["name"], payload["strategy"]): keys
+                    for payload, (_lot, keys) in zip(payloads, kept)
+                })
 
             with timer("Convert to suggestions", log=True, record=True):
-                result = [self._candidate_to_suggestion(lot) for lot in enriched_candidates]
+                result = [self._candidate_to_suggestion(lot) for lot in changed]
 
         # Print timing report
         print("\n" + stats.report() + "\n")
         return result
 
+    def _lot_index_kinds(self) -> set[str]:
+        """Group kinds the active lot strategies can form lots from."""
+        strategies = set(getattr(self, "lot_strategies", None) or ())
+        if strategies:
+            return strategies & {"author", "series", "genre"}
+        return {"author", "series"}
+
+    def _accepted_books(self, isbns: Iterable[str]) -> List[BookEvaluation]:
+        """Decode the accepted books among ``isbns``, newest first (list_books order)."""
+        generation = self._book_snapshot.generation
+        rows = [
+            row for row in self.db.fetch_books_by_isbns(isbns).values()
+            if ((row["status"] if "status" in row.keys() else None) or "ACCEPT") == "ACCEPT"
+        ]
+        rows.sort(key=lambda row: row["updated_at"] or "", reverse=True)
+        return [self._book_snapshot.evaluation_for_row(row, generation) for row in rows]
+
+    @staticmethod
+    def _shared_group_keys(isbns: Iterable[str], book_keys: Dict[str, set]) -> set:
+        members = [book_keys[isbn] for isbn in isbns if isbn in book_keys]
+        return set.intersection(*members) if members else set()
+
+    def _rebuild_lot_index(self) -> None:
+        """Recompute the lot index from every accepted book and stored lot."""
+        cursor = self.db.fetch_change_cursor()
+        book_keys = {book.isbn: book_group_keys(book) for book in self.list_books()}
+        lot_keys = {
+            int(row["id"]): self._shared_group_keys(json.loads(row["book_isbns"] or "[]"), book_keys)
+            for row in self.db.fetch_lots()
+        }
+        self.db.rebuild_lot_index(book_keys, lot_keys, cursor)
+
+    def _sync_lot_index(self, isbns: set) -> set:
+        """
+        Bring book group keys up to date with the change log.
+
+        Returns the old and new keys of every book whose keys changed since
+        the index cursor, plus the keys of ``isbns`` themselves.
+        """
+        head = self.db.fetch_change_cursor()
+        since = self.db.fetch_lot_index_cursor() or 0
+        changed = {row["isbn"] for row in self.db.fetch_changes_since(since, until=head)}
+        changed |= isbns
+
+        old_keys = self.db.fetch_book_group_keys(changed)
+        new_keys = {book.isbn: book_group_keys(book) for book in self._accepted_books(changed)}
+        affected: set = set()
+        for changed_isbn in changed:
+            before = old_keys.get(changed_isbn, set())
+            after = new_keys.get(changed_isbn, set())
+            if changed_isbn in isbns or before != after:
+                affected |= before | after
+        self.db.update_book_group_keys({i: new_keys.get(i, set()) for i in changed}, head)
+        return affected
+
+    @staticmethod
+    def _copy_lot_pricing(lot: LotCandidate, row) -> None:
+        """Carry stored pricing over to a rebuilt lot whose books did not change."""
+        lot.estimated_value = row["estimated_value"] or 0.0
+        lot.probability_score = row["probability_score"] or 0.0
+        lot.probability_label = row["probability_label"] or lot.probability_label
+        lot.sell_through = row["sell_through"]
+        lot.justification = (row["justification"] or "").split("\n") if row["justification"] else []
+        lot.probability_reasons = ""
+        lot.lot_market_value = row["lot_market_value"]
+        lot.lot_optimal_size = row["lot_optimal_size"]
+        lot.lot_per_book_price = row["lot_per_book_price"]
+        lot.lot_comps_count = row["lot_comps_count"]
+        lot.use_lot_pricing = bool(row["use_lot_pricing"])
+
     # ------------------------------------------------------------------
     # Internal helpers
 
@@ -3351,6 +3590,102 @@ class BookService:
             ledger[lot_key] = entry
             self.db.update_book_market_json(book.isbn, market_blob)
 
+    def _get_evaluation_executor(self) -> ThreadPoolExecutor:
+        # Concurrent first scans (web worker threads) must share one pool
+        with self._evaluation_executor_lock:
+            if self._evaluation_executor is None:
+                self._evaluation_executor = ThreadPoolExecutor(
+                    max_workers=EVALUATION_MAX_WORKERS,
+                    thread_name_prefix="evaluate-isbn",
+                )
+            return self._evaluation_executor
+
+    def _evaluate_bookscouter_metadata(
+        self, isbn: str
+    ) -> Tuple[Optional[BookMetadata], Optional[int]]:
+        """Fetch BookScouter metadata and Amazon rank for evaluate_isbn."""
+        metadata: Optional[BookMetadata] = None
+        amazon_rank: Optional[int] = None
+        try:
+            with timer(f"BookScouter metadata: {isbn}", log=True, record=False):
+                raw = fetch_bookscouter_metadata(
+                    isbn,
+                    api_key=self.bookscouter_api_key,
+                    base_url=self.bookscouter_base_url,
+                    timeout=int(self.bookscouter_timeout),
+                    session=self._bookscouter_session,
+                )
+            if raw:
+                rank_value = raw.get("AmazonSalesRank")
+                if rank_value:
+                    try:
+                        amazon_rank = int(rank_value)
+                    except (ValueError, TypeError):
+                        pass
+                metadata = self._build_metadata_from_bookscouter(isbn, raw)
+        except BookScouterAPIError:
+            pass  # Caller falls back to Google Books
+        return metadata, amazon_rank
+
+    def _evaluate_google_metadata(self, isbn: str) -> Optional[BookMetadata]:
+        with timer(f"Google Books metadata: {isbn}", log=True, record=False):
+            metadata_payload = fetch_metadata(self.metadata_session, isbn, delay=self.metadata_delay)
+            return self._build_metadata_from_payload(isbn, metadata_payload)
+
+    def _evaluate_market_stats(
+        self, isbn: str
+    ) -> Tuple[Optional[EbayMarketStats], Optional[Dict[str, Any]]]:
+        """
+        Fetch eBay market stats for evaluate_isbn.
+
+        Uses the v2 API (Browse API + sold comps, Track B), which only needs
+        EBAY_CLIENT_ID/EBAY_CLIENT_SECRET. Returns the converted stats and the
+        raw v2 dict (used for estimated_price and persistence).
+        """
+        try:
+            with timer(f"eBay market stats v2: {isbn}", log=True, record=False):
+                stats_dict = fetch_market_stats_v2(isbn, include_sold_comps=True)
+        except Exception as e:
+            print(f"⚠️  eBay market data fetch failed: {e}")
+            return None, None
+        if not stats_dict or "error" in stats_dict:
+            return None, None
+        market_stats = EbayMarketStats(
+            isbn=isbn,
+            active_count=stats_dict.get("active_count", 0) or 0,
+            active_avg_price=stats_dict.get("median_price"),  # Use median as avg
+            active_median_price=stats_dict.get("median_price"),
+            sold_count=stats_dict.get("sold_count", 0) or 0,
+            sold_avg_price=None,  # Not available from Browse API
+            sold_median_price=None,  # Not available from Browse API
+            sell_through_rate=stats_dict.get("sell_through"),
+            currency="USD",
+            # Sold comps from Track B (active listing estimate)
+            sold_comps_count=stats_dict.get("sold_comps_count"),
+            sold_comps_min=stats_dict.get("sold_comps_min"),
+            sold_comps_median=stats_dict.get("sold_comps_median"),
+            sold_comps_max=stats_dict.get("sold_comps_max"),
+            sold_comps_is_estimate=stats_dict.get("sold_comps_is_estimate", True),
+            sold_comps_source=stats_dict.get("sold_comps_source", "estimate"),
+            sold_comps_last_sold_date=stats_dict.get("sold_comps_last_sold_date"),
+            # Smart filtering metadata
+            signed_listings_detected=stats_dict.get("signed_listings_detected"),
+            lot_listings_detected=stats_dict.get("lot_listings_detected"),
+            filtered_count=stats_dict.get("filtered_count"),
+            total_listings=stats_dict.get("total_listings"),
+        )
+        return market_stats, stats_dict
+
+    def _evaluate_booksrun_offer(self, isbn: str, condition: Optional[str]) -> Optional[BooksRunOffer]:
+        with timer(f"BooksRun offer: {isbn}", log=True, record=False):
+            return self._fetch_booksrun_offer(isbn, condition=condition)
+
+    def _evaluate_bookscouter_offers(self, isbn: str) -> Optional[BookScouterResult]:
+        # Always fetch Amazon data (includes price, rank, count)
+        # Even if we got rank from metadata fetch, we need price and count
+        with timer(f"BookScouter offers (+ Amazon): {isbn}", log=True, record=False):
+            return self._fetch_bookscouter_offers_internal(isbn, fetch_amazon_rank=True)
+
     def _fetch_booksrun_offer(self, isbn: str, *, condition: Optional[str]) -> Optional[BooksRunOffer]:
         if not self.booksrun_api_key:
             return None
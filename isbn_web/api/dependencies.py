@@ -1,7 +1,6 @@
 """Dependency injection for FastAPI routes."""
 from __future__ import annotations
 
-import sqlite3
 from typing import Generator
 
 from shared.database import DatabaseManager
@@ -14,27 +13,14 @@ _book_service: BookService | None = None
 
 
 class ThreadSafeDatabaseManager(DatabaseManager):
-    """Database manager that creates thread-safe connections for FastAPI."""
-
-    def __init__(self, db_path):
-        """Initialize with a single shared connection."""
-        self._conn = None  # Initialize before super().__init__ calls _get_connection
-        super().__init__(db_path)
-
-    def _get_connection(self) -> sqlite3.Connection:
-        """
-        Create a thread-safe connection for web requests.
+    """
+    Database manager used by the FastAPI routes.
 
-        Override parent method to use check_same_thread=False,
-        which is safe in FastAPI's single-threaded request handling.
-        """
-        if self._conn is None:
-            self._conn = sqlite3.connect(
-                self.db_path,
-                check_same_thread=False  # Allow use across FastAPI threads
-            )
-            self._conn.row_factory = sqlite3.Row
-        return self._conn
+    ``DatabaseManager`` now goes through the shared connection pool in
+    ``shared.db_pool`` (one locked writer, read-only readers, WAL), which is
+    safe across FastAPI's worker threads. The subclass is kept so existing
+    imports and isinstance checks continue to work.
+    """
 
 
 def get_book_service() -> Generator[BookService, None, None]:
@@ -0,0 +1,138 @@
+"""Background job queue wiring for the web app.
+
+Refresh and cover-fix jobs run on the durable ``JobQueue`` (jobs.db) instead
+of in-process background tasks, so they use several workers, respect the
+shared API rate limiters, retry failures and resume after a restart.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from isbn_lot_optimizer.job_queue import JobQueue, PermanentFailure
+from isbn_lot_optimizer.service import BookService
+
+from ..config import settings
+from .dependencies import get_book_service
+
+logger = logging.getLogger(__name__)
+
+REFRESH_JOB = "refresh_books"
+FIX_COVERS_JOB = "fix_covers"
+
+# Cover URL templates to try, best first
+COVER_URL_TEMPLATES = (
+    "https://covers.openlibrary.org/b/isbn/{isbn}-L.jpg",
+    "https://covers.openlibrary.org/b/isbn/{isbn}-M.jpg",
+)
+
+_job_queue: Optional[JobQueue] = None
+_job_queue_lock = threading.Lock()
+
+
+def _rate_limiters() -> Dict[str, Any]:
+    """Token buckets shared with EnrichmentCoordinator where the API overlaps."""
+    from isbn_lot_optimizer.enrichment_coordinator import EnrichmentCoordinator, RateLimiter
+
+    coordinator = EnrichmentCoordinator.get_instance()
+    return {
+        "ebay": coordinator.rate_limiters["ebay_browse"],
+        "bookscouter": RateLimiter(name="BookScouter API", rate_per_second=1.0, burst_capacity=3),
+        "openlibrary": RateLimiter(name="OpenLibrary Covers", rate_per_second=2.0, burst_capacity=4),
+    }
+
+
+def _refreshes_offers(payload: Dict[str, Any]) -> bool:
+    """Whether a refresh item asks for buyback offers; items without data_types do."""
+    data_types = payload.get("data_types")
+    return data_types is None or "bookscouter" in data_types
+
+
+def register_job_handlers(queue: JobQueue, service: BookService) -> None:
+    """Register the refresh and cover-fix handlers on ``queue``."""
+    limiters = _rate_limiters()
+
+    def refresh_book(isbn: str, payload: Dict[str, Any]) -> None:
+        service.refresh_book_market(
+            isbn, recalc_lots=False, include_offers=_refreshes_offers(payload)
+        )
+
+    def refresh_limiters(payload: Dict[str, Any]) -> List[Any]:
+        # eBay is always re-fetched; BookScouter only when offers are
+        selected = [limiters["ebay"]]
+        if _refreshes_offers(payload):
+            selected.append(limiters["bookscouter"])
+        return selected
+
+    def refresh_done(job: Dict[str, Any]) -> None:
+        # Recalculate lots once at the end if market data was refreshed
+        data_types = job.get("params", {}).get("data_types") or []
+        if "market" in data_types and job.get("completed"):
+            service.recalculate_lots()
+            logger.info(f"Recalculated lots after refresh job {job['job_id']}")
+
+    def fix_cover(isbn: str, payload: Dict[str, Any]) -> None:
+        row = service.db.fetch_book(isbn)
+        if row is None:
+            raise PermanentFailure("book not found")
+        try:
+            metadata = json.loads(row["metadata_json"] or "{}")
+        except Exception:
+            metadata = {}
+
+        # Skip if already has a cover (unless force_recheck)
+        if (metadata.get("cover_url") or metadata.get("thumbnail")) and not payload.get("force_recheck"):
+            return
+
+        working_url = None
+        for template in COVER_URL_TEMPLATES:
+            url = template.format(isbn=isbn)
+            response = requests.head(url, timeout=10.0, allow_redirects=True)
+            if response.status_code == 200 and response.headers.get("content-type", "").startswith("image/"):
+                working_url = url
+                break
+        if working_url is None:
+            raise PermanentFailure("no cover found")
+
+        metadata["cover_url"] = working_url
+        metadata["thumbnail"] = working_url
+        service.db.update_book_record(isbn, metadata=metadata)
+
+    queue.register(
+        REFRESH_JOB,
+        refresh_book,
+        select_limiters=refresh_limiters,
+        on_complete=refresh_done,
+    )
+    queue.register(FIX_COVERS_JOB, fix_cover, limiters=[limiters["openlibrary"]])
+
+
+def get_job_queue() -> JobQueue:
+    """
+    FastAPI dependency returning the process-wide job queue.
+
+    Created on first use: registers handlers against the shared BookService,
+    puts interrupted items back to pending and starts the worker threads.
+    """
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            service = next(get_book_service())
+            queue = JobQueue(settings.JOBS_DB_PATH, workers=settings.JOB_WORKERS)
+            register_job_handlers(queue, service)
+            queue.start()
+            _job_queue = queue
+        return _job_queue
+
+
+def shutdown_job_queue() -> None:
+    """Stop the job workers; unfinished items resume on next start."""
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is not None:
+            _job_queue.stop()
+            _job_queue = None
@@ -0,0 +1,218 @@
+"""Run blocking BookService calls off the event loop.
+
+BookService methods do ``requests`` I/O and SQLite work synchronously. Called
+directly from an ``async def`` route they stall the event loop, so one slow
+eBay lookup freezes every other request along with the SSE and WebSocket
+streams. Routes call them through ``run_service`` instead:
+
+    book = await run_service("scan", service.scan_isbn, isbn, recalc_lots=False)
+
+which runs the call on a bounded worker pool, caps how many calls of a kind
+run at once, and turns overruns into HTTP 503/504. ``LoopLagMonitor`` samples
+event-loop lag so regressions show up in ``/health``.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Optional, TypeVar
+
+from fastapi import HTTPException
+
+from ..config import settings
+
+T = TypeVar("T")
+
+# Per-route-kind concurrency limits; kinds not listed share DEFAULT_ROUTE_LIMIT
+ROUTE_LIMITS: Dict[str, int] = {
+    "scan": 6,          # metadata + market + vendor lookups
+    "evaluate": 8,
+    "refresh": 4,
+    "list": 4,          # whole-catalogue reads and serialization
+    "update": 4,        # field edits; SQLite has a single writer anyway
+    "lots": 1,          # full lot regeneration; one at a time is plenty
+}
+DEFAULT_ROUTE_LIMIT = 8
+
+# Seconds a call may run (including time queued for its route slot)
+ROUTE_TIMEOUTS: Dict[str, float] = {
+    "scan": 60.0,
+    "evaluate": 30.0,
+    "refresh": 60.0,
+    "list": 60.0,
+    "update": 60.0,      # deletes re-price the affected lots
+    "lots": 300.0,
+}
+DEFAULT_ROUTE_TIMEOUT = 30.0
+
+
+class ServiceExecutor:
+    """Bounded thread pool plus per-kind semaphores for blocking service calls."""
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        # asyncio primitives belong to one event loop, so each loop gets its own
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._semaphores_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._in_flight: Dict[str, int] = {}
+        self._timeouts: Dict[str, int] = {}
+        self._rejected: Dict[str, int] = {}
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="service"
+                )
+            return self._executor
+
+    def _semaphore(self, kind: str) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._semaphores_lock:
+            semaphores = self._semaphores.get(loop)
+            if semaphores is None:
+                semaphores = self._semaphores[loop] = {}
+            sem = semaphores.get(kind)
+            if sem is None:
+                sem = semaphores[kind] = asyncio.Semaphore(ROUTE_LIMITS.get(kind, DEFAULT_ROUTE_LIMIT))
+            return sem
+
+    def _bump(self, counter: Dict[str, int], kind: str, delta: int = 1) -> None:
+        with self._stats_lock:
+            counter[kind] = counter.get(kind, 0) + delta
+
+    async def run(
+        self,
+        kind: str,
+        func: Callable[..., T],
+        *args: Any,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> T:
+        """
+        Run ``func(*args, **kwargs)`` on the worker pool.
+
+        Raises HTTPException(503) if no slot for ``kind`` frees up within the
+        timeout, and HTTPException(504) if the call itself overruns. A timed
+        out call keeps running in its worker thread and keeps its slot until
+        it finishes, so hung calls can't pile up past the kind's limit.
+        """
+        limit = ROUTE_TIMEOUTS.get(kind, DEFAULT_ROUTE_TIMEOUT) if timeout is None else timeout
+        deadline = time.monotonic() + limit
+        sem = self._semaphore(kind)
+        try:
+            await asyncio.wait_for(sem.acquire(), timeout=limit)
+        except asyncio.TimeoutError:
+            self._bump(self._rejected, kind)
+            raise HTTPException(status_code=503, detail=f"Too many concurrent {kind} requests")
+
+        self._bump(self._in_flight, kind)
+        loop = asyncio.get_running_loop()
+
+        def release(_future=None) -> None:
+            self._bump(self._in_flight, kind, -1)
+            sem.release()
+
+        def release_from_worker(_future) -> None:
+            # asyncio primitives are not thread-safe; release on the owning loop
+            try:
+                loop.call_soon_threadsafe(release)
+            except RuntimeError:
+                # The loop has closed; nothing is waiting on its semaphore
+                self._bump(self._in_flight, kind, -1)
+
+        try:
+            job = self._get_executor().submit(functools.partial(func, *args, **kwargs))
+        except BaseException:
+            release()
+            raise
+        job.add_done_callback(release_from_worker)
+
+        try:
+            # On timeout wait_for cancels the job, which only succeeds if it
+            # hasn't started yet; a running call holds its slot until done
+            return await asyncio.wait_for(
+                asyncio.wrap_future(job), timeout=max(0.0, deadline - time.monotonic())
+            )
+        except asyncio.TimeoutError:
+            self._bump(self._timeouts, kind)
+            raise HTTPException(status_code=504, detail=f"{kind} request timed out")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "max_workers": self.max_workers,
+                "in_flight": {k: v for k, v in self._in_flight.items() if v},
+                "timeouts": dict(self._timeouts),
+                "rejected": dict(self._rejected),
+            }
+
+    def shutdown(self) -> None:
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+        with self._semaphores_lock:
+            self._semaphores.clear()
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes up from a fixed-interval sleep."""
+
+    def __init__(self, interval: float = 0.5, window: int = 240):
+        self.interval = interval
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._max_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - started - self.interval)
+            self._samples.append(lag)
+            self._max_lag = max(self._max_lag, lag)
+
+    def stats(self) -> Dict[str, Any]:
+        samples = sorted(self._samples)
+        if not samples:
+            return {"samples": 0, "last_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+        return {
+            "samples": len(samples),
+            "last_ms": round(self._samples[-1] * 1000, 2),
+            "p95_ms": round(p95 * 1000, 2),
+            "max_ms": round(self._max_lag * 1000, 2),
+        }
+
+
+service_executor = ServiceExecutor(max_workers=settings.SERVICE_WORKERS)
+loop_lag_monitor = LoopLagMonitor()
+
+
+async def run_service(kind: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking service call for route ``kind`` on the shared worker pool."""
+    return await service_executor.run(kind, func, *args, **kwargs)
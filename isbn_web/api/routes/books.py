@@ -1,12 +1,16 @@
 """API routes for book management."""
 from __future__ import annotations
 
+from collections import OrderedDict
 from dataclasses import asdict
 from datetime import datetime, timezone
+import gzip
+import hashlib
 import json
 import logging
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from urllib.parse import quote_plus
 
 from fastapi import APIRouter, BackgroundTasks, Depends, Form, Request, Response
@@ -23,9 +27,15 @@ from shared.collectible_detection import CollectibleDetector
 from shared.reprint_detector import is_likely_reprint
 
 from ..dependencies import get_book_service
+from ..offload import run_service
 from ...config import settings
 from .sphere_viz import viz_broadcaster
 
+try:
+    import brotli  # optional: enables Content-Encoding: br for /api/books/all
+except ImportError:
+    brotli = None
+
 router = APIRouter()
 templates = Jinja2Templates(directory=str(settings.TEMPLATE_DIR))
 logger = logging.getLogger(__name__)
@@ -438,9 +448,208 @@ def _book_evaluation_to_dict(evaluation, routing_info: Optional[Dict] = None, ch
     return result
 
 
+# ----------------------------------------------------------------------------
+# /api/books/all sync helpers
+
+# Responses smaller than this are sent uncompressed
+_COMPRESS_MIN_BYTES = 1024
+
+# Field preset for fields=compact (dotted names select inside "metadata")
+_COMPACT_FIELDS = (
+    "isbn",
+    "quantity",
+    "condition",
+    "estimated_price",
+    "probability_score",
+    "probability_label",
+    "updated_at",
+    "metadata.title",
+    "metadata.authors",
+    "metadata.thumbnail",
+    "metadata.series_name",
+    "metadata.series_index",
+)
+
+# Most serialized books kept per database
+_BOOK_JSON_CACHE_MAX = 20000
+
+
+class _BookJsonCache:
+    """
+    Serialized books for one database, valid as of change cursor ``cursor``.
+
+    ``sync`` brings the cache up to a newer cursor by evicting only the
+    books in that slice of the change log, so unchanged books are not
+    re-serialized on every request and the full log is never re-read.
+    Entries are least-recently-used ordered and capped at ``max_entries``.
+    """
+
+    def __init__(self, max_entries: int = _BOOK_JSON_CACHE_MAX):
+        self.max_entries = max_entries
+        self.cursor = 0
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+
+    def sync(self, db: Any, current: int) -> None:
+        """Evict books changed between the last synced cursor and ``current``."""
+        with self._sync_lock:
+            since = self.cursor
+            if current == since:
+                return
+            # A cursor that went backwards means the catalogue was reset
+            changed = (
+                [row["isbn"] for row in db.fetch_changes_since(since, until=current)]
+                if current > since else None
+            )
+            with self._lock:
+                if changed is None:
+                    self._entries.clear()
+                else:
+                    for isbn in changed:
+                        self._entries.pop(isbn, None)
+                self.cursor = current
+
+    def serialize(self, evaluations: Iterable[Any], cursor: int) -> List[Dict[str, Any]]:
+        """
+        Serialize evaluations read after syncing to ``cursor``, reusing cached dicts.
+
+        New dicts are only cached while the cache is still at ``cursor``; if
+        another request synced past it, the evaluations may predate changes
+        that sync already evicted.
+        """
+        payload: List[Dict[str, Any]] = []
+        for evaluation in evaluations:
+            with self._lock:
+                cached = self._entries.get(evaluation.isbn)
+                if cached is not None:
+                    self._entries.move_to_end(evaluation.isbn)
+            if cached is not None:
+                payload.append(cached)
+                continue
+            book = _book_evaluation_to_dict(evaluation)
+            with self._lock:
+                if self.cursor == cursor:
+                    self._entries[evaluation.isbn] = book
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+            payload.append(book)
+        return payload
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_book_json_caches: Dict[str, _BookJsonCache] = {}
+_book_json_lock = threading.Lock()
+
+
+def _book_json_cache(service: BookService) -> _BookJsonCache:
+    key = str(Path(service.db.db_path).resolve())
+    with _book_json_lock:
+        cache = _book_json_caches.get(key)
+        if cache is None:
+            cache = _book_json_caches[key] = _BookJsonCache()
+        return cache
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Parse the ``fields`` query parameter; None means the full payload."""
+    if not fields:
+        return None
+    names: List[str] = []
+    for name in fields.split(","):
+        name = name.strip()
+        if name == "compact":
+            names.extend(_COMPACT_FIELDS)
+        elif name:
+            names.append(name)
+    if "isbn" not in names:
+        names.insert(0, "isbn")
+    return tuple(dict.fromkeys(names))
+
+
+def _project_book(book: Dict[str, Any], fields: Tuple[str, ...]) -> Dict[str, Any]:
+    """Keep only the requested fields (``metadata.title`` style selects nested keys)."""
+    projected: Dict[str, Any] = {}
+    for name in fields:
+        if "." in name:
+            parent, child = name.split(".", 1)
+            source = book.get(parent)
+            if isinstance(source, dict) and child in source:
+                projected.setdefault(parent, {})[child] = source[child]
+        elif name in book:
+            projected[name] = book[name]
+    return projected
+
+
+def _accepted_encodings(header: str) -> set[str]:
+    accepted: set[str] = set()
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                pass
+        if token:
+            accepted.add(token.strip().lower())
+    return accepted
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    wanted = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == wanted for tag in header.split(","))
+
+
+def _books_etag(cursor: int, requested: str, projection: Optional[Tuple[str, ...]]) -> str:
+    tag_source = f"{cursor}|{requested}|{','.join(projection or ())}"
+    return f'W/"books-{hashlib.sha1(tag_source.encode("utf-8")).hexdigest()[:16]}"'
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    return str(value)
+
+
+def _sync_response(request: Request, body: Any, etag: str, cursor: int) -> Response:
+    """Encode ``body`` as JSON, compressing per Accept-Encoding."""
+    data = json.dumps(
+        body, separators=(",", ":"), ensure_ascii=False, default=_json_default
+    ).encode("utf-8")
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "private, no-cache",
+        "Vary": "Accept-Encoding",
+        "X-Books-Cursor": str(cursor),
+    }
+    if len(data) >= _COMPRESS_MIN_BYTES:
+        accepted = _accepted_encodings(request.headers.get("accept-encoding", ""))
+        if brotli is not None and "br" in accepted:
+            data = brotli.compress(data, quality=5)
+            headers["Content-Encoding"] = "br"
+        elif "gzip" in accepted:
+            data = gzip.compress(data, compresslevel=6)
+            headers["Content-Encoding"] = "gzip"
+    return Response(content=data, media_type="application/json", headers=headers)
+
+
 @router.get("/all", response_class=JSONResponse)
 async def get_all_books_json(
+    request: Request,
     since: Optional[str] = None,
+    cursor: Optional[int] = None,
+    fields: Optional[str] = None,
     service: BookService = Depends(get_book_service),
 ):
     """
@@ -448,12 +657,46 @@ async def get_all_books_json(
 
     Query parameters:
     - since: Optional ISO 8601 timestamp. If provided, only returns books updated after this time.
+    - cursor: Optional change cursor for delta sync. Switches the response to
+      ``{"cursor", "full", "books", "deleted"}``: books changed since the
+      cursor plus tombstones for deleted ISBNs. Use 0 for the initial sync;
+      ``full`` is true when the client should replace its whole cache.
+    - fields: Optional comma-separated projection (e.g. ``isbn,estimated_price,metadata.title``)
+      or ``compact`` for a small list-view preset.
+
+    Every response carries an ETag and X-Books-Cursor. If-None-Match with a
+    current ETag, or a cursor equal to the current one, yields 304. Bodies are
+    gzip/brotli compressed when the client accepts it.
     """
+    projection = _parse_fields(fields)
+    current = service.db.fetch_change_cursor()
+    requested = "all" if cursor is None and not since else f"{cursor}:{since or ''}"
+    etag = _books_etag(current, requested, projection)
+
+    if _etag_matches(request, etag) or (cursor is not None and cursor == current):
+        return Response(
+            status_code=304,
+            headers={"ETag": etag, "X-Books-Cursor": str(current), "Cache-Control": "private, no-cache"},
+        )
 
-    if since:
-        evaluations = service.get_books_updated_since(since)
+    cache = _book_json_cache(service)
+    await run_service("list", cache.sync, service.db, current)
+    synced = current
+
+    deleted: List[str] = []
+    full = False
+    if cursor is not None:
+        # A cursor ahead of ours means the catalogue was reset, and one older
+        # than the pruned tombstones can't see every deletion; resync fully
+        full = cursor <= 0 or cursor > current or cursor < service.db.fetch_change_horizon()
+        changes = await run_service("list", service.get_book_changes, 0 if full else cursor)
+        current = changes["cursor"]
+        evaluations = changes["books"]
+        deleted = [] if full else changes["deleted"]
+    elif since:
+        evaluations = await run_service("list", service.get_books_updated_since, since)
     else:
-        evaluations = service.get_all_books()
+        evaluations = await run_service("list", service.get_all_books)
 
     # Broadcast DB read event
     try:
@@ -461,8 +704,73 @@ async def get_all_books_json(
     except Exception:
         pass  # Don't fail request if broadcast fails
 
-    payload = [_book_evaluation_to_dict(evaluation) for evaluation in evaluations]
-    return payload
+    books = await run_service("list", cache.serialize, evaluations, synced)
+    if projection is not None:
+        books = [_project_book(book, projection) for book in books]
+
+    etag = _books_etag(current, requested, projection)
+    if cursor is None:
+        return _sync_response(request, books, etag, current)
+    body = {"cursor": current, "full": full, "books": books, "deleted": deleted}
+    return _sync_response(request, body, etag, current)
+
+
+@router.get("/ml-estimates", response_class=JSONResponse)
+async def get_ml_estimates(
+    isbns: Optional[str] = None,
+    service: BookService = Depends(get_book_service),
+) -> JSONResponse:
+    """
+    ML price estimates for many books at once.
+
+    Query parameters:
+    - isbns: Optional comma-separated ISBNs (default: every accepted book)
+
+    Returns:
+        ``{isbn: {"price", "confidence", "reason", "model_version"}}``
+    """
+    from isbn_lot_optimizer.ml import get_ml_estimator
+
+    estimator = get_ml_estimator()
+    if not estimator or not estimator.is_ready():
+        return JSONResponse(
+            status_code=503,
+            content={"error": "ML model not available"}
+        )
+
+    wanted = [isbn.strip() for isbn in isbns.split(",") if isbn.strip()] if isbns else None
+    estimates = await run_service("list", service.estimate_ml_prices, wanted)
+    return JSONResponse(content={
+        isbn: {
+            "price": estimate.price,
+            "confidence": round(estimate.confidence, 2),
+            "reason": estimate.reason,
+            "model_version": estimate.model_version,
+        }
+        for isbn, estimate in estimates.items()
+    })
+
+
+def _scan_and_match_series(
+    service: BookService, normalized_isbn: str, condition: str, edition: Optional[str]
+):
+    """Scan an ISBN and try to attach it to a series (blocking; run via run_service)."""
+    evaluation = service.scan_isbn(
+        raw_isbn=normalized_isbn,
+        condition=condition,
+        edition=edition,
+    )
+
+    # Try to match the book to a series (non-blocking)
+    try:
+        db_path = Path(service.db.db_path)
+        series_match = match_and_attach_series(evaluation, db_path, auto_save=True)
+        if series_match:
+            logger.info(f"Matched {normalized_isbn} to series: {series_match['series_title']}")
+    except Exception as e:
+        # Don't fail the scan if series matching fails
+        logger.warning(f"Failed to match series for {normalized_isbn}: {e}")
+    return evaluation
 
 
 @router.post("/scan", response_class=HTMLResponse)
@@ -485,7 +793,7 @@ async def scan_book(
     if not normalized_isbn:
         response.headers["X-Success-Message"] = f"Invalid ISBN: {isbn}"
         # Return current books table
-        books = service.list_books()
+        books = await run_service("list", service.list_books)
         return templates.TemplateResponse(
             "components/book_table.html",
             {"request": request, "books": books},
@@ -493,31 +801,15 @@ async def scan_book(
 
     # Scan the book (adds to DB, fetches metadata, runs market lookup)
     try:
-        evaluation = service.scan_isbn(
-            raw_isbn=normalized_isbn,
-            condition=condition,
-            edition=edition or None,
+        evaluation = await run_service(
+            "scan", _scan_and_match_series, service, normalized_isbn, condition, edition or None
         )
 
-        # Try to match the book to a series (non-blocking)
-        try:
-            db_path = Path(service.db.db_path)
-            series_match = match_and_attach_series(evaluation, db_path, auto_save=True)
-            if series_match:
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.info(f"Matched {normalized_isbn} to series: {series_match['series_title']}")
-        except Exception as e:
-            # Don't fail the scan if series matching fails
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.warning(f"Failed to match series for {normalized_isbn}: {e}")
-
         # Set success message header
         response.headers["X-Success-Message"] = f"Added: {evaluation.title or normalized_isbn}"
 
         # Return updated books list
-        books = service.list_books()
+        books = await run_service("list", service.list_books)
         return templates.TemplateResponse(
             "components/book_table.html",
             {"request": request, "books": books, "selected_isbn": normalized_isbn},
@@ -525,7 +817,7 @@ async def scan_book(
 
     except Exception as e:
         response.headers["X-Success-Message"] = f"Error scanning {normalized_isbn}: {str(e)}"
-        books = service.list_books()
+        books = await run_service("list", service.list_books)
         return templates.TemplateResponse(
             "components/book_table.html",
             {"request": request, "books": books},
@@ -549,10 +841,10 @@ async def list_books(
     normalized_selected = normalise_isbn(selected_isbn) if selected_isbn and selected_isbn.strip() else None
 
     if search:
-        # Search by ISBN, title, or author
-        books = service.search_books(search)
+        # Ranked full-text search by ISBN, title, author, series or publisher
+        books = await run_service("list", service.search_books, search)
     else:
-        books = service.list_books()
+        books = await run_service("list", service.list_books)
 
     return templates.TemplateResponse(
         "components/book_table.html",
@@ -564,50 +856,12 @@ async def list_books(
     )
 
 
-@router.get("/{isbn}/evaluate")
-async def get_book_evaluation_json(
-    isbn: str,
-    condition: Optional[str] = None,
-    edition: Optional[str] = None,
-    service: BookService = Depends(get_book_service),
-) -> JSONResponse:
+def _evaluation_payload(book, condition: Optional[str], edition: Optional[str]) -> Dict[str, Any]:
     """
-    Get full evaluation data for a book as JSON (mobile-friendly endpoint).
+    Build the /evaluate response for ``book`` (blocking: ML routing, pricing).
 
-    Returns complete triage information including:
-    - Probability score and label
-    - Estimated resale price
-    - Justification/reasoning
-    - BookScouter offers
-    - Amazon sales rank
-    - Rarity score
-    - Series information
-    - Market data (eBay comps)
-
-    If condition or edition are provided, re-calculates evaluation with those attributes.
+    Runs on the service worker pool via run_service.
     """
-    normalized_isbn = normalise_isbn(isbn)
-
-    if not normalized_isbn:
-        return JSONResponse(
-            status_code=400,
-            content={"error": "Invalid ISBN", "isbn": isbn}
-        )
-
-    book = service.get_book(normalized_isbn)
-
-    # Broadcast DB read event
-    try:
-        await viz_broadcaster.database_read("get_book_evaluation", 1)
-    except Exception:
-        pass
-
-    if not book:
-        return JSONResponse(
-            status_code=404,
-            content={"error": "Book not found", "isbn": normalized_isbn}
-        )
-
     # Debug: print parameters received
     print(f"DEBUG: Received params - condition={condition!r}, edition={edition!r}")
     print(f"DEBUG: Book from DB - condition={book.condition!r}, edition={book.edition!r}")
@@ -622,7 +876,7 @@ async def get_book_evaluation_json(
         eval_condition = condition if condition is not None else book.condition
         eval_edition = edition if edition is not None else book.edition
 
-        logger.info(f"Re-evaluating {normalized_isbn}: condition={eval_condition}, edition={eval_edition}")
+        logger.info(f"Re-evaluating {book.isbn}: condition={eval_condition}, edition={eval_edition}")
 
         # Get Amazon rank from existing evaluation
         amazon_rank = None
@@ -633,12 +887,6 @@ async def get_book_evaluation_json(
         bookscouter_data = book.bookscouter
         booksrun_data = book.booksrun
 
-        # Broadcast ML prediction event
-        try:
-            await viz_broadcaster.ml_prediction("re_evaluation", 1)
-        except Exception:
-            pass
-
         # Rebuild evaluation with new attributes
         book = build_book_evaluation(
             isbn=book.isbn,
@@ -714,6 +962,61 @@ async def get_book_evaluation_json(
 
     result_dict = _book_evaluation_to_dict(book, routing_info=routing_info, channel_recommendation=channel_recommendation)
     print(f"DEBUG: Result dict - condition={result_dict.get('condition')!r}, edition={result_dict.get('edition')!r}")
+    return result_dict
+
+
+@router.get("/{isbn}/evaluate")
+async def get_book_evaluation_json(
+    isbn: str,
+    condition: Optional[str] = None,
+    edition: Optional[str] = None,
+    service: BookService = Depends(get_book_service),
+) -> JSONResponse:
+    """
+    Get full evaluation data for a book as JSON (mobile-friendly endpoint).
+
+    Returns complete triage information including:
+    - Probability score and label
+    - Estimated resale price
+    - Justification/reasoning
+    - BookScouter offers
+    - Amazon sales rank
+    - Rarity score
+    - Series information
+    - Market data (eBay comps)
+
+    If condition or edition are provided, re-calculates evaluation with those attributes.
+    """
+    normalized_isbn = normalise_isbn(isbn)
+
+    if not normalized_isbn:
+        return JSONResponse(
+            status_code=400,
+            content={"error": "Invalid ISBN", "isbn": isbn}
+        )
+
+    book = await run_service("evaluate", service.get_book, normalized_isbn)
+
+    # Broadcast DB read event
+    try:
+        await viz_broadcaster.database_read("get_book_evaluation", 1)
+    except Exception:
+        pass
+
+    if not book:
+        return JSONResponse(
+            status_code=404,
+            content={"error": "Book not found", "isbn": normalized_isbn}
+        )
+
+    if condition is not None or edition is not None:
+        # Broadcast ML prediction event
+        try:
+            await viz_broadcaster.ml_prediction("re_evaluation", 1)
+        except Exception:
+            pass
+
+    result_dict = await run_service("evaluate", _evaluation_payload, book, condition, edition)
     return JSONResponse(content=result_dict)
 
 
@@ -923,7 +1226,9 @@ async def accept_book(
 
     try:
         # Accept book WITHOUT lot regeneration (returns immediately)
-        book = service.accept_book(
+        book = await run_service(
+            "scan",
+            service.accept_book,
             normalized_isbn,
             condition=request.condition or "Good",
             edition=request.edition,
@@ -985,14 +1290,18 @@ async def refresh_book_data(
     try:
         # Use refresh_book_market to update market data from eBay, BookScouter, etc.
         # This method fetches fresh data and persists it to the database
-        book = service.refresh_book_market(
+        book = await run_service(
+            "refresh",
+            service.refresh_book_market,
             normalized_isbn,
             recalc_lots=False,  # Don't recalculate lots on refresh
         )
 
         if not book:
             # Book doesn't exist in database, scan it fresh
-            book = service.scan_isbn(
+            book = await run_service(
+                "scan",
+                service.scan_isbn,
                 normalized_isbn,
                 condition="Good",
                 edition=None,
@@ -1002,7 +1311,7 @@ async def refresh_book_data(
         else:
             # Reload from database to get the persisted v2_stats (sold_comps) data
             # refresh_book_market persists the data but doesn't return the complete object
-            book = service.get_book(normalized_isbn)
+            book = await run_service("evaluate", service.get_book, normalized_isbn)
 
         return templates.TemplateResponse(
             "components/book_detail.html",
@@ -1147,7 +1456,7 @@ async def update_book(
         fields["edition"] = edition
 
     try:
-        service.update_book_fields(normalized_isbn, fields)
+        await run_service("update", service.update_book_fields, normalized_isbn, fields)
         return JSONResponse({"message": "Book updated successfully"})
     except Exception as e:
         return JSONResponse({"error": str(e)}, status_code=500)
@@ -1168,7 +1477,7 @@ async def delete_book_json(
         )
 
     try:
-        service.delete_books([normalized_isbn])
+        await run_service("update", service.delete_books, [normalized_isbn])
         return JSONResponse(content={"message": "Book deleted", "isbn": normalized_isbn})
     except Exception as e:
         return JSONResponse(
@@ -1188,20 +1497,20 @@ async def delete_book(
     normalized_isbn = normalise_isbn(isbn)
 
     if not normalized_isbn:
-        books = service.list_books()
+        books = await run_service("list", service.list_books)
         return templates.TemplateResponse(
             "components/book_table.html",
             {"request": request, "books": books},
         )
 
     # Delete the book
-    service.delete_books([normalized_isbn])
+    await run_service("update", service.delete_books, [normalized_isbn])
 
     # Set success message
     response.headers["X-Success-Message"] = f"Deleted book: {normalized_isbn}"
 
     # Return updated book list
-    books = service.list_books()
+    books = await run_service("list", service.list_books)
     return templates.TemplateResponse(
         "components/book_table.html",
         {"request": request, "books": books},
@@ -1220,19 +1529,19 @@ async def bulk_delete_books(
     isbn_list = [isbn for isbn in isbn_list if isbn]  # Filter out invalid
 
     if not isbn_list:
-        books = service.list_books()
+        books = await run_service("list", service.list_books)
         return templates.TemplateResponse(
             "components/book_table.html",
             {"request": request, "books": books},
         )
 
     # Delete books
-    count = service.delete_books(isbn_list)
+    count = await run_service("update", service.delete_books, isbn_list)
 
     response.headers["X-Success-Message"] = f"Deleted {count} books"
 
     # Return updated list
-    books = service.list_books()
+    books = await run_service("list", service.list_books)
     return templates.TemplateResponse(
         "components/book_table.html",
         {"request": request, "books": books},
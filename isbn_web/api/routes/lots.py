@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from typing import List
 from pydantic import BaseModel
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Query, Request
 from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.templating import Jinja2Templates
 
@@ -11,6 +11,7 @@ from shared.models import LotSuggestion
 from isbn_lot_optimizer.service import BookService
 
 from ..dependencies import get_book_service
+from ..offload import run_service
 from ...config import settings
 from .books import _book_evaluation_to_dict
 
@@ -84,7 +85,7 @@ async def list_lots(
 
     Returns the lots table HTML partial.
     """
-    lots = service.list_lots()
+    lots = await run_service("list", service.list_lots)
 
     # Convert lots to serializable dictionaries for Alpine.js
     lots_data = [_lot_suggestion_to_dict(lot) for lot in lots]
@@ -113,7 +114,7 @@ async def regenerate_lots(
     Returns the updated lots table HTML.
     """
     # Regenerate lots
-    lots = service.recompute_lots()
+    lots = await run_service("lots", service.recompute_lots)
 
     # Convert lots to serializable dictionaries for Alpine.js
     lots_data = [_lot_suggestion_to_dict(lot) for lot in lots]
@@ -142,26 +143,13 @@ async def regenerate_lots_json(
     including lot market pricing integration.
     """
     # Recalculate lots (includes lot pricing integration)
-    lots = service.recompute_lots()
+    lots = await run_service("lots", service.recompute_lots)
 
     return [_lot_suggestion_to_dict(lot) for lot in lots]
 
 
-@router.get("/all", response_class=JSONResponse)
-@router.get("/all.json", response_class=JSONResponse)
-@router.get("/list", response_class=JSONResponse)
-@router.get("/list.json", response_class=JSONResponse)
-async def get_all_lots_json(
-    service: BookService = Depends(get_book_service),
-):
-    """
-    Return persisted lot suggestions as JSON.
-
-    Filters out lots where:
-    - Books have been deleted from catalog
-    - Books have status != 'ACCEPT'
-    - Fewer than 2 accepted books remain
-    """
+def _lots_with_accepted_books(service: BookService) -> List[LotSuggestion]:
+    """Persisted lots with 2+ accepted books attached (blocking; run via run_service)."""
     lots = service.list_lots()
     valid_lots = []
 
@@ -197,9 +185,58 @@ async def get_all_lots_json(
             lot.books = tuple(accepted_books)
             valid_lots.append(lot)
 
+    return valid_lots
+
+
+@router.get("/all", response_class=JSONResponse)
+@router.get("/all.json", response_class=JSONResponse)
+@router.get("/list", response_class=JSONResponse)
+@router.get("/list.json", response_class=JSONResponse)
+async def get_all_lots_json(
+    service: BookService = Depends(get_book_service),
+):
+    """
+    Return persisted lot suggestions as JSON.
+
+    Filters out lots where:
+    - Books have been deleted from catalog
+    - Books have status != 'ACCEPT'
+    - Fewer than 2 accepted books remain
+    """
+    valid_lots = await run_service("list", _lots_with_accepted_books, service)
     return [_lot_suggestion_to_dict(lot) for lot in valid_lots]
 
 
+@router.get("/optimized.json", response_class=JSONResponse)
+async def get_optimized_lots_json(
+    time_budget: float = Query(2.0, ge=0.0, le=60.0, description="Seconds to spend searching"),
+    service: BookService = Depends(get_book_service),
+):
+    """
+    Return a non-overlapping partition of accepted books into lots and singles.
+
+    Unlike /all, every book appears at most once. The summary compares the
+    optimised expected profit with the greedy split of the current suggestions.
+    """
+    plan = await run_service("lots", service.optimize_lots, time_budget)
+    return {
+        "summary": plan.summary(),
+        "lots": [
+            {
+                "name": lot.group.name,
+                "strategy": lot.group.strategy,
+                "book_isbns": lot.book_isbns,
+                "estimated_value": lot.estimated_value,
+                "probability": lot.probability,
+                "expected_profit": lot.expected_profit,
+                "singles_profit": lot.singles_profit,
+            }
+            for lot in plan.lots
+        ],
+        "singles": plan.singles,
+    }
+
+
 @router.get("/{lot_id:int}", response_class=HTMLResponse)
 async def get_lot_detail(
     request: Request,
@@ -211,7 +248,7 @@ async def get_lot_detail(
 
     Returns the lot detail HTML partial.
     """
-    lots = service.list_lots()
+    lots = await run_service("list", service.list_lots)
 
     # Find the lot by ID
     lot = None
@@ -227,7 +264,7 @@ async def get_lot_detail(
         )
 
     # Get books in this lot
-    books = service.get_books_for_lot(lot)
+    books = await run_service("list", service.get_books_for_lot, lot)
 
     # Convert books to serializable format for Alpine.js/carousel
     books_data = []
@@ -262,7 +299,7 @@ async def get_lot_carousel(
 
     Returns only the carousel partial (no lot details).
     """
-    lots = service.list_lots()
+    lots = await run_service("list", service.list_lots)
 
     # Find the lot by ID
     lot = None
@@ -278,7 +315,7 @@ async def get_lot_carousel(
         )
 
     # Get books in this lot
-    books = service.get_books_for_lot(lot)
+    books = await run_service("list", service.get_books_for_lot, lot)
 
     # Convert books to serializable format for carousel
     books_data = []
@@ -313,7 +350,7 @@ async def get_lot_details_page(
 
     Returns the complete lot details page.
     """
-    lots = service.list_lots()
+    lots = await run_service("list", service.list_lots)
 
     # Find the lot by ID
     lot = None
@@ -329,7 +366,7 @@ async def get_lot_details_page(
         )
 
     # Get books in this lot
-    books = service.get_books_for_lot(lot)
+    books = await run_service("list", service.get_books_for_lot, lot)
 
     # Convert books to serializable format for Alpine.js
     books_data = []
@@ -379,7 +416,7 @@ async def get_lot_edit_form(
 
     Returns the edit form HTML partial.
     """
-    lots = service.list_lots()
+    lots = await run_service("list", service.list_lots)
     lot = None
     for l in lots:
         if l.id == lot_id:
@@ -412,7 +449,7 @@ async def update_lot(
     # Get form data from request
     form_data = await request.form()
     
-    lots = service.list_lots()
+    lots = await run_service("list", service.list_lots)
     lot = None
     for l in lots:
         if l.id == lot_id:
@@ -438,7 +475,7 @@ async def update_lot(
         lot.justification = [line.strip() for line in justification_text.split('\n') if line.strip()]
 
     # Get books in this lot
-    books = service.get_books_for_lot(lot)
+    books = await run_service("list", service.get_books_for_lot, lot)
 
     # Calculate lot statistics
     total_books = len(books)
@@ -475,7 +512,7 @@ async def remove_book_from_lot(
     """
     # This would need to be implemented in the service
     # For now, return a placeholder response
-    lots = service.list_lots()
+    lots = await run_service("list", service.list_lots)
     lot = None
     for l in lots:
         if l.id == lot_id:
@@ -489,7 +526,7 @@ async def remove_book_from_lot(
         )
 
     # Get updated books list (in a real implementation, you'd remove the book)
-    books = service.get_books_for_lot(lot)
+    books = await run_service("list", service.get_books_for_lot, lot)
     # Filter out the removed book
     books = [b for b in books if b.isbn != book_id]
 
@@ -4,12 +4,15 @@ from __future__ import annotations
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional
+from uuid import uuid4
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 
+from isbn_lot_optimizer.job_queue import JobQueue
 from isbn_lot_optimizer.service import BookService
 from ..dependencies import get_book_service
+from ..jobs import REFRESH_JOB, get_job_queue
 
 router = APIRouter()
 
@@ -133,21 +136,23 @@ async def check_book_staleness(
 @router.post("/refresh-stale-data", response_model=RefreshJobResponse)
 async def trigger_stale_data_refresh(
     request: RefreshJobRequest,
-    background_tasks: BackgroundTasks,
     service: BookService = Depends(get_book_service),
+    queue: JobQueue = Depends(get_job_queue),
 ) -> RefreshJobResponse:
     """
     Trigger background refresh of stale data.
 
-    Queues a background job to refresh data for books with stale information.
-    Respects rate limits and prioritizes based on strategy.
+    Queues a durable job (see isbn_lot_optimizer.job_queue) to refresh data
+    for books with stale information. Items are processed by several workers
+    under the shared API rate limiters, retried with backoff, and resumed
+    after a server restart. Poll GET /jobs/{job_id} for progress.
     """
     # Get stale books based on data types requested
     stale_books = []
 
     if "market" in request.data_types:
         market_stale = service.db.fetch_books_needing_market_refresh(max_age_days=7)
-        stale_books.extend(market_stale)
+        stale_books.extend(dict(book) for book in market_stale)
 
     if "bookscouter" in request.data_types:
         bookscouter_stale = service.db.fetch_books_needing_bookscouter_refresh(max_age_days=14)
@@ -155,14 +160,14 @@ async def trigger_stale_data_refresh(
         existing_isbns = {book["isbn"] for book in stale_books}
         for book in bookscouter_stale:
             if book["isbn"] not in existing_isbns:
-                stale_books.append(book)
+                stale_books.append(dict(book))
 
     if "metadata" in request.data_types:
         metadata_stale = service.db.fetch_books_needing_metadata_refresh(max_age_days=90)
         existing_isbns = {book["isbn"] for book in stale_books}
         for book in metadata_stale:
             if book["isbn"] not in existing_isbns:
-                stale_books.append(book)
+                stale_books.append(dict(book))
 
     # Apply prioritization
     if request.priority == "high_value":
@@ -178,16 +183,11 @@ async def trigger_stale_data_refresh(
     # Limit to max_books
     books_to_refresh = stale_books[:request.max_books]
 
-    # Generate job ID
-    job_id = f"refresh_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}"
-
-    # Queue background task
-    background_tasks.add_task(
-        _refresh_books_background,
-        service=service,
-        books=books_to_refresh,
-        data_types=request.data_types,
-        job_id=job_id,
+    job_id = queue.enqueue(
+        REFRESH_JOB,
+        [(book["isbn"], {"data_types": list(request.data_types)}) for book in books_to_refresh],
+        params={"data_types": list(request.data_types), "priority": request.priority},
+        job_id=f"refresh_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}_{uuid4().hex[:6]}",
     )
 
     return RefreshJobResponse(
@@ -197,76 +197,40 @@ async def trigger_stale_data_refresh(
     )
 
 
-async def _refresh_books_background(
-    service: BookService,
-    books: List[Dict[str, Any]],
-    data_types: List[str],
-    job_id: str,
-) -> None:
-    """
-    Background task to refresh data for books.
-
-    Respects rate limits and logs progress.
-    """
-    import logging
-    import time
-
-    logger = logging.getLogger(__name__)
-    logger.info(f"Starting refresh job {job_id} for {len(books)} books")
-
-    success_count = 0
-    error_count = 0
-
-    for idx, book in enumerate(books):
-        isbn = book["isbn"]
-        try:
-            # Refresh the book (this will fetch fresh data from APIs)
-            service.refresh_book_market(
-                isbn,
-                recalc_lots=False,  # Don't recalculate lots after each book
-            )
-            success_count += 1
-
-            # Rate limiting: 1 request per second for eBay
-            if "market" in data_types and idx < len(books) - 1:
-                time.sleep(1.0)
-
-        except Exception as e:
-            logger.error(f"Failed to refresh {isbn}: {e}")
-            error_count += 1
-
-        # Log progress every 10 books
-        if (idx + 1) % 10 == 0:
-            logger.info(
-                f"Refresh job {job_id} progress: {idx + 1}/{len(books)} "
-                f"(success: {success_count}, errors: {error_count})"
-            )
-
-    # Recalculate lots once at the end if market data was refreshed
-    if "market" in data_types and success_count > 0:
-        try:
-            service.recalculate_lots()
-            logger.info(f"Recalculated lots after refresh job {job_id}")
-        except Exception as e:
-            logger.error(f"Failed to recalculate lots: {e}")
-
-    logger.info(
-        f"Refresh job {job_id} complete: "
-        f"{success_count} successful, {error_count} errors"
-    )
+@router.get("/jobs")
+async def list_refresh_jobs(
+    limit: int = 20,
+    queue: JobQueue = Depends(get_job_queue),
+) -> List[Dict[str, Any]]:
+    """List recent refresh jobs, newest first."""
+    return queue.list_jobs(kind=REFRESH_JOB, limit=limit)
 
 
 @router.get("/jobs/{job_id}")
-async def get_refresh_job_status(job_id: str) -> Dict[str, Any]:
+async def get_refresh_job_status(
+    job_id: str,
+    queue: JobQueue = Depends(get_job_queue),
+) -> Dict[str, Any]:
     """
     Get status of a refresh job.
 
-    Note: This is a placeholder. For production, implement proper job tracking
-    using Redis, Celery, or similar task queue.
+    Returns status (queued/running/completed/cancelled), item counts
+    (completed/failed/pending/running), progress as a 0-1 fraction and the
+    first few item errors.
     """
-    # TODO: Implement proper job status tracking
-    return {
-        "job_id": job_id,
-        "status": "running",
-        "message": "Job status tracking not yet implemented. Check server logs.",
-    }
+    job = queue.get_job(job_id)
+    if job is None or job["kind"] != REFRESH_JOB:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+
+@router.delete("/jobs/{job_id}")
+async def cancel_refresh_job(
+    job_id: str,
+    queue: JobQueue = Depends(get_job_queue),
+) -> Dict[str, Any]:
+    """Cancel the pending items of a job (items already running finish)."""
+    job = queue.get_job(job_id)
+    if job is None or job["kind"] != REFRESH_JOB or not queue.cancel(job_id):
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return queue.get_job(job_id)
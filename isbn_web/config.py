@@ -45,6 +45,12 @@ class Settings:
     HOST: str = os.getenv("HOST", "127.0.0.1")
     PORT: int = int(os.getenv("PORT", "8000"))
     DEBUG: bool = os.getenv("DEBUG", "false").lower() in ("true", "1", "yes")
+    # Worker threads for blocking BookService calls made from async routes
+    SERVICE_WORKERS: int = int(os.getenv("SERVICE_WORKERS", "16"))
+
+    # Background job queue (refresh / cover fix jobs)
+    JOBS_DB_PATH: Path = Path.home() / ".isbn_lot_optimizer" / "jobs.db"
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "4"))
 
     # Paths
     COVER_CACHE_DIR: Path = Path.home() / ".isbn_lot_optimizer" / "covers"
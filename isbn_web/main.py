@@ -6,6 +6,7 @@ from pathlib import Path
 from typing import TYPE_CHECKING
 
 import sys
+import threading
 
 from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.responses import HTMLResponse, Response as FastAPIResponse
@@ -21,12 +22,15 @@ if str(PROJECT_ROOT) not in sys.path:  # Ensure package imports work when run as
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from isbn_web.api.dependencies import cleanup_book_service, get_book_service
+from isbn_web.api.jobs import get_job_queue, shutdown_job_queue
+from isbn_web.api.offload import loop_lag_monitor, run_service, service_executor
 from isbn_web.api.routes import actions, books, covers, covers_check, ebay_listings, events, lots, refresh, sold_history, sphere_viz
 from isbn_web.api.routes.sphere_viz import viz_broadcaster
 from isbn_web.config import settings
 from isbn_web.logging_middleware import HTTPLoggingMiddleware
 from isbn_lot_optimizer.ml.monitor import ModelMonitor
 from isbn_lot_optimizer.ml.dashboard import MonitoringDashboard
+from shared.http_cache import get_http_cache
 
 if TYPE_CHECKING:  # pragma: no cover - import only for typing
     from isbn_lot_optimizer.service import BookService
@@ -44,11 +48,24 @@ async def lifespan(app: FastAPI):
 
     # Initialize ML estimator with monitor (must happen before any predictions)
     from isbn_lot_optimizer.ml import get_ml_estimator
-    get_ml_estimator(monitor=app.state.ml_monitor)
+    estimator = get_ml_estimator(monitor=app.state.ml_monitor)
+
+    # Models load lazily; warm them up off the event loop so startup isn't
+    # blocked and the first prediction doesn't pay for loading them
+    threading.Thread(target=estimator.warm_up, name="ml-warm-up", daemon=True).start()
+
+    # Track event-loop lag so blocking calls on the loop show up in /health
+    loop_lag_monitor.start()
+
+    # Start job workers so refresh/cover jobs interrupted by a restart resume
+    get_job_queue()
 
     yield
 
     # Shutdown: cleanup resources
+    await loop_lag_monitor.stop()
+    shutdown_job_queue()
+    service_executor.shutdown()
     cleanup_book_service()
 
 
@@ -57,8 +74,9 @@ class NoCacheMiddleware(BaseHTTPMiddleware):
 
     async def dispatch(self, request: Request, call_next):
         response = await call_next(request)
-        # Add no-cache headers for HTML and API responses
-        if isinstance(response, Response):
+        # Add no-cache headers for HTML and API responses; responses carrying
+        # an ETag (e.g. /api/books/all) set their own revalidation policy
+        if isinstance(response, Response) and "etag" not in response.headers:
             response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
             response.headers["Pragma"] = "no-cache"
             response.headers["Expires"] = "0"
@@ -162,7 +180,13 @@ async def ml_metrics(
 @app.get("/health")
 async def health_check():
     """Health check endpoint for monitoring."""
-    return {"status": "healthy"}
+    http_cache = get_http_cache()
+    return {
+        "status": "healthy",
+        "event_loop_lag": loop_lag_monitor.stats(),
+        "service_executor": service_executor.stats(),
+        "http_cache": http_cache.stats() if http_cache is not None else None,
+    }
 
 
 class ISBNRequest(BaseModel):
@@ -189,7 +213,7 @@ async def isbn_lookup(
     To accept the book into inventory, call POST /api/books/{isbn}/accept
     """
 
-    book = service.get_book(data.isbn)
+    book = await run_service("evaluate", service.get_book, data.isbn)
 
     # Broadcast DB read event
     try:
@@ -207,7 +231,9 @@ async def isbn_lookup(
 
             # Use scan_isbn to persist with REJECT status by default
             # User can later accept the book to change status to ACCEPT
-            book = service.scan_isbn(
+            book = await run_service(
+                "scan",
+                service.scan_isbn,
                 raw_isbn=data.isbn,
                 condition=data.condition or "Good",
                 edition=data.edition,
@@ -227,6 +253,8 @@ async def isbn_lookup(
                 pass
         except ValueError as exc:
             raise HTTPException(status_code=400, detail=str(exc)) from exc
+        except HTTPException:
+            raise
         except Exception as exc:  # pragma: no cover - defensive
             raise HTTPException(
                 status_code=502,
@@ -243,7 +271,9 @@ async def isbn_lookup(
                     pass
 
                 # Refresh market data for books that were scanned before Track B was fixed
-                refreshed_book = service.refresh_book_market(data.isbn, recalc_lots=False)
+                refreshed_book = await run_service(
+                    "refresh", service.refresh_book_market, data.isbn, recalc_lots=False
+                )
                 if refreshed_book:
                     book = refreshed_book
             except Exception:
@@ -262,8 +292,8 @@ async def isbn_lookup(
             update_fields["first_edition"] = 1 if data.first_edition else 0
         if update_fields:
             try:
-                service.update_book_fields(data.isbn, update_fields)
-                book = service.get_book(data.isbn)  # Refresh
+                await run_service("update", service.update_book_fields, data.isbn, update_fields)
+                book = await run_service("evaluate", service.get_book, data.isbn)  # Refresh
                 # Broadcast DB write event for attribute update
                 try:
                     await viz_broadcaster.database_write("update_fields", 1)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark PredictionRouter.predict_batch against per-book predict calls.
+
+Runs both paths over the same synthetic books (a mix that routes to the
+AbeBooks, eBay and unified models), checks that they agree, and reports
+books/second for each:
+
+    python scripts/benchmark_batch_prediction.py --books 5000
+    python scripts/benchmark_batch_prediction.py --model-dir ~/ISBN/isbn_lot_optimizer/models
+"""
+
+import random
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+# Add parent directory for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from isbn_lot_optimizer.ml.prediction_router import PredictionRouter
+from shared.models import BookMetadata, BookScouterResult, EbayMarketStats
+
+CONDITIONS = ["New", "Like New", "Very Good", "Good", "Acceptable", "Poor"]
+COVERS = [None, "Hardcover", "Paperback", "Mass Market Paperback"]
+
+
+def _synthetic_books(count: int, seed: int) -> list:
+    rng = random.Random(seed)
+    books = []
+    for n in range(count):
+        isbn = f"978{n:010d}"
+        has_abebooks = rng.random() < 0.5
+        has_market = rng.random() < 0.7
+        books.append({
+            "metadata": BookMetadata(
+                isbn=isbn,
+                title=f"Book {n}",
+                authors=("Some Author",),
+                published_year=rng.randint(1950, 2024),
+                page_count=rng.randint(80, 900),
+                cover_type=rng.choice(COVERS),
+            ),
+            "market": EbayMarketStats(
+                isbn=isbn,
+                active_count=rng.randint(0, 30),
+                active_avg_price=rng.uniform(5, 40),
+                sold_count=rng.randint(0, 20),
+                sold_avg_price=rng.uniform(5, 40),
+                sell_through_rate=rng.random(),
+                currency="USD",
+                active_median_price=rng.uniform(5, 40),
+            ) if has_market else None,
+            "bookscouter": BookScouterResult(
+                isbn_10="", isbn_13=isbn, amazon_sales_rank=rng.randint(1, 2_000_000)
+            ),
+            "condition": rng.choice(CONDITIONS),
+            "abebooks": {
+                "abebooks_avg_price": rng.uniform(4, 60),
+                "abebooks_min_price": rng.uniform(2, 20),
+                "abebooks_count": rng.randint(1, 40),
+            } if has_abebooks else None,
+        })
+    return books
+
+
+def main() -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark batched vs single-book ML prediction")
+    parser.add_argument("--model-dir", type=Path,
+                        default=Path(__file__).parent.parent / "isbn_lot_optimizer" / "models")
+    parser.add_argument("--books", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    router = PredictionRouter(model_dir=args.model_dir)
+    books = _synthetic_books(args.books, args.seed)
+
+    started = time.perf_counter()
+    single = [router.predict(**book) for book in books]
+    single_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    batch = router.predict_batch(books)
+    batch_elapsed = time.perf_counter() - started
+
+    mismatches = sum(
+        1 for (price, model, _), (expected, expected_model, _) in zip(batch, single)
+        if model != expected_model or abs(price - expected) > 1e-6 * max(1.0, abs(expected))
+    )
+    routes = Counter(model for _price, model, _info in batch)
+
+    print(f"{len(books)} books, routes: {dict(routes)}")
+    print(f"  predict       {single_elapsed:.2f}s ({len(books) / single_elapsed:.0f} books/s)")
+    print(f"  predict_batch {batch_elapsed:.2f}s ({len(books) / batch_elapsed:.0f} books/s), "
+          f"{single_elapsed / batch_elapsed:.1f}x")
+    print(f"  mismatches: {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
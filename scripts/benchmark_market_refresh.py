@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark collect_ebay_market_stats offline against recorded eBay responses.
+
+Record fixtures once with live credentials:
+
+    python scripts/benchmark_market_refresh.py --record fixtures/ --isbns isbns.txt
+
+then replay them through the local fixture server as often as needed:
+
+    python scripts/benchmark_market_refresh.py fixtures/ --isbns isbns.txt \\
+        --latency 0.25 --quota 5 --concurrency 8
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from shared.market import collect_ebay_market_stats
+from shared.market_refresh import AdaptiveRateLimiter, MarketFixtureServer
+
+
+def _read_isbns(path: Path) -> list:
+    return [line.strip() for line in path.read_text().splitlines() if line.strip()]
+
+
+def main() -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark bulk eBay market refresh")
+    parser.add_argument("fixtures", type=Path, nargs="?", help="Directory of recorded responses to replay")
+    parser.add_argument("--isbns", type=Path, required=True, help="File with one ISBN per line")
+    parser.add_argument("--record", type=Path, help="Call eBay live and save responses here")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=2.0, help="Starting calls/second")
+    parser.add_argument("--max-rate", type=float, default=10.0, help="Ceiling calls/second")
+    parser.add_argument("--latency", type=float, default=0.2, help="Replay: seconds per call")
+    parser.add_argument("--quota", type=float, help="Replay: calls/second before the server answers 429")
+    args = parser.parse_args()
+
+    isbns = _read_isbns(args.isbns)
+    limiter = AdaptiveRateLimiter(args.rate, max_rate=args.max_rate)
+    done = 0
+
+    def on_result(isbn, stats):
+        nonlocal done
+        done += 1
+        if done % 25 == 0:
+            print(f"  {done}/{len(isbns)}  rate={limiter.rate:.2f}/s")
+
+    kwargs = dict(concurrency=args.concurrency, limiter=limiter, on_result=on_result)
+    started = time.perf_counter()
+    if args.record:
+        app_id = os.getenv("EBAY_APP_ID")
+        if not app_id:
+            print("EBAY_APP_ID is required to record fixtures")
+            return 1
+        stats = collect_ebay_market_stats(isbns, app_id, record_dir=args.record, **kwargs)
+    elif args.fixtures:
+        with MarketFixtureServer(args.fixtures, latency=args.latency, quota_per_second=args.quota) as server:
+            stats = collect_ebay_market_stats(isbns, "dry-run", replay_url=server.url, **kwargs)
+    else:
+        parser.error("pass a fixtures directory or --record")
+    elapsed = time.perf_counter() - started
+
+    print(f"{len(stats)}/{len(isbns)} ISBNs in {elapsed:.1f}s "
+          f"({len(isbns) / elapsed:.2f} ISBN/s), limiter: {limiter.stats()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
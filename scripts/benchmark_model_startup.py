@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark ML startup: import, estimator construction, warm-up and first prediction.
+
+Each measurement runs in a fresh interpreter so nothing is already imported
+or loaded:
+
+    python scripts/benchmark_model_startup.py
+    python scripts/benchmark_model_startup.py --model-dir ~/ISBN/isbn_lot_optimizer/models --runs 5
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Runs in a child interpreter; prints a JSON dict of phase -> seconds
+PROBE = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+timings = {{}}
+started = time.perf_counter()
+from isbn_lot_optimizer.ml import get_ml_estimator
+timings["import"] = time.perf_counter() - started
+
+started = time.perf_counter()
+estimator = get_ml_estimator({model_dir!r})
+timings["construct"] = time.perf_counter() - started
+
+if {warm_up!r}:
+    started = time.perf_counter()
+    estimator.warm_up()
+    timings["warm_up"] = time.perf_counter() - started
+
+from shared.models import BookMetadata, EbayMarketStats
+started = time.perf_counter()
+estimator.estimate_price(
+    BookMetadata(isbn="9780000000001", title="Benchmark", page_count=320, published_year=2001),
+    EbayMarketStats(isbn="9780000000001", active_count=4, active_avg_price=12.0, sold_count=3,
+                    sold_avg_price=10.0, sell_through_rate=0.4, currency="USD", active_median_price=11.0),
+    None,
+)
+timings["first_prediction"] = time.perf_counter() - started
+print(json.dumps(timings))
+"""
+
+
+def _probe(model_dir, warm_up: bool) -> dict:
+    code = PROBE.format(root=str(PROJECT_ROOT), model_dir=str(model_dir) if model_dir else None, warm_up=warm_up)
+    result = subprocess.run([sys.executable, "-W", "ignore", "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark ML model startup time")
+    parser.add_argument("--model-dir", type=Path, help="Model directory (default: ML_MODEL_DIR or package models)")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    for label, warm_up in (("lazy (load on first prediction)", False), ("warm-up at startup", True)):
+        runs = [_probe(args.model_dir, warm_up) for _ in range(args.runs)]
+        print(f"{label}, median of {args.runs} runs:")
+        for phase in runs[0]:
+            print(f"  {phase:<17} {statistics.median(run[phase] for run in runs) * 1000:8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,41 +2,135 @@
 """
 Training Orchestrator - Coordinates retraining of all ML models.
 
-Runs all training scripts in sequence:
-1. Main price model
-2. Specialist models (AbeBooks, Alibris, Amazon, Biblio, eBay, ZVAB)
-3. Lot model
-4. Meta-model (stacking ensemble)
+Runs the training scripts as a dependency graph:
+- Main price model, the six specialist models (AbeBooks, Alibris, Amazon,
+  Biblio, eBay, ZVAB), the lot model and the out-of-fold predictions have
+  no dependencies and run in parallel within a CPU budget
+- The meta-model (stacking ensemble) waits for the out-of-fold predictions
+
+A step is skipped when its inputs (script and shared training code, the
+training databases, and the steps it depends on) are unchanged since its
+last successful run and its model files are still the ones it wrote.
 
 Handles model backups, validation, and rollback on failure.
 """
 
+import argparse
+import hashlib
+import json
+import os
 import sys
 import subprocess
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Dict, Optional, Sequence, Tuple
 
 # Add project to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from isbn_lot_optimizer.ml.model_versioner import ModelVersioner
+from scripts.stacking.dataset_cache import data_version
 from shared.training_detector import TrainingDataDetector
 
 
+@dataclass(frozen=True)
+class TrainingStep:
+    """One training script in the retraining graph."""
+
+    name: str  # Key in training_results
+    label: str
+    script: str  # Relative to the project root
+    outputs: Tuple[str, ...]  # Model files it writes, relative to the model directory
+    depends_on: Tuple[str, ...] = ()
+
+
+def _specialist_step(platform: str, label: str) -> TrainingStep:
+    return TrainingStep(
+        name=f"specialist_{platform}",
+        label=f"{label} specialist",
+        script=f"scripts/stacking/train_{platform}_model.py",
+        outputs=tuple(f"stacking/{platform}_{suffix}" for suffix in ("model.pkl", "scaler.pkl", "metadata.json")),
+    )
+
+
+TRAINING_STEPS = (
+    TrainingStep(
+        "main_model", "Main price model", "scripts/train_price_model.py",
+        ("price_v1.pkl", "scaler_v1.pkl", "metadata.json"),
+    ),
+    _specialist_step("abebooks", "AbeBooks"),
+    _specialist_step("alibris", "Alibris"),
+    _specialist_step("amazon", "Amazon"),
+    _specialist_step("biblio", "Biblio"),
+    _specialist_step("ebay", "eBay"),
+    _specialist_step("zvab", "ZVAB"),
+    TrainingStep(
+        "lot_model", "Lot model", "scripts/stacking/train_lot_model.py",
+        ("stacking/lot_model.pkl", "stacking/lot_scaler.pkl", "stacking/lot_metadata.json"),
+    ),
+    TrainingStep(
+        "oof_predictions", "Out-of-fold predictions", "scripts/stacking/generate_oof_predictions.py",
+        ("stacking/oof_predictions.pkl", "stacking/oof_metadata.json"),
+    ),
+    TrainingStep(
+        "meta_model", "Meta-model (ensemble)", "scripts/stacking/train_meta_model.py",
+        ("stacking/meta_model.pkl", "stacking/meta_metadata.json"),
+        depends_on=("oof_predictions",),
+    ),
+)
+
+# Code every training script imports besides its own source
+SHARED_SOURCES = (
+    "scripts/stacking/data_loader.py",
+    "scripts/stacking/dataset_cache.py",
+    "scripts/stacking/training_utils.py",
+    "isbn_lot_optimizer/ml/feature_extractor.py",
+    "isbn_lot_optimizer/ml/feature_store.py",
+)
+
+# Caps OpenMP (XGBoost), BLAS and joblib (n_jobs=-1) threads in a training subprocess
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "LOKY_MAX_CPU_COUNT")
+
+SCRIPT_TIMEOUT_SECONDS = 600
+
+
 class TrainingOrchestrator:
     """Orchestrates the complete model retraining pipeline."""
 
-    def __init__(self):
-        self.project_root = Path(__file__).parent.parent
-        self.versioner = ModelVersioner()
+    def __init__(
+        self,
+        cpu_budget: Optional[int] = None,
+        steps: Sequence[TrainingStep] = TRAINING_STEPS,
+        project_root: Optional[Path] = None,
+        state_path: Optional[Path] = None,
+    ):
+        """
+        Initialize the orchestrator.
+
+        Args:
+            cpu_budget: Cores shared by concurrently running steps (default: all)
+            steps: Training graph (default: TRAINING_STEPS)
+            project_root: Repository root the step scripts are relative to
+            state_path: Where step fingerprints are recorded between runs
+        """
+        self.project_root = Path(project_root) if project_root else Path(__file__).parent.parent
+        self.model_dir = self.project_root / "isbn_lot_optimizer" / "models"
+        self.cpu_budget = max(1, cpu_budget or os.cpu_count() or 1)
+        self.steps = list(steps)
+        self.state_path = state_path or Path.home() / ".isbn_lot_optimizer" / "training_steps.json"
+        self.versioner = ModelVersioner(self.model_dir)
         self.detector = TrainingDataDetector()
         self.training_results = {}
 
-    def run_full_training(self) -> Dict[str, any]:
+    def run_full_training(self, force: bool = False) -> Dict[str, any]:
         """
         Run complete training pipeline with backup and validation.
 
+        Args:
+            force: Retrain every step even if its inputs are unchanged
+
         Returns:
             Dictionary with training results and metrics
         """
@@ -44,9 +138,11 @@ class TrainingOrchestrator:
         print("ML Model Training Orchestrator")
         print("=" * 70)
         print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"CPU budget: {self.cpu_budget} cores")
         print()
 
         start_time = datetime.now()
+        self.training_results = {}
 
         try:
             # Step 1: Create backup of current models
@@ -55,48 +151,14 @@ class TrainingOrchestrator:
             backup_version = self.versioner.backup_current_models()
             print()
 
-            # Step 2: Train main price model
-            print("🎯 Step 2: Training main price model...")
-            print("-" * 70)
-            main_result = self._run_training_script("scripts/train_price_model.py")
-            self.training_results["main_model"] = main_result
-            print()
-
-            # Step 3: Train specialist models
-            print("🔬 Step 3: Training specialist models...")
-            print("-" * 70)
-            specialist_scripts = [
-                ("AbeBooks", "scripts/stacking/train_abebooks_model.py"),
-                ("Alibris", "scripts/stacking/train_alibris_model.py"),
-                ("Amazon", "scripts/stacking/train_amazon_model.py"),
-                ("Biblio", "scripts/stacking/train_biblio_model.py"),
-                ("eBay", "scripts/stacking/train_ebay_model.py"),
-                ("ZVAB", "scripts/stacking/train_zvab_model.py"),
-            ]
-
-            for name, script in specialist_scripts:
-                print(f"\n  Training {name} specialist...")
-                result = self._run_training_script(script)
-                self.training_results[f"specialist_{name.lower()}"] = result
-
-            print()
-
-            # Step 4: Train lot model
-            print("📚 Step 4: Training lot model...")
+            # Step 2: Train models in dependency order
+            print("🎯 Step 2: Training models...")
             print("-" * 70)
-            lot_result = self._run_training_script("scripts/stacking/train_lot_model.py")
-            self.training_results["lot_model"] = lot_result
+            step_state = self.run_steps(force=force)
             print()
 
-            # Step 5: Train meta-model
-            print("🎓 Step 5: Training meta-model (ensemble)...")
-            print("-" * 70)
-            meta_result = self._run_training_script("scripts/stacking/train_meta_model.py")
-            self.training_results["meta_model"] = meta_result
-            print()
-
-            # Step 6: Validate models
-            print("✅ Step 6: Validating trained models...")
+            # Step 3: Validate models
+            print("✅ Step 3: Validating trained models...")
             print("-" * 70)
             validation_passed = self._validate_models()
 
@@ -108,9 +170,10 @@ class TrainingOrchestrator:
             print("✅ All models validated successfully!")
             print()
 
-            # Step 7: Mark training as completed
-            print("📝 Step 7: Updating training state...")
+            # Step 4: Mark training as completed
+            print("📝 Step 4: Updating training state...")
             print("-" * 70)
+            self._save_step_state(step_state)
             self.detector.mark_training_completed()
             print()
 
@@ -147,19 +210,175 @@ class TrainingOrchestrator:
                 "results": self.training_results,
             }
 
-    def _run_training_script(self, script_path: str) -> Dict[str, any]:
+    def run_steps(self, force: bool = False) -> Dict[str, dict]:
+        """
+        Run the training graph, in parallel where dependencies allow.
+
+        Ready steps share the free cores of the CPU budget; a step whose
+        dependencies failed is not run. Results land in training_results.
+
+        Args:
+            force: Retrain every step even if its inputs are unchanged
+
+        Returns:
+            Step state to record once the run is validated
+        """
+        steps = {step.name: step for step in self.steps}
+        fingerprints = self._step_fingerprints()
+        state = {} if force else self._load_step_state()
+        results = {}
+        pending = [step.name for step in self.steps]
+        running = {}
+        cores_in_use = 0
+
+        with ThreadPoolExecutor(max_workers=max(1, len(self.steps))) as pool:
+            while pending or running:
+                ready = []
+                for name in list(pending):
+                    step = steps[name]
+                    if any(dep not in results for dep in step.depends_on):
+                        continue
+                    failed = [dep for dep in step.depends_on if not results[dep].get("success")]
+                    if failed:
+                        print(f"  ⏭️ {step.label}: not run, {', '.join(failed)} failed")
+                        results[name] = {"success": False, "error": f"Dependency failed: {', '.join(failed)}"}
+                        pending.remove(name)
+                    elif self._is_current(step, fingerprints[name], state.get(name), results):
+                        print(f"  ⏭️ {step.label}: inputs unchanged, skipped")
+                        results[name] = {
+                            "success": True,
+                            "skipped": True,
+                            "mae": state[name].get("mae"),
+                            "elapsed_seconds": 0.0,
+                        }
+                        pending.remove(name)
+                    else:
+                        ready.append(name)
+
+                # Start as many ready steps as the free cores allow
+                for position, name in enumerate(ready):
+                    cores = max(1, (self.cpu_budget - cores_in_use) // (len(ready) - position))
+                    if running and cores_in_use + cores > self.cpu_budget:
+                        break
+                    step = steps[name]
+                    print(f"  ▶️ {step.label}: started ({cores} cores)")
+                    future = pool.submit(self._run_training_script, step.script, cores, step.label)
+                    running[future] = (step, cores)
+                    cores_in_use += cores
+                    pending.remove(name)
+
+                if not running:
+                    # Only skips and failures this round; they may unblock dependents
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    step, cores = running.pop(future)
+                    cores_in_use -= cores
+                    results[step.name] = future.result()
+
+        # Report in graph order rather than completion order
+        self.training_results.update((step.name, results[step.name]) for step in self.steps)
+
+        step_state = dict(state)
+        for step in self.steps:
+            result = results[step.name]
+            if result.get("success") and not result.get("skipped"):
+                step_state[step.name] = {
+                    "fingerprint": fingerprints[step.name],
+                    "mae": result.get("mae"),
+                }
+        return step_state
+
+    def _step_fingerprints(self) -> Dict[str, str]:
+        """Hash of each step's inputs, including the fingerprints of its dependencies."""
+        shared = hashlib.sha256(data_version().encode())
+        for source in SHARED_SOURCES:
+            shared.update(self._file_digest(source).encode())
+
+        fingerprints = {}
+        remaining = list(self.steps)
+        while remaining:
+            progressed = False
+            for step in list(remaining):
+                if any(dep not in fingerprints for dep in step.depends_on):
+                    continue
+                digest = hashlib.sha256(shared.digest())
+                digest.update(self._file_digest(step.script).encode())
+                for dep in step.depends_on:
+                    digest.update(fingerprints[dep].encode())
+                fingerprints[step.name] = digest.hexdigest()
+                remaining.remove(step)
+                progressed = True
+            if not progressed:
+                raise ValueError(f"Training steps have unknown or circular dependencies: {[s.name for s in remaining]}")
+        return fingerprints
+
+    def _file_digest(self, relative_path: str) -> str:
+        try:
+            return hashlib.sha256((self.project_root / relative_path).read_bytes()).hexdigest()
+        except OSError:
+            return "missing"
+
+    def _output_signatures(self, step: TrainingStep) -> Optional[Dict[str, list]]:
+        """(mtime_ns, size) of each output file, or None if one is missing."""
+        signatures = {}
+        for output in step.outputs:
+            try:
+                stat = (self.model_dir / output).stat()
+            except OSError:
+                return None
+            signatures[output] = [stat.st_mtime_ns, stat.st_size]
+        return signatures
+
+    def _is_current(self, step: TrainingStep, fingerprint: str, recorded: Optional[dict], results: Dict[str, dict]) -> bool:
+        """Whether the step's last successful run still stands for these inputs."""
+        if not recorded or recorded.get("fingerprint") != fingerprint:
+            return False
+        # A dependency that reran may have produced different outputs
+        if any(not results[dep].get("skipped") for dep in step.depends_on):
+            return False
+        return recorded.get("outputs") == self._output_signatures(step)
+
+    def _load_step_state(self) -> Dict[str, dict]:
+        try:
+            with open(self.state_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_step_state(self, step_state: Dict[str, dict]):
+        """Record fingerprints and output signatures of the validated run."""
+        for step in self.steps:
+            entry = step_state.get(step.name)
+            if entry is not None and "outputs" not in entry:
+                entry["outputs"] = self._output_signatures(step)
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(step_state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def _run_training_script(self, script_path: str, threads: Optional[int] = None, label: Optional[str] = None) -> Dict[str, any]:
         """
         Run a training script and capture results.
 
         Args:
             script_path: Path to training script relative to project root
+            threads: Cap on the script's OpenMP/BLAS/joblib threads (default: uncapped)
+            label: Prefix for progress lines when steps run concurrently
 
         Returns:
             Dictionary with training results (success, mae, time, etc.)
         """
         full_path = self.project_root / script_path
+        prefix = f"  [{label}]" if label else " "
         start_time = datetime.now()
 
+        env = os.environ.copy()
+        if threads is not None:
+            env.update({var: str(threads) for var in THREAD_ENV_VARS})
+
         try:
             # Run script with timeout
             result = subprocess.run(
@@ -167,7 +386,8 @@ class TrainingOrchestrator:
                 cwd=str(self.project_root),
                 capture_output=True,
                 text=True,
-                timeout=600,  # 10 minute timeout per script
+                timeout=SCRIPT_TIMEOUT_SECONDS,
+                env=env,
             )
 
             elapsed = (datetime.now() - start_time).total_seconds()
@@ -178,10 +398,11 @@ class TrainingOrchestrator:
             success = result.returncode == 0
 
             if success:
-                print(f"  ✅ Success (MAE: {mae:.2f}, {elapsed:.1f}s)")
+                mae_str = f"{mae:.2f}" if mae is not None else "N/A"
+                print(f"{prefix} ✅ Success (MAE: {mae_str}, {elapsed:.1f}s)")
             else:
-                print(f"  ❌ Failed (exit code: {result.returncode})")
-                print(f"  Error: {result.stderr[:200]}")
+                print(f"{prefix} ❌ Failed (exit code: {result.returncode})")
+                print(f"{prefix} Error: {result.stderr[:200]}")
 
             return {
                 "success": success,
@@ -193,14 +414,14 @@ class TrainingOrchestrator:
             }
 
         except subprocess.TimeoutExpired:
-            print(f"  ⏱️ Timeout after 10 minutes")
+            print(f"{prefix} ⏱️ Timeout after {SCRIPT_TIMEOUT_SECONDS // 60} minutes")
             return {
                 "success": False,
                 "error": "Timeout",
-                "elapsed_seconds": 600,
+                "elapsed_seconds": SCRIPT_TIMEOUT_SECONDS,
             }
         except Exception as e:
-            print(f"  ❌ Error: {e}")
+            print(f"{prefix} ❌ Error: {e}")
             return {
                 "success": False,
                 "error": str(e),
@@ -284,7 +505,8 @@ class TrainingOrchestrator:
                 mae = result.get("mae")
                 time = result.get("elapsed_seconds", 0)
                 mae_str = f"${mae:.2f}" if mae else "N/A"
-                print(f"  {model_name:25s}: MAE={mae_str:8s} ({time:.1f}s)")
+                timing = "unchanged" if result.get("skipped") else f"{time:.1f}s"
+                print(f"  {model_name:25s}: MAE={mae_str:8s} ({timing})")
             else:
                 error = result.get("error", "Unknown error")
                 print(f"  {model_name:25s}: ❌ FAILED ({error})")
@@ -292,8 +514,13 @@ class TrainingOrchestrator:
 
 def main():
     """Main entry point."""
-    orchestrator = TrainingOrchestrator()
-    result = orchestrator.run_full_training()
+    parser = argparse.ArgumentParser(description="Retrain all ML models")
+    parser.add_argument("--cpus", type=int, help="Cores shared by parallel training steps (default: all)")
+    parser.add_argument("--force", action="store_true", help="Retrain steps whose inputs are unchanged")
+    args = parser.parse_args()
+
+    orchestrator = TrainingOrchestrator(cpu_budget=args.cpus)
+    result = orchestrator.run_full_training(force=args.force)
 
     # Exit with appropriate code
     sys.exit(0 if result["success"] else 1)
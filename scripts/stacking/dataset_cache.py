@@ -0,0 +1,259 @@
+"""
+Cached, columnar training datasets shared by the stacking trainers.
+
+Every trainer used to call load_platform_training_data(), which reopens the
+catalog, training and metadata cache databases, json.loads every blob and
+then rebuilds the platform features row by row, so a full retrain built the
+same matrices more than ten times. This module builds each dataset once per
+data version and stores it on disk:
+
+- numeric arrays (X, y, ...) as one .npy file each, loaded memory-mapped
+  copy-on-write so trainers can slice or modify them without a copy of the
+  whole matrix and without touching the file
+- the remaining values (ISBNs, timestamps, price types, ...) in values.json
+
+A dataset is keyed by a content hash of its inputs: the size and mtime of
+the source databases (and their WAL files), the source of data_loader.py,
+the ML feature extractor and the feature store behind its BookFinder,
+sold-listing and author lookups, and the source file of the trainer's
+extract function. Changing any of them builds a fresh copy and removes the
+stale one.
+
+Usage:
+    X, y, isbns, completeness, timestamps, price_types = load_platform_dataset(
+        'abebooks', extract_features
+    )
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import sys
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from scripts.stacking import data_loader
+from scripts.stacking.data_loader import PlatformDataLoader
+
+DEFAULT_CACHE_DIR = Path.home() / '.isbn_lot_optimizer' / 'training_cache'
+CATALOG_DB = Path.home() / '.isbn_lot_optimizer' / 'catalog.db'
+
+# Bump to invalidate every cached dataset after a change to the storage layout
+FORMAT_VERSION = 1
+
+# Code every dataset depends on besides the trainer's own extract function
+_SHARED_SOURCES = (
+    Path(data_loader.__file__),
+    Path(__file__).parent.parent.parent / 'isbn_lot_optimizer' / 'ml' / 'feature_extractor.py',
+    Path(__file__).parent.parent.parent / 'isbn_lot_optimizer' / 'ml' / 'feature_store.py',
+)
+
+
+def source_databases() -> List[Path]:
+    """Databases the training data is loaded from."""
+    loader = PlatformDataLoader()
+    return [loader.catalog_db, loader.training_db, loader.cache_db]
+
+
+def data_version(databases: Optional[Sequence[Path]] = None) -> str:
+    """Hash of the source databases' (size, mtime); changes whenever one is written."""
+    digest = hashlib.sha256()
+    for db_path in databases if databases is not None else source_databases():
+        for path in (Path(db_path), Path(f"{db_path}-wal")):
+            try:
+                stat = path.stat()
+            except OSError:
+                digest.update(f"{path}:missing\n".encode())
+                continue
+            digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+def _function_source_file(func: Callable) -> Optional[Path]:
+    while isinstance(func, functools.partial):
+        func = func.func
+    try:
+        return Path(inspect.getsourcefile(func))
+    except (TypeError, OSError):
+        return None
+
+
+def dataset_key(name: str, extract: Callable, databases: Optional[Sequence[Path]] = None) -> str:
+    """Content hash identifying one version of a dataset."""
+    digest = hashlib.sha256(f"{FORMAT_VERSION}:{name}:{data_version(databases)}\n".encode())
+    sources = list(_SHARED_SOURCES)
+    extract_file = _function_source_file(extract)
+    if extract_file is not None:
+        sources.append(extract_file)
+    for path in sources:
+        try:
+            digest.update(path.read_bytes())
+        except OSError:
+            digest.update(f"{path}:missing\n".encode())
+    return digest.hexdigest()
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Cannot store {type(value).__name__} in a cached dataset")
+
+
+def _write_dataset(directory: Path, values: Tuple) -> None:
+    directory.mkdir(parents=True)
+    layout = []
+    other = {}
+    for position, value in enumerate(values):
+        if isinstance(value, np.ndarray) and value.dtype != object:
+            np.save(directory / f"{position}.npy", value, allow_pickle=False)
+            layout.append('array')
+        else:
+            other[str(position)] = value.tolist() if isinstance(value, np.ndarray) else list(value)
+            layout.append('object_array' if isinstance(value, np.ndarray) else 'list')
+    with open(directory / 'values.json', 'w') as f:
+        json.dump(other, f, default=_json_default)
+    # Written last: a directory without a manifest is an interrupted build
+    with open(directory / 'manifest.json', 'w') as f:
+        json.dump({'format_version': FORMAT_VERSION, 'layout': layout}, f)
+
+
+def _read_dataset(directory: Path) -> Tuple:
+    with open(directory / 'manifest.json') as f:
+        layout = json.load(f)['layout']
+    with open(directory / 'values.json') as f:
+        other = json.load(f)
+    values = []
+    for position, kind in enumerate(layout):
+        if kind == 'array':
+            values.append(np.load(directory / f"{position}.npy", mmap_mode='c', allow_pickle=False))
+        elif kind == 'object_array':
+            values.append(np.array(other[str(position)], dtype=object))
+        else:
+            values.append(other[str(position)])
+    return tuple(values)
+
+
+def cached_dataset(
+    name: str,
+    build: Callable[[], Tuple],
+    extract: Callable,
+    cache_dir: Optional[Path] = None,
+    rebuild: bool = False,
+) -> Tuple:
+    """
+    Return the tuple ``build()`` produces, from the on-disk cache when current.
+
+    Args:
+        name: Dataset name, unique per trainer and platform
+        build: Loads the training data and extracts features; called on a miss
+        extract: Feature extraction function ``build`` uses (part of the key)
+        cache_dir: Cache root (default: ~/.isbn_lot_optimizer/training_cache)
+        rebuild: Build even if a current copy exists
+
+    Returns:
+        Tuple with numpy arrays memory-mapped from the cache
+    """
+    cache_dir = Path(cache_dir) if cache_dir is not None else DEFAULT_CACHE_DIR
+    key = dataset_key(name, extract)
+    directory = cache_dir / f"{name}-{key[:16]}"
+
+    if not rebuild and (directory / 'manifest.json').exists():
+        try:
+            values = _read_dataset(directory)
+            print(f"   Using cached dataset {directory.name}")
+            return values
+        except (OSError, ValueError, KeyError) as e:
+            print(f"   ⚠ Cached dataset {directory.name} unreadable, rebuilding: {e}")
+
+    values = tuple(build())
+    staging = cache_dir / f".{directory.name}.{os.getpid()}"
+    shutil.rmtree(staging, ignore_errors=True)
+    try:
+        _write_dataset(staging, values)
+        shutil.rmtree(directory, ignore_errors=True)
+        os.replace(staging, directory)
+    except OSError as e:
+        # Another trainer may have published the same version concurrently
+        print(f"   ⚠ Could not cache dataset {directory.name}: {e}")
+        shutil.rmtree(staging, ignore_errors=True)
+        return values
+
+    # Drop older versions of this dataset
+    for stale in cache_dir.glob(f"{name}-*"):
+        if stale != directory and stale.name[len(name) + 1:].isalnum():
+            shutil.rmtree(stale, ignore_errors=True)
+
+    try:
+        return _read_dataset(directory)
+    except (OSError, ValueError, KeyError) as e:
+        # Another trainer replaced or removed the directory between our publish
+        # and this read; the values we just built are the same data
+        print(f"   ⚠ Cached dataset {directory.name} changed while reading, using built copy: {e}")
+        return values
+
+
+@functools.lru_cache(maxsize=1)
+def _platform_records(version: str) -> Dict[str, Tuple[List[dict], List[float]]]:
+    return data_loader.load_platform_training_data()
+
+
+@functools.lru_cache(maxsize=1)
+def _unified_records(version: str) -> Tuple[List[dict], List[float]]:
+    return data_loader.load_unified_cross_platform_data()
+
+
+def _dataset_name(prefix: str, extract: Callable) -> str:
+    func = extract
+    while isinstance(func, functools.partial):
+        func = func.func
+    module = Path(inspect.getsourcefile(func) or func.__module__).stem
+    return f"{prefix}-{module}.{func.__name__}"
+
+
+def load_platform_dataset(
+    platform: str,
+    extract: Callable,
+    cache_dir: Optional[Path] = None,
+    rebuild: bool = False,
+) -> Tuple:
+    """
+    Cached ``extract(records, targets, extractor, catalog_db_path)`` for one platform.
+
+    The raw platform data is loaded at most once per process and data
+    version, so building several platforms' datasets shares one load.
+
+    Args:
+        platform: Platform key in load_platform_training_data() ('ebay', 'abebooks', ...)
+        extract: The trainer's extract_features function
+        cache_dir: Cache root (default: ~/.isbn_lot_optimizer/training_cache)
+        rebuild: Build even if a current copy exists
+    """
+    from isbn_lot_optimizer.ml.feature_extractor import PlatformFeatureExtractor
+
+    def build():
+        records, targets = _platform_records(data_version())[platform]
+        return extract(records, targets, PlatformFeatureExtractor(), CATALOG_DB)
+
+    return cached_dataset(_dataset_name(platform, extract), build, extract, cache_dir, rebuild)
+
+
+def load_unified_dataset(
+    extract: Callable,
+    cache_dir: Optional[Path] = None,
+    rebuild: bool = False,
+) -> Tuple:
+    """Cached ``extract(records)`` over load_unified_cross_platform_data() records."""
+
+    def build():
+        records, _targets = _unified_records(data_version())
+        return extract(records)
+
+    return cached_dataset(_dataset_name('unified', extract), build, extract, cache_dir, rebuild)
@@ -4,12 +4,21 @@ Generate out-of-fold predictions for stacking ensemble meta-model.
 
 Uses 5-fold cross-validation to generate predictions from each base model
 without overfitting. These OOF predictions become features for the meta-model.
+
+Folds of all platforms are trained in a process pool. Each platform's OOF
+vector is cached under ~/.isbn_lot_optimizer/training_cache/oof, keyed by a
+hash of its feature matrix, targets and the base model hyperparameters, so
+only platforms whose data changed are recomputed.
 """
 
+import argparse
+import functools
+import hashlib
 import json
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import joblib
 import numpy as np
@@ -20,9 +29,35 @@ from sklearn.ensemble import GradientBoostingRegressor
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from scripts.stacking.data_loader import load_platform_training_data
+from scripts.stacking.dataset_cache import DEFAULT_CACHE_DIR, load_platform_dataset
 from scripts.stacking.training_utils import apply_log_transform, inverse_log_transform
-from isbn_lot_optimizer.ml.feature_extractor import PlatformFeatureExtractor
+
+# Meta-model feature order; eBay is the target dataset
+PLATFORMS = ['ebay', 'abebooks', 'amazon', 'biblio', 'alibris', 'zvab']
+PLATFORM_LABELS = {
+    'ebay': 'eBay',
+    'abebooks': 'AbeBooks',
+    'amazon': 'Amazon',
+    'biblio': 'Biblio',
+    'alibris': 'Alibris',
+    'zvab': 'Zvab',
+}
+
+# Base model fitted on every fold; part of the OOF cache key
+GBR_PARAMS = {
+    'n_estimators': 200,
+    'max_depth': 4,
+    'learning_rate': 0.05,
+    'subsample': 0.8,
+    'min_samples_split': 6,
+    'min_samples_leaf': 3,
+    'random_state': 42,
+    'loss': 'squared_error',
+    'verbose': 0,
+}
+KFOLD_SEED = 42
+
+OOF_CACHE_DIR = DEFAULT_CACHE_DIR / 'oof'
 
 
 def create_simple_objects(record: dict):
@@ -91,76 +126,94 @@ def extract_platform_features(records, platform, extractor, catalog_db_path):
     return np.array(X)
 
 
-def generate_oof_for_platform(
-    platform: str,
-    records: list,
-    targets: list,
-    catalog_db_path: Path,
-    n_folds: int = 5
-) -> Tuple[np.ndarray, Dict]:
-    """
-    Generate out-of-fold predictions for a single platform.
+def extract_platform_dataset(records, targets, extractor, catalog_db_path, platform):
+    """Extract platform-specific features, targets and ISBNs from records."""
+    X = extract_platform_features(records, platform, extractor, catalog_db_path)
+    return X, np.array(targets), [record['isbn'] for record in records]
+
+
+def load_platform_features(platform: str) -> Tuple[np.ndarray, np.ndarray, list]:
+    """(X, y, isbns) for a platform, from the shared training dataset cache."""
+    extract = functools.partial(extract_platform_dataset, platform=platform)
+    return load_platform_dataset(platform, extract)
+
+
+def fit_fold(X_train: np.ndarray, y_train: np.ndarray, X_val: np.ndarray) -> np.ndarray:
+    """Fit the base model on one fold and predict its held-out rows (runs in a worker process)."""
+    # Scale features
+    scaler = StandardScaler()
+    X_train_scaled = scaler.fit_transform(X_train)
+    X_val_scaled = scaler.transform(X_val)
+
+    # Train on log prices, predict back on the original scale
+    model = GradientBoostingRegressor(**GBR_PARAMS)
+    model.fit(X_train_scaled, np.log1p(y_train))
+    return np.expm1(model.predict(X_val_scaled))
+
+
+def submit_folds(pool: ProcessPoolExecutor, X: np.ndarray, y: np.ndarray, n_folds: int = 5) -> List[tuple]:
+    """Queue every fold of one platform; returns (val_idx, future) per fold."""
+    kfold = KFold(n_splits=n_folds, shuffle=True, random_state=KFOLD_SEED)
+    return [
+        (val_idx, pool.submit(fit_fold, np.asarray(X[train_idx]), np.asarray(y[train_idx]), np.asarray(X[val_idx])))
+        for train_idx, val_idx in kfold.split(X)
+    ]
+
+
+def oof_cache_key(X: np.ndarray, y: np.ndarray, n_folds: int) -> str:
+    """Hash of a platform's OOF inputs: data, fold layout and base model hyperparameters."""
+    digest = hashlib.sha256()
+    for array in (X, y):
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.shape}:{array.dtype}\n".encode())
+        digest.update(array.tobytes())
+    settings = {'params': GBR_PARAMS, 'n_folds': n_folds, 'kfold_seed': KFOLD_SEED}
+    digest.update(json.dumps(settings, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def load_cached_oof(platform: str, key: str, cache_dir: Path = OOF_CACHE_DIR) -> Optional[Tuple[np.ndarray, Dict]]:
+    """Cached (oof_predictions, metadata) for a platform, or None if missing or stale."""
+    path = cache_dir / f"{platform}.npz"
+    try:
+        with np.load(path, allow_pickle=False) as cached:
+            if str(cached['key']) != key:
+                return None
+            return cached['oof'], json.loads(str(cached['metadata']))
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def save_cached_oof(platform: str, key: str, oof_predictions: np.ndarray, metadata: Dict,
+                    cache_dir: Path = OOF_CACHE_DIR):
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_dir / f".{platform}.tmp.npz"
+    np.savez(tmp_path, key=np.array(key), oof=oof_predictions, metadata=np.array(json.dumps(metadata)))
+    tmp_path.replace(cache_dir / f"{platform}.npz")
+
+
+def _print_oof_metrics(metadata: Dict):
+    print(f"\n  Overall OOF Metrics:")
+    print(f"    MAE:  ${metadata['oof_mae']:.2f}")
+    print(f"    RMSE: ${metadata['oof_rmse']:.2f}")
+    print(f"    R²:   {metadata['oof_r2']:.3f}")
 
-    Args:
-        platform: Platform name ('ebay', 'abebooks', 'amazon', 'biblio', 'alibris', 'zvab')
-        records: List of book records
-        targets: List of target prices
-        catalog_db_path: Path to catalog database for BookFinder features
-        n_folds: Number of CV folds (default: 5)
 
-    Returns:
-        Tuple of (oof_predictions, metadata)
-    """
+def collect_oof(platform: str, y: np.ndarray, folds: List[tuple]) -> Tuple[np.ndarray, Dict]:
+    """Assemble a platform's OOF predictions from its submitted folds and report metrics."""
     print(f"\n{platform.upper()} Out-of-Fold Predictions:")
     print("-" * 60)
 
-    extractor = PlatformFeatureExtractor()
-    X = extract_platform_features(records, platform, extractor, catalog_db_path)
-    y = np.array(targets)
-
-    # Initialize OOF predictions array
+    y = np.asarray(y)
     oof_predictions = np.zeros(len(y))
+    n_folds = len(folds)
 
-    # 5-fold cross-validation
-    kfold = KFold(n_splits=n_folds, shuffle=True, random_state=42)
-
-    for fold, (train_idx, val_idx) in enumerate(kfold.split(X), 1):
-        print(f"  Fold {fold}/{n_folds}: ", end="", flush=True)
-
-        # Split data
-        X_train, X_val = X[train_idx], X[val_idx]
-        y_train, y_val = y[train_idx], y[val_idx]
-
-        # Apply log transform
-        y_train_log = np.log1p(y_train)
-
-        # Scale features
-        scaler = StandardScaler()
-        X_train_scaled = scaler.fit_transform(X_train)
-        X_val_scaled = scaler.transform(X_val)
-
-        # Train model
-        model = GradientBoostingRegressor(
-            n_estimators=200,
-            max_depth=4,
-            learning_rate=0.05,
-            subsample=0.8,
-            min_samples_split=6,
-            min_samples_leaf=3,
-            random_state=42,
-            loss='squared_error',
-            verbose=0
-        )
-
-        model.fit(X_train_scaled, y_train_log)
-
-        # Generate OOF predictions (inverse transform back to original scale)
-        y_val_pred_log = model.predict(X_val_scaled)
-        oof_predictions[val_idx] = np.expm1(y_val_pred_log)
+    for fold, (val_idx, future) in enumerate(folds, 1):
+        oof_predictions[val_idx] = future.result()
 
         # Calculate fold MAE
-        fold_mae = np.mean(np.abs(y_val - oof_predictions[val_idx]))
-        print(f"MAE ${fold_mae:.2f}")
+        fold_mae = np.mean(np.abs(y[val_idx] - oof_predictions[val_idx]))
+        print(f"  Fold {fold}/{n_folds}: MAE ${fold_mae:.2f}")
 
     # Calculate overall OOF metrics
     oof_mae = np.mean(np.abs(y - oof_predictions))
@@ -172,11 +225,6 @@ def generate_oof_for_platform(
     ss_tot = np.sum((y - np.mean(y)) ** 2)
     oof_r2 = 1 - (ss_res / ss_tot)
 
-    print(f"\n  Overall OOF Metrics:")
-    print(f"    MAE:  ${oof_mae:.2f}")
-    print(f"    RMSE: ${oof_rmse:.2f}")
-    print(f"    R²:   {oof_r2:.3f}")
-
     metadata = {
         'platform': platform,
         'n_samples': len(y),
@@ -187,32 +235,61 @@ def generate_oof_for_platform(
         'target_mean': float(np.mean(y)),
         'target_std': float(np.std(y)),
     }
+    _print_oof_metrics(metadata)
 
     return oof_predictions, metadata
 
 
-def generate_all_oof_predictions():
-    """Generate OOF predictions for all platforms and save."""
+def generate_oof_for_platform(
+    platform: str,
+    X: np.ndarray,
+    y: np.ndarray,
+    n_folds: int = 5,
+    pool: Optional[ProcessPoolExecutor] = None,
+) -> Tuple[np.ndarray, Dict]:
+    """
+    Generate out-of-fold predictions for a single platform.
+
+    Args:
+        platform: Platform name ('ebay', 'abebooks', 'amazon', 'biblio', 'alibris', 'zvab')
+        X: Platform feature matrix
+        y: Target prices
+        n_folds: Number of CV folds (default: 5)
+        pool: Process pool to train the folds in (default: a pool for this call)
+
+    Returns:
+        Tuple of (oof_predictions, metadata)
+    """
+    if pool is not None:
+        return collect_oof(platform, y, submit_folds(pool, X, y, n_folds))
+    with ProcessPoolExecutor(max_workers=min(n_folds, joblib.cpu_count())) as own_pool:
+        return collect_oof(platform, y, submit_folds(own_pool, X, y, n_folds))
+
+
+def generate_all_oof_predictions(n_jobs: Optional[int] = None, rebuild: bool = False, n_folds: int = 5):
+    """
+    Generate OOF predictions for all platforms and save.
+
+    Args:
+        n_jobs: Worker processes for fold training (default: joblib.cpu_count())
+        rebuild: Recompute every platform even if its cached OOF vector is current
+        n_folds: Number of CV folds
+    """
     print("=" * 80)
     print("GENERATING OUT-OF-FOLD PREDICTIONS FOR STACKING META-MODEL")
     print("=" * 80)
 
-    # Load platform-specific data
+    # Load platform-specific datasets
     print("\nLoading platform data...")
-    platform_data = load_platform_training_data()
-    catalog_db_path = Path.home() / '.isbn_lot_optimizer' / 'catalog.db'
 
     # We need a common dataset for meta-model training
     # Use catalog books that have eBay targets (the final prediction target)
-    ebay_records, ebay_targets = platform_data['ebay']
+    ebay_X, ebay_targets, ebay_isbns = load_platform_features('ebay')
 
-    print(f"\nMeta-model training set: {len(ebay_records)} books with eBay targets")
+    print(f"\nMeta-model training set: {len(ebay_isbns)} books with eBay targets")
 
     # For each book in the eBay dataset, we'll generate predictions from all available specialists
     # Some books won't have data for all platforms, which is fine - we'll use 0 as fallback
-
-    # Extract ISBNs for matching
-    ebay_isbns = [record['isbn'] for record in ebay_records]
     isbn_to_idx = {isbn: i for i, isbn in enumerate(ebay_isbns)}
 
     # Generate OOF predictions for each platform
@@ -220,128 +297,84 @@ def generate_all_oof_predictions():
     print("GENERATING PLATFORM-SPECIFIC OOF PREDICTIONS")
     print("=" * 80)
 
-    # eBay predictions (on the same dataset)
-    ebay_oof, ebay_meta = generate_oof_for_platform('ebay', ebay_records, ebay_targets, catalog_db_path)
-
-    # AbeBooks predictions (need to map to eBay dataset)
-    abebooks_records, abebooks_targets = platform_data['abebooks']
-    abebooks_isbns = [record['isbn'] for record in abebooks_records]
-
-    # Create mapping: which eBay books have AbeBooks data
-    abebooks_available = [isbn in abebooks_isbns for isbn in ebay_isbns]
-    abebooks_indices = [isbn_to_idx[isbn] for isbn in abebooks_isbns if isbn in isbn_to_idx]
-
-    if abebooks_indices:
-        # Generate OOF for AbeBooks books
-        abebooks_records_subset = [abebooks_records[abebooks_isbns.index(ebay_isbns[i])]
-                                   for i in abebooks_indices]
-        abebooks_targets_subset = [abebooks_targets[abebooks_isbns.index(ebay_isbns[i])]
-                                   for i in abebooks_indices]
-        abebooks_oof_subset, abebooks_meta = generate_oof_for_platform('abebooks', abebooks_records_subset, abebooks_targets_subset
-        , catalog_db_path)
-
-        # Map back to full eBay dataset (use 0 for books without AbeBooks data)
-        abebooks_oof = np.zeros(len(ebay_isbns))
-        for i, oof_pred in zip(abebooks_indices, abebooks_oof_subset):
-            abebooks_oof[i] = oof_pred
-    else:
-        abebooks_oof = np.zeros(len(ebay_isbns))
-        abebooks_meta = {'platform': 'abebooks', 'n_samples': 0}
-
-    # Amazon predictions (need to map to eBay dataset)
-    amazon_records, amazon_targets = platform_data['amazon']
-    amazon_isbns = [record['isbn'] for record in amazon_records]
-
-    # Create mapping
-    amazon_available = [isbn in amazon_isbns for isbn in ebay_isbns]
-    amazon_indices = [isbn_to_idx[isbn] for isbn in amazon_isbns if isbn in isbn_to_idx]
-
-    if amazon_indices:
-        # Generate OOF for Amazon books
-        amazon_records_subset = [amazon_records[amazon_isbns.index(ebay_isbns[i])]
-                                for i in amazon_indices]
-        amazon_targets_subset = [amazon_targets[amazon_isbns.index(ebay_isbns[i])]
-                                for i in amazon_indices]
-        amazon_oof_subset, amazon_meta = generate_oof_for_platform('amazon', amazon_records_subset, amazon_targets_subset
-        , catalog_db_path)
-
-        # Map back to full eBay dataset
-        amazon_oof = np.zeros(len(ebay_isbns))
-        for i, oof_pred in zip(amazon_indices, amazon_oof_subset):
-            amazon_oof[i] = oof_pred
-    else:
-        amazon_oof = np.zeros(len(ebay_isbns))
-        amazon_meta = {'platform': 'amazon', 'n_samples': 0}
-
-    # Biblio predictions (need to map to eBay dataset)
-    biblio_records, biblio_targets = platform_data['biblio']
-    biblio_isbns = [record['isbn'] for record in biblio_records]
-    biblio_available = [isbn in biblio_isbns for isbn in ebay_isbns]
-    biblio_indices = [isbn_to_idx[isbn] for isbn in biblio_isbns if isbn in isbn_to_idx]
-    
-    if biblio_indices:
-        biblio_records_subset = [biblio_records[biblio_isbns.index(ebay_isbns[i])] for i in biblio_indices]
-        biblio_targets_subset = [biblio_targets[biblio_isbns.index(ebay_isbns[i])] for i in biblio_indices]
-        biblio_oof_subset, biblio_meta = generate_oof_for_platform('biblio', biblio_records_subset, biblio_targets_subset, catalog_db_path)
-        biblio_oof = np.zeros(len(ebay_isbns))
-        for i, oof_pred in zip(biblio_indices, biblio_oof_subset):
-            biblio_oof[i] = oof_pred
-    else:
-        biblio_oof = np.zeros(len(ebay_isbns))
-        biblio_meta = {'platform': 'biblio', 'n_samples': 0}
-
-    # Alibris predictions
-    alibris_records, alibris_targets = platform_data['alibris']
-    alibris_isbns = [record['isbn'] for record in alibris_records]
-    alibris_available = [isbn in alibris_isbns for isbn in ebay_isbns]
-    alibris_indices = [isbn_to_idx[isbn] for isbn in alibris_isbns if isbn in isbn_to_idx]
-    
-    if alibris_indices:
-        alibris_records_subset = [alibris_records[alibris_isbns.index(ebay_isbns[i])] for i in alibris_indices]
-        alibris_targets_subset = [alibris_targets[alibris_isbns.index(ebay_isbns[i])] for i in alibris_indices]
-        alibris_oof_subset, alibris_meta = generate_oof_for_platform('alibris', alibris_records_subset, alibris_targets_subset, catalog_db_path)
-        alibris_oof = np.zeros(len(ebay_isbns))
-        for i, oof_pred in zip(alibris_indices, alibris_oof_subset):
-            alibris_oof[i] = oof_pred
-    else:
-        alibris_oof = np.zeros(len(ebay_isbns))
-        alibris_meta = {'platform': 'alibris', 'n_samples': 0}
-
-    # Zvab predictions
-    zvab_records, zvab_targets = platform_data['zvab']
-    zvab_isbns = [record['isbn'] for record in zvab_records]
-    zvab_available = [isbn in zvab_isbns for isbn in ebay_isbns]
-    zvab_indices = [isbn_to_idx[isbn] for isbn in zvab_isbns if isbn in isbn_to_idx]
-    
-    if zvab_indices:
-        zvab_records_subset = [zvab_records[zvab_isbns.index(ebay_isbns[i])] for i in zvab_indices]
-        zvab_targets_subset = [zvab_targets[zvab_isbns.index(ebay_isbns[i])] for i in zvab_indices]
-        zvab_oof_subset, zvab_meta = generate_oof_for_platform('zvab', zvab_records_subset, zvab_targets_subset, catalog_db_path)
-        zvab_oof = np.zeros(len(ebay_isbns))
-        for i, oof_pred in zip(zvab_indices, zvab_oof_subset):
-            zvab_oof[i] = oof_pred
-    else:
-        zvab_oof = np.zeros(len(ebay_isbns))
-        zvab_meta = {'platform': 'zvab', 'n_samples': 0}
+    # eBay predictions are on the full eBay dataset; other platforms train on the
+    # eBay books they cover and are mapped back to the eBay dataset
+    platform_inputs = {'ebay': (ebay_X, ebay_targets, None)}
+    available_by_platform = {}
+    for platform in PLATFORMS[1:]:
+        X, y, isbns = load_platform_features(platform)
+        isbn_set = set(isbns)
+        first_row = {}
+        for row, isbn in enumerate(isbns):
+            first_row.setdefault(isbn, row)
+
+        available_by_platform[platform] = [isbn in isbn_set for isbn in ebay_isbns]
+        indices = [isbn_to_idx[isbn] for isbn in isbns if isbn in isbn_to_idx]
+        if indices:
+            rows = [first_row[ebay_isbns[i]] for i in indices]
+            platform_inputs[platform] = (X[rows], y[rows], indices)
+
+    # Queue the folds of every platform whose inputs changed, then collect in order
+    oof_by_platform = {}
+    meta_by_platform = {}
+    n_jobs = n_jobs or joblib.cpu_count()
+    with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+        submitted = {}
+        cached = {}
+        for platform, (X, y, _indices) in platform_inputs.items():
+            key = oof_cache_key(X, y, n_folds)
+            hit = None if rebuild else load_cached_oof(platform, key)
+            if hit is None:
+                submitted[platform] = (key, submit_folds(pool, X, y, n_folds))
+            else:
+                cached[platform] = hit
+        print(f"\nTraining {len(submitted)} platform(s) on {n_jobs} worker(s); {len(cached)} cached")
+
+        for platform in PLATFORMS:
+            if platform not in platform_inputs:
+                # Use 0 for every book: no data for this platform
+                oof_by_platform[platform] = np.zeros(len(ebay_isbns))
+                meta_by_platform[platform] = {'platform': platform, 'n_samples': 0}
+                continue
+
+            X, y, indices = platform_inputs[platform]
+            if platform in cached:
+                subset_oof, meta_by_platform[platform] = cached[platform]
+                print(f"\n{platform.upper()} Out-of-Fold Predictions:")
+                print("-" * 60)
+                print("  Inputs unchanged, using cached predictions")
+                _print_oof_metrics(meta_by_platform[platform])
+            else:
+                key, folds = submitted[platform]
+                subset_oof, meta_by_platform[platform] = collect_oof(platform, y, folds)
+                save_cached_oof(platform, key, subset_oof, meta_by_platform[platform])
+
+            if indices is None:
+                oof_by_platform[platform] = np.asarray(subset_oof)
+            else:
+                # Use 0 for books without data for this platform
+                platform_oof = np.zeros(len(ebay_isbns))
+                for i, oof_pred in zip(indices, subset_oof):
+                    platform_oof[i] = oof_pred
+                oof_by_platform[platform] = platform_oof
 
     # Stack predictions into meta-features
     print("\n" + "=" * 80)
     print("CREATING META-MODEL TRAINING DATA")
     print("=" * 80)
 
-    meta_X = np.column_stack([ebay_oof, abebooks_oof, amazon_oof, biblio_oof, alibris_oof, zvab_oof])
+    meta_X = np.column_stack([oof_by_platform[platform] for platform in PLATFORMS])
     meta_y = np.array(ebay_targets)
 
     print(f"\nMeta-model features shape: {meta_X.shape}")
     print(f"Meta-model target shape: {meta_y.shape}")
 
     print(f"\nFeature availability:")
-    print(f"  eBay predictions:     {len(ebay_isbns)} / {len(ebay_isbns)} (100.0%)")
-    print(f"  AbeBooks predictions: {sum(abebooks_available)} / {len(ebay_isbns)} ({sum(abebooks_available) / len(ebay_isbns) * 100:.1f}%)")
-    print(f"  Amazon predictions:   {sum(amazon_available)} / {len(ebay_isbns)} ({sum(amazon_available) / len(ebay_isbns) * 100:.1f}%)")
-    print(f"  Biblio predictions:   {sum(biblio_available)} / {len(ebay_isbns)} ({sum(biblio_available) / len(ebay_isbns) * 100:.1f}%)")
-    print(f"  Alibris predictions:  {sum(alibris_available)} / {len(ebay_isbns)} ({sum(alibris_available) / len(ebay_isbns) * 100:.1f}%)")
-    print(f"  Zvab predictions:     {sum(zvab_available)} / {len(ebay_isbns)} ({sum(zvab_available) / len(ebay_isbns) * 100:.1f}%)")
+    print(f"  {'eBay predictions:':<22}{len(ebay_isbns)} / {len(ebay_isbns)} (100.0%)")
+    for platform in PLATFORMS[1:]:
+        available = sum(available_by_platform[platform])
+        label = f"{PLATFORM_LABELS[platform]} predictions:"
+        print(f"  {label:<22}{available} / {len(ebay_isbns)} ({available / len(ebay_isbns) * 100:.1f}%)")
 
     # Save OOF predictions and metadata
     print("\n" + "=" * 80)
@@ -356,12 +389,7 @@ def generate_all_oof_predictions():
         'meta_X': meta_X,
         'meta_y': meta_y,
         'ebay_isbns': ebay_isbns,
-        'ebay_oof': ebay_oof,
-        'abebooks_oof': abebooks_oof,
-        'amazon_oof': amazon_oof,
-        'biblio_oof': biblio_oof,
-        'alibris_oof': alibris_oof,
-        'zvab_oof': zvab_oof,
+        **{f'{platform}_oof': oof_by_platform[platform] for platform in PLATFORMS},
     }
 
     oof_path = output_dir / 'oof_predictions.pkl'
@@ -373,12 +401,7 @@ def generate_all_oof_predictions():
         'n_samples': len(ebay_isbns),
         'n_features': 6,
         'feature_names': ['ebay_pred', 'abebooks_pred', 'amazon_pred', 'biblio_pred', 'alibris_pred', 'zvab_pred'],
-        'ebay_metadata': ebay_meta,
-        'abebooks_metadata': abebooks_meta,
-        'amazon_metadata': amazon_meta,
-        'biblio_metadata': biblio_meta,
-        'alibris_metadata': alibris_meta,
-        'zvab_metadata': zvab_meta,
+        **{f'{platform}_metadata': meta_by_platform[platform] for platform in PLATFORMS},
     }
 
     metadata_path = output_dir / 'oof_metadata.json'
@@ -399,4 +422,9 @@ def generate_all_oof_predictions():
 
 
 if __name__ == "__main__":
-    generate_all_oof_predictions()
+    parser = argparse.ArgumentParser(description="Generate out-of-fold predictions for the meta-model")
+    parser.add_argument("--jobs", type=int, help="Worker processes for fold training (default: all cores)")
+    parser.add_argument("--rebuild", action="store_true", help="Ignore cached OOF predictions")
+    args = parser.parse_args()
+
+    generate_all_oof_predictions(n_jobs=args.jobs, rebuild=args.rebuild)
@@ -24,7 +24,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from shared.python_version_check import check_python_version
 check_python_version()
 
-from scripts.stacking.data_loader import load_platform_training_data
+from scripts.stacking.dataset_cache import load_platform_dataset
 from scripts.stacking.training_utils import (
     apply_log_transform,
     inverse_log_transform,
@@ -124,17 +124,13 @@ def train_abebooks_model():
 
     # Load data
     print("\n1. Loading AbeBooks training data...")
-    platform_data = load_platform_training_data()
-    abebooks_records, abebooks_targets = platform_data['abebooks']
+    X, y, isbns, completeness, timestamps, price_types = load_platform_dataset('abebooks', extract_features)
 
-    print(f"\n   Loaded {len(abebooks_records)} AbeBooks books")
-    print(f"   Target range: ${min(abebooks_targets):.2f} - ${max(abebooks_targets):.2f}")
-    print(f"   Target mean: ${np.mean(abebooks_targets):.2f}")
+    print(f"\n   Loaded {len(y)} AbeBooks books")
+    print(f"   Target range: ${y.min():.2f} - ${y.max():.2f}")
+    print(f"   Target mean: ${np.mean(y):.2f}")
 
-    # Extract features
-    print("\n2. Extracting AbeBooks-specific features...")
-    extractor = PlatformFeatureExtractor()
-    X, y, isbns, completeness, timestamps, price_types = extract_features(abebooks_records, abebooks_targets, extractor, Path.home() / '.isbn_lot_optimizer' / 'catalog.db')
+    print("\n2. AbeBooks-specific features:")
 
     feature_names = PlatformFeatureExtractor.get_platform_feature_names('abebooks')
     print(f"   Features extracted: {len(feature_names)} features")
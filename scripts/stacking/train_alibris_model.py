@@ -25,7 +25,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from shared.python_version_check import check_python_version
 check_python_version()
 
-from scripts.stacking.data_loader import load_platform_training_data
+from scripts.stacking.dataset_cache import load_platform_dataset
 from scripts.stacking.training_utils import (
     apply_log_transform,
     inverse_log_transform,
@@ -120,18 +120,13 @@ def train_alibris_model():
 
     # Load data
     print("\n1. Loading Alibris training data...")
-    platform_data = load_platform_training_data()
-    alibris_records, alibris_targets = platform_data['alibris']
-
-    print(f"\n   Loaded {len(alibris_records)} Alibris books")
-    print(f"   Target range: ${min(alibris_targets):.2f} - ${max(alibris_targets):.2f}")
-    print(f"   Target mean: ${np.mean(alibris_targets):.2f}")
-
-    # Extract features
-    print("\n2. Extracting Alibris-specific features...")
-    extractor = PlatformFeatureExtractor()
-    catalog_db_path = Path.home() / '.isbn_lot_optimizer' / 'catalog.db'
-    X, y, isbns, completeness = extract_features(alibris_records, alibris_targets, extractor, catalog_db_path)
+    X, y, isbns, completeness = load_platform_dataset('alibris', extract_features)
+
+    print(f"\n   Loaded {len(y)} Alibris books")
+    print(f"   Target range: ${y.min():.2f} - ${y.max():.2f}")
+    print(f"   Target mean: ${np.mean(y):.2f}")
+
+    print("\n2. Alibris-specific features:")
 
     feature_names = PlatformFeatureExtractor.get_platform_feature_names('alibris')
     print(f"   Features extracted: {len(feature_names)} features")
@@ -25,7 +25,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from shared.python_version_check import check_python_version
 check_python_version()
 
-from scripts.stacking.data_loader import load_platform_training_data
+from scripts.stacking.dataset_cache import load_platform_dataset
 from scripts.stacking.training_utils import (
     apply_log_transform,
     inverse_log_transform,
@@ -124,17 +124,13 @@ def train_amazon_model():
 
     # Load data
     print("\n1. Loading Amazon training data...")
-    platform_data = load_platform_training_data()
-    amazon_records, amazon_targets = platform_data['amazon']
+    X, y, isbns, completeness, timestamps = load_platform_dataset('amazon', extract_features)
 
-    print(f"\n   Loaded {len(amazon_records)} Amazon books")
-    print(f"   Target range: ${min(amazon_targets):.2f} - ${max(amazon_targets):.2f}")
-    print(f"   Target mean: ${np.mean(amazon_targets):.2f}")
+    print(f"\n   Loaded {len(y)} Amazon books")
+    print(f"   Target range: ${y.min():.2f} - ${y.max():.2f}")
+    print(f"   Target mean: ${np.mean(y):.2f}")
 
-    # Extract features
-    print("\n2. Extracting Amazon-specific features...")
-    extractor = PlatformFeatureExtractor()
-    X, y, isbns, completeness, timestamps = extract_features(amazon_records, amazon_targets, extractor, Path.home() / '.isbn_lot_optimizer' / 'catalog.db')
+    print("\n2. Amazon-specific features:")
 
     feature_names = PlatformFeatureExtractor.get_platform_feature_names('amazon')
     print(f"   Features extracted: {len(feature_names)} features")
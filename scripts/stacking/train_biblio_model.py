@@ -25,7 +25,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from shared.python_version_check import check_python_version
 check_python_version()
 
-from scripts.stacking.data_loader import load_platform_training_data
+from scripts.stacking.dataset_cache import load_platform_dataset
 from scripts.stacking.training_utils import (
     apply_log_transform,
     inverse_log_transform,
@@ -120,18 +120,13 @@ def train_biblio_model():
 
     # Load data
     print("\n1. Loading Biblio training data...")
-    platform_data = load_platform_training_data()
-    biblio_records, biblio_targets = platform_data['biblio']
-
-    print(f"\n   Loaded {len(biblio_records)} Biblio books")
-    print(f"   Target range: ${min(biblio_targets):.2f} - ${max(biblio_targets):.2f}")
-    print(f"   Target mean: ${np.mean(biblio_targets):.2f}")
-
-    # Extract features
-    print("\n2. Extracting Biblio-specific features...")
-    extractor = PlatformFeatureExtractor()
-    catalog_db_path = Path.home() / '.isbn_lot_optimizer' / 'catalog.db'
-    X, y, isbns, completeness = extract_features(biblio_records, biblio_targets, extractor, catalog_db_path)
+    X, y, isbns, completeness = load_platform_dataset('biblio', extract_features)
+
+    print(f"\n   Loaded {len(y)} Biblio books")
+    print(f"   Target range: ${y.min():.2f} - ${y.max():.2f}")
+    print(f"   Target mean: ${np.mean(y):.2f}")
+
+    print("\n2. Biblio-specific features:")
 
     feature_names = PlatformFeatureExtractor.get_platform_feature_names('biblio')
     print(f"   Features extracted: {len(feature_names)} features")
@@ -32,8 +32,8 @@ from sklearn.metrics import mean_absolute_error, r2_score
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from isbn_lot_optimizer.ml.feature_extractor import PlatformFeatureExtractor, get_bookfinder_features
-from scripts.stacking.data_loader import load_platform_training_data
+from isbn_lot_optimizer.ml.feature_extractor import get_bookfinder_features
+from scripts.stacking.dataset_cache import load_platform_dataset
 from scripts.stacking.training_utils import calculate_temporal_weights
 from isbn_lot_optimizer.ml.text_embeddings import (
     TextEmbedder,
@@ -132,17 +132,10 @@ def load_ebay_data_with_descriptions():
     print("LOADING EBAY TRAINING DATA")
     print("=" * 80)
 
-    # Load platform data
-    platform_data = load_platform_training_data()
-    ebay_records, ebay_targets = platform_data['ebay']
+    # Load platform data with tabular features
+    X, y, isbns, timestamps = load_platform_dataset('ebay', extract_features)
 
-    print(f"\n✓ Loaded {len(ebay_records)} eBay training books")
-
-    # Extract tabular features
-    print("\nExtracting tabular features...")
-    extractor = PlatformFeatureExtractor()
-    catalog_db_path = Path.home() / '.isbn_lot_optimizer' / 'catalog.db'
-    X, y, isbns, timestamps = extract_features(ebay_records, ebay_targets, extractor, catalog_db_path)
+    print(f"\n✓ Loaded {len(y)} eBay training books")
 
     print(f"✓ Features extracted: {X.shape[1]} features from {len(X)} books")
 
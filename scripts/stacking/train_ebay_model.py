@@ -25,7 +25,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from shared.python_version_check import check_python_version
 check_python_version()
 
-from scripts.stacking.data_loader import load_platform_training_data
+from scripts.stacking.dataset_cache import load_platform_dataset
 from scripts.stacking.training_utils import (
     apply_log_transform,
     inverse_log_transform,
@@ -138,18 +138,13 @@ def train_ebay_model():
 
     # Load data
     print("\n1. Loading eBay training data...")
-    platform_data = load_platform_training_data()
-    ebay_records, ebay_targets = platform_data['ebay']
-
-    print(f"\n   Loaded {len(ebay_records)} eBay books")
-    print(f"   Target range: ${min(ebay_targets):.2f} - ${max(ebay_targets):.2f}")
-    print(f"   Target mean: ${np.mean(ebay_targets):.2f}")
-
-    # Extract features
-    print("\n2. Extracting eBay-specific features...")
-    extractor = PlatformFeatureExtractor()
-    catalog_db_path = Path.home() / '.isbn_lot_optimizer' / 'catalog.db'
-    X, y, isbns, completeness, timestamps, price_types = extract_features(ebay_records, ebay_targets, extractor, catalog_db_path)
+    X, y, isbns, completeness, timestamps, price_types = load_platform_dataset('ebay', extract_features)
+
+    print(f"\n   Loaded {len(y)} eBay books")
+    print(f"   Target range: ${y.min():.2f} - ${y.max():.2f}")
+    print(f"   Target mean: ${np.mean(y):.2f}")
+
+    print("\n2. eBay-specific features:")
 
     feature_names = PlatformFeatureExtractor.get_platform_feature_names('ebay')
     print(f"   Features extracted: {len(feature_names)} features")
@@ -23,59 +23,60 @@ import pandas as pd
 from sklearn.model_selection import train_test_split
 from xgboost import XGBRegressor
 
-from isbn_lot_optimizer.ml.feature_extractor import FeatureExtractor
-from scripts.stacking.data_loader import load_unified_cross_platform_data
+from isbn_lot_optimizer.ml.feature_extractor import FEATURE_NAMES, FeatureExtractor
+from scripts.stacking.dataset_cache import load_unified_dataset
 
 warnings.filterwarnings('ignore')
 
 
+def extract_first_edition_features(records):
+    """
+    Feature matrix for the first editions among unified training records.
+
+    Returns:
+        X: Feature matrix
+        y: Target vector (eBay sold prices)
+        feature_names: List of feature names
+    """
+    extractor = FeatureExtractor()
+    X = []
+    y = []
+
+    for book in records:
+        # Check book level first (data_loader puts it there), then metadata
+        printing = book.get('printing') or book.get('metadata', {}).get('printing', '')
+        if printing and '1st' in str(printing).lower():
+            try:
+                features = extractor.extract(book)
+            except Exception as e:
+                print(f"  Warning: Failed to extract features: {e}")
+                continue
+            X.append(features.values)
+            y.append(book['ebay_sold_median'])
+
+    X = np.array(X, dtype=float).reshape(len(X), len(FEATURE_NAMES))
+    return X, np.array(y, dtype=float), list(FEATURE_NAMES)
+
+
 def main():
     print("=" * 70)
     print("Training First Edition Specialist Model")
     print("=" * 70)
     print()
 
-    # Load all training data
+    # Load all training data, filtered and extracted once per data version
     print("Loading training data...")
-    all_books, all_targets = load_unified_cross_platform_data()
-    print(f"  Total books loaded: {len(all_books)}")
-
-    # Filter for first edition books only
-    first_ed_books = []
-    first_ed_targets = []
-    for book, target in zip(all_books, all_targets):
-        # Check book level first (data_loader puts it there), then metadata
-        printing = book.get('printing') or book.get('metadata', {}).get('printing', '')
-        if printing and '1st' in str(printing).lower():
-            first_ed_books.append(book)
-            first_ed_targets.append(target)
-
-    print(f"  First edition books: {len(first_ed_books)}")
+    X, y, feature_names = load_unified_dataset(extract_first_edition_features)
+    print(f"  First edition books: {len(y)}")
     print()
 
-    if len(first_ed_books) < 50:
+    if len(y) < 50:
         print("⚠️  Not enough first edition books for training (need at least 50)")
-        print(f"   Found: {len(first_ed_books)}")
+        print(f"   Found: {len(y)}")
         print("   Collect more first edition data first")
         return
 
-    # Extract features
-    print("Extracting features from first edition books...")
-    extractor = FeatureExtractor()
-    X = []
-    y = []
-
-    for book, target in zip(first_ed_books, first_ed_targets):
-        try:
-            features = extractor.extract(book)
-            X.append(features)
-            y.append(target)
-        except Exception as e:
-            print(f"  Warning: Failed to extract features: {e}")
-            continue
-
-    X = pd.DataFrame(X)
-    y = np.array(y)
+    X = pd.DataFrame(X, columns=feature_names)
 
     print(f"  Feature matrix: {X.shape}")
     print(f"  Target vector: {y.shape}")
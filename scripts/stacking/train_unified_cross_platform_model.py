@@ -31,7 +31,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from shared.python_version_check import check_python_version
 check_python_version()
 
-from scripts.stacking.data_loader import load_unified_cross_platform_data
+from scripts.stacking.dataset_cache import load_unified_dataset
 from scripts.stacking.training_utils import (
     apply_log_transform,
     inverse_log_transform,
@@ -275,16 +275,13 @@ def train_unified_model():
 
     # Load unified training data
     print("\n1. Loading unified cross-platform training data...")
-    records, targets = load_unified_cross_platform_data()
+    X, y, isbns, timestamps, price_types, feature_names = load_unified_dataset(extract_unified_features)
 
-    print(f"\n   Loaded {len(records)} books with eBay sold targets")
-    print(f"   Target range: ${min(targets):.2f} - ${max(targets):.2f}")
-    print(f"   Target mean: ${np.mean(targets):.2f}")
-
-    # Extract features
-    print("\n2. Extracting cross-platform features...")
-    X, y, isbns, timestamps, price_types, feature_names = extract_unified_features(records)
+    print(f"\n   Loaded {len(y)} books with eBay sold targets")
+    print(f"   Target range: ${y.min():.2f} - ${y.max():.2f}")
+    print(f"   Target mean: ${np.mean(y):.2f}")
 
+    print("\n2. Cross-platform features:")
     print(f"   Features extracted: {len(feature_names)} features")
     print(f"   Feature matrix shape: {X.shape}")
 
@@ -25,7 +25,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from shared.python_version_check import check_python_version
 check_python_version()
 
-from scripts.stacking.data_loader import load_platform_training_data
+from scripts.stacking.dataset_cache import load_platform_dataset
 from scripts.stacking.training_utils import (
     apply_log_transform,
     inverse_log_transform,
@@ -120,18 +120,13 @@ def train_zvab_model():
 
     # Load data
     print("\n1. Loading Zvab training data...")
-    platform_data = load_platform_training_data()
-    zvab_records, zvab_targets = platform_data['zvab']
-
-    print(f"\n   Loaded {len(zvab_records)} Zvab books")
-    print(f"   Target range: ${min(zvab_targets):.2f} - ${max(zvab_targets):.2f}")
-    print(f"   Target mean: ${np.mean(zvab_targets):.2f}")
-
-    # Extract features
-    print("\n2. Extracting Zvab-specific features...")
-    extractor = PlatformFeatureExtractor()
-    catalog_db_path = Path.home() / '.isbn_lot_optimizer' / 'catalog.db'
-    X, y, isbns, completeness = extract_features(zvab_records, zvab_targets, extractor, catalog_db_path)
+    X, y, isbns, completeness = load_platform_dataset('zvab', extract_features)
+
+    print(f"\n   Loaded {len(y)} Zvab books")
+    print(f"   Target range: ${y.min():.2f} - ${y.max():.2f}")
+    print(f"   Target mean: ${np.mean(y):.2f}")
+
+    print("\n2. Zvab-specific features:")
 
     feature_names = PlatformFeatureExtractor.get_platform_feature_names('zvab')
     print(f"   Features extracted: {len(feature_names)} features")
@@ -14,6 +14,8 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import requests  # type: ignore[reportMissingImports]
 
+from shared.http_cache import cached_get
+
 
 DEFAULT_BASE_URL = "https://api.bookscouter.com/services/v1"
 DEFAULT_TIMEOUT = 15
@@ -91,10 +93,7 @@ def fetch_offers(
     }
 
     try:
-        if session is not None:
-            response = session.get(url, params=params, headers=headers, timeout=timeout)
-        else:
-            response = requests.get(url, params=params, headers=headers, timeout=timeout)
+        response = cached_get(url, params=params, headers=headers, timeout=timeout, session=session)
     except requests.RequestException as exc:
         raise BookScouterAPIError(f"BookScouter request failed: {exc}") from exc
 
@@ -267,10 +266,7 @@ def fetch_metadata(
     }
 
     try:
-        if session is not None:
-            response = session.get(url, params=params, headers=headers, timeout=timeout)
-        else:
-            response = requests.get(url, params=params, headers=headers, timeout=timeout)
+        response = cached_get(url, params=params, headers=headers, timeout=timeout, session=session)
     except requests.RequestException as exc:
         raise BookScouterAPIError(f"BookScouter request failed: {exc}") from exc
 
@@ -488,7 +484,7 @@ def fetch_offers_bulk(
         }
 
         try:
-            response = requests.get(url, params=list(params.items()) + isbn_params, headers=headers, timeout=timeout)
+            response = cached_get(url, params=list(params.items()) + isbn_params, headers=headers, timeout=timeout)
 
             if response.status_code == 429:
                 raise BookScouterAPIError(
@@ -6,6 +6,7 @@ from typing import Any, Iterable, Mapping, Optional
 
 import requests  # type: ignore[reportMissingImports]
 
+from shared.http_cache import cached_get
 from shared.models import BooksRunOffer
 
 DEFAULT_BASE_URL = "https://booksrun.com"
@@ -80,10 +81,7 @@ def fetch_offer(
     headers = {"Accept": "application/json", "User-Agent": "ISBN-Lot-Optimizer/1.0"}
 
     try:
-        if session is not None:
-            response = session.get(url, params=params, headers=headers, timeout=timeout)
-        else:
-            response = requests.get(url, params=params, headers=headers, timeout=timeout)
+        response = cached_get(url, params=params, headers=headers, timeout=timeout, session=session)
     except requests.RequestException as exc:  # pragma: no cover - network failure
         raise BooksRunAPIError(f"BooksRun request failed: {exc}") from exc
 
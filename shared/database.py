@@ -5,10 +5,11 @@ import re
 import sqlite3
 import os
 import logging
-import threading
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from shared.db_pool import ConnectionPool, acquire_pool, release_pool
 
 # Import organic growth manager for auto-sync
 try:
@@ -49,6 +50,126 @@ def _log(action: str, **fields: Any) -> None:
             pass
 # ------------------------------------------------------------------------------
 
+def _fts_meta_expr(column: str, key: str) -> str:
+    """SQL expression pulling a metadata_json key without failing on bad JSON."""
+    return f"CASE WHEN json_valid({column}) THEN json_extract({column}, '$.{key}') END"
+
+
+BOOKS_FTS_SCHEMA = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5(
+    isbn, title, authors, series_name, publisher,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS books_fts_ai AFTER INSERT ON books BEGIN
+    INSERT INTO books_fts (rowid, isbn, title, authors, series_name, publisher)
+    VALUES (new.rowid, new.isbn, new.title, new.authors,
+            {_fts_meta_expr('new.metadata_json', 'series_name')},
+            {_fts_meta_expr('new.metadata_json', 'publisher')});
+END;
+
+CREATE TRIGGER IF NOT EXISTS books_fts_ad AFTER DELETE ON books BEGIN
+    DELETE FROM books_fts WHERE rowid = old.rowid;
+END;
+
+CREATE TRIGGER IF NOT EXISTS books_fts_au AFTER UPDATE OF isbn, title, authors, metadata_json ON books BEGIN
+    DELETE FROM books_fts WHERE rowid = old.rowid;
+    INSERT INTO books_fts (rowid, isbn, title, authors, series_name, publisher)
+    VALUES (new.rowid, new.isbn, new.title, new.authors,
+            {_fts_meta_expr('new.metadata_json', 'series_name')},
+            {_fts_meta_expr('new.metadata_json', 'publisher')});
+END;
+"""
+
+# One row per ISBN; each change deletes and re-inserts the row with a fresh
+# AUTOINCREMENT seq, so MAX(seq) is a monotonic change cursor and deleted=1
+# rows are tombstones. (Explicit DELETE + INSERT rather than INSERT OR
+# REPLACE: an outer upsert's conflict policy would override the trigger's.)
+# Only the newest BOOK_CHANGES_MAX_TOMBSTONES tombstones are kept;
+# book_changes_state.pruned_through is the highest seq dropped (it also keeps
+# the cursor from going backwards), and cursors older than it can no longer
+# be answered with a delta.
+BOOK_CHANGES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS book_changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    isbn TEXT NOT NULL UNIQUE,
+    deleted INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_book_changes_tombstones ON book_changes(seq) WHERE deleted = 1;
+
+CREATE TABLE IF NOT EXISTS book_changes_state (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    pruned_through INTEGER NOT NULL
+);
+
+CREATE TRIGGER IF NOT EXISTS book_changes_ai AFTER INSERT ON books BEGIN
+    DELETE FROM book_changes WHERE isbn = new.isbn;
+    INSERT INTO book_changes (isbn, deleted) VALUES (new.isbn, 0);
+END;
+
+CREATE TRIGGER IF NOT EXISTS book_changes_au AFTER UPDATE ON books BEGIN
+    DELETE FROM book_changes WHERE isbn IN (old.isbn, new.isbn);
+    INSERT INTO book_changes (isbn, deleted)
+        SELECT old.isbn, 1 WHERE old.isbn IS NOT new.isbn;
+    INSERT INTO book_changes (isbn, deleted) VALUES (new.isbn, 0);
+END;
+
+CREATE TRIGGER IF NOT EXISTS book_changes_ad AFTER DELETE ON books BEGIN
+    DELETE FROM book_changes WHERE isbn = old.isbn;
+    INSERT INTO book_changes (isbn, deleted) VALUES (old.isbn, 1);
+END;
+"""
+
+# Inverted index used by incremental lot updates. book_group_keys holds the
+# (kind, key) groups each accepted book can be lotted under (author, series,
+# genre); lot_index maps those keys, plus kind='isbn' for every member, to
+# lots.id. lot_index_state.change_cursor is the book_changes seq the index
+# reflects (no row means the index has never been built).
+LOT_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS book_group_keys (
+    isbn TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    PRIMARY KEY (isbn, kind, key)
+);
+CREATE INDEX IF NOT EXISTS idx_book_group_keys_key ON book_group_keys(kind, key);
+
+CREATE TABLE IF NOT EXISTS lot_index (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    lot_id INTEGER NOT NULL,
+    PRIMARY KEY (kind, key, lot_id)
+);
+CREATE INDEX IF NOT EXISTS idx_lot_index_lot ON lot_index(lot_id);
+
+CREATE TABLE IF NOT EXISTS lot_index_state (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    change_cursor INTEGER NOT NULL
+);
+"""
+
+BOOK_CHANGES_MAX_TOMBSTONES = 5000
+
+_FTS_ISBN_RE = re.compile(r"\b[\dXx][\dXx-]{8,}[\dXx]\b")
+_FTS_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+# Digits-only input that may be any part of an ISBN, not just its start
+_ISBN_FRAGMENT_RE = re.compile(r"[\dXx]{3,13}")
+
+
+def _fts_match_expression(query: Optional[str]) -> str:
+    """
+    Turn free text into an FTS5 MATCH expression.
+
+    Every word becomes a quoted prefix term and all terms must match, so
+    "harry pot" finds "Harry Potter". Hyphens inside ISBNs are dropped so
+    "978-0-14-312755-0" matches the stored ISBN.
+    """
+    text = _FTS_ISBN_RE.sub(lambda m: m.group(0).replace("-", ""), (query or "").strip())
+    tokens = _FTS_TOKEN_RE.findall(text)
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
 class DatabaseManager:
     """Lightweight SQLite wrapper for storing scanned books and lot suggestions."""
 
@@ -56,7 +177,10 @@ class DatabaseManager:
         self.db_path = Path(db_path)
         if not self.db_path.parent.exists():
             self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._local = threading.local()  # Thread-local storage for connections
+        # Shared per-path pool: one serialised writer plus read-only readers
+        self._pool_handle: Optional[ConnectionPool] = acquire_pool(self.db_path)
+        # Callbacks told which ISBNs a write touched (None = everything)
+        self._change_listeners: List[Callable[[Optional[List[str]]], None]] = []
 
         # Initialize organic growth manager for auto-sync to training database
         self.organic_growth = None
@@ -70,7 +194,7 @@ class DatabaseManager:
         self._initialise()
 
     def _initialise(self) -> None:
-        with self._get_connection() as conn:
+        with self._pool.write() as conn:
             conn.executescript(
                 """
                 PRAGMA journal_mode=WAL;
@@ -156,28 +280,34 @@ class DatabaseManager:
             self._ensure_api_fetch_timestamps(conn)
             self._ensure_status_column(conn)
             self._ensure_sold_comps_columns(conn)
+            self._fts_enabled = self._ensure_books_fts(conn)
+            self._ensure_book_changes(conn)
+            conn.executescript(LOT_INDEX_SCHEMA)
+
+    @property
+    def _pool(self) -> ConnectionPool:
+        if self._pool_handle is None:
+            self._pool_handle = acquire_pool(self.db_path)
+        return self._pool_handle
 
     def _get_connection(self) -> sqlite3.Connection:
         """
-        Get or create a thread-local database connection.
+        Get a thread-local read/write connection from the shared pool.
 
-        SQLite connections must be used in the same thread they were created in.
-        This uses thread-local storage to ensure each thread gets its own connection.
+        Kept for callers that run their own SQL against the catalogue. The
+        methods on this class use ``self._pool.read()``/``self._pool.write()``,
+        which serialise writers and keep lookups on read-only connections.
         """
-        if not hasattr(self._local, 'conn') or self._local.conn is None:
-            self._local.conn = sqlite3.connect(self.db_path)
-            self._local.conn.row_factory = sqlite3.Row
-        return self._local.conn
+        return self._pool.connection()
 
     def close(self) -> None:
-        """Close the database connection for the current thread."""
-        if hasattr(self._local, 'conn') and self._local.conn is not None:
+        """Release this manager's reference to the shared connection pool."""
+        if self._pool_handle is not None:
+            pool, self._pool_handle = self._pool_handle, None
             try:
-                self._local.conn.close()
+                release_pool(pool)
             except Exception:
                 pass
-            finally:
-                self._local.conn = None
 
     def _ensure_lot_justification(self, conn: sqlite3.Connection) -> None:
         cursor = conn.execute("PRAGMA table_info(lots)")
@@ -285,6 +415,85 @@ class DatabaseManager:
         if "sold_comps_source" not in columns:
             conn.execute("ALTER TABLE books ADD COLUMN sold_comps_source TEXT")
 
+    def _ensure_books_fts(self, conn: sqlite3.Connection) -> bool:
+        """
+        Ensure the books_fts full-text index and its sync triggers exist.
+
+        Indexes isbn, title, authors plus series_name and publisher pulled out
+        of metadata_json. Rows are keyed by books.rowid. When the index is
+        first created it is backfilled from the existing books. Returns False
+        if this SQLite build lacks FTS5, in which case search falls back to
+        LIKE.
+        """
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='books_fts'"
+        ).fetchone()
+        try:
+            conn.executescript(BOOKS_FTS_SCHEMA)
+        except sqlite3.OperationalError as exc:
+            _logger.warning(f"FTS5 unavailable, using LIKE search: {exc}")
+            return False
+        if not exists:
+            self._rebuild_books_fts(conn)
+        return True
+
+    @staticmethod
+    def _rebuild_books_fts(conn: sqlite3.Connection) -> int:
+        conn.execute("DELETE FROM books_fts")
+        conn.execute(
+            f"""
+            INSERT INTO books_fts (rowid, isbn, title, authors, series_name, publisher)
+            SELECT rowid, isbn, title, authors, {_fts_meta_expr('metadata_json', 'series_name')},
+                   {_fts_meta_expr('metadata_json', 'publisher')}
+            FROM books
+            """
+        )
+        return conn.execute("SELECT COUNT(*) FROM books_fts").fetchone()[0]
+
+    def rebuild_search_index(self) -> int:
+        """Rebuild books_fts from the books table; returns the number of rows indexed."""
+        if not self._fts_enabled:
+            return 0
+        with self._pool.write() as conn:
+            count = self._rebuild_books_fts(conn)
+        _log("rebuild_search_index", rows=count)
+        return count
+
+    def _ensure_book_changes(self, conn: sqlite3.Connection) -> None:
+        """Ensure the book_changes log exists, seeding it from books on first run."""
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='book_changes'"
+        ).fetchone()
+        conn.executescript(BOOK_CHANGES_SCHEMA)
+        if not exists:
+            conn.execute(
+                "INSERT OR IGNORE INTO book_changes (isbn) "
+                "SELECT isbn FROM books ORDER BY datetime(updated_at)"
+            )
+
+    def add_change_listener(self, callback: Callable[[Optional[List[str]]], None]) -> None:
+        """
+        Register ``callback`` to be called after every write to the books table.
+
+        The callback receives the list of ISBNs touched, or None when the
+        whole table changed (e.g. ``clear()``). Used by in-memory caches such
+        as BookService's decoded-row snapshot.
+        """
+        if callback not in self._change_listeners:
+            self._change_listeners.append(callback)
+
+    def remove_change_listener(self, callback: Callable[[Optional[List[str]]], None]) -> None:
+        if callback in self._change_listeners:
+            self._change_listeners.remove(callback)
+
+    def _notify_changed(self, isbns: Optional[Iterable[str]]) -> None:
+        changed = None if isbns is None else [i for i in isbns if i]
+        for callback in list(self._change_listeners):
+            try:
+                callback(changed)
+            except Exception as e:
+                _logger.warning(f"Book change listener failed: {e}")
+
     # ------------------------------------------------------------------
     # Book persistence helpers
 
@@ -304,7 +513,7 @@ class DatabaseManager:
 
         _log("upsert_book", isbn=data.get("isbn"), title=data.get("title"))
 
-        with self._get_connection() as conn:
+        with self._pool.write() as conn:
             conn.execute(
                 """
                 INSERT INTO books (
@@ -367,12 +576,13 @@ class DatabaseManager:
                     self.organic_growth.sync_book_to_training_db(data)
                 except Exception as e:
                     _logger.warning(f"Failed to sync book to training DB: {e}")
+        self._notify_changed([data.get("isbn")])
 
     def update_book_market_json(self, isbn: str, market_blob: Dict[str, Any]) -> None:
         """Update market data and set market_fetched_at timestamp."""
         payload = json.dumps(market_blob or {}, ensure_ascii=False)
         _log("update_market", isbn=isbn, bytes=len(payload))
-        with self._get_connection() as conn:
+        with self._pool.write() as conn:
             conn.execute(
                 """UPDATE books
                    SET market_json = ?,
@@ -381,21 +591,23 @@ class DatabaseManager:
                    WHERE isbn = ?""",
                 (payload, isbn),
             )
+        self._notify_changed([isbn])
 
     def update_book_source_json(self, isbn: str, source_blob: Dict[str, Any]) -> None:
         payload = json.dumps(source_blob or {}, ensure_ascii=False)
         _log("update_source", isbn=isbn, bytes=len(payload))
-        with self._get_connection() as conn:
+        with self._pool.write() as conn:
             conn.execute(
                 "UPDATE books SET source_json = ?, updated_at = CURRENT_TIMESTAMP WHERE isbn = ?",
                 (payload, isbn),
             )
+        self._notify_changed([isbn])
 
     def update_book_bookscouter_json(self, isbn: str, bookscouter_blob: Dict[str, Any]) -> None:
         """Update BookScouter data and set fetched_at timestamp."""
         payload = json.dumps(bookscouter_blob or {}, ensure_ascii=False)
         _log("update_bookscouter", isbn=isbn, bytes=len(payload))
-        with self._get_connection() as conn:
+        with self._pool.write() as conn:
             conn.execute(
                 """UPDATE books
                    SET bookscouter_json = ?,
@@ -404,6 +616,7 @@ class DatabaseManager:
                    WHERE isbn = ?""",
                 (payload, isbn),
             )
+        self._notify_changed([isbn])
 
     def update_book_attributes(
         self,
@@ -427,7 +640,7 @@ class DatabaseManager:
             printing: "1st" for first edition, or None
         """
         _log("update_attributes", isbn=isbn, condition=condition, cover_type=cover_type, signed=signed, first_edition=first_edition, printing=printing)
-        with self._get_connection() as conn:
+        with self._pool.write() as conn:
             conn.execute(
                 """UPDATE books
                    SET condition = ?,
@@ -439,6 +652,7 @@ class DatabaseManager:
                    WHERE isbn = ?""",
                 (condition, cover_type, 1 if signed else 0, 1 if first_edition else 0, printing, isbn),
             )
+        self._notify_changed([isbn])
 
     def update_book_price(
         self,
@@ -453,7 +667,7 @@ class DatabaseManager:
             estimated_price: New estimated price value
         """
         _log("update_book_price", isbn=isbn, price=estimated_price)
-        with self._get_connection() as conn:
+        with self._pool.write() as conn:
             conn.execute(
                 """UPDATE books
                    SET estimated_price = ?,
@@ -461,6 +675,7 @@ class DatabaseManager:
                    WHERE isbn = ?""",
                 (estimated_price, isbn),
             )
+        self._notify_changed([isbn])
 
     def update_book_record(
         self,
@@ -479,7 +694,7 @@ class DatabaseManager:
         elif columns:
             metadata_dict = None
 
-        with self._get_connection() as conn:
+        with self._pool.write() as conn:
             if metadata_dict is None and metadata is None:
                 existing = conn.execute(
                     "SELECT metadata_json FROM books WHERE isbn = ?", (isbn,)
@@ -517,15 +732,19 @@ class DatabaseManager:
             values.append(isbn)
             _log("update_record", isbn=isbn, columns=list(columns.keys()), metadata_changed=metadata_dict is not None)
             conn.execute(sql, values)
+        self._notify_changed([isbn])
 
     def delete_book(self, isbn: str) -> None:
-        with self._get_connection() as conn:
+        with self._pool.write() as conn:
             _log("delete_book", isbn=isbn)
             conn.execute("DELETE FROM books WHERE isbn = ?", (isbn,))
+            self._prune_book_changes(conn)
+        self._notify_changed([isbn])
 
     def delete_books(self, isbns: Iterable[str]) -> int:
+        isbns = list(isbns)
         deleted = 0
-        with self._get_connection() as conn:
+        with self._pool.write() as conn:
             for isbn in isbns:
                 before = conn.total_changes
                 conn.execute("DELETE FROM books WHERE isbn = ?", (isbn,))
@@ -533,22 +752,124 @@ class DatabaseManager:
                 delta = max(0, after - before)
                 deleted += delta
                 _log("delete_book", isbn=isbn, deleted=delta)
+            self._prune_book_changes(conn)
+        self._notify_changed(isbns)
         return deleted
 
     def fetch_book(self, isbn: str) -> Optional[sqlite3.Row]:
-        with self._get_connection() as conn:
+        with self._pool.read() as conn:
             cursor = conn.execute("SELECT * FROM books WHERE isbn = ?", (isbn,))
             row = cursor.fetchone()
         return row
 
     def fetch_all_books(self) -> List[sqlite3.Row]:
-        with self._get_connection() as conn:
+        with self._pool.read() as conn:
             cursor = conn.execute(
                 "SELECT * FROM books WHERE status='ACCEPT' ORDER BY datetime(updated_at) DESC"
             )
             rows = cursor.fetchall()
         return list(rows)
 
+    def fetch_book_versions(self) -> List[Tuple[str, Optional[str]]]:
+        """
+        Return (isbn, updated_at) for every accepted book, in fetch_all_books order.
+
+        Cheap enough to run on every listing; callers holding decoded rows
+        use it to work out which books actually changed.
+        """
+        with self._pool.read() as conn:
+            cursor = conn.execute(
+                "SELECT isbn, updated_at FROM books WHERE status='ACCEPT' ORDER BY datetime(updated_at) DESC"
+            )
+            rows = cursor.fetchall()
+        return [(row["isbn"], row["updated_at"]) for row in rows]
+
+    def fetch_books_by_isbns(self, isbns: Iterable[str]) -> Dict[str, sqlite3.Row]:
+        """Fetch full rows for the given ISBNs, keyed by ISBN (missing ones are omitted)."""
+        wanted = list(dict.fromkeys(isbns))
+        found: Dict[str, sqlite3.Row] = {}
+        with self._pool.read() as conn:
+            # Stay well under SQLITE_MAX_VARIABLE_NUMBER on older builds
+            for start in range(0, len(wanted), 500):
+                chunk = wanted[start:start + 500]
+                placeholders = ",".join("?" for _ in chunk)
+                cursor = conn.execute(
+                    f"SELECT * FROM books WHERE isbn IN ({placeholders})", chunk
+                )
+                for row in cursor.fetchall():
+                    found[row["isbn"]] = row
+        return found
+
+    def fetch_change_cursor(self) -> int:
+        """Return the current change cursor (highest book_changes.seq ever used, 0 when empty)."""
+        with self._pool.read() as conn:
+            row = conn.execute(
+                """
+                SELECT MAX(
+                    COALESCE((SELECT MAX(seq) FROM book_changes), 0),
+                    COALESCE((SELECT pruned_through FROM book_changes_state WHERE id = 1), 0)
+                )
+                """
+            ).fetchone()
+        return int(row[0])
+
+    def fetch_change_horizon(self) -> int:
+        """Return the oldest cursor a delta can still be computed from (0 if nothing was pruned)."""
+        with self._pool.read() as conn:
+            row = conn.execute("SELECT pruned_through FROM book_changes_state WHERE id = 1").fetchone()
+        return int(row[0]) if row else 0
+
+    def prune_book_changes(self, max_tombstones: int = BOOK_CHANGES_MAX_TOMBSTONES) -> int:
+        """Drop all but the newest ``max_tombstones`` tombstones; returns the number dropped."""
+        with self._pool.write() as conn:
+            return self._prune_book_changes(conn, max_tombstones)
+
+    @staticmethod
+    def _prune_book_changes(conn: sqlite3.Connection, max_tombstones: int = BOOK_CHANGES_MAX_TOMBSTONES) -> int:
+        row = conn.execute(
+            "SELECT seq FROM book_changes WHERE deleted = 1 ORDER BY seq DESC LIMIT 1 OFFSET ?",
+            (max_tombstones,),
+        ).fetchone()
+        if row is None:
+            return 0
+        horizon = int(row[0])
+        # The lot index still has to see deletions it has not synced
+        lot_cursor = conn.execute("SELECT change_cursor FROM lot_index_state WHERE id = 1").fetchone()
+        if lot_cursor is not None:
+            horizon = min(horizon, int(lot_cursor[0]))
+        removed = conn.execute(
+            "DELETE FROM book_changes WHERE deleted = 1 AND seq <= ?", (horizon,)
+        ).rowcount
+        if removed:
+            conn.execute(
+                """
+                INSERT INTO book_changes_state (id, pruned_through) VALUES (1, ?)
+                ON CONFLICT(id) DO UPDATE SET pruned_through = MAX(pruned_through, excluded.pruned_through)
+                """,
+                (horizon,),
+            )
+            _log("prune_book_changes", removed=removed, pruned_through=horizon)
+        return removed
+
+    def fetch_changes_since(self, cursor: int, until: Optional[int] = None) -> List[sqlite3.Row]:
+        """
+        Return (seq, isbn, deleted) for books changed after ``cursor``, oldest first.
+
+        Each ISBN appears once with its latest change. ``until`` caps the seq so
+        callers can pair the result with a cursor read beforehand.
+        """
+        with self._pool.read() as conn:
+            cursor_obj = conn.execute(
+                """
+                SELECT seq, isbn, deleted FROM book_changes
+                WHERE seq > ? AND (? IS NULL OR seq <= ?)
+                ORDER BY seq
+                """,
+                (int(cursor), until, until),
+            )
+            rows = cursor_obj.fetchall()
+        return list(rows)
+
     def fetch_books_updated_since(self, since_timestamp: str) -> List[sqlite3.Row]:
         """
         Fetch books that have been updated since the given timestamp.
@@ -559,7 +880,7 @@ class DatabaseManager:
         Returns:
             List of book rows updated after the given timestamp
         """
-        with self._get_connection() as conn:
+        with self._pool.read() as conn:
             cursor = conn.execute(
                 """
                 SELECT * FROM books
@@ -574,22 +895,73 @@ class DatabaseManager:
 
     def search_books(self, query: str) -> List[sqlite3.Row]:
         """
-        Full-text-like search across ISBN, title, and authors using simple LIKE.
-        Returns rows ordered by probability_score then title.
+        Full-text search over ISBN, title, authors, series and publisher.
+
+        Each word in the query is prefix-matched against the books_fts index
+        and results are ranked by bm25 relevance (ISBN and title weigh most),
+        then probability_score. An empty query returns every accepted book; a
+        query with no searchable words (only punctuation) returns nothing.
+        Digit-only input is also matched anywhere inside ISBNs, after the
+        ranked results. Falls back to LIKE matching when FTS5 is unavailable.
         """
-        q = f"%{(query or '').strip()}%"
-        with self._get_connection() as conn:
+        if not (query or "").strip():
+            with self._pool.read() as conn:
+                rows = conn.execute(
+                    """
+                    SELECT * FROM books
+                    WHERE status='ACCEPT'
+                    ORDER BY probability_score DESC, title COLLATE NOCASE
+                    """
+                ).fetchall()
+            return list(rows)
+
+        if not self._fts_enabled:
+            q = f"%{query.strip()}%"
+            with self._pool.read() as conn:
+                cursor = conn.execute(
+                    """
+                    SELECT * FROM books
+                    WHERE (isbn LIKE ? OR title LIKE ? OR authors LIKE ?)
+                      AND status='ACCEPT'
+                    ORDER BY probability_score DESC, title COLLATE NOCASE
+                    """,
+                    (q, q, q),
+                )
+                rows = cursor.fetchall()
+            return list(rows)
+
+        match = _fts_match_expression(query)
+        if not match:
+            return []
+
+        with self._pool.read() as conn:
             cursor = conn.execute(
                 """
-                SELECT * FROM books
-                WHERE (isbn LIKE ? OR title LIKE ? OR authors LIKE ?)
-                  AND status='ACCEPT'
-                ORDER BY probability_score DESC, title COLLATE NOCASE
+                SELECT books.* FROM books_fts
+                JOIN books ON books.rowid = books_fts.rowid
+                WHERE books_fts MATCH ?
+                  AND books.status='ACCEPT'
+                ORDER BY bm25(books_fts, 10.0, 5.0, 3.0, 2.0, 1.0),
+                         books.probability_score DESC
                 """,
-                (q, q, q),
+                (match,),
             )
-            rows = cursor.fetchall()
-        return list(rows)
+            rows = list(cursor.fetchall())
+
+            # FTS only prefix-matches, so a middle fragment of an ISBN needs LIKE
+            fragment = re.sub(r"[\s-]", "", query)
+            if _ISBN_FRAGMENT_RE.fullmatch(fragment):
+                found = {row["isbn"] for row in rows}
+                cursor = conn.execute(
+                    """
+                    SELECT * FROM books
+                    WHERE isbn LIKE ? AND status='ACCEPT'
+                    ORDER BY probability_score DESC, title COLLATE NOCASE
+                    """,
+                    (f"%{fragment}%",),
+                )
+                rows.extend(row for row in cursor.fetchall() if row["isbn"] not in found)
+        return rows
 
     def fetch_books_needing_bookscouter_refresh(
         self,
@@ -608,7 +980,7 @@ class DatabaseManager:
         Returns:
             List of book rows that need refresh
         """
-        with self._get_connection() as conn:
+        with self._pool.read() as conn:
             cursor = conn.execute(
                 """
                 SELECT * FROM books
@@ -638,7 +1010,7 @@ class DatabaseManager:
         Returns:
             List of book rows that need refresh
         """
-        with self._get_connection() as conn:
+        with self._pool.read() as conn:
             cursor = conn.execute(
                 """
                 SELECT * FROM books
@@ -669,7 +1041,7 @@ class DatabaseManager:
         Returns:
             List of book rows that need refresh
         """
-        with self._get_connection() as conn:
+        with self._pool.read() as conn:
             cursor = conn.execute(
                 """
                 SELECT * FROM books
@@ -692,7 +1064,7 @@ class DatabaseManager:
         Returns:
             List of book rows with missing cover images
         """
-        with self._get_connection() as conn:
+        with self._pool.read() as conn:
             cursor = conn.execute(
                 """
                 SELECT * FROM books
@@ -714,7 +1086,7 @@ class DatabaseManager:
         Returns:
             Dict with 'with_covers', 'without_covers', and 'total' counts
         """
-        with self._get_connection() as conn:
+        with self._pool.read() as conn:
             # Total books
             total = conn.execute("SELECT COUNT(*) FROM books").fetchone()[0]
 
@@ -749,8 +1121,9 @@ class DatabaseManager:
             payload.setdefault("justification", "")
 
         _log("replace_lots", count=len(lot_payloads))
-        with self._get_connection() as conn:
+        with self._pool.write() as conn:
             conn.execute("DELETE FROM lots")
+            conn.execute("DELETE FROM lot_index")
             conn.executemany(
                 """
                 INSERT INTO lots (
@@ -785,7 +1158,7 @@ class DatabaseManager:
             payload.setdefault("justification", "")
 
         _log("upsert_lots", count=len(lot_payloads))
-        with self._get_connection() as conn:
+        with self._pool.write() as conn:
             conn.executemany(
                 """
                 INSERT OR REPLACE INTO lots (
@@ -806,29 +1179,204 @@ class DatabaseManager:
                 """,
                 lot_payloads,
             )
+            # INSERT OR REPLACE gives replaced lots a new id
+            self._prune_lot_index(conn)
 
     def delete_lot_by_name_and_strategy(self, name: str, strategy: str) -> None:
         """Delete a specific lot by its name and strategy."""
         _log("delete_lot", name=name, strategy=strategy)
-        with self._get_connection() as conn:
+        with self._pool.write() as conn:
             conn.execute(
                 "DELETE FROM lots WHERE name = ? AND strategy = ?",
                 (name, strategy)
             )
+            self._prune_lot_index(conn)
 
     def fetch_lots(self) -> List[sqlite3.Row]:
-        with self._get_connection() as conn:
+        with self._pool.read() as conn:
             cursor = conn.execute(
                 "SELECT * FROM lots ORDER BY probability_score DESC, estimated_value DESC"
             )
             rows = cursor.fetchall()
         return list(rows)
 
+    def fetch_lot_names(self) -> set:
+        """Return the (name, strategy) pair of every stored lot."""
+        with self._pool.read() as conn:
+            return {(row["name"], row["strategy"]) for row in conn.execute("SELECT name, strategy FROM lots")}
+
+    # ------------------------------------------------------------------
+    # Lot index helpers
+
+    @staticmethod
+    def _prune_lot_index(conn: sqlite3.Connection) -> None:
+        conn.execute("DELETE FROM lot_index WHERE lot_id NOT IN (SELECT id FROM lots)")
+
+    @staticmethod
+    def _key_filter(keys: Iterable[Tuple[str, str]]) -> Tuple[str, List[str]]:
+        """Build a ``(kind, key) IN (...)`` clause for keys chunked by the caller."""
+        params: List[str] = []
+        for kind, key in keys:
+            params.extend((kind, key))
+        clause = ",".join("(?, ?)" for _ in range(len(params) // 2))
+        return f"(kind, key) IN (VALUES {clause})", params
+
+    def fetch_lot_index_cursor(self) -> Optional[int]:
+        """Return the book_changes seq the lot index reflects, or None if never built."""
+        with self._pool.read() as conn:
+            row = conn.execute("SELECT change_cursor FROM lot_index_state WHERE id = 1").fetchone()
+        return int(row[0]) if row else None
+
+    def rebuild_lot_index(
+        self,
+        book_keys: Dict[str, Iterable[Tuple[str, str]]],
+        lot_keys: Dict[int, Iterable[Tuple[str, str]]],
+        cursor: int,
+    ) -> None:
+        """
+        Replace the whole lot index.
+
+        Args:
+            book_keys: Group keys per accepted ISBN
+            lot_keys: Group keys shared by every member, per lots.id
+            cursor: book_changes seq the keys were computed at
+        """
+        with self._pool.write() as conn:
+            conn.execute("DELETE FROM book_group_keys")
+            conn.execute("DELETE FROM lot_index")
+            conn.executemany(
+                "INSERT OR IGNORE INTO book_group_keys (isbn, kind, key) VALUES (?, ?, ?)",
+                [(isbn, kind, key) for isbn, keys in book_keys.items() for kind, key in keys],
+            )
+            self._index_lot_rows(conn, lot_keys)
+            self._set_lot_index_cursor(conn, cursor)
+        _log("rebuild_lot_index", books=len(book_keys), lots=len(lot_keys))
+
+    def update_book_group_keys(self, book_keys: Dict[str, Iterable[Tuple[str, str]]], cursor: int) -> None:
+        """Replace the group keys of the given ISBNs (empty to drop a book) and advance the cursor."""
+        with self._pool.write() as conn:
+            conn.executemany("DELETE FROM book_group_keys WHERE isbn = ?", [(isbn,) for isbn in book_keys])
+            conn.executemany(
+                "INSERT OR IGNORE INTO book_group_keys (isbn, kind, key) VALUES (?, ?, ?)",
+                [(isbn, kind, key) for isbn, keys in book_keys.items() for kind, key in keys],
+            )
+            self._set_lot_index_cursor(conn, cursor)
+
+    @staticmethod
+    def _set_lot_index_cursor(conn: sqlite3.Connection, cursor: int) -> None:
+        conn.execute(
+            "INSERT OR REPLACE INTO lot_index_state (id, change_cursor) VALUES (1, ?)", (int(cursor),)
+        )
+
+    @staticmethod
+    def _index_lot_rows(conn: sqlite3.Connection, lot_keys: Dict[int, Iterable[Tuple[str, str]]]) -> None:
+        conn.executemany(
+            "INSERT OR IGNORE INTO lot_index (kind, key, lot_id) VALUES (?, ?, ?)",
+            [(kind, key, lot_id) for lot_id, keys in lot_keys.items() for kind, key in keys],
+        )
+        # Every member ISBN is a key too, straight from lots.book_isbns
+        conn.executemany(
+            """
+            INSERT OR IGNORE INTO lot_index (kind, key, lot_id)
+            SELECT 'isbn', j.value, lots.id FROM lots, json_each(lots.book_isbns) AS j
+            WHERE lots.id = ?
+            """,
+            [(lot_id,) for lot_id in lot_keys],
+        )
+
+    def index_lots(self, lot_keys: Dict[Tuple[str, str], Iterable[Tuple[str, str]]]) -> None:
+        """Add index rows for lots identified by (name, strategy)."""
+        with self._pool.write() as conn:
+            by_id: Dict[int, Iterable[Tuple[str, str]]] = {}
+            for (name, strategy), keys in lot_keys.items():
+                row = conn.execute(
+                    "SELECT id FROM lots WHERE name = ? AND strategy = ?", (name, strategy)
+                ).fetchone()
+                if row is not None:
+                    by_id[int(row[0])] = keys
+            self._index_lot_rows(conn, by_id)
+
+    def fetch_book_group_keys(self, isbns: Iterable[str]) -> Dict[str, set]:
+        """Return the indexed group keys per ISBN (ISBNs without keys are omitted)."""
+        wanted = list(dict.fromkeys(isbns))
+        found: Dict[str, set] = {}
+        with self._pool.read() as conn:
+            for start in range(0, len(wanted), 500):
+                chunk = wanted[start:start + 500]
+                placeholders = ",".join("?" for _ in chunk)
+                for row in conn.execute(
+                    f"SELECT isbn, kind, key FROM book_group_keys WHERE isbn IN ({placeholders})", chunk
+                ):
+                    found.setdefault(row["isbn"], set()).add((row["kind"], row["key"]))
+        return found
+
+    def fetch_isbns_for_group_keys(self, keys: Iterable[Tuple[str, str]]) -> set:
+        """Return every ISBN indexed under any of ``keys``."""
+        wanted = list(dict.fromkeys(keys))
+        found: set = set()
+        with self._pool.read() as conn:
+            for start in range(0, len(wanted), 250):
+                clause, params = self._key_filter(wanted[start:start + 250])
+                for row in conn.execute(f"SELECT DISTINCT isbn FROM book_group_keys WHERE {clause}", params):
+                    found.add(row["isbn"])
+        return found
+
+    def fetch_lot_ids_for_keys(self, keys: Iterable[Tuple[str, str]]) -> set:
+        """Return the ids of lots indexed under any of ``keys`` (kind 'isbn' matches members)."""
+        wanted = list(dict.fromkeys(keys))
+        found: set = set()
+        with self._pool.read() as conn:
+            for start in range(0, len(wanted), 250):
+                clause, params = self._key_filter(wanted[start:start + 250])
+                for row in conn.execute(f"SELECT DISTINCT lot_id FROM lot_index WHERE {clause}", params):
+                    found.add(int(row["lot_id"]))
+        return found
+
+    def fetch_lot_index_keys(self, lot_ids: Iterable[int]) -> Dict[int, set]:
+        """Return the group keys (excluding member ISBNs) each lot is indexed under."""
+        wanted = list(dict.fromkeys(int(i) for i in lot_ids))
+        found: Dict[int, set] = {lot_id: set() for lot_id in wanted}
+        with self._pool.read() as conn:
+            for start in range(0, len(wanted), 500):
+                chunk = wanted[start:start + 500]
+                placeholders = ",".join("?" for _ in chunk)
+                for row in conn.execute(
+                    f"SELECT lot_id, kind, key FROM lot_index WHERE kind <> 'isbn' AND lot_id IN ({placeholders})",
+                    chunk,
+                ):
+                    found[int(row["lot_id"])].add((row["kind"], row["key"]))
+        return found
+
+    def fetch_lots_by_ids(self, lot_ids: Iterable[int]) -> List[sqlite3.Row]:
+        wanted = list(dict.fromkeys(int(i) for i in lot_ids))
+        rows: List[sqlite3.Row] = []
+        with self._pool.read() as conn:
+            for start in range(0, len(wanted), 500):
+                chunk = wanted[start:start + 500]
+                placeholders = ",".join("?" for _ in chunk)
+                rows.extend(conn.execute(f"SELECT * FROM lots WHERE id IN ({placeholders})", chunk).fetchall())
+        return rows
+
+    def delete_lots_by_ids(self, lot_ids: Iterable[int]) -> int:
+        """Delete lots (and their index rows) by id; returns the number removed."""
+        wanted = [(int(i),) for i in dict.fromkeys(lot_ids)]
+        _log("delete_lots", count=len(wanted))
+        with self._pool.write() as conn:
+            before = conn.total_changes
+            conn.executemany("DELETE FROM lots WHERE id = ?", wanted)
+            removed = conn.total_changes - before
+            conn.executemany("DELETE FROM lot_index WHERE lot_id = ?", wanted)
+        return removed
+
     def clear(self) -> None:
-        with self._get_connection() as conn:
+        with self._pool.write() as conn:
             _log("clear_all")
             conn.execute("DELETE FROM books")
             conn.execute("DELETE FROM lots")
+            conn.execute("DELETE FROM lot_index")
+            conn.execute("DELETE FROM book_group_keys")
+            conn.execute("DELETE FROM lot_index_state")
+        self._notify_changed(None)
 
     def list_distinct_author_names(self) -> List[str]:
         """
@@ -838,7 +1386,7 @@ class DatabaseManager:
         semicolons and commas, trims whitespace, and returns unique names sorted
         case-insensitively for stable display.
         """
-        with self._get_connection() as conn:
+        with self._pool.read() as conn:
             rows = conn.execute(
                 "SELECT authors FROM books WHERE authors IS NOT NULL AND authors <> ''"
             ).fetchall()
@@ -869,7 +1417,7 @@ class DatabaseManager:
         publication_year = meta.get("publication_year")
         metadata_json = json.dumps(meta, ensure_ascii=False)
 
-        with self._get_connection() as conn:
+        with self._pool.write() as conn:
             conn.execute("""
                 UPDATE books SET
                   title = COALESCE(:title, title),
@@ -886,6 +1434,7 @@ class DatabaseManager:
                 "publication_year": publication_year,
                 "metadata_json": metadata_json,
             })
+        self._notify_changed([isbn])
 
     def log_scan(
         self,
@@ -928,7 +1477,7 @@ class DatabaseManager:
         Returns:
             The ID of the inserted scan history record
         """
-        with self._get_connection() as conn:
+        with self._pool.write() as conn:
             cursor = conn.execute(
                 """
                 INSERT INTO scan_history (
@@ -947,7 +1496,6 @@ class DatabaseManager:
                     device_id, app_version, notes,
                 ),
             )
-            conn.commit()
             return cursor.lastrowid
 
     def get_scan_history(
@@ -988,7 +1536,7 @@ class DatabaseManager:
             query += " LIMIT ?"
             params.append(limit)
 
-        with self._get_connection() as conn:
+        with self._pool.read() as conn:
             cursor = conn.execute(query, params)
             rows = cursor.fetchall()
         return list(rows)
@@ -1000,7 +1548,7 @@ class DatabaseManager:
         Returns:
             List of dicts with location_name, scan_count, last_scan
         """
-        with self._get_connection() as conn:
+        with self._pool.read() as conn:
             cursor = conn.execute(
                 """
                 SELECT
@@ -1025,7 +1573,7 @@ class DatabaseManager:
         Returns:
             Dictionary with scan counts by decision, total scans, unique ISBNs, etc.
         """
-        with self._get_connection() as conn:
+        with self._pool.read() as conn:
             cursor = conn.execute(
                 """
                 SELECT
@@ -0,0 +1,297 @@
+"""
+Shared SQLite connection pool.
+
+Every database in the app (catalog.db, metadata_cache.db, the training and
+monitoring databases) is opened through this module so that all connections
+get the same pragmas and writers never race each other.
+
+Each database path gets one ``ConnectionPool`` per process with:
+- a single writer connection, serialised by a re-entrant lock
+- a bounded pool of read-only connections (``mode=ro``) for lookups
+- WAL journaling, ``synchronous=NORMAL``, a busy timeout, mmap and a larger
+  page cache applied to every connection
+
+Usage:
+    from shared.db_pool import get_pool
+
+    pool = get_pool(db_path)
+    with pool.read() as conn:
+        row = conn.execute("SELECT ...", params).fetchone()
+    with pool.write() as conn:
+        conn.execute("UPDATE ...", params)   # committed on exit
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Dict, Iterator, Optional, Tuple, Union
+
+DEFAULT_READERS = 4
+BUSY_TIMEOUT_SECONDS = 30.0
+MMAP_SIZE_BYTES = 256 * 1024 * 1024
+CACHE_SIZE_KIB = 16 * 1024
+
+_PRAGMAS = (
+    f"PRAGMA busy_timeout={int(BUSY_TIMEOUT_SECONDS * 1000)}",
+    "PRAGMA synchronous=NORMAL",
+    f"PRAGMA mmap_size={MMAP_SIZE_BYTES}",
+    f"PRAGMA cache_size=-{CACHE_SIZE_KIB}",
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+def apply_pragmas(conn: sqlite3.Connection, *, read_only: bool = False) -> None:
+    """Apply the standard pragmas to a connection."""
+    if not read_only:
+        conn.execute("PRAGMA journal_mode=WAL")
+    for pragma in _PRAGMAS:
+        conn.execute(pragma)
+
+
+class ConnectionPool:
+    """One writer plus a bounded set of read-only connections for a database."""
+
+    def __init__(self, db_path: Union[str, Path], *, readers: int = DEFAULT_READERS):
+        self.db_path = Path(db_path)
+        self.max_readers = max(1, readers)
+        self._write_lock = threading.RLock()
+        self._writer: Optional[sqlite3.Connection] = None
+        self._write_depth = 0
+        self._readers: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._reader_count = 0
+        self._reader_lock = threading.Lock()
+        self._local = threading.local()
+        self._legacy: list[sqlite3.Connection] = []
+        self._refs = 0
+        self._closed = False
+
+    # ------------------------------------------------------------------
+    # Connection factories
+
+    def _connect(self, *, read_only: bool) -> sqlite3.Connection:
+        if read_only:
+            conn = sqlite3.connect(
+                f"{self.db_path.resolve().as_uri()}?mode=ro",
+                uri=True,
+                timeout=BUSY_TIMEOUT_SECONDS,
+                check_same_thread=False,
+            )
+        else:
+            if not self.db_path.parent.exists():
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=BUSY_TIMEOUT_SECONDS,
+                check_same_thread=False,
+            )
+        conn.row_factory = sqlite3.Row
+        apply_pragmas(conn, read_only=read_only)
+        return conn
+
+    def _get_writer(self) -> sqlite3.Connection:
+        if self._writer is None:
+            self._writer = self._connect(read_only=False)
+        return self._writer
+
+    # ------------------------------------------------------------------
+    # Public API
+
+    @contextmanager
+    def write(self) -> Iterator[sqlite3.Connection]:
+        """
+        Yield the writer connection while holding the write lock.
+
+        The outermost ``write()`` block commits on success and rolls back on
+        error; nested blocks on the same thread join the outer transaction.
+        """
+        with self._write_lock:
+            conn = self._get_writer()
+            self._write_depth += 1
+            try:
+                yield conn
+            except BaseException:
+                self._write_depth -= 1
+                if self._write_depth == 0:
+                    conn.rollback()
+                raise
+            else:
+                self._write_depth -= 1
+                if self._write_depth == 0:
+                    conn.commit()
+
+    @contextmanager
+    def read(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a read-only connection, returning it to the pool afterwards."""
+        conn = self._acquire_reader()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            if self._closed:
+                conn.close()
+            else:
+                self._readers.put(conn)
+
+    def connection(self) -> sqlite3.Connection:
+        """
+        Return a thread-local read/write connection with the standard pragmas.
+
+        Escape hatch for callers that manage their own ``with conn:``
+        transactions (e.g. ``DatabaseManager._get_connection``). Prefer
+        ``read()``/``write()`` in new code.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect(read_only=False)
+            self._local.conn = conn
+            with self._reader_lock:
+                self._legacy.append(conn)
+        return conn
+
+    def close(self) -> None:
+        """Close every connection owned by the pool."""
+        self._closed = True
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._reader_lock:
+            for conn in self._legacy:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._legacy.clear()
+            self._reader_count = 0
+        self._local = threading.local()
+
+    def _acquire_reader(self) -> sqlite3.Connection:
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+        with self._reader_lock:
+            can_open = self._reader_count < self.max_readers
+            if can_open:
+                self._reader_count += 1
+        if not can_open:
+            return self._readers.get(timeout=BUSY_TIMEOUT_SECONDS)
+        try:
+            if not self.db_path.exists():
+                # mode=ro cannot create the file; let the writer do it
+                with self.write():
+                    pass
+            return self._connect(read_only=True)
+        except Exception:
+            with self._reader_lock:
+                self._reader_count -= 1
+            raise
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def _pool_key(db_path: Union[str, Path]) -> str:
+    return os.path.realpath(os.fspath(db_path))
+
+
+def get_pool(db_path: Union[str, Path], *, readers: int = DEFAULT_READERS) -> ConnectionPool:
+    """Return the process-wide pool for ``db_path``, creating it on first use."""
+    key = _pool_key(db_path)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(db_path, readers=readers)
+            _pools[key] = pool
+        return pool
+
+
+def acquire_pool(db_path: Union[str, Path], *, readers: int = DEFAULT_READERS) -> ConnectionPool:
+    """Like ``get_pool`` but reference-counted; pair with ``release_pool``."""
+    pool = get_pool(db_path, readers=readers)
+    with _pools_lock:
+        pool._refs += 1
+    return pool
+
+
+def release_pool(pool: ConnectionPool) -> None:
+    """Drop a reference taken by ``acquire_pool``; closes the pool at zero."""
+    key = _pool_key(pool.db_path)
+    with _pools_lock:
+        pool._refs -= 1
+        if pool._refs > 0:
+            return
+        if _pools.get(key) is pool:
+            del _pools[key]
+    pool.close()
+
+
+def close_pool(db_path: Union[str, Path]) -> None:
+    """Close and forget the pool for ``db_path`` regardless of references."""
+    with _pools_lock:
+        pool = _pools.pop(_pool_key(db_path), None)
+    if pool is not None:
+        pool.close()
+
+
+def import_legacy_json(
+    write: Callable[[], ContextManager[sqlite3.Connection]],
+    json_path: Union[str, Path],
+    *,
+    table: str,
+    key_column: str,
+    value_column: str,
+    extract: Callable[[Any], Optional[Tuple[float, Any]]],
+) -> int:
+    """
+    One-time import of a legacy whole-file JSON cache into a SQLite table.
+
+    ``json_path`` holds ``{key: entry}``; ``extract`` turns an entry into
+    ``(ts, value)`` or None to skip it. Rows go into ``table`` (which has a
+    ``ts`` column) inside ``write()``, keeping whichever copy is newer if the
+    key already exists, and the file is then renamed to ``*.migrated``.
+
+    Returns:
+        Number of entries imported (0 when the file is missing or unreadable)
+    """
+    path = Path(json_path)
+    if not path.exists():
+        return 0
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return 0
+    rows = []
+    if isinstance(data, dict):
+        for key, entry in data.items():
+            extracted = extract(entry)
+            if extracted is not None:
+                timestamp, value = extracted
+                rows.append((str(key), float(timestamp), json.dumps(value, ensure_ascii=False)))
+    with write() as conn:
+        conn.executemany(
+            f"""
+            INSERT INTO {table} ({key_column}, ts, {value_column}) VALUES (?, ?, ?)
+            ON CONFLICT({key_column}) DO UPDATE SET ts=excluded.ts, {value_column}=excluded.{value_column}
+            WHERE excluded.ts > {table}.ts
+            """,
+            rows,
+        )
+    try:
+        os.replace(path, path.with_name(path.name + ".migrated"))
+    except OSError:
+        pass
+    return len(rows)
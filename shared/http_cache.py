@@ -0,0 +1,418 @@
+"""
+Shared HTTP response cache for the marketplace API clients.
+
+eBay, BookScouter and BooksRun lookups all go through ``cached_get`` instead of
+calling ``requests.get`` directly, so an ISBN re-scanned a few minutes later
+(often by someone else on the team) is answered from disk instead of paying
+for another round trip and quota. The cache:
+
+- persists responses in ``http_cache.db`` with a TTL per endpoint
+  (``ENDPOINT_TTLS``), keyed on URL, query parameters and headers that change
+  the answer (auth tokens and user agents are ignored)
+- coalesces identical requests already in flight, so concurrent scans of the
+  same ISBN make one upstream call (only successful answers are shared)
+- revalidates stale entries with ``If-None-Match`` / ``If-Modified-Since``
+  when the server sent validators, refreshing the TTL on 304
+- counts hits, misses, revalidations and coalesced calls per endpoint
+
+Usage:
+    from shared.http_cache import cached_get
+
+    response = cached_get(url, params=params, headers=headers, timeout=20, session=session)
+    response.from_cache  # True when no upstream call was made
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from shared.db_pool import get_pool
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HTTP_CACHE_DB = Path(
+    os.getenv("HTTP_CACHE_PATH", str(Path.home() / ".isbn_lot_optimizer" / "http_cache.db"))
+)
+DEFAULT_TTL_SECONDS = 300.0
+# Not-found answers are cached briefly so a typo'd ISBN doesn't burn quota twice
+NEGATIVE_TTL_SECONDS = 300.0
+# Expired entries are kept this long so they can be revalidated with a 304
+STALE_RETENTION_SECONDS = 7 * 24 * 3600.0
+PURGE_EVERY_STORES = 500
+
+CACHEABLE_STATUSES = (200, 404)
+# Answers handed to callers coalesced onto an in-flight request; anything else
+# (throttling, server errors, not-found) makes them send their own request
+SHARED_STATUSES = (200,)
+
+# (name, URL prefix, TTL seconds); the longest matching prefix wins
+ENDPOINT_TTLS: List[Tuple[str, str, float]] = [
+    ("ebay_finding", "https://svcs.ebay.com/services/search/FindingService", 3600.0),
+    ("ebay_browse", "https://api.ebay.com/buy/browse", 3600.0),
+    ("bookscouter_recent", "https://api.bookscouter.com/services/v1/recentPrices", 300.0),
+    ("bookscouter", "https://api.bookscouter.com", 1800.0),
+    ("booksrun", "https://booksrun.com/api", 1800.0),
+]
+
+# Request headers that never change the response body
+_UNKEYED_HEADERS = frozenset({
+    "authorization", "user-agent", "accept-encoding", "connection",
+    "if-none-match", "if-modified-since", "cache-control",
+})
+
+# Response headers worth keeping with the cached body
+_STORED_HEADERS = ("content-type", "etag", "last-modified", "content-language")
+
+HTTP_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS http_cache (
+    key TEXT PRIMARY KEY,
+    endpoint TEXT NOT NULL,
+    url TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_http_cache_stored ON http_cache(stored_at);
+"""
+
+Params = Union[None, Mapping[str, Any], Iterable[Tuple[str, Any]]]
+
+
+class _CachedEntry:
+    __slots__ = ("status", "headers", "body", "url", "etag", "last_modified", "expires_at")
+
+    def __init__(
+        self,
+        status: int,
+        headers: Dict[str, str],
+        body: bytes,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        expires_at: float = 0.0,
+    ):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.url = url
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires_at = expires_at
+
+    def to_response(self, *, from_cache: bool) -> requests.Response:
+        response = requests.Response()
+        response.status_code = self.status
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.body
+        response.url = self.url
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.from_cache = from_cache  # type: ignore[attr-defined]
+        return response
+
+
+class _Flight:
+    """An upstream call other callers with the same key can wait on."""
+
+    __slots__ = ("done", "entry")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        # Set only when the answer can be shared with the waiting callers
+        self.entry: Optional[_CachedEntry] = None
+
+
+def _normalize_params(params: Params) -> List[Tuple[str, str]]:
+    if not params:
+        return []
+    items = params.items() if isinstance(params, Mapping) else params
+    return sorted((str(k), str(v)) for k, v in items)
+
+
+class HttpCache:
+    """Persistent, TTL-aware GET cache with request coalescing."""
+
+    def __init__(
+        self,
+        db_path: Path = DEFAULT_HTTP_CACHE_DB,
+        *,
+        endpoint_ttls: Optional[List[Tuple[str, str, float]]] = None,
+        default_ttl: float = DEFAULT_TTL_SECONDS,
+    ):
+        self.db_path = Path(db_path)
+        self.endpoint_ttls = sorted(
+            endpoint_ttls if endpoint_ttls is not None else ENDPOINT_TTLS,
+            key=lambda entry: len(entry[1]),
+            reverse=True,
+        )
+        self.default_ttl = default_ttl
+        self._pool = get_pool(self.db_path)
+        self._inflight: Dict[str, _Flight] = {}
+        self._inflight_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._stores = 0
+        with self._pool.write() as conn:
+            conn.executescript(HTTP_CACHE_SCHEMA)
+
+    # ------------------------------------------------------------------
+    # Keys, TTLs and metrics
+
+    def endpoint_for(self, url: str) -> Tuple[str, float]:
+        """Return (endpoint name, TTL seconds) for ``url``."""
+        for name, prefix, ttl in self.endpoint_ttls:
+            if url.startswith(prefix):
+                return name, ttl
+        return "other", self.default_ttl
+
+    @staticmethod
+    def cache_key(url: str, params: Params = None, headers: Optional[Mapping[str, str]] = None) -> str:
+        keyed_headers = sorted(
+            (k.lower(), str(v)) for k, v in (headers or {}).items() if k.lower() not in _UNKEYED_HEADERS
+        )
+        raw = json.dumps(["GET", url, _normalize_params(params), keyed_headers], separators=(",", ":"))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _count(self, endpoint: str, metric: str) -> None:
+        with self._stats_lock:
+            counters = self._stats.setdefault(
+                endpoint, {"hits": 0, "misses": 0, "revalidated": 0, "coalesced": 0, "bypassed": 0}
+            )
+            counters[metric] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-endpoint counters plus overall hit ratio."""
+        with self._stats_lock:
+            endpoints = {name: dict(counters) for name, counters in self._stats.items()}
+        served = sum(c["hits"] + c["revalidated"] + c["coalesced"] for c in endpoints.values())
+        total = served + sum(c["misses"] for c in endpoints.values())
+        return {
+            "endpoints": endpoints,
+            "hit_ratio": round(served / total, 3) if total else None,
+        }
+
+    # ------------------------------------------------------------------
+    # Storage
+
+    def _load(self, key: str) -> Optional[_CachedEntry]:
+        with self._pool.read() as conn:
+            row = conn.execute(
+                "SELECT status, headers, body, url, etag, last_modified, expires_at "
+                "FROM http_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        return _CachedEntry(
+            row["status"], json.loads(row["headers"]), bytes(row["body"]), row["url"],
+            row["etag"], row["last_modified"], row["expires_at"],
+        )
+
+    def _store(self, key: str, endpoint: str, entry: _CachedEntry) -> None:
+        now = time.time()
+        with self._pool.write() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO http_cache
+                    (key, endpoint, url, status, headers, body, etag, last_modified, stored_at, expires_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    key, endpoint, entry.url.split("?", 1)[0], entry.status, json.dumps(entry.headers),
+                    entry.body, entry.etag, entry.last_modified, now, entry.expires_at,
+                ),
+            )
+            self._stores += 1
+            if self._stores % PURGE_EVERY_STORES == 0:
+                conn.execute(
+                    "DELETE FROM http_cache WHERE expires_at < ?", (now - STALE_RETENTION_SECONDS,)
+                )
+
+    def _touch(self, key: str, expires_at: float) -> None:
+        with self._pool.write() as conn:
+            conn.execute("UPDATE http_cache SET expires_at = ? WHERE key = ?", (expires_at, key))
+
+    def invalidate(self, url_prefix: Optional[str] = None) -> int:
+        """Drop cached responses whose URL starts with ``url_prefix`` (all if None)."""
+        with self._pool.write() as conn:
+            if url_prefix is None:
+                return conn.execute("DELETE FROM http_cache").rowcount
+            return conn.execute(
+                "DELETE FROM http_cache WHERE substr(url, 1, ?) = ?", (len(url_prefix), url_prefix)
+            ).rowcount
+
+    # ------------------------------------------------------------------
+    # Fetching
+
+    def get(
+        self,
+        url: str,
+        *,
+        params: Params = None,
+        headers: Optional[Mapping[str, str]] = None,
+        timeout: float = 20,
+        session: Optional[requests.Session] = None,
+        ttl: Optional[float] = None,
+    ) -> requests.Response:
+        """
+        GET ``url`` through the cache.
+
+        ``session`` is used for the upstream call when given. ``ttl``
+        overrides the endpoint TTL; ``ttl=0`` bypasses the cache entirely.
+        Only 200 and 404 answers are stored; anything else is returned as-is.
+        Callers coalesced onto an in-flight request get its answer only if it
+        was a 200; otherwise (or if it raised) they retry.
+        """
+        endpoint, endpoint_ttl = self.endpoint_for(url)
+        ttl = endpoint_ttl if ttl is None else ttl
+        if ttl <= 0:
+            self._count(endpoint, "bypassed")
+            return self._send(url, params, headers, timeout, session)
+
+        key = self.cache_key(url, params, headers)
+        while True:
+            cached = self._load(key)
+            if cached is not None and cached.expires_at > time.time():
+                self._count(endpoint, "hits")
+                return cached.to_response(from_cache=True)
+
+            with self._inflight_lock:
+                flight = self._inflight.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._inflight[key] = _Flight()
+            if leader:
+                break
+
+            if not flight.done.wait(timeout):
+                # The leader is still going after our own timeout; don't hang forever
+                return self._send(url, params, headers, timeout, session)
+            if flight.entry is not None:
+                self._count(endpoint, "coalesced")
+                return flight.entry.to_response(from_cache=True)
+            # The leader failed or got an answer not worth sharing (429, 5xx);
+            # try again, one of the waiting callers leading the next attempt
+
+        try:
+            response = self._fetch(key, endpoint, ttl, url, params, headers, timeout, session, cached)
+            if response.status_code in SHARED_STATUSES:
+                flight.entry = _CachedEntry(
+                    response.status_code, self._kept_headers(response), response.content, response.url
+                )
+            return response
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+    def _fetch(
+        self,
+        key: str,
+        endpoint: str,
+        ttl: float,
+        url: str,
+        params: Params,
+        headers: Optional[Mapping[str, str]],
+        timeout: float,
+        session: Optional[requests.Session],
+        stale: Optional[_CachedEntry],
+    ) -> requests.Response:
+        request_headers = dict(headers or {})
+        if stale is not None and stale.status == 200:
+            if stale.etag:
+                request_headers["If-None-Match"] = stale.etag
+            if stale.last_modified:
+                request_headers["If-Modified-Since"] = stale.last_modified
+
+        response = self._send(url, params, request_headers, timeout, session)
+
+        if response.status_code == 304 and stale is not None:
+            stale.expires_at = time.time() + ttl
+            self._touch(key, stale.expires_at)
+            self._count(endpoint, "revalidated")
+            return stale.to_response(from_cache=True)
+
+        self._count(endpoint, "misses")
+        if response.status_code in CACHEABLE_STATUSES:
+            lifetime = ttl if response.status_code == 200 else min(ttl, NEGATIVE_TTL_SECONDS)
+            entry = _CachedEntry(
+                response.status_code,
+                self._kept_headers(response),
+                response.content,
+                response.url or url,
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+                time.time() + lifetime,
+            )
+            try:
+                self._store(key, endpoint, entry)
+            except Exception as exc:
+                logger.warning(f"HTTP cache write failed for {endpoint}: {exc}")
+        return response
+
+    @staticmethod
+    def _kept_headers(response: requests.Response) -> Dict[str, str]:
+        return {name: response.headers[name] for name in _STORED_HEADERS if name in response.headers}
+
+    @staticmethod
+    def _send(
+        url: str,
+        params: Params,
+        headers: Optional[Mapping[str, str]],
+        timeout: float,
+        session: Optional[requests.Session],
+    ) -> requests.Response:
+        getter = session.get if session is not None else requests.get
+        response = getter(url, params=params, headers=headers, timeout=timeout)
+        response.from_cache = False  # type: ignore[attr-defined]
+        return response
+
+
+_default_cache: Optional[HttpCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_http_cache() -> Optional[HttpCache]:
+    """Process-wide cache, or None when ``HTTP_CACHE_DISABLED`` is set."""
+    global _default_cache
+    if os.getenv("HTTP_CACHE_DISABLED", "").lower() in ("1", "true", "yes"):
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            try:
+                _default_cache = HttpCache()
+            except Exception as exc:
+                logger.warning(f"HTTP cache unavailable, calling APIs directly: {exc}")
+                return None
+        return _default_cache
+
+
+def cached_get(
+    url: str,
+    *,
+    params: Params = None,
+    headers: Optional[Mapping[str, str]] = None,
+    timeout: float = 20,
+    session: Optional[requests.Session] = None,
+    ttl: Optional[float] = None,
+) -> requests.Response:
+    """``requests.get`` replacement backed by the shared ``HttpCache``."""
+    cache = get_http_cache()
+    if cache is None:
+        return HttpCache._send(url, params, headers, timeout, session)
+    return cache.get(url, params=params, headers=headers, timeout=timeout, session=session, ttl=ttl)
@@ -2,13 +2,24 @@ from __future__ import annotations
 
 import re
 import statistics
+import threading
 import time
 import os
-from typing import Any, Dict, List, Optional, Sequence, Tuple, TypedDict, cast
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TypedDict, cast
 
 import requests
 from requests.auth import _basic_auth_str
 
+from shared.http_cache import cached_get
+from shared.market_refresh import (
+    DEFAULT_FINDING_RATE,
+    MAX_FINDING_RATE,
+    AdaptiveRateLimiter,
+    build_market_session,
+)
 from shared.models import EbayMarketStats
 from shared.timing import timer
 from shared.lot_detector import is_lot as is_lot_listing
@@ -26,10 +37,8 @@ class _TokenCache(TypedDict):
     expires_at: float
 
 _token_cache: _TokenCache = {"access_token": None, "expires_at": 0.0}
-
-# Cache for Browse API results (1-hour TTL to reduce redundant API calls)
-_browse_cache: Dict[str, Tuple[Dict[str, Any], float]] = {}
-_BROWSE_CACHE_TTL = 3600  # 1 hour in seconds
+# Concurrent lot pricing would otherwise race to fetch the same token
+_token_lock = threading.Lock()
 
 
 def _retry_with_exponential_backoff(
@@ -95,6 +104,11 @@ def _retry_with_exponential_backoff(
 
 
 def get_app_token() -> str:
+    with _token_lock:
+        return _get_app_token_locked()
+
+
+def _get_app_token_locked() -> str:
     now = time.time()
     if _token_cache.get("access_token") and float(_token_cache.get("expires_at", 0)) - now > 120:
         return str(_token_cache["access_token"])
@@ -135,21 +149,12 @@ def browse_active_by_isbn(
     Returns:
         Dict with pricing stats and filtering metadata
     """
-    # Check cache first (1-hour TTL)
-    cache_key = f"{isbn}:{limit}:{marketplace}:{include_signed}"
-    now = time.time()
-    if cache_key in _browse_cache:
-        cached_result, expires_at = _browse_cache[cache_key]
-        if expires_at > now:
-            # Cache hit - return cached result
-            return cached_result
-
-    # Cache miss - make API call with exponential backoff for rate limiting
     tok = get_app_token()
 
-    # Wrap the API call in a lambda for retry logic
+    # Wrap the API call in a lambda for retry logic; repeat lookups within
+    # the Browse TTL are served by the shared HTTP cache
     r = _retry_with_exponential_backoff(
-        lambda: requests.get(
+        lambda: cached_get(
             BROWSE_URL,
             params={"gtin": isbn, "limit": str(limit)},
             headers={"Authorization": f"Bearer {tok}", "X-EBAY-C-MARKETPLACE-ID": marketplace},
@@ -226,9 +231,6 @@ def browse_active_by_isbn(
         "include_signed": include_signed,
     }
 
-    # Store in cache before returning
-    _browse_cache[cache_key] = (stats, now + _BROWSE_CACHE_TTL)
-
     return stats
 
 
@@ -272,35 +274,79 @@ def collect_ebay_market_stats(
     isbns: Sequence[str],
     app_id: str,
     global_id: str = "EBAY-US",
-    delay: float = 1.0,
+    delay: Optional[float] = None,
     max_results: int = 20,
+    *,
+    concurrency: int = 4,
+    rate_per_second: float = DEFAULT_FINDING_RATE,
+    max_rate_per_second: float = MAX_FINDING_RATE,
+    on_result: Optional[Callable[[str, Optional[EbayMarketStats]], None]] = None,
+    limiter: Optional[AdaptiveRateLimiter] = None,
+    replay_url: Optional[str] = None,
+    record_dir: Optional[Path] = None,
 ) -> Dict[str, EbayMarketStats]:
+    """
+    Fetch Finding API market stats for many ISBNs concurrently.
+
+    Up to ``concurrency`` lookups run at once on a pooled session. All calls
+    share an ``AdaptiveRateLimiter`` that starts at ``rate_per_second``, ramps
+    toward ``max_rate_per_second`` while eBay answers normally and backs off
+    on 429s and rate-limit headers. ``delay`` is the old fixed pause between
+    ISBNs; if given it sets the starting rate to ``1 / delay`` (0 starts at
+    ``max_rate_per_second``).
+
+    ``on_result(isbn, stats_or_None)`` is called from this thread as each
+    lookup finishes, so callers can persist results while the batch runs.
+
+    Dry run: ``replay_url`` points the session at a ``MarketFixtureServer``
+    (no eBay traffic, no Browse fallback); ``record_dir`` saves live
+    responses there as fixtures for later replay.
+    """
     if not isbns:
         return {}
 
-    session = requests.Session()
-    session.headers.update({
-        "User-Agent": "ISBN-Lot-Optimizer/2.0 (market)",
-        "Accept": "application/json",
-    })
+    if delay is not None:
+        # delay=0 meant "no pause": start at the ceiling instead of the default
+        rate_per_second = 1.0 / delay if delay > 0 else max_rate_per_second
+    concurrency = max(1, concurrency)
+    limiter = limiter or AdaptiveRateLimiter(rate_per_second, max_rate=max_rate_per_second)
+    session = build_market_session(
+        limiter, pool_size=concurrency, replay_url=replay_url, record_dir=record_dir
+    )
+
+    def lookup(isbn: str) -> Optional[EbayMarketStats]:
+        try:
+            return query_ebay_market_snapshot(
+                session=session,
+                isbn=isbn,
+                app_id=app_id,
+                global_id=global_id,
+                max_results=max_results,
+                browse_fallback=replay_url is None,
+                use_cache=replay_url is None and record_dir is None,
+            )
+        except Exception:
+            return None
 
     stats: Dict[str, EbayMarketStats] = {}
+    queue = iter(dict.fromkeys(isbns))
     try:
-        for idx, isbn in enumerate(isbns, start=1):
-            try:
-                result = query_ebay_market_snapshot(
-                    session=session,
-                    isbn=isbn,
-                    app_id=app_id,
-                    global_id=global_id,
-                    max_results=max_results,
-                )
-            except Exception:
-                result = None
-            if result:
-                stats[isbn] = result
-            if delay:
-                time.sleep(delay)
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="market") as pool:
+            # Keep a bounded window in flight so huge catalogues don't queue every ISBN up front
+            pending: Dict[Future, str] = {}
+            for isbn in islice(queue, concurrency * 2):
+                pending[pool.submit(lookup, isbn)] = isbn
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    isbn = pending.pop(future)
+                    result = future.result()
+                    if result:
+                        stats[isbn] = result
+                    if on_result is not None:
+                        on_result(isbn, result)
+                    for next_isbn in islice(queue, 1):
+                        pending[pool.submit(lookup, next_isbn)] = next_isbn
     finally:
         session.close()
     return stats
@@ -313,7 +359,7 @@ def _browse_active_by_isbn(isbn: str, limit: int = 50, include_signed: bool = Fa
     Filters out multi-book lots and (optionally) signed copies.
     """
     tok = get_app_token()
-    r = requests.get(
+    r = cached_get(
         BROWSE_URL,
         params={"gtin": isbn, "limit": str(limit)},
         headers={"Authorization": f"Bearer {tok}", "X-EBAY-C-MARKETPLACE-ID": MARKETPLACE},
@@ -385,6 +431,8 @@ def query_ebay_market_snapshot(
     app_id: str,
     global_id: str,
     max_results: int,
+    browse_fallback: bool = True,
+    use_cache: bool = True,
 ) -> Optional[EbayMarketStats]:
     active_response = call_ebay_finding(
         session=session,
@@ -397,6 +445,7 @@ def query_ebay_market_snapshot(
             "paginationInput.entriesPerPage": str(max_results),
             "outputSelector": "SellerInfo",
         },
+        use_cache=use_cache,
     )
     sold_response = call_ebay_finding(
         session=session,
@@ -409,9 +458,12 @@ def query_ebay_market_snapshot(
             "paginationInput.entriesPerPage": str(max_results),
             "outputSelector": "SellerInfo",
         },
+        use_cache=use_cache,
     )
 
     if active_response is None and sold_response is None:
+        if not browse_fallback:
+            return None
         # Fallback to Browse (active comps only)
         try:
             b = _browse_active_by_isbn(isbn, limit=max_results)
@@ -444,7 +496,7 @@ def query_ebay_market_snapshot(
     sold_prices, sold_currency, sold_counts = gather_completed_samples(sold_items)
 
     # Optional: If both price arrays are empty, try Browse before bailing out
-    if not active_prices and not sold_prices:
+    if not active_prices and not sold_prices and browse_fallback:
         try:
             b = _browse_active_by_isbn(isbn, limit=max_results)
         except Exception:
@@ -487,6 +539,7 @@ def call_ebay_finding(
     app_id: str,
     global_id: str,
     extra_params: Dict[str, Any],
+    use_cache: bool = True,
 ) -> Optional[Dict[str, Any]]:
     params = {
         "OPERATION-NAME": operation,
@@ -498,7 +551,9 @@ def call_ebay_finding(
     }
     params.update(extra_params)
     try:
-        response = session.get(EBAY_FINDING_URL, params=params, timeout=20)
+        response = cached_get(
+            EBAY_FINDING_URL, params=params, timeout=20, session=session, ttl=None if use_cache else 0
+        )
         response.raise_for_status()
     except Exception:
         return None
@@ -678,7 +733,8 @@ def parse_lot_size_from_title(title: str) -> Optional[int]:
 def search_ebay_lot_comps(
     search_term: str,
     limit: int = 50,
-    marketplace: str = MARKETPLACE
+    marketplace: str = MARKETPLACE,
+    ttl: Optional[float] = None,
 ) -> LotPricingResult:
     """
     Search eBay for lot listings and analyze per-book pricing.
@@ -687,6 +743,7 @@ def search_ebay_lot_comps(
         search_term: Search query (e.g., "Alex Cross Lot", "James Patterson Books")
         limit: Maximum number of results to fetch
         marketplace: eBay marketplace ID
+        ttl: HTTP cache lifetime override in seconds (default: the Browse endpoint TTL)
         
     Returns:
         LotPricingResult with pricing analysis
@@ -698,11 +755,12 @@ def search_ebay_lot_comps(
     # Search eBay Browse API
     tok = get_app_token()
     with timer(f"eBay lot search: '{search_term[:40]}...'", log=True, record=True):
-        r = requests.get(
+        r = cached_get(
             BROWSE_URL,
             params={"q": search_term, "limit": str(limit)},
             headers={"Authorization": f"Bearer {tok}", "X-EBAY-C-MARKETPLACE-ID": marketplace},
             timeout=30,
+            ttl=ttl,
         )
     
     if r.status_code != 200:
@@ -0,0 +1,368 @@
+"""Concurrency and throttling plumbing for bulk eBay market refreshes.
+
+``collect_ebay_market_stats`` used to walk ISBNs one at a time with a fixed
+``time.sleep`` between them, capping bulk repricing at about one ISBN per
+second regardless of the real quota. The pieces here let it run several
+lookups at once without tripping eBay's limits:
+
+- ``AdaptiveRateLimiter``: token bucket whose rate grows while calls succeed
+  and backs off on HTTP 429 / ``Retry-After`` / ``X-RateLimit-*`` headers.
+- ``ThrottledAdapter``: ``requests`` transport adapter that makes every call
+  on a pooled session wait for the limiter and retries 429s.
+- ``MarketFixtureServer``: local HTTP server replaying recorded Finding API
+  responses (with optional latency and quota) for offline benchmarks.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+from urllib.parse import parse_qs, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Starting and ceiling request rates for the eBay Finding API (calls/second)
+DEFAULT_FINDING_RATE = 2.0
+MAX_FINDING_RATE = 10.0
+
+# Status codes that mean "slow down" rather than "this request is bad"
+THROTTLE_STATUSES = (429, 503)
+
+
+def fixture_name(isbn: str, operation: str) -> str:
+    """File name a recorded Finding API response is stored under."""
+    safe_isbn = re.sub(r"[^0-9Xx]", "", isbn) or "unknown"
+    return f"{safe_isbn}.{operation}.json"
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _header_float(headers: Mapping[str, str], *names: str) -> Optional[float]:
+    for name in names:
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            return float(value)
+        except ValueError:
+            continue
+    return None
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket with additive-increase / multiplicative-decrease rate control.
+
+    Every successful response nudges the rate up by ``increase`` calls/second
+    (to at most ``max_rate``); a throttled response cuts it by
+    ``decrease_factor`` and pauses all callers for ``Retry-After`` seconds.
+    When the server reports its remaining quota via ``X-RateLimit-Remaining``
+    and ``X-RateLimit-Reset``, the rate is capped so the window is not
+    overrun.
+    """
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_FINDING_RATE,
+        *,
+        min_rate: float = 0.2,
+        max_rate: float = MAX_FINDING_RATE,
+        burst: Optional[int] = None,
+        increase: float = 0.25,
+        decrease_factor: float = 0.5,
+    ):
+        self.min_rate = min_rate
+        self.max_rate = max(max_rate, rate)
+        self.rate = max(min_rate, rate)
+        self.burst = burst if burst is not None else max(1, int(round(rate)))
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self._tokens = float(self.burst)
+        self._last_update = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self.throttled = 0
+        self.calls = 0
+
+    def acquire(self) -> None:
+        """Block until a call may be made."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now >= self._paused_until:
+                    elapsed = now - self._last_update
+                    self._tokens = min(float(self.burst), self._tokens + elapsed * self.rate)
+                    self._last_update = now
+                    if self._tokens >= 1.0:
+                        self._tokens -= 1.0
+                        self.calls += 1
+                        return
+                    wait = (1.0 - self._tokens) / self.rate
+                else:
+                    self._last_update = now
+                    wait = self._paused_until - now
+            time.sleep(min(wait, 1.0))
+
+    def on_response(self, status_code: int, headers: Mapping[str, str]) -> None:
+        """Adjust the rate from a response's status code and rate-limit headers."""
+        retry_after = _parse_retry_after(headers.get("Retry-After"))
+        remaining = _header_float(headers, "X-RateLimit-Remaining", "X-Rate-Limit-Remaining")
+        reset = _header_float(headers, "X-RateLimit-Reset", "X-Rate-Limit-Reset")
+
+        with self._lock:
+            now = time.monotonic()
+            if status_code in THROTTLE_STATUSES:
+                self.throttled += 1
+                # Concurrent calls throttled in the same burst count as one signal
+                if now >= self._paused_until:
+                    self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+                pause = retry_after if retry_after is not None else 1.0 / self.rate
+                self._paused_until = max(self._paused_until, now + pause)
+                self._tokens = 0.0
+                logger.info(
+                    "eBay throttled (HTTP %s); rate now %.2f/s, pausing %.2fs",
+                    status_code, self.rate, pause,
+                )
+                return
+
+            if remaining is not None and remaining <= 0:
+                self._paused_until = max(self._paused_until, now + (reset or retry_after or 1.0))
+                self._tokens = 0.0
+                return
+
+            self.rate = min(self.max_rate, self.rate + self.increase)
+            if remaining is not None and reset:
+                # Don't spend the rest of the window's quota faster than it refills
+                self.rate = max(self.min_rate, min(self.rate, remaining / reset))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"rate": round(self.rate, 3), "calls": self.calls, "throttled": self.throttled}
+
+
+class ThrottledAdapter(HTTPAdapter):
+    """
+    HTTP adapter that routes every request through an ``AdaptiveRateLimiter``.
+
+    Throttled responses are fed back to the limiter and retried up to
+    ``throttle_retries`` times, so callers that swallow HTTP errors (like
+    ``call_ebay_finding``) still get the backoff. ``replay_url`` redirects
+    requests to a ``MarketFixtureServer``; ``record_dir`` saves successful
+    Finding API responses as fixtures for later replay.
+    """
+
+    def __init__(
+        self,
+        limiter: AdaptiveRateLimiter,
+        *,
+        throttle_retries: int = 3,
+        replay_url: Optional[str] = None,
+        record_dir: Optional[Path] = None,
+        pool_maxsize: int = 10,
+    ):
+        super().__init__(pool_connections=1, pool_maxsize=pool_maxsize)
+        self.limiter = limiter
+        self.throttle_retries = throttle_retries
+        self.replay_url = replay_url
+        self.record_dir = Path(record_dir) if record_dir else None
+        if self.record_dir:
+            self.record_dir.mkdir(parents=True, exist_ok=True)
+
+    def send(self, request, **kwargs):  # type: ignore[override]
+        if self.replay_url:
+            target = urlsplit(self.replay_url)
+            parts = urlsplit(request.url)
+            request.url = urlunsplit((target.scheme, target.netloc, parts.path, parts.query, ""))
+
+        attempt = 0
+        while True:
+            self.limiter.acquire()
+            response = super().send(request, **kwargs)
+            self.limiter.on_response(response.status_code, response.headers)
+            if response.status_code not in THROTTLE_STATUSES or attempt >= self.throttle_retries:
+                break
+            attempt += 1
+            response.close()
+
+        if self.record_dir and response.status_code == 200:
+            self._record(request.url, response)
+        return response
+
+    def _record(self, url: str, response: requests.Response) -> None:
+        query = parse_qs(urlsplit(url).query)
+        isbn = (query.get("productId") or [""])[0]
+        operation = (query.get("OPERATION-NAME") or [""])[0]
+        if not isbn or not operation:
+            return
+        try:
+            (self.record_dir / fixture_name(isbn, operation)).write_bytes(response.content)  # type: ignore[operator]
+        except OSError as exc:
+            logger.warning("Could not record fixture for %s: %s", isbn, exc)
+
+
+def build_market_session(
+    limiter: AdaptiveRateLimiter,
+    *,
+    pool_size: int = 10,
+    replay_url: Optional[str] = None,
+    record_dir: Optional[Path] = None,
+) -> requests.Session:
+    """Pooled ``requests.Session`` whose calls share ``limiter``."""
+    session = requests.Session()
+    session.headers.update({
+        "User-Agent": "ISBN-Lot-Optimizer/2.0 (market)",
+        "Accept": "application/json",
+    })
+    adapter = ThrottledAdapter(
+        limiter, replay_url=replay_url, record_dir=record_dir, pool_maxsize=pool_size
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class MarketFixtureServer:
+    """
+    Local stand-in for the eBay Finding API that replays recorded responses.
+
+    Responses are looked up by ``productId`` and ``OPERATION-NAME`` in
+    ``fixture_dir`` (see ``fixture_name``); unknown ISBNs get an empty
+    result. ``latency`` adds a fixed delay per call and ``quota_per_second``
+    makes the server answer 429 with rate-limit headers once exceeded, so
+    throughput and backoff can be benchmarked without touching eBay.
+
+        with MarketFixtureServer(fixtures, latency=0.2, quota_per_second=5) as server:
+            collect_ebay_market_stats(isbns, "dry-run", replay_url=server.url)
+    """
+
+    def __init__(
+        self,
+        fixture_dir: Path,
+        *,
+        latency: float = 0.0,
+        quota_per_second: Optional[float] = None,
+    ):
+        self.fixture_dir = Path(fixture_dir)
+        self.latency = latency
+        self.quota_per_second = quota_per_second
+        self.requests_served = 0
+        self.throttled = 0
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        if self._server is None:
+            raise RuntimeError("MarketFixtureServer is not running")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _admit(self) -> Optional[float]:
+        """Count a call against the quota; return seconds to wait if over it."""
+        with self._lock:
+            self.requests_served += 1
+            if not self.quota_per_second:
+                return None
+            now = time.monotonic()
+            if now - self._window_start >= 1.0:
+                self._window_start = now
+                self._window_count = 0
+            self._window_count += 1
+            if self._window_count > self.quota_per_second:
+                self.throttled += 1
+                return max(0.0, 1.0 - (now - self._window_start))
+            return None
+
+    def _quota_headers(self) -> Dict[str, str]:
+        if not self.quota_per_second:
+            return {}
+        with self._lock:
+            remaining = max(0, int(self.quota_per_second) - self._window_count)
+            reset = max(0.0, 1.0 - (time.monotonic() - self._window_start))
+        return {
+            "X-RateLimit-Limit": str(int(self.quota_per_second)),
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset": f"{reset:.3f}",
+        }
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                wait = server._admit()
+                if wait is not None:
+                    self.send_response(429)
+                    self.send_header("Retry-After", f"{wait:.3f}")
+                    for name, value in server._quota_headers().items():
+                        self.send_header(name, value)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                if server.latency:
+                    time.sleep(server.latency)
+                query = parse_qs(urlsplit(self.path).query)
+                isbn = (query.get("productId") or [""])[0]
+                operation = (query.get("OPERATION-NAME") or [""])[0]
+                path = server.fixture_dir / fixture_name(isbn, operation)
+                body = path.read_bytes() if path.exists() else json.dumps({}).encode()
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in server._quota_headers().items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
+
+    def start(self) -> "MarketFixtureServer":
+        if self._server is None:
+            self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+            self._server.daemon_threads = True
+            self._thread = threading.Thread(
+                target=self._server.serve_forever, name="market-fixtures", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            self._thread = None
+
+    def __enter__(self) -> "MarketFixtureServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
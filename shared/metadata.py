@@ -3,12 +3,16 @@ from __future__ import annotations
 import json
 import os
 import re
+import sqlite3
+import threading
 import time
-from typing import Any, Dict, Iterable, Optional, overload
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple, overload
 
 import requests  # type: ignore[reportMissingImports]
 
 from shared.author_aliases import canonical_author as _alias_canonical_author
+from shared.db_pool import import_legacy_json
 from shared.series_finder import attach_series
 
 GOOGLE_BOOKS_URL = "https://www.googleapis.com/books/v1/volumes"
@@ -18,7 +22,9 @@ OPENLIB_WORK_JSON = "https://openlibrary.org{work_key}.json"
 OPENLIB_COVER_TMPL = "https://covers.openlibrary.org/b/isbn/{isbn}-L.jpg"
 OPENLIB_COVER_BY_ID = "https://covers.openlibrary.org/b/id/{cover_id}-L.jpg"
 
-CACHE_PATH = os.path.expanduser("~/.isbn_lot_optimizer/gbooks_cache.json")
+CACHE_PATH = os.path.expanduser("~/.isbn_lot_optimizer/gbooks_cache.json")  # legacy, migrated on first use
+CACHE_DB_PATH = os.path.expanduser("~/.isbn_lot_optimizer/gbooks_cache.sqlite")
+CACHE_LRU_SIZE = 2048
 CACHE_TTL_DAYS = 365
 _CACHE_TTL_SECONDS = CACHE_TTL_DAYS * 24 * 60 * 60
 _DEFAULT_HEADERS = {
@@ -78,50 +84,141 @@ def _finalise_meta(meta: Dict[str, Any], isbn: str, session: Optional[requests.S
 
 
 # ------------------------------ Cache helpers ------------------------------ #
-def _cache_load() -> Dict[str, Any]:
+# Metadata is cached in a small SQLite key/value table (WAL mode) so lookups are
+# indexed and concurrent writers cannot corrupt the store. A bounded in-process
+# LRU sits in front of it. The legacy whole-file JSON cache (CACHE_PATH) is
+# imported once, the first time the SQLite store is opened.
+_cache_lock = threading.RLock()
+_cache_conn: Optional[sqlite3.Connection] = None
+_cache_conn_path: Optional[str] = None
+_cache_lru: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+
+def _cache_connect() -> Optional[sqlite3.Connection]:
+    global _cache_conn, _cache_conn_path
+    if _cache_conn is not None and _cache_conn_path == CACHE_DB_PATH:
+        return _cache_conn
+    _cache_close()
     try:
-        with open(CACHE_PATH, "r", encoding="utf-8") as fh:
-            data = json.load(fh)
-        return data if isinstance(data, dict) else {}
-    except FileNotFoundError:
-        return {}
+        os.makedirs(os.path.dirname(CACHE_DB_PATH), exist_ok=True)
+        conn = sqlite3.connect(CACHE_DB_PATH, timeout=30.0, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS metadata_cache (
+                isbn TEXT PRIMARY KEY,
+                ts REAL NOT NULL,
+                meta TEXT NOT NULL
+            )
+            """
+        )
+        conn.commit()
+        _cache_migrate_json(conn)
     except Exception:
-        return {}
+        return None
+    _cache_conn = conn
+    _cache_conn_path = CACHE_DB_PATH
+    return conn
 
 
-def _cache_save(obj: Dict[str, Any]) -> None:
-    try:
-        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
-        with open(CACHE_PATH, "w", encoding="utf-8") as fh:
-            json.dump(obj, fh, ensure_ascii=False, indent=2)
-    except Exception:
-        pass
+def _cache_close() -> None:
+    global _cache_conn, _cache_conn_path
+    if _cache_conn is not None:
+        try:
+            _cache_conn.close()
+        except Exception:
+            pass
+    _cache_conn = None
+    _cache_conn_path = None
+    _cache_lru.clear()
 
 
-def cache_get(isbn: str) -> Optional[Dict[str, Any]]:
-    key = _clean_isbn(isbn)
-    if not key:
-        return None
-    data = _cache_load()
-    entry = data.get(key)
+def _legacy_cache_entry(entry: Any) -> Optional[Tuple[float, Dict[str, Any]]]:
     if not isinstance(entry, dict):
         return None
     timestamp = entry.get("ts")
-    if not isinstance(timestamp, (int, float)):
+    meta = entry.get("meta")
+    if isinstance(timestamp, (int, float)) and isinstance(meta, dict):
+        return float(timestamp), meta
+    return None
+
+
+def _cache_migrate_json(conn: sqlite3.Connection) -> None:
+    """One-time import of the legacy JSON cache; renames the file when done."""
+    # A sqlite3 connection used as a context manager commits on exit
+    import_legacy_json(
+        lambda: conn,
+        CACHE_PATH,
+        table="metadata_cache",
+        key_column="isbn",
+        value_column="meta",
+        extract=_legacy_cache_entry,
+    )
+
+
+def _cache_lru_put(key: str, timestamp: float, meta: Dict[str, Any]) -> None:
+    _cache_lru[key] = (timestamp, meta)
+    _cache_lru.move_to_end(key)
+    while len(_cache_lru) > CACHE_LRU_SIZE:
+        _cache_lru.popitem(last=False)
+
+
+def cache_get(isbn: str) -> Optional[Dict[str, Any]]:
+    key = _clean_isbn(isbn)
+    if not key:
         return None
-    if time.time() - float(timestamp) > _CACHE_TTL_SECONDS:
+    with _cache_lock:
+        conn = _cache_connect()
+        hit = _cache_lru.get(key)
+        if hit is not None:
+            _cache_lru.move_to_end(key)
+            timestamp, meta = hit
+        else:
+            if conn is None:
+                return None
+            try:
+                row = conn.execute(
+                    "SELECT ts, meta FROM metadata_cache WHERE isbn = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error:
+                return None
+            if not row:
+                return None
+            try:
+                timestamp, meta = float(row[0]), json.loads(row[1])
+            except Exception:
+                return None
+            if not isinstance(meta, dict):
+                return None
+            _cache_lru_put(key, timestamp, meta)
+    if time.time() - timestamp > _CACHE_TTL_SECONDS:
         return None
-    meta = entry.get("meta")
-    return meta if isinstance(meta, dict) else None
+    return dict(meta)
 
 
 def cache_set(isbn: str, meta: Dict[str, Any]) -> None:
     key = _clean_isbn(isbn)
     if not key or not isinstance(meta, dict):
         return
-    data = _cache_load()
-    data[key] = {"ts": time.time(), "meta": meta}
-    _cache_save(data)
+    timestamp = time.time()
+    try:
+        payload = json.dumps(meta, ensure_ascii=False)
+    except (TypeError, ValueError):
+        return
+    with _cache_lock:
+        conn = _cache_connect()
+        if conn is None:
+            return
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO metadata_cache (isbn, ts, meta) VALUES (?, ?, ?)",
+                    (key, timestamp, payload),
+                )
+        except sqlite3.Error:
+            return
+        _cache_lru_put(key, timestamp, dict(meta))
 
 
 # ------------------------------ ISBN utilities ----------------------------- #
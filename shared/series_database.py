@@ -8,7 +8,7 @@ import json
 import sqlite3
 import threading
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 
 class SeriesDatabaseManager:
@@ -252,6 +252,20 @@ class SeriesDatabaseManager:
                 VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
             """, (isbn, series_id, confidence, match_method))
 
+    def match_books_to_series(self, matches: Sequence[Tuple[str, int, float, str]]) -> None:
+        """
+        Record many book/series matches in one transaction.
+
+        Args:
+            matches: (isbn, series_id, confidence, match_method) tuples
+        """
+        with self._get_connection() as conn:
+            conn.executemany("""
+                INSERT OR REPLACE INTO book_series_matches
+                    (isbn, series_id, confidence, match_method, created_at)
+                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+            """, list(matches))
+
     def get_series_for_isbn(self, isbn: str) -> List[Dict[str, Any]]:
         """
         Get all series matches for a given ISBN.
@@ -281,6 +295,118 @@ class SeriesDatabaseManager:
 
             return [dict(row) for row in cursor.fetchall()]
 
+    def get_series_for_isbns(self, isbns: Sequence[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get series matches for many ISBNs in a single query.
+
+        The ISBN list is passed as one JSON array and expanded with
+        ``json_each``, so the cost is one round trip however many ISBNs
+        there are.
+
+        Args:
+            isbns: Book ISBNs
+
+        Returns:
+            Dict of ISBN -> matches (same shape and order as get_series_for_isbn);
+            ISBNs without matches are left out
+        """
+        unique = list(dict.fromkeys(isbn for isbn in isbns if isbn))
+        if not unique:
+            return {}
+
+        with self._get_connection() as conn:
+            cursor = conn.execute("""
+                SELECT
+                    m.isbn,
+                    s.id as series_id,
+                    s.title as series_title,
+                    s.book_count,
+                    a.id as author_id,
+                    a.name as author_name,
+                    m.confidence,
+                    m.match_method
+                FROM json_each(?) wanted
+                JOIN book_series_matches m ON m.isbn = wanted.value
+                JOIN series s ON m.series_id = s.id
+                JOIN authors a ON s.author_id = a.id
+                ORDER BY m.isbn, m.confidence DESC, m.series_id
+            """, (json.dumps(unique),))
+
+            matches: Dict[str, List[Dict[str, Any]]] = {}
+            for row in cursor.fetchall():
+                match = dict(row)
+                matches.setdefault(match.pop('isbn'), []).append(match)
+            return matches
+
+    def get_books_for_series(self, series_ids: Sequence[int]) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Get the books of many series in a single query.
+
+        Args:
+            series_ids: Series database IDs
+
+        Returns:
+            Dict of series ID -> books (same shape and order as get_series_books);
+            every requested ID is present
+        """
+        unique = list(dict.fromkeys(int(series_id) for series_id in series_ids))
+        books: Dict[int, List[Dict[str, Any]]] = {series_id: [] for series_id in unique}
+        if not unique:
+            return books
+
+        with self._get_connection() as conn:
+            cursor = conn.execute("""
+                SELECT
+                    b.series_id,
+                    b.book_title,
+                    b.series_position,
+                    b.source_link
+                FROM json_each(?) wanted
+                JOIN series_books b ON b.series_id = wanted.value
+                ORDER BY b.series_id, COALESCE(b.series_position, 999999), b.book_title
+            """, (json.dumps(unique),))
+
+            for row in cursor.fetchall():
+                book = dict(row)
+                books[book.pop('series_id')].append(book)
+            return books
+
+    def group_isbns_by_series(self, isbns: Sequence[str]) -> Dict[int, Dict[str, Any]]:
+        """
+        Resolve ISBNs to their best series match and group them by series.
+
+        Each ISBN goes to its highest-confidence series. Uses one query for
+        the whole list (see get_series_for_isbns).
+
+        Args:
+            isbns: Book ISBNs
+
+        Returns:
+            Dict of series ID -> series info (series_title, book_count,
+            author_id, author_name) plus ``isbns``, the member ISBNs in input
+            order. Series appear in order of their first member ISBN.
+        """
+        matches = self.get_series_for_isbns(isbns)
+        groups: Dict[int, Dict[str, Any]] = {}
+        for isbn in dict.fromkeys(isbns):
+            isbn_matches = matches.get(isbn)
+            if not isbn_matches:
+                continue
+            best_match = isbn_matches[0]
+            group = groups.get(best_match['series_id'])
+            if group is None:
+                group = {
+                    'series_id': best_match['series_id'],
+                    'series_title': best_match['series_title'],
+                    'book_count': best_match['book_count'],
+                    'author_id': best_match['author_id'],
+                    'author_name': best_match['author_name'],
+                    'isbns': [],
+                }
+                groups[best_match['series_id']] = group
+            group['isbns'].append(isbn)
+        return groups
+
     def get_series_books(self, series_id: int) -> List[Dict[str, Any]]:
         """
         Get all books in a series.
@@ -0,0 +1,257 @@
+"""
+Precomputed title index for matching scanned books to bookseries.org series.
+
+``SeriesMatcher.match_book`` used to query every series of an author, fetch
+each series' books, and score every title against the scanned one. The index
+loads the authors/series/series_books tables once, groups normalised book
+titles per normalised author, and answers a match with no database calls:
+
+- candidates are limited to the author's titles whose length can still reach
+  the similarity threshold (a sorted length list + bisect)
+- the survivors go through difflib's ``real_quick_ratio`` / ``quick_ratio``
+  upper bounds before the full ``ratio``, so pruning never drops a match
+
+The index is pickled next to the database (``<db>.series_index.pkl``) and
+reused, in this process and across runs, while the series tables are
+unchanged.
+
+Usage:
+    index = SeriesMatchIndex.load(db_path)
+    for series, book_title, similarity in index.match("killing floor", "lee child"):
+        ...
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+import pickle
+import sqlite3
+import threading
+from bisect import bisect_left, bisect_right
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+MATCH_THRESHOLD = 0.8
+
+
+class IndexedSeries(NamedTuple):
+    series_id: int
+    series_title: str
+    book_count: int
+
+
+class _AuthorTitles:
+    """One author's series and titles, plus a length-sorted view for pruning."""
+
+    __slots__ = ("series", "titles", "lengths", "by_length")
+
+    def __init__(self) -> None:
+        self.series: List[IndexedSeries] = []
+        # (series slot, book title, normalised title), in match order
+        self.titles: List[Tuple[int, str, str]] = []
+        self.lengths: List[int] = []
+        self.by_length: List[int] = []
+
+    def finish(self) -> None:
+        order = sorted(range(len(self.titles)), key=lambda pos: len(self.titles[pos][2]))
+        self.by_length = order
+        self.lengths = [len(self.titles[pos][2]) for pos in order]
+
+
+# Indexes already loaded in this process, by cache path
+_loaded: Dict[str, "SeriesMatchIndex"] = {}
+_loaded_lock = threading.Lock()
+
+
+def _fingerprint(conn: sqlite3.Connection) -> Tuple:
+    """Cheap summary of the series tables; changes whenever they are edited."""
+    return tuple(conn.execute(
+        """
+        SELECT
+            (SELECT COUNT(*) FROM authors), (SELECT MAX(id) FROM authors),
+            (SELECT COUNT(*) FROM series), (SELECT MAX(id) FROM series),
+            (SELECT MAX(updated_at) FROM series),
+            (SELECT COUNT(*) FROM series_books), (SELECT MAX(id) FROM series_books)
+        """
+    ).fetchone())
+
+
+class SeriesMatchIndex:
+    """Per-author title index over the bookseries.org tables."""
+
+    def __init__(self, fingerprint: Tuple = ()):
+        self.fingerprint = fingerprint
+        self._authors: Dict[str, _AuthorTitles] = {}
+
+    # ------------------------------------------------------------------
+    # Building and caching
+
+    @classmethod
+    def build(cls, conn: sqlite3.Connection) -> "SeriesMatchIndex":
+        """Build the index from an open series database in one query."""
+        from shared.series_matcher import SeriesMatcher
+
+        index = cls(_fingerprint(conn))
+        series_slots: Dict[Tuple[str, int], int] = {}
+        rows = conn.execute(
+            """
+            SELECT
+                a.name_normalized,
+                s.id,
+                s.title,
+                s.book_count,
+                b.book_title
+            FROM series s
+            JOIN authors a ON s.author_id = a.id
+            LEFT JOIN series_books b ON b.series_id = s.id
+            WHERE a.name_normalized IS NOT NULL AND a.name_normalized != ''
+            ORDER BY a.name_normalized, s.title, s.id,
+                     COALESCE(b.series_position, 999999), b.book_title
+            """
+        )
+        for author, series_id, series_title, book_count, book_title in rows:
+            entry = index._authors.get(author)
+            if entry is None:
+                entry = index._authors[author] = _AuthorTitles()
+            slot = series_slots.get((author, series_id))
+            if slot is None:
+                slot = series_slots[(author, series_id)] = len(entry.series)
+                entry.series.append(IndexedSeries(series_id, series_title, book_count or 0))
+            if book_title is not None:
+                entry.titles.append((slot, book_title, SeriesMatcher.normalize_for_matching(book_title)))
+        for entry in index._authors.values():
+            entry.finish()
+        return index
+
+    @staticmethod
+    def cache_path_for(db_path: Path) -> Path:
+        db_path = Path(db_path)
+        return db_path.with_name(db_path.name + ".series_index.pkl")
+
+    @classmethod
+    def load(cls, db_path: Path, cache_path: Optional[Path] = None) -> "SeriesMatchIndex":
+        """
+        Load the index for ``db_path``, rebuilding it if the tables changed.
+
+        The pickled copy at ``cache_path`` (default ``<db>.series_index.pkl``)
+        is used when its fingerprint matches the database; otherwise the
+        index is rebuilt and the cache rewritten.
+        """
+        cache_path = Path(cache_path) if cache_path else cls.cache_path_for(db_path)
+        memo_key = str(cache_path.resolve())
+        conn = sqlite3.connect(db_path)
+        try:
+            fingerprint = _fingerprint(conn)
+            with _loaded_lock:
+                loaded = _loaded.get(memo_key)
+            if loaded is not None and loaded.fingerprint == fingerprint:
+                return loaded
+            index = cls._read_cache(cache_path)
+            if index is None or index.fingerprint != fingerprint:
+                index = cls.build(conn)
+                index._write_cache(cache_path)
+        finally:
+            conn.close()
+        with _loaded_lock:
+            _loaded[memo_key] = index
+        return index
+
+    @classmethod
+    def _read_cache(cls, cache_path: Path) -> Optional["SeriesMatchIndex"]:
+        try:
+            with open(cache_path, "rb") as fh:
+                version, index = pickle.load(fh)
+        except FileNotFoundError:
+            return None
+        except Exception as exc:
+            logger.warning(f"Ignoring unreadable series index cache {cache_path}: {exc}")
+            return None
+        return index if version == INDEX_VERSION and isinstance(index, cls) else None
+
+    def _write_cache(self, cache_path: Path) -> None:
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, "wb") as fh:
+                pickle.dump((INDEX_VERSION, self), fh, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError as exc:
+            logger.warning(f"Could not write series index cache {cache_path}: {exc}")
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+
+    def __getstate__(self):
+        return {
+            "fingerprint": self.fingerprint,
+            "authors": {
+                author: (entry.series, entry.titles) for author, entry in self._authors.items()
+            },
+        }
+
+    def __setstate__(self, state) -> None:
+        self.fingerprint = state["fingerprint"]
+        self._authors = {}
+        for author, (series, titles) in state["authors"].items():
+            entry = _AuthorTitles()
+            entry.series = series
+            entry.titles = titles
+            entry.finish()
+            self._authors[author] = entry
+
+    # ------------------------------------------------------------------
+    # Matching
+
+    def __len__(self) -> int:
+        return sum(len(entry.titles) for entry in self._authors.values())
+
+    def has_author(self, author_normalized: str) -> bool:
+        return author_normalized in self._authors
+
+    def match(
+        self,
+        normalized_title: str,
+        author_normalized: str,
+        threshold: float = MATCH_THRESHOLD,
+    ) -> Iterator[Tuple[IndexedSeries, str, float]]:
+        """
+        Yield (series, matched book title, similarity) for an author's series.
+
+        For each series, only its first book (in series order) scoring at
+        least ``threshold`` is reported, same as the unindexed matcher.
+        Series come out in title order.
+        """
+        entry = self._authors.get(author_normalized)
+        if entry is None or not entry.titles:
+            return
+
+        # ratio = 2*M / (len(a) + len(b)) <= 2*min / (len(a) + len(b))
+        size = len(normalized_title)
+        if threshold > 0:
+            low = math.ceil(size * threshold / (2 - threshold))
+            high = math.floor(size * (2 - threshold) / threshold)
+        else:
+            low, high = 0, entry.lengths[-1]
+        start = bisect_left(entry.lengths, low)
+        stop = bisect_right(entry.lengths, high)
+        candidates = sorted(entry.by_length[start:stop])
+
+        matcher = SequenceMatcher(None, normalized_title)
+        matched_slots = set()
+        for position in candidates:
+            slot, book_title, normalized = entry.titles[position]
+            if slot in matched_slots:
+                continue
+            matcher.set_seq2(normalized)
+            if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+                continue
+            similarity = matcher.ratio()
+            if similarity >= threshold:
+                matched_slots.add(slot)
+                yield entry.series[slot], book_title, similarity
@@ -11,13 +11,26 @@ from typing import Any, Dict, List, Optional, Tuple
 
 from shared.author_aliases import canonical_author
 from shared.series_database import SeriesDatabaseManager
+from shared.series_match_index import MATCH_THRESHOLD, SeriesMatchIndex
+
+# Matches at or above this confidence are saved to book_series_matches
+AUTO_SAVE_CONFIDENCE = 0.9
 
 
 class SeriesMatcher:
     """Matches books to series using various strategies."""
 
-    def __init__(self, db_path: Path):
+    def __init__(self, db_path: Path, index_cache_path: Optional[Path] = None):
         self.series_db = SeriesDatabaseManager(db_path)
+        self._index_cache_path = index_cache_path
+        self._index: Optional[SeriesMatchIndex] = None
+
+    @property
+    def index(self) -> SeriesMatchIndex:
+        """Title index over the series tables, loaded (or built) on first use."""
+        if self._index is None:
+            self._index = SeriesMatchIndex.load(self.series_db.db_path, self._index_cache_path)
+        return self._index
 
     def close(self) -> None:
         """Close database connection."""
@@ -71,6 +84,23 @@ class SeriesMatcher:
         Returns:
             List of potential series matches with confidence scores
         """
+        matches = self._find_matches(book_title, book_authors)
+
+        # Auto-save high confidence matches
+        if auto_save:
+            for match in matches:
+                if match['confidence'] >= AUTO_SAVE_CONFIDENCE:
+                    self.series_db.match_book_to_series(
+                        isbn=isbn,
+                        series_id=match['series_id'],
+                        confidence=match['confidence'],
+                        match_method=match['match_method']
+                    )
+
+        return self._dedupe_matches(matches)
+
+    def _find_matches(self, book_title: str, book_authors: List[str]) -> List[Dict[str, Any]]:
+        """Every series match for a book, at most one per (author, series)."""
         matches: List[Dict[str, Any]] = []
 
         if not book_title or not book_authors:
@@ -85,50 +115,28 @@ class SeriesMatcher:
             if not author_normalized:
                 continue
 
-            # Try to find series by normalized author name
-            author_series = self.series_db.get_author_series_by_normalized_name(author_normalized)
-
-            for series_info in author_series:
-                series_id = series_info['series_id']
-                series_title = series_info['series_title']
-                series_books = self.series_db.get_series_books(series_id)
-
-                # Check if book title matches any book in this series
-                for series_book in series_books:
-                    book_in_series_title = series_book['book_title']
-                    normalized_series_book = self.normalize_for_matching(book_in_series_title)
-
-                    similarity = self.similarity_score(normalized_title, normalized_series_book)
-
-                    if similarity >= 0.8:  # High confidence threshold
-                        confidence = similarity
-                        match_method = f"title_match_{similarity:.2f}"
-
-                        matches.append({
-                            'series_id': series_id,
-                            'series_title': series_title,
-                            'author_name': author,
-                            'book_count': series_info['book_count'],
-                            'matched_book': book_in_series_title,
-                            'confidence': confidence,
-                            'match_method': match_method
-                        })
-
-                        # Auto-save high confidence matches
-                        if auto_save and confidence >= 0.9:
-                            self.series_db.match_book_to_series(
-                                isbn=isbn,
-                                series_id=series_id,
-                                confidence=confidence,
-                                match_method=match_method
-                            )
-
-                        break  # Found best match for this series
+            # The index only scores this author's titles that can still reach the threshold
+            for series, matched_book, similarity in self.index.match(
+                normalized_title, author_normalized, threshold=MATCH_THRESHOLD
+            ):
+                matches.append({
+                    'series_id': series.series_id,
+                    'series_title': series.series_title,
+                    'author_name': author,
+                    'book_count': series.book_count,
+                    'matched_book': matched_book,
+                    'confidence': similarity,
+                    'match_method': f"title_match_{similarity:.2f}"
+                })
 
         # Strategy 2: Series name in metadata
         # (This would use series_name from metadata_json if available)
 
-        # Deduplicate and sort by confidence
+        return matches
+
+    @staticmethod
+    def _dedupe_matches(matches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Keep the best match per series, highest confidence first."""
         seen_series = set()
         unique_matches = []
 
@@ -158,6 +166,7 @@ class SeriesMatcher:
             Dict mapping ISBN to list of matches
         """
         results = {}
+        to_save: List[Tuple[str, int, float, str]] = []
         total = len(books)
 
         for i, book in enumerate(books, 1):
@@ -169,19 +178,26 @@ class SeriesMatcher:
                 # Parse comma/semicolon separated authors
                 authors = [a.strip() for a in re.split(r'[;,]', authors) if a.strip()]
 
-            matches = self.match_book(
-                isbn=isbn,
-                book_title=title,
-                book_authors=authors,
-                auto_save=auto_save
-            )
+            matches = self._find_matches(title, authors)
+
+            if auto_save:
+                to_save.extend(
+                    (isbn, match['series_id'], match['confidence'], match['match_method'])
+                    for match in matches
+                    if match['confidence'] >= AUTO_SAVE_CONFIDENCE
+                )
 
+            matches = self._dedupe_matches(matches)
             if matches:
                 results[isbn] = matches
 
             if progress_callback:
                 progress_callback(i, total)
 
+        # Save all high confidence matches in one transaction
+        if to_save:
+            self.series_db.match_books_to_series(to_save)
+
         return results
 
     def get_series_info_for_isbn(self, isbn: str) -> Optional[Dict[str, Any]]:
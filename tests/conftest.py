@@ -3,6 +3,8 @@ from __future__ import annotations
 
 import sqlite3
 import tempfile
+import threading
+import time
 from pathlib import Path
 from typing import Generator
 from unittest.mock import Mock
@@ -125,6 +127,32 @@ def mock_metadata_response() -> dict:
     }
 
 
+class CallRecorder:
+    """Stand-in for a slow upstream call: records each call and the peak concurrency."""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.calls: list[tuple] = []
+        self.peak = 0
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, *call) -> None:
+        with self._lock:
+            self.calls.append(call)
+            self._active += 1
+            self.peak = max(self.peak, self._active)
+        time.sleep(self.delay)
+        with self._lock:
+            self._active -= 1
+
+
+@pytest.fixture
+def call_recorder() -> CallRecorder:
+    """Record calls made by fakes of slow network functions."""
+    return CallRecorder()
+
+
 @pytest.fixture(autouse=True)
 def setup_test_environment(monkeypatch):
     """Set up test environment variables and configurations."""
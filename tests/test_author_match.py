@@ -1,6 +1,12 @@
 import pytest  # type: ignore[import]
 
-from isbn_lot_optimizer.author_match import author_key, similarity, probable_author_matches, cluster_authors
+from isbn_lot_optimizer.author_match import (
+    AuthorClusterIndex,
+    author_key,
+    cluster_authors,
+    probable_author_matches,
+    similarity,
+)
 
 
 @pytest.mark.parametrize(
@@ -65,3 +71,70 @@ def test_cluster_authors_groups_variants() -> None:
     for k in rowling_keys:
         # members should be drawn from provided names and include at least 2 variants
         assert len(clusters[k]) >= 2
+
+
+def test_cluster_authors_merges_surname_spelling_variants() -> None:
+    clusters = cluster_authors(["Jane Austen", "Austen, Jane", "Jane Austin", "Stephen King"])
+    assert sorted(clusters["jane austen"]) == ["Austen, Jane", "Jane Austen", "Jane Austin"]
+    assert clusters["stephen king"] == ["Stephen King"]
+
+
+@pytest.mark.parametrize(
+    "names",
+    [
+        ["Stephen King", "Stephen Kang"],  # short surnames one letter apart
+        ["Jane Austen", "Janet Austin"],  # different given names
+        ["Lee Child", "Lee Childress"],  # more than one edit
+    ],
+)
+def test_cluster_authors_keeps_different_surnames_apart(names) -> None:
+    assert len(cluster_authors(names)) == 2
+
+
+def test_cluster_key_ties_go_to_first_seen_name() -> None:
+    assert list(cluster_authors(["Tom Clancy", "Tim Clancy"])) == ["tom clancy"]
+    assert list(cluster_authors(["Tim Clancy", "Tom Clancy"])) == ["tim clancy"]
+
+
+def test_removed_names_drop_their_cached_decisions() -> None:
+    index = AuthorClusterIndex()
+    index.update(["Tom Clancy", "Tim Clancy", "Jane Austen", "Jane Austin"])
+    index.clusters()
+
+    index.update(["Tom Clancy", "Jane Austen"])
+    index.clusters()
+
+    assert all({"tim clancy", "jane austin"}.isdisjoint(pair) for pair in index.decisions)
+
+
+def test_author_cluster_index_incremental_matches_fresh_build() -> None:
+    first = ["Rowling, J. K.", "Joanne K Rowling", "Stephen King", "Stephen Kingg", "Jane Austen"]
+    second = ["Joanne K Rowling", "J K Rowling", "Stephen King", "Stephen Kingg", "Steven King", "Lee Child"]
+    index = AuthorClusterIndex()
+    index.update(first)
+    index.clusters()
+    scored = index.scored
+
+    index.update(second)
+    incremental = index.clusters()
+
+    fresh = AuthorClusterIndex()
+    fresh.update(second)
+    assert {k: sorted(v) for k, v in incremental.items()} == {k: sorted(v) for k, v in fresh.clusters().items()}
+    # Only pairs involving keys that were not indexed before get scored
+    assert index.scored - scored < fresh.scored
+
+
+def test_cluster_authors_persists_state(tmp_path) -> None:
+    cache_path = tmp_path / "catalog.db.author_clusters.pkl"
+    names = ["Rowling, J. K.", "J K Rowling", "Joanne K Rowling", "Stephen King"]
+
+    clusters = cluster_authors(names, cache_path=cache_path)
+
+    assert cache_path.exists()
+    saved = AuthorClusterIndex.load(cache_path)
+    assert set(saved.names) == set(names)
+    assert cluster_authors(names + ["King, Stephen"], cache_path=cache_path)["stephen king"] == [
+        "Stephen King", "King, Stephen",
+    ]
+    assert clusters.keys() == {"rowling", "stephen king"}
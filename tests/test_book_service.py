@@ -230,3 +230,83 @@ class TestBookServiceStatistics:
 
         assert isinstance(stats, dict)
         assert "total_books" in stats or "book_count" in stats
+
+
+@pytest.mark.integration
+class TestEvaluateIsbnConcurrency:
+    """Test the concurrent upstream fan-out in evaluate_isbn."""
+
+    def _patch_sources(self, book_service: BookService, delay: float):
+        import time
+
+        def slow(result):
+            def _inner(*args, **kwargs):
+                time.sleep(delay)
+                return result
+            return _inner
+
+        from shared.models import BookMetadata
+
+        book_service.bookscouter_api_key = "test-key"
+        metadata = BookMetadata(isbn="9780143127550", title="Test Book", authors=("Test Author",))
+        return [
+            patch.object(book_service, "_evaluate_bookscouter_metadata", side_effect=slow((None, 12345))),
+            patch.object(book_service, "_evaluate_google_metadata", side_effect=slow(metadata)),
+            patch.object(book_service, "_evaluate_market_stats", side_effect=slow((None, None))),
+            patch.object(book_service, "_evaluate_booksrun_offer", side_effect=slow(None)),
+            patch.object(book_service, "_evaluate_bookscouter_offers", side_effect=slow(None)),
+        ]
+
+    def test_concurrent_matches_sequential(self, book_service: BookService):
+        """Both modes should produce the same evaluation."""
+        patches = self._patch_sources(book_service, delay=0)
+        for p in patches:
+            p.start()
+        try:
+            sequential = book_service.evaluate_isbn("9780143127550", concurrent=False)
+            parallel = book_service.evaluate_isbn("9780143127550", concurrent=True)
+        finally:
+            for p in patches:
+                p.stop()
+
+        assert parallel.isbn == sequential.isbn
+        assert parallel.metadata.title == sequential.metadata.title == "Test Book"
+        assert parallel.rarity == sequential.rarity
+        assert parallel.probability_score == sequential.probability_score
+
+    def test_concurrent_latency_tracks_slowest_source(self, book_service: BookService):
+        """Independent sources should overlap rather than add up."""
+        import time
+
+        patches = self._patch_sources(book_service, delay=0.2)
+        for p in patches:
+            p.start()
+        try:
+            start = time.perf_counter()
+            book_service.evaluate_isbn("9780143127550", concurrent=True)
+            elapsed = time.perf_counter() - start
+        finally:
+            for p in patches:
+                p.stop()
+
+        # Metadata + Google fallback are chained (0.4s); the rest overlap
+        assert elapsed < 0.8
+
+    def test_executor_created_once_under_concurrent_first_use(self, book_service: BookService):
+        """Racing first scans should all get the same pool."""
+        import threading
+
+        start = threading.Barrier(8)
+        seen = []
+
+        def grab():
+            start.wait()
+            seen.append(book_service._get_evaluation_executor())
+
+        threads = [threading.Thread(target=grab) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len({id(executor) for executor in seen}) == 1
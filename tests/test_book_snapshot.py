@@ -0,0 +1,114 @@
+"""Tests for the decoded-row snapshot behind BookService.list_books."""
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from isbn_lot_optimizer.service import BookService
+from tests.test_database import _full_book_payload
+
+
+@pytest.fixture
+def service(temp_db_path: Path):
+    service = BookService(temp_db_path)
+    service.db.upsert_book(_full_book_payload("9780439708180", "Sorcerer's Stone", "J. K. Rowling"))
+    service.db.upsert_book(_full_book_payload("9780143127550", "Everything I Never Told You", "Celeste Ng"))
+    yield service
+    service.close()
+
+
+def _count_decodes(service: BookService, monkeypatch) -> list[str]:
+    decoded: list[str] = []
+    decode = service._book_snapshot._decode
+
+    def counting(row):
+        decoded.append(row["isbn"])
+        return decode(row)
+
+    monkeypatch.setattr(service._book_snapshot, "_decode", counting)
+    return decoded
+
+
+@pytest.mark.database
+class TestBookSnapshot:
+    """Test that list_books only re-decodes rows that changed."""
+
+    def test_unchanged_rows_are_not_decoded_again(self, service, monkeypatch):
+        """Test that a second listing is served entirely from the snapshot."""
+        decoded = _count_decodes(service, monkeypatch)
+
+        first = service.list_books()
+        assert sorted(decoded) == ["9780143127550", "9780439708180"]
+
+        decoded.clear()
+        second = service.list_books()
+        assert decoded == []
+        assert [b.isbn for b in second] == [b.isbn for b in first]
+
+    def test_write_invalidates_only_that_book(self, service, monkeypatch):
+        """Test that a DatabaseManager write evicts just the touched ISBN."""
+        decoded = _count_decodes(service, monkeypatch)
+        service.list_books()
+        decoded.clear()
+
+        service.db.update_book_price("9780143127550", 42.0)
+        books = {b.isbn: b for b in service.list_books()}
+
+        assert decoded == ["9780143127550"]
+        assert books["9780143127550"].estimated_price == 42.0
+
+    def test_deleted_books_drop_out(self, service):
+        """Test that deleted books disappear from the listing."""
+        service.list_books()
+        service.db.delete_book("9780439708180")
+        assert [b.isbn for b in service.list_books()] == ["9780143127550"]
+
+    def test_callers_get_copies(self, service):
+        """Test that mutating a returned evaluation does not leak into the cache."""
+        book = service.list_books()[0]
+        book.estimated_price = -1.0
+        book.metadata.title = "Mutated"
+
+        again = {b.isbn: b for b in service.list_books()}[book.isbn]
+        assert again.estimated_price != -1.0
+        assert again.metadata.title != "Mutated"
+
+    def test_nested_mutations_do_not_leak(self, service):
+        """Test that callers get their own nested lists and dicts too."""
+        book = service.list_books()[0]
+        book.justification.append("Mutated")
+        book.metadata.raw["title"] = "Mutated"
+
+        again = {b.isbn: b for b in service.list_books()}[book.isbn]
+        assert "Mutated" not in again.justification
+        assert again.metadata.raw.get("title") != "Mutated"
+
+    def test_row_read_before_invalidation_is_not_cached(self, service):
+        """Test that a row decoded after a same-second write does not stick in the cache."""
+        snapshot = service._book_snapshot
+        generation = snapshot.generation
+        old_row = service.db.fetch_book("9780143127550")
+
+        service.db.update_book_price("9780143127550", 42.0)
+        # The write landed in the same second as the row we already read
+        with service.db._pool.write() as conn:
+            conn.execute(
+                "UPDATE books SET updated_at = ? WHERE isbn = ?", (old_row["updated_at"], "9780143127550")
+            )
+        assert snapshot.evaluation_for_row(old_row, generation).estimated_price != 42.0
+
+        books = {b.isbn: b for b in service.list_books()}
+        assert books["9780143127550"].estimated_price == 42.0
+
+    def test_replacing_db_resubscribes(self, service, temp_db_path):
+        """Test that swapping service.db clears and re-wires the snapshot."""
+        old_db = service.db
+        service.list_books()
+        service.db = type(old_db)(temp_db_path)
+        assert len(service._book_snapshot) == 0
+
+        service.db.update_book_price("9780439708180", 7.5)
+        books = {b.isbn: b for b in service.list_books()}
+        assert books["9780439708180"].estimated_price == 7.5
+        old_db.close()
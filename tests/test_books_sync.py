@@ -0,0 +1,153 @@
+"""Tests for the /api/books/all delta sync protocol."""
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from isbn_lot_optimizer.service import BookService
+from isbn_web.api.dependencies import get_book_service
+from isbn_web.api.routes import books as books_routes
+from tests.test_database import _full_book_payload
+
+
+@pytest.fixture
+def service(temp_db_path: Path):
+    service = BookService(temp_db_path)
+    service.db.upsert_book(_full_book_payload("9780439708180", "Sorcerer's Stone", "J. K. Rowling"))
+    service.db.upsert_book(_full_book_payload("9780143127550", "Everything I Never Told You", "Celeste Ng"))
+    yield service
+    service.close()
+
+
+@pytest.fixture
+def client(service):
+    app = FastAPI()
+    app.include_router(books_routes.router, prefix="/api/books")
+    app.dependency_overrides[get_book_service] = lambda: service
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.mark.database
+class TestBookChangeLog:
+    """Test the book_changes cursor and tombstones."""
+
+    def test_cursor_advances_and_records_tombstones(self, service):
+        """Test that writes bump the cursor and deletes leave tombstones."""
+        start = service.db.fetch_change_cursor()
+        assert start == 2
+
+        service.db.update_book_price("9780143127550", 12.0)
+        service.db.delete_book("9780439708180")
+
+        changes = service.get_book_changes(start)
+        assert changes["cursor"] == start + 2
+        assert [b.isbn for b in changes["books"]] == ["9780143127550"]
+        assert changes["deleted"] == ["9780439708180"]
+
+    def test_old_tombstones_are_pruned(self, service):
+        """Test that pruning drops tombstones and moves the delta horizon."""
+        start = service.db.fetch_change_cursor()
+        service.db.delete_book("9780439708180")
+        service.db.delete_book("9780143127550")
+
+        assert service.db.prune_book_changes(max_tombstones=1) == 1
+        assert service.db.fetch_change_horizon() == start + 1
+        assert service.get_book_changes(start)["deleted"] == ["9780143127550"]
+
+    def test_rejected_books_are_reported_as_deleted(self, service):
+        """Test that books leaving ACCEPT status show up as tombstones."""
+        start = service.db.fetch_change_cursor()
+        service.db.update_book_record("9780143127550", columns={"status": "REJECT"})
+        assert service.get_book_changes(start)["deleted"] == ["9780143127550"]
+
+
+@pytest.mark.integration
+class TestBooksAllSync:
+    """Test the HTTP side of /api/books/all."""
+
+    def test_legacy_listing_has_etag_and_304(self, client):
+        """Test that the plain listing is unchanged but revalidatable."""
+        first = client.get("/api/books/all")
+        assert first.status_code == 200
+        assert {b["isbn"] for b in first.json()} == {"9780439708180", "9780143127550"}
+
+        again = client.get("/api/books/all", headers={"If-None-Match": first.headers["etag"]})
+        assert again.status_code == 304
+
+    def test_delta_sync_round_trip(self, client, service):
+        """Test initial sync, an empty delta, then a delta with a tombstone."""
+        initial = client.get("/api/books/all", params={"cursor": 0}).json()
+        assert initial["full"] is True
+        assert len(initial["books"]) == 2
+
+        unchanged = client.get("/api/books/all", params={"cursor": initial["cursor"]})
+        assert unchanged.status_code == 304
+
+        service.db.delete_book("9780439708180")
+        delta = client.get("/api/books/all", params={"cursor": initial["cursor"]}).json()
+        assert delta["full"] is False
+        assert delta["books"] == []
+        assert delta["deleted"] == ["9780439708180"]
+
+    def test_cursor_older_than_pruned_tombstones_resyncs_fully(self, client, service):
+        """Test that a client that may have missed a pruned tombstone gets a full resync."""
+        initial = client.get("/api/books/all", params={"cursor": 0}).json()
+        service.db.delete_book("9780439708180")
+        service.db.prune_book_changes(max_tombstones=0)
+
+        delta = client.get("/api/books/all", params={"cursor": initial["cursor"]}).json()
+        assert delta["full"] is True
+        assert [b["isbn"] for b in delta["books"]] == ["9780143127550"]
+
+    def test_listing_reads_only_new_changes(self, client, service, monkeypatch):
+        """Test that repeated listings read just the change-log slice since the last one."""
+        client.get("/api/books/all")
+        reads = []
+        fetch_changes_since = service.db.fetch_changes_since
+
+        def recording(cursor, until=None):
+            rows = fetch_changes_since(cursor, until=until)
+            reads.append([row["isbn"] for row in rows])
+            return rows
+
+        monkeypatch.setattr(service.db, "fetch_changes_since", recording)
+        client.get("/api/books/all")
+        assert reads == []
+
+        service.db.update_book_price("9780143127550", 12.0)
+        books = {b["isbn"]: b for b in client.get("/api/books/all").json()}
+        assert reads == [["9780143127550"]]
+        assert books["9780143127550"]["estimated_price"] == 12.0
+
+    def test_serialized_book_cache_is_bounded(self, client, service, monkeypatch):
+        """Test that the per-database JSON cache evicts least recently used books."""
+        cache = books_routes._book_json_cache(service)
+        monkeypatch.setattr(cache, "max_entries", 1)
+
+        assert len(client.get("/api/books/all").json()) == 2
+        assert len(cache) == 1
+
+    def test_compact_projection(self, client):
+        """Test that fields=compact trims the payload."""
+        books = client.get("/api/books/all", params={"fields": "compact"}).json()
+        assert set(books[0]) <= {"isbn", "quantity", "condition", "estimated_price",
+                                 "probability_score", "probability_label", "updated_at", "metadata"}
+        assert set(books[0]["metadata"]) <= {"title", "authors", "thumbnail", "series_name", "series_index"}
+
+    def test_gzip_when_accepted(self, client, monkeypatch):
+        """Test that large bodies are gzip-compressed when the client allows it."""
+        monkeypatch.setattr(books_routes, "_COMPRESS_MIN_BYTES", 0)
+        monkeypatch.setattr(books_routes, "brotli", None)
+        response = client.get(
+            "/api/books/all",
+            headers={"Accept-Encoding": "gzip"},
+        )
+        assert response.headers["content-encoding"] == "gzip"
+        assert len(response.json()) == 2
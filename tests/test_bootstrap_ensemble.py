@@ -0,0 +1,73 @@
+"""Tests for vectorized bootstrap ensemble prediction and its file format."""
+from __future__ import annotations
+
+import joblib
+import numpy as np
+import pytest
+
+pytest.importorskip("xgboost")
+
+from isbn_lot_optimizer.ml.bootstrap_ensemble import ENSEMBLE_FILE, Z_90, Z_95, BootstrapEnsemble
+
+
+@pytest.fixture(scope="module")
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(80, 4))
+    y = 10 + 3 * X[:, 0] + rng.normal(scale=0.5, size=80)
+    return X, y
+
+
+@pytest.fixture(scope="module")
+def ensemble(data):
+    X, y = data
+    ensemble = BootstrapEnsemble(n_models=4, random_state=7)
+    ensemble.fit(X, y, {'n_estimators': 15, 'max_depth': 3, 'random_state': 7, 'n_jobs': 1})
+    return ensemble
+
+
+class TestBootstrapEnsemble:
+    """Test batch statistics, per-sample compatibility and save/load."""
+
+    def test_predict_arrays_matches_member_statistics(self, ensemble, data):
+        X, _y = data
+        batch = ensemble.predict_arrays(X[:10])
+
+        members = np.vstack([model.predict(ensemble.scaler.transform(X[:10])) for model in ensemble.models])
+        np.testing.assert_allclose(batch.individual_predictions, members, rtol=1e-6)
+        np.testing.assert_allclose(batch.mean, members.mean(axis=0), rtol=1e-6)
+        np.testing.assert_allclose(batch.std, members.std(axis=0), rtol=1e-5, atol=1e-6)
+        np.testing.assert_allclose(batch.ci_90_upper, batch.mean + Z_90 * batch.std)
+        np.testing.assert_allclose(batch.ci_95_lower, batch.mean - Z_95 * batch.std)
+
+        parallel = ensemble.predict_arrays(X[:10], n_jobs=4)
+        np.testing.assert_array_equal(parallel.mean, batch.mean)
+
+    def test_per_sample_results_agree_with_batch(self, ensemble, data):
+        X, _y = data
+        batch = ensemble.predict_arrays(X[:5])
+        results = ensemble.predict_batch(X[:5])
+        single = ensemble.predict(X[3])
+
+        assert [result.mean for result in results] == pytest.approx(batch.mean.tolist())
+        assert results[3].confidence_interval_95 == pytest.approx((batch.ci_95_lower[3], batch.ci_95_upper[3]))
+        assert single.mean == pytest.approx(results[3].mean)
+        assert len(single.individual_predictions) == 4
+
+    def test_saves_one_file_and_loads_older_layout(self, ensemble, data, tmp_path):
+        X, y = data
+        ensemble.save(tmp_path / "compact")
+        assert [path.name for path in (tmp_path / "compact").iterdir()] == [ENSEMBLE_FILE]
+
+        loaded = BootstrapEnsemble.load(tmp_path / "compact")
+        np.testing.assert_array_equal(loaded.predict_arrays(X).mean, ensemble.predict_arrays(X).mean)
+        assert loaded.evaluate(X, y) == ensemble.evaluate(X, y)
+
+        legacy = tmp_path / "legacy"
+        legacy.mkdir()
+        for i, model in enumerate(ensemble.models):
+            joblib.dump(model, legacy / f"model_{i}.pkl")
+        joblib.dump(ensemble.scaler, legacy / "scaler.pkl")
+        joblib.dump({'n_models': 4, 'random_state': 7, 'trained': True}, legacy / "metadata.pkl")
+
+        np.testing.assert_array_equal(BootstrapEnsemble.load(legacy).predict_arrays(X).mean, ensemble.predict_arrays(X).mean)
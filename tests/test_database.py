@@ -194,3 +194,89 @@ class TestDatabaseManager:
 
         assert len(results) == 1
         assert results[0]["title"] == "Book 3"
+
+
+def _full_book_payload(isbn: str, title: str, authors: str, **extra) -> dict:
+    """Build an upsert_book payload with every bound column present."""
+    payload = {
+        "isbn": isbn,
+        "title": title,
+        "authors": authors,
+        "publication_year": None,
+        "edition": None,
+        "rarity": None,
+        "sell_through": None,
+        "ebay_active_count": None,
+        "ebay_sold_count": None,
+        "ebay_currency": None,
+        "time_to_sell_days": None,
+        "sold_comps_count": None,
+        "sold_comps_min": None,
+        "sold_comps_median": None,
+        "sold_comps_max": None,
+        "sold_comps_is_estimate": None,
+        "sold_comps_source": None,
+    }
+    payload.update(extra)
+    return payload
+
+
+@pytest.mark.database
+class TestBooksFullTextSearch:
+    """Test the books_fts index behind search_books."""
+
+    @pytest.fixture
+    def db(self, temp_db_path: Path):
+        manager = DatabaseManager(temp_db_path, enable_organic_growth=False)
+        manager.upsert_book(_full_book_payload(
+            "9780439708180", "Harry Potter and the Sorcerer's Stone", "J. K. Rowling",
+            metadata_json={"series_name": "Harry Potter", "publisher": "Scholastic"},
+            probability_score=50.0,
+        ))
+        manager.upsert_book(_full_book_payload(
+            "9780143127550", "Everything I Never Told You", "Celeste Ng",
+            metadata_json={"publisher": "Penguin Books"},
+            probability_score=60.0,
+        ))
+        yield manager
+        manager.close()
+
+    def test_prefix_match_on_title(self, db: DatabaseManager):
+        """Test that partial words match via prefix search."""
+        results = db.search_books("harr pot")
+        assert [row["isbn"] for row in results] == ["9780439708180"]
+
+    def test_matches_series_and_publisher_from_metadata(self, db: DatabaseManager):
+        """Test that series_name and publisher in metadata_json are searchable."""
+        assert [row["isbn"] for row in db.search_books("scholastic")] == ["9780439708180"]
+        assert [row["isbn"] for row in db.search_books("penguin")] == ["9780143127550"]
+
+    def test_hyphenated_isbn(self, db: DatabaseManager):
+        """Test that hyphenated ISBN input matches the stored ISBN."""
+        results = db.search_books("978-0-14-312755-0")
+        assert [row["isbn"] for row in results] == ["9780143127550"]
+
+    def test_punctuation_only_query_matches_nothing(self, db: DatabaseManager):
+        """Test that a query without searchable words doesn't return the whole library."""
+        assert db.search_books("!!! ---") == []
+        assert len(db.search_books("  ")) == 2
+
+    def test_isbn_fragment_matches_anywhere_in_isbn(self, db: DatabaseManager):
+        """Test that the middle or end of an ISBN still finds the book."""
+        assert [row["isbn"] for row in db.search_books("312755")] == ["9780143127550"]
+        assert [row["isbn"] for row in db.search_books("708-180")] == ["9780439708180"]
+        assert [row["isbn"] for row in db.search_books("978")] == ["9780143127550", "9780439708180"]
+
+    def test_index_follows_updates_and_deletes(self, db: DatabaseManager):
+        """Test that triggers keep the index in sync with the books table."""
+        db.update_book_record("9780143127550", columns={"title": "Little Fires Everywhere"})
+        assert db.search_books("never told") == []
+        assert len(db.search_books("little fires")) == 1
+
+        db.delete_book("9780143127550")
+        assert db.search_books("little fires") == []
+
+    def test_rebuild_search_index(self, db: DatabaseManager):
+        """Test that the backfill rebuilds one entry per book."""
+        assert db.rebuild_search_index() == 2
+        assert len(db.search_books("rowling")) == 1
@@ -0,0 +1,104 @@
+"""Tests for the cached, memory-mapped stacking training datasets."""
+from __future__ import annotations
+
+import os
+
+import numpy as np
+import pytest
+
+from scripts.stacking import data_loader, dataset_cache
+from scripts.stacking.dataset_cache import cached_dataset, load_platform_dataset
+
+
+def extract(records, targets, extractor, catalog_db_path):
+    X = np.array([[record['pages'], record['year']] for record in records], dtype=float)
+    return X, np.array(targets), [record['isbn'] for record in records], [None] * len(records)
+
+
+@pytest.fixture
+def source_db(tmp_path, monkeypatch):
+    path = tmp_path / "catalog.db"
+    path.write_bytes(b"v1")
+    monkeypatch.setattr(dataset_cache, "source_databases", lambda: [path])
+    dataset_cache._platform_records.cache_clear()
+    yield path
+    dataset_cache._platform_records.cache_clear()
+
+
+@pytest.fixture
+def builds():
+    built = []
+
+    def build():
+        built.append(1)
+        records = [{'isbn': '9780000000001', 'pages': 320, 'year': 2001}]
+        return extract(records, [12.5], None, None)
+
+    build.count = built
+    return build
+
+
+class TestDatasetCache:
+    """Test building, reuse and invalidation of cached datasets."""
+
+    def test_second_load_is_memory_mapped_from_disk(self, tmp_path, source_db, builds):
+        first = cached_dataset("ebay-test", builds, extract, tmp_path / "cache")
+        X, y, isbns, timestamps = cached_dataset("ebay-test", builds, extract, tmp_path / "cache")
+
+        assert len(builds.count) == 1
+        assert isinstance(X, np.memmap)
+        np.testing.assert_array_equal(X, first[0])
+        assert y.tolist() == [12.5]
+        assert isbns == ['9780000000001']
+        assert timestamps == [None]
+
+        # Copy-on-write: trainers may modify the arrays without touching the cache
+        X[0, 0] = 0
+        reloaded = cached_dataset("ebay-test", builds, extract, tmp_path / "cache")[0]
+        assert reloaded[0, 0] == 320
+
+    def test_changed_database_rebuilds_and_drops_stale_copy(self, tmp_path, source_db, builds):
+        cache_dir = tmp_path / "cache"
+        cached_dataset("ebay-test", builds, extract, cache_dir)
+
+        source_db.write_bytes(b"version two")
+        stat = source_db.stat()
+        os.utime(source_db, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        cached_dataset("ebay-test", builds, extract, cache_dir)
+
+        assert len(builds.count) == 2
+        assert len(list(cache_dir.iterdir())) == 1
+
+    def test_directory_replaced_while_reading_falls_back_to_built_copy(self, tmp_path, source_db, builds, monkeypatch):
+        read_dataset = dataset_cache._read_dataset
+
+        def replaced_by_other_trainer(directory):
+            # Another process rebuilt this version and is swapping it in
+            (directory / 'manifest.json').unlink()
+            return read_dataset(directory)
+
+        monkeypatch.setattr(dataset_cache, "_read_dataset", replaced_by_other_trainer)
+        X, y, isbns, timestamps = cached_dataset("ebay-test", builds, extract, tmp_path / "cache")
+
+        assert len(builds.count) == 1
+        assert X.tolist() == [[320.0, 2001.0]]
+        assert isbns == ['9780000000001']
+
+    def test_platforms_share_one_raw_data_load(self, tmp_path, source_db, monkeypatch):
+        loads = []
+
+        def load_platform_training_data():
+            loads.append(1)
+            return {
+                'ebay': ([{'isbn': '9780000000001', 'pages': 100, 'year': 1999}], [8.0]),
+                'amazon': ([{'isbn': '9780000000002', 'pages': 200, 'year': 2010}], [15.0]),
+            }
+
+        monkeypatch.setattr(data_loader, "load_platform_training_data", load_platform_training_data)
+
+        ebay = load_platform_dataset('ebay', extract, tmp_path / "cache")
+        amazon = load_platform_dataset('amazon', extract, tmp_path / "cache")
+
+        assert len(loads) == 1
+        assert ebay[2] == ['9780000000001']
+        assert amazon[1].tolist() == [15.0]
@@ -0,0 +1,74 @@
+"""Tests for shared.db_pool connection pooling."""
+from __future__ import annotations
+
+import sqlite3
+import threading
+
+import pytest
+
+from shared.db_pool import acquire_pool, get_pool, release_pool
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = acquire_pool(tmp_path / "pool.db")
+    with pool.write() as conn:
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, value TEXT)")
+    yield pool
+    release_pool(pool)
+
+
+@pytest.mark.unit
+class TestConnectionPool:
+    """Test writer/reader behaviour of the shared pool."""
+
+    def test_pragmas_applied(self, pool):
+        """Test that connections use WAL and the standard pragmas."""
+        with pool.write() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        with pool.read() as conn:
+            assert conn.execute("PRAGMA busy_timeout").fetchone()[0] > 0
+
+    def test_readers_are_read_only(self, pool):
+        """Test that read() connections reject writes."""
+        with pool.read() as conn:
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("INSERT INTO items (value) VALUES ('x')")
+
+    def test_write_rolls_back_on_error(self, pool):
+        """Test that a failing write block leaves no partial changes."""
+        with pytest.raises(RuntimeError):
+            with pool.write() as conn:
+                conn.execute("INSERT INTO items (value) VALUES ('lost')")
+                raise RuntimeError("boom")
+        with pool.read() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+
+    def test_concurrent_writers_and_readers(self, pool):
+        """Test that many threads can write and read without lock errors."""
+        errors: list[Exception] = []
+
+        def worker(n: int) -> None:
+            try:
+                for i in range(20):
+                    with pool.write() as conn:
+                        conn.execute("INSERT INTO items (value) VALUES (?)", (f"{n}-{i}",))
+                    with pool.read() as conn:
+                        conn.execute("SELECT COUNT(*) FROM items").fetchone()
+            except Exception as exc:  # pragma: no cover - surfaced below
+                errors.append(exc)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert not errors
+        with pool.read() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 160
+
+    def test_get_pool_is_shared_per_path(self, pool):
+        """Test that the same path resolves to the same pool."""
+        assert get_pool(pool.db_path) is pool
@@ -0,0 +1,83 @@
+"""Tests for the persistent description embedding cache."""
+from __future__ import annotations
+
+import numpy as np
+
+from isbn_lot_optimizer.ml.text_embeddings import TextEmbedder, augment_features_with_embeddings
+
+
+class FakeEncoder:
+    """Stands in for SentenceTransformer: deterministic vectors, records every text it encodes."""
+
+    def __init__(self, dim=8):
+        self.dim = dim
+        self.encoded = []
+
+    def encode(self, texts, batch_size=32, normalize_embeddings=True, show_progress_bar=False, convert_to_numpy=True):
+        self.encoded.extend(texts)
+        vectors = np.array([[hash((text, i)) % 1000 / 1000.0 for i in range(self.dim)] for text in texts], dtype=np.float32)
+        if normalize_embeddings:
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors
+
+
+def _embedder(cache_dir, model_name='fake-model'):
+    embedder = TextEmbedder(model_name=model_name, embedding_cache_dir=str(cache_dir))
+    embedder.model = FakeEncoder()
+    return embedder
+
+
+class TestEmbeddingCache:
+    """Test that only new descriptions are encoded and cached vectors are reused."""
+
+    def test_only_new_descriptions_are_encoded(self, tmp_path):
+        embedder = _embedder(tmp_path)
+        first = embedder.encode_descriptions(["First edition", "Signed copy", "First edition"])
+        second = embedder.encode_descriptions(["Signed  copy ", "Dust jacket", None, "First edition"])
+
+        assert embedder.model.encoded == ["First edition", "Signed copy", "Dust jacket"]
+        np.testing.assert_array_equal(first[0], first[2])
+        np.testing.assert_array_equal(second[0], first[1])
+        np.testing.assert_array_equal(second[3], first[0])
+        assert second.shape == (4, 8)
+        assert not second[2].any()
+
+    def test_cache_persists_across_embedders(self, tmp_path):
+        descriptions = ["Hardcover", "Collectible vintage paperback"]
+        fresh = _embedder(tmp_path).encode_descriptions(descriptions)
+
+        reloaded = _embedder(tmp_path)
+        cached = reloaded.encode_descriptions(descriptions)
+
+        assert reloaded.model.encoded == []
+        np.testing.assert_array_equal(cached, fresh)
+        # Stored as float16
+        np.testing.assert_allclose(fresh, FakeEncoder().encode(descriptions), atol=1e-3)
+
+    def test_models_and_normalization_do_not_share_vectors(self, tmp_path):
+        _embedder(tmp_path).encode_descriptions(["Hardcover"])
+
+        other_model = _embedder(tmp_path, model_name='other-model')
+        other_model.encode_descriptions(["Hardcover"])
+        unnormalized = _embedder(tmp_path)
+        unnormalized.encode_descriptions(["Hardcover"], normalize=False)
+
+        assert other_model.model.encoded == ["Hardcover"]
+        assert unnormalized.model.encoded == ["Hardcover"]
+
+    def test_missing_descriptions_do_not_load_the_model(self, tmp_path):
+        embedder = TextEmbedder(embedding_cache_dir=str(tmp_path))
+        X = augment_features_with_embeddings(np.ones((2, 3)), [None, "  "], embedder)
+
+        assert embedder.model is None
+        assert X.shape == (2, 3 + 384)
+        assert not X[:, 3:].any()
+
+    def test_cache_can_be_disabled(self, tmp_path):
+        embedder = TextEmbedder(model_name='fake-model', embedding_cache_dir=str(tmp_path), use_embedding_cache=False)
+        embedder.model = FakeEncoder()
+        embedder.encode_descriptions(["Hardcover"])
+        embedder.encode_descriptions(["Hardcover"])
+
+        assert embedder.model.encoded == ["Hardcover", "Hardcover"]
+        assert not list(tmp_path.iterdir())
@@ -0,0 +1,136 @@
+"""Tests for the preloaded ML feature store."""
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from isbn_lot_optimizer.ml import feature_store
+from isbn_lot_optimizer.ml.feature_extractor import (
+    get_author_aggregates,
+    get_bookfinder_features,
+    get_sold_listings_features,
+)
+from isbn_lot_optimizer.ml.feature_store import (
+    FeatureStore,
+    load_author_aggregates,
+    load_bookfinder_features,
+    load_sold_listings_features,
+    query_features,
+)
+from shared.db_pool import close_pool
+
+SCHEMA = """
+CREATE TABLE books (
+    isbn TEXT PRIMARY KEY, canonical_author TEXT, sold_comps_median REAL, sold_count INTEGER,
+    ratings_count INTEGER, average_rating REAL, bookfinder_has_signed INTEGER,
+    bookfinder_has_first_edition INTEGER
+);
+CREATE TABLE bookfinder_offers (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, isbn TEXT NOT NULL, vendor TEXT NOT NULL, price REAL NOT NULL,
+    shipping REAL, condition TEXT, is_signed INTEGER, is_first_edition INTEGER, is_oldworld INTEGER,
+    description TEXT
+);
+"""
+
+SOLD_LISTINGS_SCHEMA = """
+CREATE TABLE sold_listings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, isbn TEXT, platform TEXT, price REAL, signed INTEGER,
+    cover_type TEXT
+);
+"""
+
+
+@pytest.fixture
+def catalog_path(tmp_path):
+    path = tmp_path / "catalog.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    conn.executemany(
+        "INSERT INTO books VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            ("9780000000001", "Stephen King", 12.0, 5, 1000, 4.1, 1, 0),
+            ("9780000000002", "Stephen King", 20.0, 3, 400, 3.9, 0, 1),
+            ("9780000000003", "Lee Child", 8.0, 9, 50, 4.5, 0, 0),
+            ("9780000000004", "Lee Child", None, 2, 10, 4.0, 0, 0),
+        ],
+    )
+    conn.executemany(
+        "INSERT INTO bookfinder_offers (isbn, vendor, price, shipping, condition, is_signed, "
+        "is_first_edition, is_oldworld, description) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            ("9780000000001", "abebooks", 10.0, 4.0, "Used", 0, 0, 0, "ok"),
+            ("9780000000001", "biblio", 30.0, None, "New", 1, 1, 0, "x" * 150),
+            ("9780000000001", "abebooks", 12.5, 3.5, "Used", 0, 1, 1, None),
+            ("9780000000002", "alibris", 7.0, 0.0, "Used", 0, 0, 0, "fine"),
+        ],
+    )
+    conn.commit()
+    conn.close()
+    yield path
+    close_pool(path)
+
+
+def _assert_matches_direct_queries(store, path, isbns, authors):
+    for isbn in isbns:
+        assert store.bookfinder_features(isbn) == query_features(path, load_bookfinder_features, isbn)
+        assert store.sold_listings_features(isbn) == query_features(path, load_sold_listings_features, isbn)
+    for author in authors:
+        assert store.author_aggregates(author) == query_features(path, load_author_aggregates, author)
+
+
+class TestFeatureStore:
+    """Test preloading, incremental refresh and the public helpers."""
+
+    def test_preloaded_features_match_direct_queries(self, catalog_path):
+        store = FeatureStore(catalog_path)
+
+        features = store.bookfinder_features("9780000000001")
+        assert features["bookfinder_lowest_price"] == 14.0
+        assert features["bookfinder_total_offers"] == 3
+        assert features["bookfinder_source_count"] == 2
+        assert features["bookfinder_new_vs_used_spread"] == 30.0 - 14.0
+        assert store.author_aggregates("Lee Child")["author_book_count"] == 1
+        assert store.sold_listings_features("9780000000001") is None
+        _assert_matches_direct_queries(
+            store, catalog_path, ["9780000000001", "9780000000002", "9780000000009"], ["Stephen King", "Lee Child"]
+        )
+
+    def test_refresh_applies_only_logged_changes(self, catalog_path):
+        store = FeatureStore(catalog_path, refresh_interval=3600)
+        conn = sqlite3.connect(catalog_path)
+        conn.executescript(SOLD_LISTINGS_SCHEMA)
+        conn.execute("DELETE FROM bookfinder_offers WHERE isbn = '9780000000002'")
+        conn.execute(
+            "INSERT INTO bookfinder_offers (isbn, vendor, price, condition) VALUES ('9780000000003', 'zvab', 5.0, 'Used')"
+        )
+        conn.execute("UPDATE books SET canonical_author = 'Lee Child', sold_comps_median = 30.0 WHERE isbn = '9780000000002'")
+        conn.commit()
+
+        # Changes are not visible until the store refreshes
+        assert store.bookfinder_features("9780000000003") is None
+
+        store.refresh()
+        conn.execute("INSERT INTO sold_listings (isbn, platform, price, signed, cover_type) VALUES ('9780000000003', 'ebay', 9.0, 1, 'Hardcover')")
+        conn.execute("INSERT INTO sold_listings (isbn, platform, price) VALUES (NULL, 'ebay', 9.0)")
+        conn.commit()
+        store.refresh()
+        conn.close()
+
+        assert store.bookfinder_features("9780000000002") is None
+        assert store.bookfinder_features("9780000000003")["bookfinder_lowest_price"] == 5.0
+        assert store.author_aggregates("Stephen King")["author_book_count"] == 1
+        assert store.author_aggregates("Lee Child")["author_book_count"] == 2
+        assert store.sold_listings_features("9780000000003")["serper_sold_hardcover_pct"] == 1.0
+        _assert_matches_direct_queries(
+            store, catalog_path, [f"978000000000{n}" for n in range(1, 5)], ["Stephen King", "Lee Child"]
+        )
+
+    def test_public_helpers_use_one_store_per_database(self, catalog_path, monkeypatch):
+        monkeypatch.setattr(feature_store, "_stores", {})
+
+        assert get_bookfinder_features("9780000000002", str(catalog_path))["bookfinder_avg_price"] == 7.0
+        assert get_sold_listings_features("9780000000002", str(catalog_path)) is None
+        assert get_author_aggregates("Unknown", str(catalog_path)) is None
+        assert get_author_aggregates("Stephen King", str(catalog_path))["author_book_count"] == 2
+        assert len(feature_store._stores) == 1
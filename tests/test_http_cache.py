@@ -0,0 +1,156 @@
+"""Tests for the shared persistent HTTP response cache."""
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from shared.db_pool import close_pool
+from shared.http_cache import HttpCache
+
+
+class _Upstream:
+    """Tiny HTTP server counting calls, with optional ETag support."""
+
+    def __init__(self, delay: float = 0.0, etag: str | None = None):
+        self.calls = 0
+        self.conditional = 0
+        self.delay = delay
+        self.etag = etag
+        self.status = 200
+        # Statuses for the next calls, used before falling back to ``status``
+        self.statuses: list[int] = []
+        upstream = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                upstream.calls += 1
+                if upstream.delay:
+                    time.sleep(upstream.delay)
+                if upstream.etag and self.headers.get("If-None-Match") == upstream.etag:
+                    upstream.conditional += 1
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                body = b'{"price": 4.25}'
+                self.send_response(upstream.statuses.pop(0) if upstream.statuses else upstream.status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                if upstream.etag:
+                    self.send_header("ETag", upstream.etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/api/price"
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    path = tmp_path / "http_cache.db"
+    yield path
+    close_pool(path)
+
+
+@pytest.fixture
+def upstream():
+    server = _Upstream()
+    yield server
+    server.close()
+
+
+def _cache(path, upstream, ttl=60.0):
+    return HttpCache(path, endpoint_ttls=[("test", upstream.url, ttl)])
+
+
+@pytest.mark.integration
+class TestHttpCache:
+    """Test hits, TTLs, coalescing and revalidation against a local server."""
+
+    def test_repeat_request_is_served_from_disk(self, cache_path, upstream):
+        """Test that a second cache (new process) reuses the stored response."""
+        first = _cache(cache_path, upstream).get(upstream.url, params={"isbn": "9780143127550", "key": "a"})
+        assert first.from_cache is False and first.json() == {"price": 4.25}
+
+        again = _cache(cache_path, upstream)
+        second = again.get(upstream.url, params={"key": "a", "isbn": "9780143127550"},
+                           headers={"Authorization": "Bearer other-token"})
+        assert second.from_cache is True and second.json() == {"price": 4.25}
+        assert upstream.calls == 1
+        assert again.stats()["endpoints"]["test"]["hits"] == 1
+
+    def test_ttl_expiry_and_bypass(self, cache_path, upstream):
+        """Test that expired entries refetch and ttl=0 skips the cache."""
+        cache = _cache(cache_path, upstream, ttl=0.05)
+        cache.get(upstream.url, params={"isbn": "1"})
+        time.sleep(0.1)
+        assert cache.get(upstream.url, params={"isbn": "1"}).from_cache is False
+        cache.get(upstream.url, params={"isbn": "1"}, ttl=0)
+        assert upstream.calls == 3
+        assert cache.stats()["endpoints"]["test"]["bypassed"] == 1
+
+    def test_errors_are_not_cached(self, cache_path, upstream):
+        """Test that throttled responses always go upstream."""
+        upstream.status = 429
+        cache = _cache(cache_path, upstream)
+        assert cache.get(upstream.url).status_code == 429
+        assert cache.get(upstream.url).status_code == 429
+        assert upstream.calls == 2
+
+    def test_identical_in_flight_requests_coalesce(self, cache_path):
+        """Test that concurrent scans of one ISBN make a single upstream call."""
+        slow = _Upstream(delay=0.2)
+        try:
+            cache = _cache(cache_path, slow)
+            with ThreadPoolExecutor(max_workers=6) as pool:
+                responses = list(pool.map(lambda _: cache.get(slow.url, params={"isbn": "1"}), range(6)))
+            assert slow.calls == 1
+            assert all(r.json() == {"price": 4.25} for r in responses)
+            assert cache.stats()["endpoints"]["test"]["coalesced"] == 5
+        finally:
+            slow.close()
+
+    def test_throttled_response_is_not_shared_with_waiting_callers(self, cache_path):
+        """Test that callers coalesced onto a throttled request retry instead of reusing its 429."""
+        slow = _Upstream(delay=0.2)
+        slow.statuses = [429]
+        try:
+            cache = _cache(cache_path, slow)
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                responses = list(pool.map(lambda _: cache.get(slow.url, params={"isbn": "1"}), range(4)))
+
+            statuses = sorted(r.status_code for r in responses)
+            assert statuses == [200, 200, 200, 429]
+            throttled = next(r for r in responses if r.status_code == 429)
+            assert throttled.from_cache is False
+            # One throttled call, then one retry shared by the remaining callers
+            assert slow.calls == 2
+            assert cache.stats()["endpoints"]["test"]["coalesced"] == 2
+        finally:
+            slow.close()
+
+    def test_stale_entry_revalidates_with_etag(self, cache_path):
+        """Test that a 304 refreshes the stored entry without a new body."""
+        tagged = _Upstream(etag='"v1"')
+        try:
+            cache = _cache(cache_path, tagged, ttl=0.05)
+            cache.get(tagged.url)
+            time.sleep(0.1)
+            response = cache.get(tagged.url)
+            assert response.from_cache is True and response.json() == {"price": 4.25}
+            assert tagged.conditional == 1
+            assert cache.stats()["endpoints"]["test"]["revalidated"] == 1
+        finally:
+            tagged.close()
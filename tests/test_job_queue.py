@@ -0,0 +1,213 @@
+"""Tests for the durable background job queue."""
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from isbn_lot_optimizer import job_queue as jq
+from isbn_lot_optimizer.enrichment_coordinator import RateLimiter
+from isbn_lot_optimizer.job_queue import JobQueue, PermanentFailure
+from shared.db_pool import close_pool, get_pool
+
+
+@pytest.fixture
+def queue_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(jq, "BACKOFF_BASE_SECONDS", 0.0)
+    path = tmp_path / "jobs.db"
+    yield path
+    close_pool(path)
+
+
+def _expire_leases(path) -> None:
+    with get_pool(path).write() as conn:
+        conn.execute("UPDATE job_items SET lease_expires_at = 0 WHERE status = 'running'")
+
+
+@pytest.mark.database
+class TestJobQueue:
+    """Test persistence, retries and resumption."""
+
+    def test_items_processed_and_hook_called(self, queue_path):
+        """Test that every item runs once and on_complete sees the final counts."""
+        seen: list[str] = []
+        finished: list[dict] = []
+        queue = JobQueue(queue_path)
+        queue.register("demo", lambda key, payload: seen.append(key), on_complete=finished.append)
+
+        job_id = queue.enqueue("demo", [("a", {}), ("b", {}), ("c", {})])
+        assert queue.run_pending() == 3
+
+        assert seen == ["a", "b", "c"]
+        job = queue.get_job(job_id)
+        assert job["status"] == "completed"
+        assert job["completed"] == 3 and job["progress"] == 1.0
+        assert finished and finished[0]["job_id"] == job_id
+
+    def test_retry_then_fail(self, queue_path):
+        """Test that transient errors retry and exhausted items are marked failed."""
+        calls = {"flaky": 0, "broken": 0}
+
+        def handler(key, payload):
+            calls[key] += 1
+            if key == "broken" or calls[key] < 2:
+                raise RuntimeError("upstream 503")
+
+        queue = JobQueue(queue_path)
+        queue.register("demo", handler, max_attempts=3)
+        job_id = queue.enqueue("demo", [("flaky", {}), ("broken", {})])
+        queue.run_pending()
+
+        job = queue.get_job(job_id)
+        assert calls == {"flaky": 2, "broken": 3}
+        assert job["completed"] == 1 and job["failed"] == 1
+        assert job["errors"][0]["item"] == "broken"
+
+    def test_permanent_failure_skips_retries(self, queue_path):
+        """Test that PermanentFailure fails an item on the first attempt."""
+        calls = []
+
+        def handler(key, payload):
+            calls.append(key)
+            raise PermanentFailure("no cover found")
+
+        queue = JobQueue(queue_path)
+        queue.register("demo", handler, max_attempts=5)
+        job_id = queue.enqueue("demo", [("x", {})])
+        queue.run_pending()
+        assert calls == ["x"]
+        assert queue.get_job(job_id)["failed"] == 1
+
+    def test_resumes_after_restart(self, queue_path):
+        """Test that a new queue on the same DB finishes an interrupted job."""
+        first = JobQueue(queue_path)
+        first.register("demo", lambda key, payload: None)
+        job_id = first.enqueue("demo", [(str(n), {}) for n in range(5)])
+        first.run_pending(max_items=2)
+        # Simulate a crash mid-item: the claim stops being renewed
+        first._claim()
+        _expire_leases(queue_path)
+
+        seen: list[str] = []
+        second = JobQueue(queue_path)
+        second.register("demo", lambda key, payload: seen.append(key))
+        second.start()
+        try:
+            deadline = time.time() + 5
+            while second.get_job(job_id)["status"] != "completed" and time.time() < deadline:
+                time.sleep(0.02)
+        finally:
+            second.stop()
+
+        assert sorted(seen) == ["2", "3", "4"]
+        assert second.get_job(job_id)["completed"] == 5
+
+    def test_live_claim_is_not_taken_by_another_queue(self, queue_path):
+        """Test that a second process leaves items alone while their lease is renewed."""
+        first = JobQueue(queue_path)
+        first.register("demo", lambda key, payload: None)
+        job_id = first.enqueue("demo", [("a", {})])
+        claimed = first._claim()
+
+        seen: list[str] = []
+        second = JobQueue(queue_path)
+        second.register("demo", lambda key, payload: seen.append(key))
+        second.start()
+        try:
+            time.sleep(0.2)
+            assert first.renew_leases() == 1
+            assert seen == []
+            assert second.get_job(job_id)["running"] == 1
+
+            # The original owner still records its result
+            first._process(*claimed)
+        finally:
+            second.stop()
+        assert first.get_job(job_id)["completed"] == 1
+        assert seen == []
+
+    def test_expired_claim_is_taken_over(self, queue_path):
+        """Test that a lease that ran out lets another queue redo the item and fences the old owner."""
+        first = JobQueue(queue_path)
+        first.register("demo", lambda key, payload: None)
+        job_id = first.enqueue("demo", [("a", {})])
+        stale = first._claim()
+        _expire_leases(queue_path)
+
+        seen: list[str] = []
+        second = JobQueue(queue_path)
+        second.register("demo", lambda key, payload: seen.append(key))
+        reclaimed = second._claim()
+        assert reclaimed is not None and reclaimed[3] == "a"
+
+        # The old owner finishing late must not overwrite the new claim
+        first._process(*stale)
+        assert second.get_job(job_id)["running"] == 1
+
+        second._process(*reclaimed)
+        assert seen == ["a"]
+        assert second.get_job(job_id)["completed"] == 1
+
+    def test_limiters_selected_per_item(self, queue_path):
+        """Test that select_limiters picks the token buckets from each payload."""
+        taken: list[str] = []
+
+        class Bucket:
+            def __init__(self, name):
+                self.name = name
+
+            def acquire(self, timeout=None):
+                taken.append(self.name)
+                return True
+
+        buckets = {"x": Bucket("x"), "y": Bucket("y")}
+        queue = JobQueue(queue_path)
+        queue.register(
+            "demo",
+            lambda key, payload: None,
+            select_limiters=lambda payload: [buckets[name] for name in payload["use"]],
+        )
+        queue.enqueue("demo", [("a", {"use": ["x"]}), ("b", {"use": ["x", "y"]})])
+        assert queue.run_pending() == 2
+        assert taken == ["x", "x", "y"]
+
+    def test_workers_run_in_parallel_under_rate_limit(self, queue_path):
+        """Test that workers overlap slow items while honouring the token bucket."""
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def handler(key, payload):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.05)
+            with lock:
+                active -= 1
+
+        limiter = RateLimiter(name="test", rate_per_second=1000.0, burst_capacity=100)
+        queue = JobQueue(queue_path, workers=4)
+        queue.register("demo", handler, limiters=[limiter])
+        job_id = queue.enqueue("demo", [(str(n), {}) for n in range(12)])
+        queue.start()
+        try:
+            deadline = time.time() + 5
+            while queue.get_job(job_id)["status"] != "completed" and time.time() < deadline:
+                time.sleep(0.02)
+        finally:
+            queue.stop()
+
+        assert queue.get_job(job_id)["completed"] == 12
+        assert peak > 1
+
+    def test_cancel_stops_pending_items(self, queue_path):
+        """Test that cancelling leaves pending items unprocessed."""
+        queue = JobQueue(queue_path)
+        queue.register("demo", lambda key, payload: None)
+        job_id = queue.enqueue("demo", [("a", {}), ("b", {})])
+        assert queue.cancel(job_id)
+        assert queue.run_pending() == 0
+        job = queue.get_job(job_id)
+        assert job["status"] == "cancelled" and job["cancelled"] == 2
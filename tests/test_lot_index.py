@@ -0,0 +1,165 @@
+"""Tests for the persistent lot index behind incremental lot updates."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from isbn_lot_optimizer.service import BookService
+from tests.test_database import _full_book_payload
+
+KING = ["9780307743657", "9781501142970", "9780385121675"]
+ROWLING = ["9780439708180", "9780439064873"]
+NG = "9780143127550"
+NEW_KING = "9781982110567"
+
+
+def _add(service: BookService, isbn: str, title: str, author: str, **metadata) -> None:
+    service.db.upsert_book(_full_book_payload(
+        isbn, title, author,
+        metadata_json={"title": title, "authors": [author], **metadata},
+        estimated_price=12.0,
+        probability_score=50.0,
+    ))
+
+
+def _lot_shapes(service: BookService) -> set:
+    return {
+        (row["strategy"], frozenset(json.loads(row["book_isbns"])))
+        for row in service.db.fetch_lots()
+    }
+
+
+@pytest.fixture
+def service(temp_db_path: Path, monkeypatch):
+    service = BookService(temp_db_path)
+    for n, isbn in enumerate(KING):
+        _add(service, isbn, f"King Novel {n}", "Stephen King")
+    for n, isbn in enumerate(ROWLING):
+        _add(service, isbn, f"Harry Potter {n}", "J. K. Rowling", series_name="Harry Potter")
+    _add(service, NG, "Everything I Never Told You", "Celeste Ng")
+
+    # No eBay calls: record which lots would have been re-priced
+    priced: list[list[str]] = []
+
+    def fake_enrich(candidates):
+        priced.extend(list(c.book_isbns) for c in candidates)
+        return candidates
+
+    monkeypatch.setattr(service, "_enrich_candidates_with_pricing", fake_enrich)
+    service.priced = priced
+    service.save_lots(service.build_lot_candidates(fetch_pricing=False))
+    yield service
+    service.close()
+
+
+def _full_rebuild_shapes(service: BookService) -> set:
+    return {
+        (lot.strategy, frozenset(lot.book_isbns))
+        for lot in service.build_lot_candidates(fetch_pricing=False)
+    }
+
+
+@pytest.mark.database
+class TestLotIndex:
+    """Test that incremental updates touch only the affected groups."""
+
+    def test_accept_rebuilds_only_that_author(self, service, monkeypatch):
+        """Test that a new King book regroups King lots and leaves the rest alone."""
+        untouched = {
+            row["id"] for row in service.db.fetch_lots()
+            if not set(json.loads(row["book_isbns"])) & set(KING)
+        }
+        assert untouched
+
+        grouped: list[set[str]] = []
+        build = service.build_lot_candidates
+
+        def recording_build(fetch_pricing=True, books=None):
+            grouped.append({b.isbn for b in books} if books is not None else {"<all>"})
+            return build(fetch_pricing=fetch_pricing, books=books)
+
+        monkeypatch.setattr(service, "build_lot_candidates", recording_build)
+        _add(service, NEW_KING, "King Novel 3", "Stephen King")
+        result = service.update_lots_for_isbn(NEW_KING)
+
+        assert result and all(NEW_KING in lot.book_isbns for lot in result)
+        assert grouped and all(isbns == set(KING) | {NEW_KING} for isbns in grouped)
+        assert untouched <= {row["id"] for row in service.db.fetch_lots()}
+        assert service.priced == [list(lot.book_isbns) for lot in result]
+        assert _lot_shapes(service) == _full_rebuild_shapes(service)
+
+    def test_unchanged_membership_keeps_pricing(self, service):
+        """Test that re-running an update does not re-price identical lots."""
+        service.update_lots_for_isbn(KING[0])
+        assert service.priced == []
+
+    def test_delete_is_incremental(self, service, monkeypatch):
+        """Test that deleting books shrinks their lots without a full recalculation."""
+        monkeypatch.setattr(service, "recalculate_lots", lambda: pytest.fail("full recalculation"))
+        batches = []
+        update = service.update_lots_for_isbns
+
+        def recording_update(isbns):
+            batches.append(sorted(isbns))
+            return update(isbns)
+
+        monkeypatch.setattr(service, "update_lots_for_isbns", recording_update)
+        service.delete_books([KING[0], ROWLING[0]])
+
+        assert batches == [sorted([KING[0], ROWLING[0]])]
+
+        shapes = _lot_shapes(service)
+        assert not any(KING[0] in isbns or ROWLING[0] in isbns for _, isbns in shapes)
+        assert shapes == _full_rebuild_shapes(service)
+
+    def test_rebuilt_lot_does_not_replace_lot_with_same_name(self, service):
+        """Test that a rebuilt lot is renamed rather than overwriting an unaffected lot."""
+        lots = service.db.fetch_lots()
+        king = next(row for row in lots if KING[0] in json.loads(row["book_isbns"]))
+        rowling = next(row for row in lots if ROWLING[0] in json.loads(row["book_isbns"]))
+        # As save_lots leaves two lots whose generated names collide
+        with service.db._pool.write() as conn:
+            conn.execute("UPDATE lots SET name = ? WHERE id = ?", (f"{king['name']} (2)", king["id"]))
+            conn.execute(
+                "UPDATE lots SET name = ?, strategy = ? WHERE id = ?",
+                (king["name"], king["strategy"], rowling["id"]),
+            )
+
+        _add(service, NEW_KING, "King Novel 3", "Stephen King")
+        service.update_lots_for_isbn(NEW_KING)
+
+        rows = service.db.fetch_lots()
+        assert len({(row["name"], row["strategy"]) for row in rows}) == len(rows)
+        kept = next(row for row in rows if row["id"] == rowling["id"])
+        assert set(json.loads(kept["book_isbns"])) == set(ROWLING)
+        assert service.db.fetch_lot_ids_for_keys([("isbn", ROWLING[0])]) == {rowling["id"]}
+        rebuilt = next(row for row in rows if NEW_KING in json.loads(row["book_isbns"]))
+        assert rebuilt["name"] != king["name"]
+        assert service.db.fetch_lot_ids_for_keys([("isbn", NEW_KING)]) == {rebuilt["id"]}
+
+    def test_metadata_change_moves_book_between_groups(self, service):
+        """Test that changing a book's author regroups both the old and new author."""
+        service.db.update_book_record(
+            KING[2], metadata={"title": "King Novel 2", "authors": ["Celeste Ng"]}
+        )
+        service.update_lots_for_isbn(KING[2])
+
+        shapes = _lot_shapes(service)
+        assert any(isbns == {KING[2], NG} for _, isbns in shapes)
+        assert not any(KING[2] in isbns and KING[0] in isbns for _, isbns in shapes)
+        assert shapes == _full_rebuild_shapes(service)
+
+    def test_index_built_lazily_for_existing_lots(self, service):
+        """Test that a database without an index gets one on first update."""
+        with service.db._pool.write() as conn:
+            conn.execute("DELETE FROM lot_index_state")
+            conn.execute("DELETE FROM lot_index")
+        assert service.db.fetch_lot_index_cursor() is None
+
+        _add(service, NEW_KING, "King Novel 3", "Stephen King")
+        service.update_lots_for_isbn(NEW_KING)
+
+        assert service.db.fetch_lot_index_cursor() == service.db.fetch_change_cursor()
+        assert _lot_shapes(service) == _full_rebuild_shapes(service)
@@ -0,0 +1,167 @@
+"""Tests for the lot market snapshot store and batched snapshot fetching."""
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+
+import pytest
+import requests
+
+from isbn_lot_optimizer import lot_market
+from isbn_lot_optimizer.lot_market import LotSnapshotStore
+from shared.db_pool import close_pool
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    path = tmp_path / "lot_cache.db"
+    yield path
+    close_pool(path)
+
+
+@pytest.fixture
+def store(store_path, monkeypatch):
+    snapshot_store = LotSnapshotStore(store_path)
+    monkeypatch.setattr(lot_market, "get_snapshot_store", lambda: snapshot_store)
+    return snapshot_store
+
+
+@pytest.fixture
+def ebay(monkeypatch, call_recorder):
+    """Replace the eBay queries with slow fakes that record each (kind, query)."""
+    failing: set[str] = set()
+
+    def fake_browse(session, q, limit=50):
+        call_recorder("browse", q)
+        if "browse" in failing:
+            raise requests.HTTPError("429 Client Error: Too Many Requests")
+        return (20.0, 5)
+
+    def fake_sold(session, app_id, q, entries=100):
+        call_recorder("sold", q)
+        if "sold" in failing:
+            raise requests.ConnectionError("connection reset")
+        return (15.0, 3)
+
+    monkeypatch.setattr(lot_market, "_browse_active", fake_browse)
+    monkeypatch.setattr(lot_market, "_finding_sold", fake_sold)
+    monkeypatch.setenv("EBAY_APP_ID", "test-app")
+    call_recorder.failing = failing
+    return call_recorder
+
+
+def _response(status: int, payload: dict) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response._content = json.dumps(payload).encode()
+    response.url = lot_market.EBAY_FINDING_URL
+    response.from_cache = False
+    return response
+
+
+@pytest.mark.database
+class TestLotSnapshotStore:
+    """Test TTL, eviction and legacy JSON migration."""
+
+    def test_expired_snapshots_are_not_returned(self, store_path):
+        store = LotSnapshotStore(store_path, ttl=60)
+        store.put("fresh", {"ts": time.time(), "active_median": 10.0})
+        store.put("stale", {"ts": time.time() - 120, "active_median": 12.0})
+
+        assert set(store.get_many(["fresh", "stale", "unknown"])) == {"fresh"}
+
+    def test_evict_keeps_newest_entries(self, store_path):
+        store = LotSnapshotStore(store_path, max_entries=2)
+        now = time.time()
+        store.put_many({f"k{n}": {"ts": now - n} for n in range(4)})
+
+        assert store.evict() == 2
+        assert set(store.get_many(["k0", "k1", "k2", "k3"])) == {"k0", "k1"}
+
+    def test_legacy_json_is_migrated_once(self, store_path, tmp_path):
+        legacy = tmp_path / "lot_cache.json"
+        legacy.write_text(json.dumps({"king||": {"ts": time.time(), "active_median": 9.0}}))
+
+        store = LotSnapshotStore(store_path, legacy_path=legacy)
+
+        assert store.get("king||")["active_median"] == 9.0
+        assert not legacy.exists()
+        assert (tmp_path / "lot_cache.json.migrated").exists()
+
+
+class TestMarketSnapshotsForLots:
+    """Test the batch API: dedupe, cache reuse and concurrent fan-out."""
+
+    def test_batch_dedupes_keys_and_caches_results(self, store, ebay):
+        calls = ebay.calls
+        keys = [("Stephen King", "Dark Tower", None), ("stephen king ", "dark tower", None), ("Lee Child", None, None)]
+
+        snapshots = lot_market.market_snapshots_for_lots(keys)
+
+        assert set(snapshots) == set(keys)
+        assert snapshots[keys[0]] is snapshots[keys[1]]
+        queries = len(lot_market.build_lot_queries("Stephen King", "Dark Tower", None)) + len(
+            lot_market.build_lot_queries("Lee Child", None, None)
+        )
+        assert len(calls) == 2 * queries
+        assert snapshots[keys[2]]["active_median"] == 20.0
+        assert snapshots[keys[2]]["sold_count"] == 3 * len(lot_market.build_lot_queries("Lee Child", None, None))
+
+        calls.clear()
+        again = lot_market.market_snapshot_for_lot("Lee Child", None, None)
+        assert calls == []
+        assert again["ts"] == snapshots[keys[2]]["ts"]
+
+    def test_queries_for_one_lot_run_concurrently(self, store, ebay):
+        lot_market.market_snapshot_for_lot("Stephen King", "Dark Tower", None)
+
+        assert len(ebay.calls) == 8
+        assert ebay.peak > 1
+
+    def test_snapshot_with_failed_queries_is_not_cached(self, store, ebay):
+        ebay.failing.update({"browse", "sold"})
+
+        failed = lot_market.market_snapshot_for_lot("Lee Child", None, None)
+
+        assert failed["active_median"] is None and failed["sold_count"] == 0
+        assert failed["failed_queries"] == 2 * len(failed["queries"])
+        assert store.get(lot_market._cache_key("Lee Child", None, None)) is None
+
+        # A partial outage is not cached either
+        ebay.failing.discard("browse")
+        partial = lot_market.market_snapshot_for_lot("Lee Child", None, None)
+        assert partial["active_median"] == 20.0
+        assert partial["failed_queries"] == len(partial["queries"])
+        assert store.get(lot_market._cache_key("Lee Child", None, None)) is None
+
+        ebay.failing.clear()
+        ebay.calls.clear()
+        recovered = lot_market.market_snapshot_for_lot("Lee Child", None, None)
+        assert ebay.calls and recovered["sold_median"] == 15.0
+        assert store.get(lot_market._cache_key("Lee Child", None, None))["failed_queries"] == 0
+
+    def test_cache_read_error_falls_back_to_live_fetch(self, store, ebay, monkeypatch):
+        def locked(keys):
+            raise sqlite3.OperationalError("database is locked")
+
+        monkeypatch.setattr(store, "get_many", locked)
+
+        snapshot = lot_market.market_snapshot_for_lot("Lee Child", None, None)
+
+        assert ebay.calls and snapshot["sold_median"] == 15.0
+
+    def test_throttled_response_is_a_failure_not_an_empty_result(self, monkeypatch):
+        responses = {"status": 429}
+        monkeypatch.setattr(
+            lot_market, "cached_get",
+            lambda url, **kwargs: _response(responses["status"], {"findCompletedItemsResponse": [{"ack": ["Failure"]}]}),
+        )
+
+        with pytest.raises(requests.HTTPError):
+            lot_market._finding_sold(None, "test-app", "lee child lot")
+        responses["status"] = 503
+        with pytest.raises(requests.HTTPError):
+            lot_market._finding_sold(None, "test-app", "lee child lot")
+        responses["status"] = 404
+        assert lot_market._finding_sold(None, "test-app", "lee child lot") == (None, 0)
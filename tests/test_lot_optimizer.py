@@ -0,0 +1,114 @@
+"""Tests for the non-overlapping lot partition optimizer."""
+from __future__ import annotations
+
+import random
+
+import numpy as np
+import pytest
+
+from isbn_lot_optimizer.lot_optimizer import ProfitModel, optimize_lot_assignment
+from shared.models import BookEvaluation, BookMetadata, LotSuggestion
+
+
+def _book(isbn: str, price: float, probability: float = 60.0) -> BookEvaluation:
+    return BookEvaluation(
+        isbn=isbn,
+        original_isbn=isbn,
+        metadata=BookMetadata(isbn=isbn, title=f"Book {isbn}", authors=("Author",)),
+        market=None,
+        estimated_price=price,
+        condition="Good",
+        edition=None,
+        rarity=None,
+        probability_score=probability,
+        probability_label="Medium",
+    )
+
+
+def _lot(name: str, isbns, per_book=None) -> LotSuggestion:
+    return LotSuggestion(
+        name=name,
+        strategy="author",
+        book_isbns=list(isbns),
+        estimated_value=0.0,
+        probability_score=60.0,
+        probability_label="Medium",
+        sell_through=None,
+        lot_per_book_price=per_book,
+    )
+
+
+def _assert_partition(plan, books):
+    placed = [isbn for lot in plan.lots for isbn in lot.book_isbns] + plan.singles
+    assert sorted(placed) == sorted(b.isbn for b in books)
+
+
+@pytest.mark.unit
+class TestOptimizeLotAssignment:
+    """Test partition validity and profit against the greedy baseline."""
+
+    def test_overlapping_suggestions_become_a_partition(self):
+        """Test that a book shared by two suggestions lands in one place."""
+        books = [_book(str(n), 4.0) for n in range(6)]
+        groups = [_lot("Author A", ["0", "1", "2", "3"]), _lot("Series B", ["2", "3", "4", "5"])]
+        plan = optimize_lot_assignment(books, groups, time_budget=0.2, seed=1)
+        _assert_partition(plan, books)
+        assert plan.expected_profit >= plan.greedy_profit
+
+    def test_beats_greedy_when_first_lot_steals_books(self):
+        """Test that the search recovers the better split greedy misses."""
+        books = [_book(str(n), 3.0, probability=40.0) for n in range(6)]
+        # Greedy takes the big low-value lot first and strands the valuable pair
+        groups = [
+            _lot("Big", ["0", "1", "2", "3", "4"], per_book=2.0),
+            _lot("Pair", ["4", "5"], per_book=20.0),
+            _lot("Rest", ["0", "1", "2", "3"], per_book=2.5),
+        ]
+        plan = optimize_lot_assignment(books, groups, time_budget=0.3, seed=7)
+        _assert_partition(plan, books)
+        assert plan.improvement > 0
+        names = {lot.group.name: sorted(lot.book_isbns) for lot in plan.lots}
+        assert names["Pair"] == ["4", "5"]
+
+    def test_cheap_books_stay_single_when_lots_lose_money(self):
+        """Test that unprofitable groupings are not forced."""
+        books = [_book(str(n), 30.0, probability=90.0) for n in range(3)]
+        groups = [_lot("Bundle", ["0", "1", "2"], per_book=1.0)]
+        plan = optimize_lot_assignment(books, groups, time_budget=0.1, seed=3)
+        assert plan.lots == [] and len(plan.singles) == 3
+        assert plan.expected_profit == pytest.approx(plan.singles_only_profit)
+
+    def test_profit_model_matches_reported_totals(self):
+        """Test that lot and single profits add up to the plan total."""
+        books = [_book(str(n), 5.0 + n) for n in range(8)]
+        groups = [_lot("A", ["0", "1", "2", "3"]), _lot("B", ["3", "4", "5"])]
+        model = ProfitModel(listing_cost=3.0)
+        plan = optimize_lot_assignment(books, groups, time_budget=0.1, model=model, seed=2)
+        single_profit = {
+            b.isbn: float(model.single_profit(np.array(b.estimated_price), np.array(b.probability_score / 100)))
+            for b in books
+        }
+        total = sum(lot.expected_profit for lot in plan.lots) + sum(single_profit[i] for i in plan.singles)
+        assert total == pytest.approx(plan.expected_profit, abs=0.05)
+
+
+@pytest.mark.slow
+class TestOptimizerScale:
+    """The search must stay usable on large catalogues."""
+
+    def test_ten_thousand_books(self):
+        """Test a 10k-book catalogue with overlapping author/series groups."""
+        rng = random.Random(0)
+        books = [_book(f"{n:05d}", rng.uniform(2, 25), rng.uniform(20, 90)) for n in range(10_000)]
+        groups = []
+        for a in range(1500):
+            groups.append(_lot(f"Author {a}", [f"{n:05d}" for n in range(a, 10_000, 1500)]))
+        for s in range(2500):
+            start = rng.randrange(0, 10_000 - 5)
+            groups.append(_lot(f"Series {s}", [f"{n:05d}" for n in range(start, start + rng.randint(2, 5))]))
+
+        plan = optimize_lot_assignment(books, groups, time_budget=2.0, seed=0)
+        _assert_partition(plan, books)
+        assert plan.elapsed < 10.0
+        assert plan.expected_profit >= plan.greedy_profit
+        assert plan.iterations > 100
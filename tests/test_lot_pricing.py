@@ -0,0 +1,100 @@
+"""Tests for batched eBay lot-comp pricing."""
+from __future__ import annotations
+
+import pytest
+
+from isbn_lot_optimizer import lots
+from shared.models import BookEvaluation, BookMetadata, LotSuggestion
+
+
+def _book(isbn: str) -> BookEvaluation:
+    return BookEvaluation(
+        isbn=isbn,
+        original_isbn=isbn,
+        metadata=BookMetadata(isbn=isbn, title=f"Book {isbn}"),
+        market=None,
+        estimated_price=5.0,
+        condition="Good",
+        edition=None,
+        rarity=None,
+        probability_score=50.0,
+        probability_label="Medium",
+        justification=[],
+    )
+
+
+def _lot(name: str, strategy: str) -> LotSuggestion:
+    return LotSuggestion(
+        name=name,
+        strategy=strategy,
+        book_isbns=["1", "2", "3"],
+        estimated_value=15.0,
+        probability_score=50.0,
+        probability_label="Medium",
+        sell_through=None,
+        justification=["Multiple titles"],
+        canonical_author="stephen king",
+        individual_value=15.0,
+    )
+
+
+@pytest.fixture
+def searches(monkeypatch, call_recorder):
+    """Replace the eBay search with a slow fake that records each (term, ttl)."""
+
+    def fake_search(term, limit=50, ttl=None):
+        call_recorder(term, ttl)
+        return {"total_comps": 4, "optimal_lot_size": 3, "optimal_per_book_price": 8.0}
+
+    monkeypatch.setattr(lots, "search_ebay_lot_comps", fake_search)
+    monkeypatch.setattr(lots, "LOT_PRICING_AVAILABLE", True)
+    return call_recorder
+
+
+class TestEnrichLotsWithPricing:
+    """Test search-term dedupe, concurrency and applying results back."""
+
+    def test_shared_search_terms_query_once(self, searches):
+        """Test that lots with the same search term share one eBay query."""
+        calls = searches.calls
+        books = [_book("1"), _book("2"), _book("3")]
+        entries = [
+            (_lot("King Collection", "author"), books, None, "Stephen King"),
+            (_lot("King Again", "author"), books, None, "stephen  king"),
+            (_lot("Dark Tower", "series"), books, "Dark Tower", "Stephen King"),
+            (_lot("Horror Genre", "genre"), books, None, None),
+        ]
+
+        priced = lots.enrich_lots_with_pricing(entries)
+
+        assert sorted(term for term, _ttl in calls) == ["Stephen King Dark Tower lot", "Stephen King lot"]
+        assert all(ttl == lots.LOT_COMPS_TTL_SECONDS for _term, ttl in calls)
+        assert [lot.name for lot in priced] == [entry[0].name for entry in entries]
+        assert [lot.use_lot_pricing for lot in priced] == [True, True, True, False]
+        assert priced[0].estimated_value == 24.0
+        # Attributes set after composing survive pricing
+        assert priced[1].canonical_author == "stephen king"
+
+    def test_unique_queries_run_concurrently(self, searches):
+        """Test that distinct search terms are fetched in parallel."""
+        calls = searches.calls
+        books = [_book("1"), _book("2")]
+        entries = [(_lot(f"Author {n}", "author"), books, None, f"Author {n}") for n in range(8)]
+
+        lots.enrich_lots_with_pricing(entries, max_workers=4)
+
+        assert len(calls) == 8
+        assert 1 < searches.peak <= 4
+
+    def test_failed_search_leaves_lot_unpriced(self, monkeypatch):
+        """Test that an eBay error keeps the lot's individual pricing."""
+        def broken(term, limit=50, ttl=None):
+            raise RuntimeError("503")
+
+        monkeypatch.setattr(lots, "search_ebay_lot_comps", broken)
+        monkeypatch.setattr(lots, "LOT_PRICING_AVAILABLE", True)
+        lot = _lot("King Collection", "author")
+
+        priced = lots._enrich_lot_with_pricing(lot, [_book("1"), _book("2")], None, "Stephen King")
+
+        assert priced is lot and not priced.use_lot_pricing
@@ -0,0 +1,143 @@
+"""Tests for the concurrent, rate-adaptive eBay market refresh."""
+from __future__ import annotations
+
+import json
+import threading
+import time
+
+import pytest
+
+from shared import market
+from shared.market import collect_ebay_market_stats
+from shared.market_refresh import AdaptiveRateLimiter, MarketFixtureServer, fixture_name
+
+ISBNS = [f"97800000000{n:02d}" for n in range(12)]
+LATENCY = 0.1
+
+
+def _item(price: float, state: str = "Active") -> dict:
+    return {
+        "sellingStatus": [{
+            "currentPrice": [{"@currencyId": "USD", "__value__": str(price)}],
+            "sellingState": [state],
+        }]
+    }
+
+
+@pytest.fixture
+def fixtures(tmp_path):
+    for n, isbn in enumerate(ISBNS):
+        active = {"findItemsByProductResponse": [{
+            "ack": ["Success"], "searchResult": [{"item": [_item(10 + n), _item(12 + n)]}],
+        }]}
+        sold = {"findCompletedItemsResponse": [{
+            "ack": ["Success"], "searchResult": [{"item": [_item(8 + n, "EndedWithSales"), _item(5, "Ended")]}],
+        }]}
+        (tmp_path / fixture_name(isbn, "findItemsByProduct")).write_text(json.dumps(active))
+        (tmp_path / fixture_name(isbn, "findCompletedItems")).write_text(json.dumps(sold))
+    return tmp_path
+
+
+@pytest.mark.unit
+class TestAdaptiveRateLimiter:
+    """Test rate adjustments from responses."""
+
+    def test_success_ramps_up_to_ceiling(self):
+        limiter = AdaptiveRateLimiter(1.0, max_rate=2.0, increase=0.5)
+        for _ in range(5):
+            limiter.on_response(200, {})
+        assert limiter.rate == 2.0
+
+    def test_throttle_halves_rate_and_pauses(self):
+        limiter = AdaptiveRateLimiter(4.0, burst=4)
+        limiter.on_response(429, {"Retry-After": "0.2"})
+        assert limiter.rate == 2.0 and limiter.throttled == 1
+        started = time.monotonic()
+        limiter.acquire()
+        assert time.monotonic() - started >= 0.15
+
+    def test_quota_headers_cap_rate(self):
+        limiter = AdaptiveRateLimiter(5.0, max_rate=10.0)
+        limiter.on_response(200, {"X-RateLimit-Remaining": "3", "X-RateLimit-Reset": "2"})
+        assert limiter.rate == 1.5
+
+
+@pytest.mark.unit
+class TestLegacyDelay:
+    """Test how the old fixed ``delay`` maps onto the starting rate."""
+
+    @pytest.mark.parametrize("delay, expected", [(0.5, 2.0), (0, 5.0), (0.0, 5.0), (None, 1.0)])
+    def test_delay_sets_starting_rate(self, monkeypatch, delay, expected):
+        limiters: list[AdaptiveRateLimiter] = []
+
+        def stop(limiter, **kwargs):
+            limiters.append(limiter)
+            raise RuntimeError("stop")
+
+        monkeypatch.setattr(market, "build_market_session", stop)
+        with pytest.raises(RuntimeError):
+            collect_ebay_market_stats(
+                ISBNS[:1], "dry-run", delay=delay, rate_per_second=1.0, max_rate_per_second=5.0,
+            )
+        assert limiters[0].rate == expected
+
+
+@pytest.mark.integration
+@pytest.mark.slow
+class TestCollectEbayMarketStats:
+    """Dry-run collection against the local fixture server."""
+
+    def test_concurrent_replay_streams_results(self, fixtures):
+        """Test that lookups overlap and every ISBN reaches the callback."""
+        streamed: list[str] = []
+        threads: set[str] = set()
+
+        def on_result(isbn, stats):
+            streamed.append(isbn)
+            threads.add(threading.current_thread().name)
+
+        with MarketFixtureServer(fixtures, latency=LATENCY) as server:
+            started = time.perf_counter()
+            stats = collect_ebay_market_stats(
+                ISBNS, "dry-run", concurrency=6, rate_per_second=100.0,
+                max_rate_per_second=100.0, on_result=on_result, replay_url=server.url,
+            )
+            elapsed = time.perf_counter() - started
+
+        assert sorted(streamed) == sorted(ISBNS)
+        assert threads == {threading.current_thread().name}
+        assert set(stats) == set(ISBNS)
+        first = stats[ISBNS[0]]
+        assert first.active_count == 2 and first.active_avg_price == 11.0
+        assert first.sold_count == 1 and first.unsold_count == 1
+        serial = LATENCY * 2 * len(ISBNS)
+        assert elapsed < serial / 2, f"{elapsed:.2f}s (serial would be {serial:.2f}s)"
+
+    def test_backs_off_when_quota_exceeded(self, fixtures):
+        """Test that 429s slow the limiter down without losing results."""
+        limiter = AdaptiveRateLimiter(50.0, max_rate=50.0, burst=10)
+        with MarketFixtureServer(fixtures, quota_per_second=8) as server:
+            stats = collect_ebay_market_stats(
+                ISBNS[:6], "dry-run", concurrency=6, limiter=limiter, replay_url=server.url,
+            )
+            throttled = server.throttled
+
+        assert set(stats) == set(ISBNS[:6])
+        assert throttled > 0
+        assert limiter.throttled > 0 and limiter.rate < 50.0
+
+    def test_record_then_replay(self, fixtures, tmp_path_factory):
+        """Test that recorded responses replay to the same stats."""
+        recorded = tmp_path_factory.mktemp("recorded")
+        with MarketFixtureServer(fixtures) as server:
+            live = collect_ebay_market_stats(
+                ISBNS[:2], "dry-run", rate_per_second=100.0, replay_url=server.url, record_dir=recorded,
+            )
+        assert (recorded / fixture_name(ISBNS[0], "findCompletedItems")).exists()
+        with MarketFixtureServer(recorded) as server:
+            replayed = collect_ebay_market_stats(
+                ISBNS[:2], "dry-run", rate_per_second=100.0, replay_url=server.url,
+            )
+        assert {k: v.sold_avg_price for k, v in replayed.items()} == {
+            k: v.sold_avg_price for k, v in live.items()
+        }
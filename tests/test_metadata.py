@@ -6,9 +6,15 @@ from unittest.mock import Mock, patch
 import pytest
 import requests
 
+import json
+import time
+
+import shared.metadata as metadata_module
 from shared.metadata import (
     _fetch_google_books_raw,
     _normalize_from_gbooks,
+    cache_get,
+    cache_set,
     create_http_session,
     enrich_authorship,
     fetch_metadata,
@@ -209,3 +215,43 @@ class TestFetchGoogleBooksRaw:
 
             # Should return None on HTTP errors
             assert result is None
+
+
+@pytest.mark.unit
+class TestMetadataCache:
+    """Test the SQLite-backed metadata cache."""
+
+    @pytest.fixture(autouse=True)
+    def isolated_cache(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(metadata_module, "CACHE_PATH", str(tmp_path / "gbooks_cache.json"))
+        monkeypatch.setattr(metadata_module, "CACHE_DB_PATH", str(tmp_path / "gbooks_cache.sqlite"))
+        metadata_module._cache_close()
+        yield tmp_path
+        metadata_module._cache_close()
+
+    def test_cache_round_trip(self):
+        """Test that cached metadata survives the LRU being dropped."""
+        cache_set("978-0-14-312755-0", {"title": "Cached Book"})
+        assert cache_get("9780143127550") == {"title": "Cached Book"}
+
+        metadata_module._cache_lru.clear()
+        assert cache_get("9780143127550") == {"title": "Cached Book"}
+
+    def test_cache_respects_ttl(self, monkeypatch):
+        """Test that expired entries are treated as misses."""
+        cache_set("9780143127550", {"title": "Old Book"})
+        future = time.time() + metadata_module._CACHE_TTL_SECONDS + 60
+        monkeypatch.setattr(metadata_module.time, "time", lambda: future)
+        assert cache_get("9780143127550") is None
+
+    def test_cache_migrates_legacy_json(self, isolated_cache):
+        """Test that the legacy JSON cache is imported once and retired."""
+        legacy = isolated_cache / "gbooks_cache.json"
+        legacy.write_text(json.dumps({
+            "9780143127550": {"ts": time.time(), "meta": {"title": "Legacy Book"}},
+            "bogus": "not-an-entry",
+        }))
+
+        assert cache_get("9780143127550") == {"title": "Legacy Book"}
+        assert not legacy.exists()
+        assert (isolated_cache / "gbooks_cache.json.migrated").exists()
@@ -0,0 +1,117 @@
+"""Tests for lazy, shared and hot-swapped model loading."""
+from __future__ import annotations
+
+import os
+
+import numpy as np
+import pytest
+
+joblib = pytest.importorskip("joblib")
+sklearn_preprocessing = pytest.importorskip("sklearn.preprocessing")
+from sklearn.linear_model import Ridge
+
+from isbn_lot_optimizer.ml import model_registry, price_estimator
+from isbn_lot_optimizer.ml.feature_extractor import FEATURE_NAMES
+from isbn_lot_optimizer.ml.model_registry import ModelRegistry, get_model_registry
+from isbn_lot_optimizer.ml.prediction_router import PredictionRouter
+from isbn_lot_optimizer.ml.price_estimator import MLPriceEstimator
+from shared.models import BookMetadata
+
+
+def _dump_unified(model_dir, intercept: float) -> None:
+    X = np.random.default_rng(0).normal(size=(50, len(FEATURE_NAMES)))
+    scaler = sklearn_preprocessing.StandardScaler().fit(X)
+    model = Ridge().fit(scaler.transform(X), np.full(50, intercept))
+    joblib.dump(model, model_dir / "price_v1.pkl")
+    joblib.dump(scaler, model_dir / "scaler_v1.pkl")
+
+
+@pytest.fixture
+def model_dir(tmp_path):
+    _dump_unified(tmp_path, 10.0)
+    return tmp_path
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    """Record every file the registry loads."""
+    loaded = []
+    load_file = model_registry._load_file
+
+    def recording(path):
+        loaded.append(path.name)
+        return load_file(path)
+
+    monkeypatch.setattr(model_registry, "_load_file", recording)
+    return loaded
+
+
+def _bump_mtime(path) -> None:
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestModelRegistry:
+    """Test lazy loading, sharing and hot-swapping."""
+
+    def test_models_load_on_first_use_and_are_shared(self, model_dir, loads, monkeypatch):
+        monkeypatch.setattr(price_estimator, "USE_ROUTING", False)
+        router = PredictionRouter(model_dir=model_dir)
+        estimator = MLPriceEstimator(model_dir=model_dir)
+        assert loads == []
+
+        price, model_used, _info = router.predict(BookMetadata(isbn="9780000000001"), None, None)
+
+        assert model_used == "unified"
+        assert price == pytest.approx(10.0)
+        assert not router.has_ebay_specialist
+        assert estimator.model is router.unified_model
+        assert sorted(loads) == ["price_v1.pkl", "scaler_v1.pkl"]
+
+    def test_changed_file_is_hot_swapped(self, model_dir):
+        registry = ModelRegistry(model_dir, check_interval=0)
+        first = registry.get("price_v1.pkl")
+
+        _dump_unified(model_dir, 25.0)
+        _bump_mtime(model_dir / "price_v1.pkl")
+
+        swapped = registry.get("price_v1.pkl")
+        assert swapped is not first
+        assert registry.generation == 1
+        assert registry.get("price_v1.pkl") is swapped
+
+    def test_failed_reload_keeps_serving_previous_version(self, model_dir):
+        registry = ModelRegistry(model_dir, check_interval=3600)
+        first = registry.get("price_v1.pkl")
+
+        (model_dir / "price_v1.pkl").write_bytes(b"partially written")
+        assert registry.check() is False
+        assert registry.get("price_v1.pkl") is first
+
+        _dump_unified(model_dir, 25.0)
+        _bump_mtime(model_dir / "price_v1.pkl")
+        assert registry.check() is True
+        assert registry.get("price_v1.pkl") is not first
+
+    def test_loaded_model_survives_file_rewritten_in_place(self, model_dir):
+        registry = ModelRegistry(model_dir, check_interval=3600)
+        scaler = registry.get("scaler_v1.pkl")
+        mean = scaler.mean_.copy()
+
+        # Trainers and restore_backup truncate and rewrite files in place;
+        # a memory-mapped array would raise SIGBUS here
+        (model_dir / "scaler_v1.pkl").write_bytes(b"")
+        _dump_unified(model_dir, 25.0)
+
+        np.testing.assert_array_equal(scaler.mean_, mean)
+        assert not isinstance(scaler.mean_, np.memmap)
+
+    def test_missing_file_raises_until_it_appears(self, tmp_path):
+        registry = ModelRegistry(tmp_path, check_interval=3600)
+        with pytest.raises(FileNotFoundError):
+            registry.get("price_v1.pkl")
+
+        _dump_unified(tmp_path, 10.0)
+        registry.check()
+        assert registry.get("price_v1.pkl") is not None
+        assert get_model_registry(tmp_path) is get_model_registry(str(tmp_path))
@@ -0,0 +1,62 @@
+"""Tests for parallel, cached out-of-fold prediction generation."""
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+pytest.importorskip("sklearn")
+
+from scripts.stacking import generate_oof_predictions as oof
+from sklearn.model_selection import KFold
+
+
+@pytest.fixture
+def dataset():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(60, 5))
+    y = np.exp(X[:, 0] * 0.5 + 2.0) + rng.uniform(0, 1, 60)
+    return X, y
+
+
+class TestOOFPredictions:
+    """Test fold parallelism and the per-platform OOF cache."""
+
+    def test_pooled_folds_match_sequential_training(self, dataset, monkeypatch):
+        X, y = dataset
+        monkeypatch.setitem(oof.GBR_PARAMS, 'n_estimators', 20)
+
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            predictions, metadata = oof.generate_oof_for_platform('ebay', X, y, n_folds=3, pool=pool)
+
+        expected = np.zeros(len(y))
+        for train_idx, val_idx in KFold(n_splits=3, shuffle=True, random_state=oof.KFOLD_SEED).split(X):
+            expected[val_idx] = oof.fit_fold(X[train_idx], y[train_idx], X[val_idx])
+
+        np.testing.assert_allclose(predictions, expected)
+        assert metadata['n_samples'] == 60
+        assert metadata['n_folds'] == 3
+        assert metadata['oof_mae'] == pytest.approx(np.mean(np.abs(y - expected)))
+
+    def test_cache_key_covers_data_and_hyperparameters(self, dataset, monkeypatch):
+        X, y = dataset
+        key = oof.oof_cache_key(X, y, 5)
+
+        assert oof.oof_cache_key(X.copy(), y.copy(), 5) == key
+        assert oof.oof_cache_key(X, y, 3) != key
+        assert oof.oof_cache_key(X[:-1], y[:-1], 5) != key
+        monkeypatch.setitem(oof.GBR_PARAMS, 'max_depth', 6)
+        assert oof.oof_cache_key(X, y, 5) != key
+
+    def test_cached_vector_is_returned_only_for_its_key(self, tmp_path):
+        predictions = np.array([1.5, 2.5, 3.5])
+        metadata = {'platform': 'zvab', 'n_samples': 3, 'oof_mae': 0.5}
+
+        oof.save_cached_oof('zvab', 'key-1', predictions, metadata, cache_dir=tmp_path)
+
+        cached_predictions, cached_metadata = oof.load_cached_oof('zvab', 'key-1', cache_dir=tmp_path)
+        np.testing.assert_array_equal(cached_predictions, predictions)
+        assert cached_metadata == metadata
+        assert oof.load_cached_oof('zvab', 'key-2', cache_dir=tmp_path) is None
+        assert oof.load_cached_oof('amazon', 'key-1', cache_dir=tmp_path) is None
@@ -0,0 +1,176 @@
+"""Tests for batch price prediction through the router and ML estimator."""
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+joblib = pytest.importorskip("joblib")
+sklearn_preprocessing = pytest.importorskip("sklearn.preprocessing")
+from sklearn.ensemble import GradientBoostingRegressor
+from sklearn.linear_model import Ridge
+
+from isbn_lot_optimizer.ml.feature_extractor import FEATURE_NAMES, PlatformFeatureExtractor
+from isbn_lot_optimizer.ml.prediction_router import PredictionRouter
+from isbn_lot_optimizer.ml import price_estimator
+from isbn_lot_optimizer.ml.price_estimator import MLPriceEstimator
+from shared.models import BookMetadata, BookScouterResult, EbayMarketStats
+
+CONDITIONS = ["New", "Like New", "Very Good", "Good", "Acceptable", "Poor"]
+COVERS = [None, "Hardcover", "Paperback", "Mass Market Paperback", "Trade"]
+
+
+def _fit(rng, columns, model):
+    X = rng.normal(size=(200, columns))
+    y = 10 + 3 * X[:, 0] - X[:, 1] + rng.normal(size=200)
+    scaler = sklearn_preprocessing.StandardScaler().fit(X)
+    return model.fit(scaler.transform(X), y), scaler
+
+
+@pytest.fixture
+def model_dir(tmp_path):
+    rng = np.random.default_rng(3)
+    stacking = tmp_path / "stacking"
+    stacking.mkdir()
+    model, scaler = _fit(rng, len(FEATURE_NAMES), GradientBoostingRegressor(n_estimators=20, random_state=0))
+    joblib.dump(model, tmp_path / "price_v1.pkl")
+    joblib.dump(scaler, tmp_path / "scaler_v1.pkl")
+    for platform, regressor in (("abebooks", Ridge()), ("ebay", GradientBoostingRegressor(n_estimators=20))):
+        columns = len(PlatformFeatureExtractor.get_platform_feature_names(platform))
+        model, scaler = _fit(rng, columns, regressor)
+        joblib.dump(model, stacking / f"{platform}_model.pkl")
+        joblib.dump(scaler, stacking / f"{platform}_scaler.pkl")
+    return tmp_path
+
+
+def _books(count: int, seed: int = 11) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    books = []
+    for n in range(count):
+        isbn = f"978000000{n:04d}"
+        route = n % 3
+        books.append({
+            "metadata": BookMetadata(
+                isbn=isbn,
+                title=f"Book {n}",
+                authors=("Some Author",),
+                published_year=int(rng.integers(1950, 2024)),
+                page_count=int(rng.integers(80, 900)),
+                cover_type=COVERS[n % len(COVERS)],
+            ),
+            "market": EbayMarketStats(
+                isbn=isbn,
+                active_count=int(rng.integers(0, 30)),
+                active_avg_price=float(rng.uniform(5, 40)),
+                sold_count=int(rng.integers(0, 20)),
+                sold_avg_price=float(rng.uniform(5, 40)),
+                sell_through_rate=float(rng.uniform(0, 1)),
+                currency="USD",
+                active_median_price=float(rng.uniform(5, 40)) if route == 1 else None,
+            ) if route != 2 else None,
+            "bookscouter": BookScouterResult(
+                isbn_10="", isbn_13=isbn, amazon_sales_rank=int(rng.integers(1, 2_000_000))
+            ) if n % 2 else None,
+            "condition": CONDITIONS[n % len(CONDITIONS)],
+            "abebooks": {"abebooks_avg_price": float(rng.uniform(4, 60)), "abebooks_count": 7} if route == 0 else None,
+            "signed": n % 7 == 0,
+            "first_edition": n % 5 == 0,
+        })
+    return books
+
+
+class TestPredictionRouterBatch:
+    """Test that predict_batch reproduces predict row by row."""
+
+    def test_batch_matches_single_predictions(self, model_dir):
+        router = PredictionRouter(model_dir=model_dir)
+        books = _books(60)
+
+        single = [router.predict(**book) for book in books]
+        batch = router.predict_batch(books)
+
+        assert {model for _price, model, _info in batch} == {"abebooks_specialist", "ebay_specialist", "unified"}
+        for (price, model, info), (expected_price, expected_model, expected_info) in zip(batch, single):
+            assert model == expected_model
+            assert price == pytest.approx(expected_price, rel=1e-9)
+            assert info == {**expected_info, "base_price": pytest.approx(expected_info["base_price"], rel=1e-9)}
+        assert router.stats["total_predictions"] == 120
+        assert router.stats["abebooks_routed"] == 40
+
+    def test_failing_specialist_falls_back_for_its_rows(self, model_dir, monkeypatch):
+        router = PredictionRouter(model_dir=model_dir)
+        books = _books(12)
+
+        def broken(X):
+            raise RuntimeError("model unavailable")
+
+        monkeypatch.setattr(router.abebooks_model, "predict", broken)
+        single = [router.predict(**book) for book in books]
+        batch = router.predict_batch(books)
+
+        assert [model for _price, model, _info in batch] == [model for _price, model, _info in single]
+        assert "abebooks_specialist" not in {model for _price, model, _info in batch}
+
+
+class TestEstimatorBatch:
+    """Test estimate_price_batch against estimate_price."""
+
+    def test_unified_batch_matches_single(self, model_dir, monkeypatch):
+        monkeypatch.setattr(price_estimator, "USE_ROUTING", False)
+        estimator = MLPriceEstimator(model_dir=model_dir)
+        books = _books(30)
+        books.append({"metadata": None, "market": None, "bookscouter": None})
+
+        single = [estimator.estimate_price(**book) for book in books]
+        batch = estimator.estimate_price_batch(books)
+
+        assert batch == single
+
+    def test_routed_batch_matches_single(self, model_dir, monkeypatch):
+        monkeypatch.setattr(price_estimator, "USE_ROUTING", False)
+        estimator = MLPriceEstimator(model_dir=model_dir)
+        estimator.router = PredictionRouter(model_dir=model_dir)
+        books = _books(30)
+
+        assert estimator.estimate_price_batch(books) == [estimator.estimate_price(**book) for book in books]
+
+
+@pytest.mark.database
+class TestServiceBatchEstimates:
+    """Test that BookService.estimate_ml_prices scores the catalog in one batch."""
+
+    def test_catalog_is_estimated_in_one_batch(self, model_dir, temp_db_path, monkeypatch):
+        from isbn_lot_optimizer import ml
+        from isbn_lot_optimizer.service import BookService
+        from tests.test_database import _full_book_payload
+
+        monkeypatch.setattr(price_estimator, "USE_ROUTING", False)
+        estimator = MLPriceEstimator(model_dir=model_dir)
+        monkeypatch.setattr(ml, "get_ml_estimator", lambda *args, **kwargs: estimator)
+
+        service = BookService(temp_db_path)
+        try:
+            service.db.upsert_book(_full_book_payload("9780439708180", "Sorcerer's Stone", "J. K. Rowling"))
+            service.db.upsert_book(_full_book_payload("9780143127550", "Everything I Never Told You", "Celeste Ng"))
+            books = {book.isbn: book for book in service.list_books()}
+            single = {
+                isbn: estimator.estimate_price(book.metadata, book.market, book.bookscouter, book.condition or "Good")
+                for isbn, book in books.items()
+            }
+
+            batches = []
+            estimate_price_batch = estimator.estimate_price_batch
+
+            def recording(items):
+                batches.append(len(items))
+                return estimate_price_batch(items)
+
+            monkeypatch.setattr(estimator, "estimate_price_batch", recording)
+            monkeypatch.setattr(estimator, "estimate_price", None)
+
+            assert service.estimate_ml_prices() == single
+            assert service.estimate_ml_prices(["978-0-14-312755-0", "9780000000000"]) == {
+                "9780143127550": single["9780143127550"]
+            }
+            assert batches == [2, 1]
+        finally:
+            service.close()
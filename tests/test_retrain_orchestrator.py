@@ -0,0 +1,88 @@
+"""Tests for the parallel, incremental retraining graph."""
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from scripts.retrain_all_models import TrainingOrchestrator, TrainingStep
+
+# Writes its output file with start/end times and its thread cap, then reports a MAE
+SCRIPT = """
+import json, os, sys, time
+started = time.time()
+time.sleep({sleep})
+if {fail}:
+    sys.exit(1)
+out = os.path.join("isbn_lot_optimizer", "models", "{name}.json")
+with open(out, "w") as f:
+    json.dump({{"started": started, "finished": time.time(), "threads": os.environ.get("OMP_NUM_THREADS")}}, f)
+print("Test MAE: 1.50")
+"""
+
+
+def _write_script(root, name, sleep=0.3, fail=False):
+    (root / f"{name}.py").write_text(SCRIPT.format(name=name, sleep=sleep, fail=fail))
+
+
+def _output(root, name):
+    return json.loads((root / "isbn_lot_optimizer" / "models" / f"{name}.json").read_text())
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "isbn_lot_optimizer" / "models").mkdir(parents=True)
+    for name in ("a", "b", "c"):
+        _write_script(tmp_path, name)
+    return tmp_path
+
+
+def _orchestrator(root):
+    steps = [
+        TrainingStep("a", "A", "a.py", ("a.json",)),
+        TrainingStep("b", "B", "b.py", ("b.json",)),
+        TrainingStep("c", "C", "c.py", ("c.json",), depends_on=("a",)),
+    ]
+    return TrainingOrchestrator(cpu_budget=2, steps=steps, project_root=root, state_path=root / "state.json")
+
+
+class TestTrainingGraph:
+    """Test parallel execution, dependency order and skipping unchanged steps."""
+
+    def test_independent_steps_run_in_parallel_and_dependents_wait(self, project):
+        orchestrator = _orchestrator(project)
+        orchestrator.run_steps()
+
+        a, b, c = (_output(project, name) for name in "abc")
+        assert a["started"] < b["finished"] and b["started"] < a["finished"]
+        assert c["started"] >= a["finished"]
+        assert a["threads"] == b["threads"] == "1"
+        assert all(result["success"] and result["mae"] == 1.5 for result in orchestrator.training_results.values())
+
+    def test_unchanged_steps_are_skipped(self, project):
+        orchestrator = _orchestrator(project)
+        orchestrator._save_step_state(orchestrator.run_steps())
+
+        _write_script(project, "a", sleep=0.0)
+        rerun = _orchestrator(project)
+        rerun.run_steps()
+
+        assert not rerun.training_results["a"].get("skipped")
+        assert rerun.training_results["b"]["skipped"]
+        assert rerun.training_results["b"]["mae"] == 1.5
+        # c's inputs include a, which changed
+        assert not rerun.training_results["c"].get("skipped")
+
+        forced = _orchestrator(project)
+        forced.run_steps(force=True)
+        assert not any(result.get("skipped") for result in forced.training_results.values())
+
+    def test_failed_step_blocks_its_dependents(self, project):
+        _write_script(project, "a", fail=True)
+        orchestrator = _orchestrator(project)
+        step_state = orchestrator.run_steps()
+
+        assert orchestrator.training_results["a"]["success"] is False
+        assert orchestrator.training_results["b"]["success"] is True
+        assert orchestrator.training_results["c"] == {"success": False, "error": "Dependency failed: a"}
+        assert set(step_state) == {"b"}
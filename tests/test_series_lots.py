@@ -0,0 +1,105 @@
+"""Tests for bulk series resolution behind build_series_lots_enhanced."""
+from __future__ import annotations
+
+import pytest
+
+from isbn_lot_optimizer.series_lots import build_series_lots_enhanced
+from shared.models import BookEvaluation, BookMetadata
+from shared.series_database import SeriesDatabaseManager
+
+REACHER = {
+    "9780515153651": "Killing Floor",
+    "9780440245988": "Die Trying",
+    "9780440246008": "Tripwire",
+}
+POTTER = {
+    "9780439708180": "Harry Potter and the Sorcerer's Stone",
+}
+UNMATCHED = "9780143127550"
+
+
+def _book(isbn: str, title: str) -> BookEvaluation:
+    return BookEvaluation(
+        isbn=isbn,
+        original_isbn=isbn,
+        metadata=BookMetadata(isbn=isbn, title=title),
+        market=None,
+        estimated_price=8.0,
+        condition="Good",
+        edition=None,
+        rarity=None,
+        probability_score=50.0,
+        probability_label="Medium",
+        justification=[],
+    )
+
+
+@pytest.fixture
+def series_db_path(tmp_path):
+    path = tmp_path / "books.db"
+    db = SeriesDatabaseManager(path)
+    child = db.upsert_author("Lee Child")
+    reacher = db.upsert_series(child, "Jack Reacher", book_count=4)
+    for position, title in enumerate([*REACHER.values(), "Running Blind"], 1):
+        db.add_series_book(reacher, title, series_position=position)
+    for isbn in REACHER:
+        db.match_book_to_series(isbn, reacher, 0.9, "test")
+
+    rowling = db.upsert_author("J. K. Rowling")
+    potter = db.upsert_series(rowling, "Harry Potter", book_count=7)
+    other = db.upsert_series(rowling, "Wizarding World", book_count=10)
+    for isbn in POTTER:
+        db.match_book_to_series(isbn, potter, 0.95, "test")
+        db.match_book_to_series(isbn, other, 0.4, "test")
+    db.close()
+    return path
+
+
+class TestBulkSeriesResolution:
+    """Test the set-based series lookups."""
+
+    def test_get_series_for_isbns_matches_single_lookups(self, series_db_path):
+        db = SeriesDatabaseManager(series_db_path)
+        isbns = [*REACHER, *POTTER, UNMATCHED]
+
+        bulk = db.get_series_for_isbns(isbns)
+
+        assert set(bulk) == {*REACHER, *POTTER}
+        for isbn in isbns:
+            assert bulk.get(isbn, []) == db.get_series_for_isbn(isbn)
+        db.close()
+
+    def test_group_isbns_by_series_uses_best_match(self, series_db_path):
+        db = SeriesDatabaseManager(series_db_path)
+
+        groups = db.group_isbns_by_series([UNMATCHED, *POTTER, *REACHER])
+
+        assert [group["series_title"] for group in groups.values()] == ["Harry Potter", "Jack Reacher"]
+        reacher = next(group for group in groups.values() if group["series_title"] == "Jack Reacher")
+        assert reacher["isbns"] == list(REACHER)
+        assert reacher["author_name"] == "Lee Child"
+        assert db.get_books_for_series(list(groups))[reacher["series_id"]] == db.get_series_books(
+            reacher["series_id"]
+        )
+        db.close()
+
+    def test_lot_build_query_count_does_not_grow_with_books(self, series_db_path, monkeypatch):
+        statements: list[str] = []
+        connect = SeriesDatabaseManager._get_connection
+
+        def traced(self):
+            conn = connect(self)
+            conn.set_trace_callback(statements.append)
+            return conn
+
+        monkeypatch.setattr(SeriesDatabaseManager, "_get_connection", traced)
+        books = [_book(isbn, title) for isbn, title in {**REACHER, **POTTER}.items()]
+        books.append(_book(UNMATCHED, "Everything I Never Told You"))
+
+        lots = build_series_lots_enhanced(books, series_db_path, min_value=0)
+
+        selects = [sql for sql in statements if sql.lstrip().upper().startswith("SELECT")]
+        assert len(selects) == 2
+        assert len(lots) == 1
+        assert lots[0].name == "Jack Reacher (3/4 Books)"
+        assert "○ Running Blind" in lots[0].justification
@@ -0,0 +1,106 @@
+"""Tests for the indexed series title matcher."""
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from shared.author_aliases import canonical_author
+from shared.series_database import SeriesDatabaseManager
+from shared.series_match_index import SeriesMatchIndex
+from shared.series_matcher import SeriesMatcher
+
+REACHER = ["Killing Floor", "Die Trying", "Tripwire", "Running Blind", "Echo Burning"]
+DISCWORLD = ["The Colour of Magic", "The Light Fantastic", "Equal Rites", "Mort", "Sourcery"]
+
+
+@pytest.fixture
+def series_db_path(tmp_path):
+    path = tmp_path / "books.db"
+    db = SeriesDatabaseManager(path)
+    child = db.upsert_author("Lee Child")
+    reacher = db.upsert_series(child, "Jack Reacher", book_count=len(REACHER))
+    for position, title in enumerate(REACHER, 1):
+        db.add_series_book(reacher, title, series_position=position)
+    pratchett = db.upsert_author("Terry Pratchett")
+    for series_title, titles in (("Discworld", DISCWORLD), ("Rincewind", DISCWORLD[:2])):
+        series_id = db.upsert_series(pratchett, series_title, book_count=len(titles))
+        for position, title in enumerate(titles, 1):
+            db.add_series_book(series_id, title, series_position=position)
+    db.close()
+    return path
+
+
+def _brute_force(db_path, title, authors):
+    """The unindexed matcher: score every title of every series of the author."""
+    db = SeriesDatabaseManager(db_path)
+    normalized = SeriesMatcher.normalize_for_matching(title)
+    found = []
+    for author in authors:
+        for series in db.get_author_series_by_normalized_name(canonical_author(author)):
+            for book in db.get_series_books(series["series_id"]):
+                score = SeriesMatcher.similarity_score(
+                    normalized, SeriesMatcher.normalize_for_matching(book["book_title"])
+                )
+                if score >= 0.8:
+                    found.append((series["series_id"], book["book_title"], score))
+                    break
+    db.close()
+    return found
+
+
+class TestSeriesMatchIndex:
+    """Test that the index agrees with brute force and is cached on disk."""
+
+    def test_index_matches_brute_force(self, series_db_path):
+        matcher = SeriesMatcher(series_db_path)
+        rng = random.Random(7)
+        queries = REACHER + DISCWORLD + ["Killing Flor", "Tripwires", "Colour of Magick", "Nothing Alike"]
+        for _ in range(50):
+            word = list(rng.choice(REACHER + DISCWORLD))
+            word[rng.randrange(len(word))] = rng.choice("aeiou")
+            queries.append("".join(word))
+
+        for query in queries:
+            for authors in (["Lee Child"], ["Terry Pratchett"], ["Pratchett, Terry", "Lee Child"]):
+                expected = _brute_force(series_db_path, query, authors)
+                got = [
+                    (match["series_id"], match["matched_book"], match["confidence"])
+                    for match in matcher._find_matches(query, authors)
+                ]
+                assert got == expected, (query, authors)
+        matcher.close()
+
+    def test_index_is_reused_until_tables_change(self, series_db_path):
+        cache_path = SeriesMatchIndex.cache_path_for(series_db_path)
+        first = SeriesMatchIndex.load(series_db_path)
+        assert cache_path.exists()
+        assert len(first) == len(REACHER) + len(DISCWORLD) + 2
+
+        assert SeriesMatchIndex.load(series_db_path) is first
+
+        db = SeriesDatabaseManager(series_db_path)
+        child = db.upsert_author("Lee Child")
+        series_id = db.upsert_series(child, "Jack Reacher", book_count=6)
+        db.add_series_book(series_id, "Without Fail", series_position=6)
+        db.close()
+
+        rebuilt = SeriesMatchIndex.load(series_db_path)
+        assert rebuilt is not first
+        assert len(rebuilt) == len(first) + 1
+        assert [book for _series, book, _score in rebuilt.match("without fail", "lee child")] == ["Without Fail"]
+
+    def test_bulk_match_saves_high_confidence_matches(self, series_db_path):
+        matcher = SeriesMatcher(series_db_path)
+        books = [
+            {"isbn": "9780515153651", "title": "Killing Floor", "authors": "Lee Child"},
+            {"isbn": "9780061020674", "title": "Mort: A Discworld Novel", "authors": ["Terry Pratchett"]},
+            {"isbn": "9780143127550", "title": "Everything I Never Told You", "authors": ["Celeste Ng"]},
+        ]
+
+        results = matcher.bulk_match_books(books)
+
+        assert set(results) == {"9780515153651", "9780061020674"}
+        assert results["9780515153651"][0]["series_title"] == "Jack Reacher"
+        assert matcher.series_db.get_series_for_isbn("9780061020674")[0]["series_title"] == "Discworld"
+        matcher.close()
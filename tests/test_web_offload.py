@@ -0,0 +1,163 @@
+"""Load test: blocking service calls must not serialize async routes."""
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from fastapi import FastAPI
+from fastapi.responses import HTMLResponse
+
+from isbn_web.api import offload
+from isbn_web.api.dependencies import get_book_service
+from isbn_web.api.offload import LoopLagMonitor, ServiceExecutor
+from isbn_web.api.routes import books as books_routes
+
+SCAN_SECONDS = 0.3
+CONCURRENT_SCANS = 6
+
+
+class _SlowService:
+    """Stand-in BookService whose scan blocks like a slow eBay lookup."""
+
+    def __init__(self, tmp_path):
+        self.db = SimpleNamespace(db_path=tmp_path / "catalog.db")
+        self.scanned: list[str] = []
+
+    def scan_isbn(self, raw_isbn, condition="Good", edition=None):
+        time.sleep(SCAN_SECONDS)
+        self.scanned.append(raw_isbn)
+        return SimpleNamespace(isbn=raw_isbn, title=f"Book {raw_isbn}")
+
+    def list_books(self):
+        return []
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setattr(offload, "service_executor", ServiceExecutor(max_workers=8))
+    monkeypatch.setattr(books_routes, "match_and_attach_series", lambda *a, **k: None)
+    # Only the scan path is under test; skip Jinja rendering of the book table
+    monkeypatch.setattr(
+        books_routes.templates, "TemplateResponse", lambda name, context: HTMLResponse("<table></table>")
+    )
+    service = _SlowService(tmp_path)
+    app = FastAPI()
+    app.include_router(books_routes.router, prefix="/api/books")
+    app.dependency_overrides[get_book_service] = lambda: service
+    app.state.service = service
+    yield app
+    offload.service_executor.shutdown()
+
+
+async def _scan_concurrently(app: FastAPI):
+    monitor = LoopLagMonitor(interval=0.02)
+    monitor.start()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        started = time.perf_counter()
+        responses = await asyncio.gather(*[
+            client.post("/api/books/scan", data={"isbn": isbn})
+            for isbn in ("9780439708180", "9780143127550", "9780316769174",
+                         "9780345339706", "9780061120084", "9780743273565")
+        ])
+        elapsed = time.perf_counter() - started
+    await monitor.stop()
+    return responses, elapsed, monitor.stats()
+
+
+@pytest.mark.integration
+@pytest.mark.slow
+class TestServiceOffload:
+    """Concurrent scans should overlap instead of queueing on the event loop."""
+
+    def test_concurrent_scans_do_not_serialize(self, app):
+        """Test that N slow scans finish in about one scan's time, not N."""
+        responses, elapsed, lag = asyncio.run(_scan_concurrently(app))
+
+        assert all(r.status_code == 200 for r in responses)
+        assert len(app.state.service.scanned) == CONCURRENT_SCANS
+        serial = SCAN_SECONDS * CONCURRENT_SCANS
+        assert elapsed < serial / 2, f"{elapsed:.2f}s for {CONCURRENT_SCANS} scans (serial would be {serial:.2f}s)"
+        # The loop kept ticking while scans ran
+        assert lag["max_ms"] < SCAN_SECONDS * 1000 / 2
+
+    def test_route_limit_caps_concurrency(self, monkeypatch):
+        """Test that a per-kind limit bounds calls running at once."""
+        monkeypatch.setitem(offload.ROUTE_LIMITS, "lots", 1)
+        executor = ServiceExecutor(max_workers=4)
+
+        async def run_two():
+            started = time.perf_counter()
+            await asyncio.gather(
+                executor.run("lots", time.sleep, 0.1),
+                executor.run("lots", time.sleep, 0.1),
+            )
+            return time.perf_counter() - started
+
+        try:
+            assert asyncio.run(run_two()) >= 0.2
+        finally:
+            executor.shutdown()
+
+    def test_executor_survives_a_new_event_loop(self, monkeypatch):
+        """Test that route limits still work when the app runs on a second event loop."""
+        monkeypatch.setitem(offload.ROUTE_LIMITS, "lots", 1)
+        executor = ServiceExecutor(max_workers=4)
+
+        async def run_two():
+            await asyncio.gather(
+                executor.run("lots", time.sleep, 0.05),
+                executor.run("lots", time.sleep, 0.05),
+            )
+
+        try:
+            asyncio.run(run_two())
+            # A semaphore shared across loops raises "bound to a different event loop"
+            asyncio.run(run_two())
+        finally:
+            executor.shutdown()
+
+    def test_every_route_kind_has_limits(self):
+        """Test that each kind the routes use is configured rather than defaulted."""
+        assert set(offload.ROUTE_LIMITS) == set(offload.ROUTE_TIMEOUTS)
+        assert {"scan", "evaluate", "refresh", "list", "update", "lots"} <= set(offload.ROUTE_LIMITS)
+
+    def test_timeout_becomes_504(self):
+        """Test that an overrunning call surfaces as HTTP 504."""
+        from fastapi import HTTPException
+
+        executor = ServiceExecutor(max_workers=1)
+        try:
+            with pytest.raises(HTTPException) as excinfo:
+                asyncio.run(executor.run("evaluate", time.sleep, 0.3, timeout=0.05))
+            assert excinfo.value.status_code == 504
+            assert executor.stats()["timeouts"] == {"evaluate": 1}
+        finally:
+            executor.shutdown()
+
+    def test_timed_out_call_keeps_its_slot_until_it_finishes(self, monkeypatch):
+        """Test that a hung call still counts against the kind's limit after its 504."""
+        from fastapi import HTTPException
+
+        monkeypatch.setitem(offload.ROUTE_LIMITS, "lots", 1)
+        executor = ServiceExecutor(max_workers=4)
+
+        async def scenario():
+            with pytest.raises(HTTPException) as hung:
+                await executor.run("lots", time.sleep, 0.4, timeout=0.05)
+            with pytest.raises(HTTPException) as rejected:
+                await executor.run("lots", time.sleep, 0, timeout=0.1)
+            await asyncio.sleep(0.4)
+            await executor.run("lots", time.sleep, 0, timeout=0.5)
+            return hung.value.status_code, rejected.value.status_code
+
+        try:
+            assert asyncio.run(scenario()) == (504, 503)
+            assert executor.stats()["in_flight"] == {}
+        finally:
+            executor.shutdown()